@@ -0,0 +1,163 @@
+"""
+Benchmark: GET /budgets spend aggregation vs. number of budgets.
+
+Compares the legacy path (one ``SELECT SUM(...)`` per budget) with
+``fetch_budgets_with_spend`` (one statement for all budgets).
+
+Usage (from ``backend/``):
+
+    python -m benchmarks.bench_budget_spend
+    python -m benchmarks.bench_budget_spend --database-url postgresql+asyncpg://...
+
+Against PostgreSQL the tables must already exist (``shared/sql/init.sql``);
+the benchmark seeds a throwaway tenant and removes it afterwards.  The
+default in-memory SQLite run has no network round-trip, so it understates
+the gap you will see against a real database.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://x:x@localhost/x")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, func, and_, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from benchmarks import sqlite_compat  # noqa: F401  (registers SQLite DDL for PG types)
+from shared.database import Base
+from shared.models import Tenant, User, Category, Expense, Budget
+from services.finance.main import fetch_budgets_with_spend, _budget_to_response
+
+BUDGET_COUNTS = [1, 5, 10, 30, 60, 120]
+
+
+async def legacy_budget_spend(db: AsyncSession, user_id: uuid.UUID):
+    """The pre-aggregation implementation: one SUM per budget."""
+    result = await db.execute(
+        select(Budget).where(and_(Budget.user_id == user_id, Budget.is_active == True))
+    )
+    responses = []
+    for budget in result.scalars().all():
+        conditions = [
+            Expense.user_id == user_id,
+            Expense.transaction_date >= budget.start_date,
+            Expense.transaction_date <= budget.end_date,
+        ]
+        if budget.category_id:
+            conditions.append(Expense.category_id == budget.category_id)
+        spent_result = await db.execute(
+            select(func.sum(Expense.amount_in_base_currency)).where(and_(*conditions))
+        )
+        responses.append(_budget_to_response(budget, spent_result.scalar() or Decimal("0")))
+    return responses
+
+
+async def seed(db: AsyncSession, budget_count: int, expense_count: int):
+    tenant = Tenant(name="bench", slug=f"bench-{uuid.uuid4().hex[:8]}")
+    db.add(tenant)
+    await db.flush()
+    user = User(tenant_id=tenant.id, email="bench@example.com", password_hash="x", full_name="Bench")
+    db.add(user)
+    await db.flush()
+
+    categories = [
+        Category(tenant_id=tenant.id, name=f"Category {i}", type="expense")
+        for i in range(12)
+    ]
+    db.add_all(categories)
+    await db.flush()
+
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=365)
+    for _ in range(expense_count):
+        amount = Decimal(str(round(rng.uniform(1, 500), 2)))
+        db.add(Expense(
+            tenant_id=tenant.id,
+            user_id=user.id,
+            category_id=rng.choice(categories).id if rng.random() < 0.9 else None,
+            amount=amount,
+            amount_in_base_currency=amount,
+            currency="USD",
+            transaction_date=start + timedelta(days=rng.randrange(365)),
+        ))
+
+    for i in range(budget_count):
+        window_start = start + timedelta(days=30 * (i % 12))
+        db.add(Budget(
+            tenant_id=tenant.id,
+            user_id=user.id,
+            category_id=categories[i % len(categories)].id if i % 3 else None,
+            name=f"Budget {i}",
+            amount=Decimal("1000"),
+            period="monthly",
+            start_date=window_start,
+            end_date=window_start + timedelta(days=29),
+            is_active=True,
+        ))
+    await db.commit()
+    return tenant.id, user.id
+
+
+async def time_it(factory, fn, user_id, repeats):
+    samples = []
+    async with factory() as db:
+        await fn(db, user_id)  # warm-up
+        for _ in range(repeats):
+            started = time.perf_counter()
+            await fn(db, user_id)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--expenses", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    is_sqlite = engine.dialect.name == "sqlite"
+    if is_sqlite:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"{'budgets':>8} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}")
+    for count in BUDGET_COUNTS:
+        async with factory() as db:
+            tenant_id, user_id = await seed(db, count, args.expenses)
+
+        legacy = await time_it(factory, legacy_budget_spend, user_id, args.repeats)
+        single = await time_it(
+            factory,
+            lambda db, uid: fetch_budgets_with_spend(db, uid, active_only=True),
+            user_id,
+            args.repeats,
+        )
+        print(f"{count:>8} {legacy:>10.2f} {single:>10.2f} {legacy / single:>7.1f}x")
+
+        async with factory() as db:
+            await db.execute(delete(Budget).where(Budget.tenant_id == tenant_id))
+            await db.execute(delete(Expense).where(Expense.tenant_id == tenant_id))
+            await db.execute(delete(Category).where(Category.tenant_id == tenant_id))
+            await db.execute(delete(User).where(User.tenant_id == tenant_id))
+            await db.execute(delete(Tenant).where(Tenant.id == tenant_id))
+            await db.commit()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
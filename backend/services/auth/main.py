@@ -8,17 +8,16 @@ from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 import uuid
-import io
-from minio import Minio
-from minio.error import S3Error
 
 import sys
 sys.path.append('/app')
 
 from shared.database import get_db, Base, engine
 from shared.models import User, Tenant
+from shared.categories import seed_default_categories
 from shared.config import get_settings
 from shared.middleware.auth import get_current_user, auth_middleware
+from shared.storage import create_storage, StorageError
 
 app = FastAPI(title="Auth Service", version="1.0.0")
 
@@ -33,22 +32,17 @@ app.add_middleware(
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Initialize MinIO client
-minio_client = Minio(
-    settings.MINIO_ENDPOINT,
-    access_key=settings.MINIO_ACCESS_KEY,
-    secret_key=settings.MINIO_SECRET_KEY,
-    secure=settings.MINIO_SECURE
-)
+# Object storage (MinIO, or a local directory with STORAGE_BACKEND=local)
+storage = create_storage()
+
 
-# Ensure buckets exist
-try:
-    if not minio_client.bucket_exists("profile-images"):
-        minio_client.make_bucket("profile-images")
-    if not minio_client.bucket_exists("bank-statements"):
-        minio_client.make_bucket("bank-statements")
-except Exception as e:
-    print(f"MinIO bucket creation error: {e}")
+@app.on_event("startup")
+async def ensure_buckets():
+    for bucket in ("profile-images", "bank-statements"):
+        try:
+            await storage.ensure_bucket(bucket)
+        except StorageError as e:
+            print(f"MinIO bucket creation error: {e}")
 
 class RegisterRequest(BaseModel):
     email: EmailStr
@@ -137,6 +131,7 @@ async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db))
         )
         db.add(tenant)
         await db.flush()
+        await seed_default_categories(db, [tenant.id])
     
     new_user = User(
         tenant_id=tenant.id,
@@ -221,26 +216,11 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     }
 
 @app.get("/me", response_model=UserResponse)
-async def get_current_user(
-    authorization: str = Depends(lambda request: request.headers.get("Authorization")),
+async def read_current_user(
+    current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
-    
-    token = authorization.split(" ")[1]
-    
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
+    user_id = current_user["user_id"]
     
     result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
     user = result.scalar_one_or_none()
@@ -270,27 +250,10 @@ class ProfileUpdateRequest(BaseModel):
 @app.put("/profile")
 async def update_profile(
     profile: ProfileUpdateRequest,
-    request: Request,
+    current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Extract and verify JWT token
-    authorization = request.headers.get("Authorization")
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header"
-        )
-    
-    token = authorization.split(" ")[1]
-    
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
+    user_id = current_user["user_id"]
     
     result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
     user = result.scalar_one_or_none()
@@ -325,55 +288,49 @@ async def update_profile(
 
 @app.post("/profile/upload-image")
 async def upload_profile_image(
-    request: Request,
     file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    user_data = get_current_user(request)
+    user_id = current_user["user_id"]
     
     # Validate file type
     allowed_types = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
     if file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail="Invalid file type. Only JPEG, PNG, and WebP images are allowed.")
     
-    # Read file content
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    # Validate file size (max 5MB)
-    if file_size > 5 * 1024 * 1024:
+    # Validate file size (max 5MB) from the spooled upload, without reading it into memory
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, 2)
+        file.file.seek(0)
+    if size > 5 * 1024 * 1024:
         raise HTTPException(status_code=400, detail="File too large. Maximum size is 5MB.")
     
     # Generate unique filename
     file_extension = file.filename.split('.')[-1]
-    unique_filename = f"{user_data['user_id']}/{uuid.uuid4()}.{file_extension}"
+    unique_filename = f"{user_id}/{uuid.uuid4()}.{file_extension}"
     
     try:
-        # Upload to MinIO
-        minio_client.put_object(
-            "profile-images",
-            unique_filename,
-            io.BytesIO(file_content),
-            file_size,
-            content_type=file.content_type
-        )
-        
-        # Update user profile with image URL
-        image_url = f"/api/profile-images/{unique_filename}"
-        
-        result = await db.execute(select(User).where(User.id == uuid.UUID(user_data["user_id"])))
-        user = result.scalar_one_or_none()
-        
-        if user:
-            user.profile_image_url = image_url
-            await db.commit()
-        
-        return {
-            "message": "Profile image uploaded successfully",
-            "image_url": image_url
-        }
-    except S3Error as e:
+        await storage.put_upload("profile-images", unique_filename, file)
+    except StorageError as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload image: {str(e)}")
+    
+    # Update user profile with image URL
+    image_url = f"/api/profile-images/{unique_filename}"
+    
+    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
+    user = result.scalar_one_or_none()
+    
+    if user:
+        user.profile_image_url = image_url
+        await db.commit()
+    
+    return {
+        "message": "Profile image uploaded successfully",
+        "image_url": image_url,
+        "download_url": await storage.presigned_get_url("profile-images", unique_filename),
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -16,6 +16,7 @@ from shared.database import get_db, set_tenant_context
 from shared.models import EMI, EMIPayment
 from shared.middleware.auth import get_current_user, auth_middleware
 from shared.config import get_settings
+from shared.versioning import versions, conditional, bumps, EMIS
 
 app = FastAPI(title="EMI Service", version="1.0.0")
 
@@ -32,6 +33,17 @@ app.middleware("http")(auth_middleware)
 
 settings = get_settings()
 
+
+@app.on_event("startup")
+async def connect_data_versions():
+    versions.connect(settings.REDIS_URL)
+
+
+@app.on_event("shutdown")
+async def close_data_versions():
+    await versions.close()
+
+
 class EMICreate(BaseModel):
     loan_type: str
     lender_name: str
@@ -188,7 +200,7 @@ async def options_handler():
 async def head_handler():
     return {"status": "ok"}
 
-@app.post("/emis", response_model=EMIResponse)
+@app.post("/emis", response_model=EMIResponse, dependencies=[Depends(bumps(EMIS))])
 async def create_emi(
     emi: EMICreate,
     request: Request,
@@ -263,7 +275,7 @@ async def create_emi(
         remaining_interest=float(total_interest)
     )
 
-@app.get("/emis", response_model=List[EMIResponse])
+@app.get("/emis", response_model=List[EMIResponse], dependencies=[Depends(conditional(EMIS))])
 async def get_emis(
     request: Request,
     db: AsyncSession = Depends(get_db)
@@ -392,7 +404,7 @@ async def get_emi(
         remaining_interest=remaining_interest
     )
 
-@app.put("/emis/{emi_id}")
+@app.put("/emis/{emi_id}", dependencies=[Depends(bumps(EMIS))])
 async def update_emi(
     emi_id: str,
     emi_update: EMICreate,
@@ -437,7 +449,7 @@ async def update_emi(
     
     return {"message": "EMI updated successfully", "emi_id": emi_id}
 
-@app.delete("/emis/{emi_id}")
+@app.delete("/emis/{emi_id}", dependencies=[Depends(bumps(EMIS))])
 async def delete_emi(
     emi_id: str,
     request: Request,
@@ -464,7 +476,7 @@ async def delete_emi(
     
     return {"message": "EMI deleted successfully"}
 
-@app.get("/emis/{emi_id}/schedule", response_model=List[EMIPaymentResponse])
+@app.get("/emis/{emi_id}/schedule", response_model=List[EMIPaymentResponse], dependencies=[Depends(conditional(EMIS))])
 async def get_emi_schedule(
     emi_id: str,
     request: Request,
@@ -495,7 +507,7 @@ async def get_emi_schedule(
         for payment in payments
     ]
 
-@app.put("/payments/{payment_id}/mark-paid")
+@app.put("/payments/{payment_id}/mark-paid", dependencies=[Depends(bumps(EMIS))])
 async def mark_payment_paid(
     payment_id: str,
     paid_date: date,
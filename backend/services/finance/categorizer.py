@@ -0,0 +1,103 @@
+"""
+Keyword categorization with an Aho–Corasick automaton.
+
+All rule keywords are compiled into one automaton, so a description is
+scanned once no matter how many keywords there are, instead of running one
+substring search per keyword.  Scoring is unchanged from the original
+rule-based categorizer: a hit scores ``len(keyword) / len(description)``
+clamped to [0.5, 0.95], the best score wins, and ties go to the rule listed
+first.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+MIN_CONFIDENCE = 0.5
+MAX_CONFIDENCE = 0.95
+
+
+class CategoryMatch(NamedTuple):
+    category: str
+    keyword: str
+    confidence: float
+
+
+class _Output(NamedTuple):
+    length: int
+    order: int
+    category: str
+    keyword: str
+
+
+class _Automaton:
+    def __init__(self, rules: Dict[str, Sequence[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[_Output]] = [[]]
+
+        order = 0
+        for category, keywords in rules.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                state = 0
+                for char in keyword:
+                    nxt = self.goto[state].get(char)
+                    if nxt is None:
+                        nxt = len(self.goto)
+                        self.goto[state][char] = nxt
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.outputs.append([])
+                    state = nxt
+                self.outputs[state].append(_Output(len(keyword), order, category, keyword))
+                order += 1
+
+        # Breadth-first failure links; each state also inherits the outputs of
+        # its failure state so a scan only has to look at the current state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.outputs[nxt] = self.outputs[nxt] + self.outputs[self.fail[nxt]]
+
+    def hits(self, text: str) -> Iterable[_Output]:
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                yield from outputs[state]
+
+
+class KeywordCategorizer:
+    def __init__(self, rules: Dict[str, Sequence[str]]):
+        self.update_rules(rules)
+
+    def update_rules(self, rules: Dict[str, Sequence[str]]):
+        """Rebuild the automaton; the swap is atomic for concurrent readers."""
+        self._automaton = _Automaton(rules)
+
+    def match(self, description: str) -> Optional[CategoryMatch]:
+        text = description.lower()
+        length = max(len(text), 1)
+        best, best_key = None, None
+        for hit in self._automaton.hits(text):
+            confidence = min(max(hit.length / length, MIN_CONFIDENCE), MAX_CONFIDENCE)
+            key = (confidence, -hit.order)
+            if best_key is None or key > best_key:
+                best, best_key = hit, key
+        if best is None:
+            return None
+        return CategoryMatch(best.category, best.keyword, best_key[0])
+
+    def match_many(self, descriptions: Iterable[str]) -> List[Optional[CategoryMatch]]:
+        return [self.match(description) for description in descriptions]
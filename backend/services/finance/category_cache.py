@@ -0,0 +1,192 @@
+"""
+Per-tenant category cache.
+
+Categories are read on almost every finance request (expense serialization,
+categorization, rollup labels) but change rarely, so each tenant's full
+category list is cached as one ``TenantCategories`` snapshot in two tiers:
+
+1. An in-process LRU of snapshots, so most lookups need no I/O at all.
+2. Redis, shared by every replica, so a cold replica loads a tenant from
+   one GET instead of a query.  Keys carry a per-tenant generation number
+   (``categories:<tenant>:<generation>``); bumping the generation on a write
+   makes every earlier entry unreachable, including one a concurrent reader
+   is writing back from a stale query.
+
+``invalidate`` is called after a category write commits.  It bumps the
+generation, drops the local entry and publishes the tenant id on
+``CATEGORIES_CHANGED_CHANNEL``, which every replica's ``listen`` loop uses to
+drop its own copy.  Local entries also expire after ``LOCAL_TTL_SECONDS`` in
+case a notification is missed.  The Redis tier is optional: until
+``connect`` is called, or whenever Redis errors, the cache falls back to the
+database.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import Category
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES_CHANGED_CHANNEL = "categories:changed"
+
+MAX_CACHED_TENANTS = 1024
+LOCAL_TTL_SECONDS = 300
+REDIS_TTL_SECONDS = 24 * 3600
+LISTEN_RETRY_SECONDS = 30
+
+
+class CategoryInfo(NamedTuple):
+    id: uuid.UUID
+    name: str
+    type: str
+    color: Optional[str]
+    icon: Optional[str]
+    is_system: bool
+    parent_id: Optional[uuid.UUID]
+
+    def to_json(self) -> list:
+        return [str(self.id), self.name, self.type, self.color, self.icon, self.is_system,
+                str(self.parent_id) if self.parent_id else None]
+
+    @classmethod
+    def from_json(cls, values: list) -> "CategoryInfo":
+        id_, name, type_, color, icon, is_system, parent_id = values
+        return cls(uuid.UUID(id_), name, type_, color, icon, is_system,
+                   uuid.UUID(parent_id) if parent_id else None)
+
+
+class TenantCategories:
+    """Every category of one tenant, ordered by name."""
+
+    def __init__(self, categories: Iterable[CategoryInfo]):
+        self.categories: List[CategoryInfo] = list(categories)
+        self.by_id: Dict[uuid.UUID, CategoryInfo] = {c.id: c for c in self.categories}
+        # Name lookups prefer system categories over same-named custom ones
+        self.ids_by_name: Dict[str, uuid.UUID] = {}
+        for category in sorted(self.categories, key=lambda c: not c.is_system):
+            self.ids_by_name.setdefault(category.name, category.id)
+
+    def get(self, category_id) -> Optional[CategoryInfo]:
+        if not category_id:
+            return None
+        if not isinstance(category_id, uuid.UUID):
+            try:
+                category_id = uuid.UUID(category_id)
+            except ValueError:
+                return None
+        return self.by_id.get(category_id)
+
+
+class CategoryCache:
+    def __init__(self):
+        self._local: "OrderedDict[str, Tuple[float, TenantCategories]]" = OrderedDict()
+        self._redis: Optional[aioredis.Redis] = None
+
+    def connect(self, redis_url: str):
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def drop(self, tenant_id: Optional[str] = None):
+        """Forget the local copy of one tenant (or of every tenant)."""
+        if tenant_id is None:
+            self._local.clear()
+        else:
+            self._local.pop(tenant_id, None)
+
+    def _remember(self, tenant_id: str, snapshot: TenantCategories):
+        self._local[tenant_id] = (time.monotonic(), snapshot)
+        self._local.move_to_end(tenant_id)
+        while len(self._local) > MAX_CACHED_TENANTS:
+            self._local.popitem(last=False)
+
+    async def _load(self, db: AsyncSession, tenant_id: str) -> TenantCategories:
+        result = await db.execute(
+            select(
+                Category.id, Category.name, Category.type, Category.color,
+                Category.icon, Category.is_system, Category.parent_id,
+            )
+            .where(Category.tenant_id == uuid.UUID(tenant_id))
+            .order_by(Category.name.asc(), Category.created_at.asc())
+        )
+        return TenantCategories(
+            CategoryInfo(row.id, row.name, row.type, row.color, row.icon, bool(row.is_system), row.parent_id)
+            for row in result.all()
+        )
+
+    async def get(self, db: AsyncSession, tenant_id: str) -> TenantCategories:
+        cached = self._local.get(tenant_id)
+        if cached is not None and time.monotonic() - cached[0] < LOCAL_TTL_SECONDS:
+            self._local.move_to_end(tenant_id)
+            return cached[1]
+
+        key = None
+        if self._redis is not None:
+            try:
+                generation = await self._redis.get(f"categories:{tenant_id}:generation") or "0"
+                key = f"categories:{tenant_id}:{generation}"
+                payload = await self._redis.get(key)
+                if payload is not None:
+                    snapshot = TenantCategories(CategoryInfo.from_json(v) for v in json.loads(payload))
+                    self._remember(tenant_id, snapshot)
+                    return snapshot
+            except Exception as e:
+                logger.warning("Category cache read failed for tenant %s: %s", tenant_id, e)
+                key = None
+
+        snapshot = await self._load(db, tenant_id)
+        self._remember(tenant_id, snapshot)
+        if key is not None:
+            try:
+                payload = json.dumps([c.to_json() for c in snapshot.categories])
+                await self._redis.set(key, payload, ex=REDIS_TTL_SECONDS)
+            except Exception as e:
+                logger.warning("Category cache write failed for tenant %s: %s", tenant_id, e)
+        return snapshot
+
+    async def invalidate(self, tenant_id: str):
+        """Call after committing a category change for ``tenant_id``."""
+        self.drop(tenant_id)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.incr(f"categories:{tenant_id}:generation")
+            await self._redis.publish(CATEGORIES_CHANGED_CHANNEL, tenant_id)
+        except Exception as e:
+            logger.warning("Category cache invalidation failed for tenant %s: %s", tenant_id, e)
+
+    async def listen(self, redis_url: str):
+        """Drop local copies changed on other replicas.  Runs until cancelled."""
+        while True:
+            client = aioredis.from_url(redis_url, decode_responses=True)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CATEGORIES_CHANGED_CHANNEL)
+                    # Anything published while we were not subscribed was missed
+                    self.drop()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.drop(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Category invalidation listener failed: %s", e)
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+            finally:
+                await client.aclose()
+
+
+category_cache = CategoryCache()
@@ -1,27 +1,35 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, UploadFile, File, Body, Form
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, UploadFile, File, Body, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, update, text
-from sqlalchemy.exc import ProgrammingError
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, func, and_, or_, case, update, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 import uuid
-import io
-import csv
-import re
-from minio import Minio
-from minio.error import S3Error
+import asyncio
+import logging
 
 import sys
 sys.path.append('/app')
 
-from shared.database import get_db, set_tenant_context
-from shared.models import Expense, Category, Budget, ExchangeRate, Borrowing, BorrowingRepayment, Income, Lending, LendingCollection, NetWorthSnapshot, Notification
+from shared.database import get_db, set_tenant_context, engine
+from shared.models import User, Expense, Category, Budget, ExchangeRate, Borrowing, BorrowingRepayment, Income, Lending, LendingCollection, NetWorthSnapshot, Notification, EMI, EMIPayment, Investment, MonthlyCategoryRollup, ImportJob, ExpenseAnomaly, RecurringSchedule
 from shared.middleware.auth import get_current_user, auth_middleware
 from shared.config import get_settings
+from shared.pagination import paginate, set_next_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from shared import anomalies, downsample, net_worth, recurring, rollups, schema, timeseries
+from shared.storage import create_storage
+from shared.exchange_rates import resolver as rate_resolver, ExchangeRateNotFound
+from shared.response_cache import response_cache, cached_response
+from shared.versioning import versions, conditional, bumps, EXPENSES, CATEGORIES, BUDGETS, INCOME, BORROWINGS, LENDINGS, NET_WORTH, EMIS, INVESTMENTS
+from services.finance import statement_formats, statement_import
+from services.finance.categorizer import KeywordCategorizer
+from services.finance.category_cache import category_cache, TenantCategories
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Finance Service", version="1.0.0")
 
@@ -31,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Add auth middleware to validate JWT tokens
@@ -38,13 +47,55 @@ app.middleware("http")(auth_middleware)
 
 settings = get_settings()
 
-# Initialize MinIO client
-minio_client = Minio(
-    settings.MINIO_ENDPOINT,
-    access_key=settings.MINIO_ACCESS_KEY,
-    secret_key=settings.MINIO_SECRET_KEY,
-    secure=settings.MINIO_SECURE
-)
+
+@app.on_event("startup")
+async def verify_schema():
+    # Fail fast if `python -m shared.schema upgrade` has not run for this deploy
+    await schema.verify(engine)
+
+
+@app.on_event("startup")
+async def start_rate_invalidation_listener():
+    # Drops cached exchange rates when the worker publishes new ones
+    app.state.rate_listener = asyncio.create_task(rate_resolver.listen(settings.REDIS_URL))
+
+
+@app.on_event("shutdown")
+async def stop_rate_invalidation_listener():
+    app.state.rate_listener.cancel()
+
+
+@app.on_event("startup")
+async def start_category_cache():
+    # Redis tier of the category cache, and drops copies changed on other replicas
+    category_cache.connect(settings.REDIS_URL)
+    app.state.category_listener = asyncio.create_task(category_cache.listen(settings.REDIS_URL))
+
+
+@app.on_event("shutdown")
+async def stop_category_cache():
+    app.state.category_listener.cancel()
+    await category_cache.close()
+
+
+@app.on_event("startup")
+async def connect_data_versions():
+    versions.connect(settings.REDIS_URL)
+    response_cache.connect(settings.REDIS_URL)
+
+
+@app.on_event("shutdown")
+async def close_data_versions():
+    await versions.close()
+    await response_cache.close()
+
+
+# Object storage (MinIO, or a local directory with STORAGE_BACKEND=local)
+storage = create_storage()
+
+class RecurringConfig(BaseModel):
+    frequency: Literal["daily", "weekly", "monthly", "yearly"] = "monthly"
+    next_due_date: date
 
 class ExpenseCreate(BaseModel):
     category_id: Optional[str] = None
@@ -54,6 +105,9 @@ class ExpenseCreate(BaseModel):
     transaction_date: date
     payment_method: Optional[str] = None
     tags: Optional[List[str]] = None
+    # Recurring template; on update, None leaves the template unchanged
+    is_recurring: Optional[bool] = None
+    recurring_config: Optional[RecurringConfig] = None
 
 class ExpenseResponse(BaseModel):
     id: str
@@ -64,6 +118,8 @@ class ExpenseResponse(BaseModel):
     payment_method: Optional[str]
     category_id: Optional[str]
     created_at: datetime
+    # False until a USD rate is known for the currency and date
+    converted: bool = True
     
     # category display fields
     category_name: Optional[str] = None
@@ -85,26 +141,6 @@ class CategoryResponse(BaseModel):
     is_system: bool
     parent_id: Optional[str] = None
 
-# Default categories to auto-seed for each tenant
-DEFAULT_CATEGORIES = [
-    # Expense Categories
-    {"name": "Food & Dining",   "type": "expense", "color": "#f97316", "icon": "utensils"},
-    {"name": "Transportation",  "type": "expense", "color": "#3b82f6", "icon": "car"},
-    {"name": "Shopping",        "type": "expense", "color": "#a855f7", "icon": "shopping"},
-    {"name": "Utilities",       "type": "expense", "color": "#10b981", "icon": "home"},
-    {"name": "Healthcare",      "type": "expense", "color": "#ef4444", "icon": "heart"},
-    {"name": "Entertainment",   "type": "expense", "color": "#ec4899", "icon": "film"},
-    {"name": "Other",           "type": "expense", "color": "#64748b", "icon": "folder"},
-    
-    # Income Categories
-    {"name": "Salary",          "type": "income", "color": "#10b981", "icon": "briefcase"},
-    {"name": "Freelance",       "type": "income", "color": "#3b82f6", "icon": "trending-up"},
-    {"name": "Investments",     "type": "income", "color": "#8b5cf6", "icon": "trending-up"},
-    {"name": "Rental Income",   "type": "income", "color": "#f59e0b", "icon": "home"},
-    {"name": "Gifts",           "type": "income", "color": "#ec4899", "icon": "gift"},
-    {"name": "Other Income",    "type": "income", "color": "#64748b", "icon": "folder"},
-]
-
 class BudgetCreate(BaseModel):
     category_id: Optional[str] = None
     name: str
@@ -177,84 +213,88 @@ async def get_exchange_rate(
     from_currency: str,
     to_currency: str,
     rate_date: date = None
-) -> Decimal:
-    if from_currency == to_currency:
+) -> Optional[Decimal]:
+    """
+    Cached rate lookup; ``None`` (with a warning) when no rate is known.
+    Expenses are then stored unconverted (NULL ``exchange_rate``) until
+    ``reconvert_expenses`` prices them.
+    """
+    try:
+        return await rate_resolver.rate(db, from_currency, to_currency, rate_date)
+    except ExchangeRateNotFound as e:
+        logger.warning("Exchange rate unavailable: %s", e)
+        return None
+
+
+async def _summary_rate(db: AsyncSession, currency: str, on: date, to_currency: str) -> Decimal:
+    """Rate for totals; 1.0 when none is known, as unconverted expenses are summed."""
+    if currency == to_currency:
         return Decimal("1.0")
-    
-    if rate_date is None:
-        rate_date = date.today()
-    
-    result = await db.execute(
-        select(ExchangeRate).where(
-            and_(
-                ExchangeRate.base_currency == from_currency,
-                ExchangeRate.target_currency == to_currency,
-                ExchangeRate.date == rate_date
-            )
-        )
-    )
-    rate_obj = result.scalar_one_or_none()
-    
-    if rate_obj:
-        return rate_obj.rate
-    
-    result = await db.execute(
-        select(ExchangeRate).where(
-            and_(
-                ExchangeRate.base_currency == to_currency,
-                ExchangeRate.target_currency == from_currency,
-                ExchangeRate.date == rate_date
-            )
-        )
-    )
-    rate_obj = result.scalar_one_or_none()
-    
-    if rate_obj:
-        return Decimal("1.0") / rate_obj.rate
-    
-    return Decimal("1.0")
+    rate = await get_exchange_rate(db, currency, to_currency, on)
+    return rate if rate is not None else Decimal("1.0")
 
-async def ensure_default_categories_for_tenant(
-    db: AsyncSession,
-    tenant_id: str,
-):
-    # Check if this tenant already has any categories
-    result = await db.execute(
-        select(func.count(Category.id)).where(
-            Category.tenant_id == uuid.UUID(tenant_id)
-        )
-    )
-    count = result.scalar_one() or 0
-    if count > 0:
-        return  # already seeded or user created some
-
-    # Seed defaults
-    for cat in DEFAULT_CATEGORIES:
-        new_cat = Category(
-            tenant_id=uuid.UUID(tenant_id),
-            user_id=None,          # system-wide for this tenant
-            name=cat["name"],
-            type=cat["type"],
-            color=cat["color"],
-            icon=cat["icon"],
-            is_system=True,
-        )
-        db.add(new_cat)
 
-    await db.commit()
+class _SummaryRates:
+    """
+    Converts totals into one currency (the user's preferred one) at the
+    rate of each month's first day, resolving each (currency, month) once.
+    """
+
+    def __init__(self, db: AsyncSession, to_currency: str):
+        self.db = db
+        self.currency = to_currency
+        self._rates = {}
+
+    async def rate(self, currency: str, on: date) -> Decimal:
+        key = (currency, on.replace(day=1))
+        if key not in self._rates:
+            self._rates[key] = await _summary_rate(self.db, currency, key[1], self.currency)
+        return self._rates[key]
+
+    async def convert(self, amount, currency: str, on: date) -> float:
+        return float(Decimal(str(amount)) * await self.rate(currency, on))
+
+
+async def _preferred_currency(db: AsyncSession, user_id: uuid.UUID) -> str:
+    currency = (await db.execute(
+        select(User.preferred_currency).where(User.id == user_id)
+    )).scalar_one_or_none()
+    return currency or "USD"
 
-async def ensure_net_worth_snapshot_table(db: AsyncSession):
-    def _create(sync_session):
-        engine = sync_session.get_bind()
-        NetWorthSnapshot.__table__.create(bind=engine, checkfirst=True)
 
-    await db.run_sync(_create)
+async def _debt_totals(db: AsyncSession, rates: _SummaryRates, model, user_id: uuid.UUID, settled, open_statuses: List[str]) -> dict:
+    """
+    Outstanding and ``settled`` (repaid / received) amounts of a user's
+    borrowings or lendings, converted at the current month's rate, plus
+    their open and overdue counts.
+    """
+    today = date.today()
+    rows = (await db.execute(
+        select(
+            model.currency,
+            func.coalesce(func.sum(model.remaining_amount).filter(model.status != "closed"), 0).label("outstanding"),
+            func.coalesce(func.sum(settled), 0).label("settled"),
+            func.count(model.id).filter(model.status.in_(open_statuses)).label("open"),
+            func.count(model.id).filter(model.status != "closed", model.due_date < today).label("overdue"),
+        ).where(model.user_id == user_id).group_by(model.currency)
+    )).all()
+    return {
+        "outstanding": sum([await rates.convert(r.outstanding, r.currency, today) for r in rows]),
+        "settled": sum([await rates.convert(r.settled, r.currency, today) for r in rows]),
+        "open": sum(r.open for r in rows),
+        "overdue": sum(r.overdue for r in rows),
+    }
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "finance"}
 
-@app.post("/expenses", response_model=ExpenseResponse)
+@app.get("/health/cache")
+async def cache_stats():
+    """Response cache hit/miss counters of this process, per endpoint."""
+    return {"service": "finance", "response_cache": response_cache.snapshot()}
+
+@app.post("/expenses", response_model=ExpenseResponse, dependencies=[Depends(bumps(EXPENSES))])
 async def create_expense(
     expense: ExpenseCreate,
     request: Request,
@@ -264,7 +304,7 @@ async def create_expense(
     await set_tenant_context(db, user["tenant_id"])
     
     exchange_rate = await get_exchange_rate(db, expense.currency, "USD", expense.transaction_date)
-    amount_in_base = Decimal(str(expense.amount)) * exchange_rate
+    amount_in_base = Decimal(str(expense.amount)) * exchange_rate if exchange_rate is not None else None
     
     new_expense = Expense(
         tenant_id=uuid.UUID(user["tenant_id"]),
@@ -278,50 +318,29 @@ async def create_expense(
         transaction_date=expense.transaction_date,
         payment_method=expense.payment_method,
         tags=expense.tags,
+        is_recurring=bool(expense.is_recurring),
+        recurring_config=expense.recurring_config.model_dump(mode="json") if expense.recurring_config else None,
         synced=True
     )
     
     db.add(new_expense)
+    await db.flush()
+    await rollups.add_entry(db, rollups.expense_entry(new_expense))
+    await anomalies.score_expenses(db, [anomalies.candidate(new_expense)])
+    await recurring.sync_expense(db, new_expense)
     await db.commit()
     await db.refresh(new_expense)
     
-    # Fetch category if exists
-    category = None
-    if new_expense.category_id:
-        result = await db.execute(
-            select(Category).where(Category.id == new_expense.category_id)
-        )
-        category = result.scalar_one_or_none()
-    
-    return ExpenseResponse(
-        id=str(new_expense.id),
-        amount=float(new_expense.amount),
-        currency=new_expense.currency,
-        description=new_expense.description,
-        transaction_date=new_expense.transaction_date,
-        payment_method=new_expense.payment_method,
-        category_id=str(new_expense.category_id) if new_expense.category_id else None,
-        created_at=new_expense.created_at,
-        category_name=category.name if category else None,
-        category_color=category.color if category else None,
-        category_icon=category.icon if category else None,
-    )
+    return _expense_to_response(new_expense, await category_cache.get(db, user["tenant_id"]))
 
-@app.get("/categories", response_model=List[CategoryResponse])
+@app.get("/categories", response_model=List[CategoryResponse], dependencies=[Depends(conditional(CATEGORIES))])
 async def list_categories(
     request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     user = get_current_user(request)
     await set_tenant_context(db, user["tenant_id"])
-    await ensure_default_categories_for_tenant(db, user["tenant_id"])
-
-    result = await db.execute(
-        select(Category)
-        .where(Category.tenant_id == uuid.UUID(user["tenant_id"]))
-        .order_by(Category.name.asc())
-    )
-    categories = result.scalars().all()
+    categories = await category_cache.get(db, user["tenant_id"])
 
     return [
         CategoryResponse(
@@ -333,47 +352,100 @@ async def list_categories(
             is_system=cat.is_system,
             parent_id=str(cat.parent_id) if cat.parent_id else None,
         )
-        for cat in categories
+        for cat in categories.categories
     ]
 
-@app.get("/expenses", response_model=List[ExpenseResponse])
+def _expense_to_response(exp: Expense, categories: TenantCategories) -> ExpenseResponse:
+    """Build an ExpenseResponse with category fields from the cached ``categories``."""
+    category = categories.get(exp.category_id)
+    return ExpenseResponse(
+        id=str(exp.id),
+        amount=float(exp.amount),
+        currency=exp.currency,
+        description=exp.description,
+        transaction_date=exp.transaction_date,
+        payment_method=exp.payment_method,
+        category_id=str(exp.category_id) if exp.category_id else None,
+        created_at=exp.created_at,
+        converted=exp.exchange_rate is not None,
+        category_name=category.name if category else None,
+        category_color=category.color if category else None,
+        category_icon=category.icon if category else None,
+    )
+
+@app.get("/expenses", response_model=List[ExpenseResponse], dependencies=[Depends(conditional(EXPENSES, CATEGORIES))])
 async def get_expenses(
     request: Request,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db)
 ):
     user = get_current_user(request)
     await set_tenant_context(db, user["tenant_id"])
     
-    result = await db.execute(
+    expenses, next_cursor = await paginate(
+        db,
         select(Expense)
-        .options(joinedload(Expense.category))
-        .where(Expense.user_id == uuid.UUID(user["user_id"]))
-        .order_by(Expense.transaction_date.desc())
-        .offset(skip)
-        .limit(limit)
+        .where(Expense.user_id == uuid.UUID(user["user_id"])),
+        Expense.transaction_date,
+        Expense.id,
+        cursor,
+        limit,
     )
-    expenses = result.scalars().all()
+    set_next_cursor(response, next_cursor)
     
-    return [
-        ExpenseResponse(
-            id=str(exp.id),
-            amount=float(exp.amount),
-            currency=exp.currency,
-            description=exp.description,
-            transaction_date=exp.transaction_date,
-            payment_method=exp.payment_method,
-            category_id=str(exp.category_id) if exp.category_id else None,
-            created_at=exp.created_at,
-            category_name=exp.category.name if exp.category else None,
-            category_color=exp.category.color if exp.category else None,
-            category_icon=exp.category.icon if exp.category else None,
-        )
-        for exp in expenses
-    ]
+    categories = await category_cache.get(db, user["tenant_id"])
+    return [_expense_to_response(exp, categories) for exp in expenses]
+
+@app.get("/expenses/summary", dependencies=[Depends(conditional(EXPENSES, daily=True))])
+async def expense_summary(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Count, spend and distinct categories over every matching expense, for
+    the list page's stat cards.  Spend is in ``currency``, the user's
+    preferred one, converted at each month's rate.
+    """
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+    uid = uuid.UUID(user["user_id"])
+    rates = _SummaryRates(db, await _preferred_currency(db, uid))
+
+    conditions = [Expense.user_id == uid]
+    if start_date:
+        conditions.append(Expense.transaction_date >= start_date)
+    if end_date:
+        conditions.append(Expense.transaction_date <= end_date)
+    if category_id:
+        try:
+            conditions.append(Expense.category_id == uuid.UUID(category_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid category_id")
+
+    year = func.extract("year", Expense.transaction_date).label("year")
+    month = func.extract("month", Expense.transaction_date).label("month")
+    by_month = await db.execute(
+        select(year, month, func.sum(func.coalesce(Expense.amount_in_base_currency, Expense.amount)).label("total"))
+        .where(*conditions)
+        .group_by(year, month)
+    )
+    total = sum([
+        await rates.convert(r.total, "USD", date(int(r.year), int(r.month), 1)) for r in by_month.all()
+    ])
+    counts = (await db.execute(
+        select(
+            func.count(Expense.id).label("count"),
+            func.count(func.distinct(Expense.category_id)).label("categories"),
+        ).where(*conditions)
+    )).one()
+    return {"currency": rates.currency, "total": total, "count": counts.count, "categories": counts.categories}
 
-@app.put("/expenses/{expense_id}", response_model=ExpenseResponse)
+@app.put("/expenses/{expense_id}", response_model=ExpenseResponse, dependencies=[Depends(bumps(EXPENSES))])
 async def update_expenses(
     expense_id: str,
     payload: ExpenseCreate,
@@ -390,45 +462,33 @@ async def update_expenses(
     if not expense: 
         raise HTTPException(status_code=404, detail="Expense not found")
 
+    old_entry = rollups.expense_entry(expense)
     expense.category_id = uuid.UUID(payload.category_id) if payload.category_id else None 
     expense.amount = Decimal(str(payload.amount))
     expense.currency = payload.currency 
     expense.description = payload.description 
-    expense.transaction_date = payload.transaction_date 
     expense.payment_method = payload.payment_method 
     expense.tags = payload.tags 
+    if payload.is_recurring is not None:
+        expense.is_recurring = payload.is_recurring
+        expense.recurring_config = payload.recurring_config.model_dump(mode="json") if payload.recurring_config else None
 
     exchange_rate = await get_exchange_rate(db, payload.currency, "USD", payload.transaction_date)
     expense.exchange_rate = exchange_rate 
-    expense.amount_in_base_currency = Decimal(str(payload.amount)) * exchange_rate 
+    expense.amount_in_base_currency = Decimal(str(payload.amount)) * exchange_rate if exchange_rate is not None else None
 
+    await timeseries.move_to_date(db, expense, Expense.transaction_date, payload.transaction_date)
+    await db.flush()
+    await rollups.replace_entry(db, old_entry, rollups.expense_entry(expense))
+    await anomalies.score_expenses(db, [anomalies.candidate(expense)], replace=True)
+    await recurring.sync_expense(db, expense)
     await db.commit()
     await db.refresh(expense)
     
-    # Fetch category if exists
-    category = None
-    if expense.category_id:
-        result = await db.execute(
-            select(Category).where(Category.id == expense.category_id)
-        )
-        category = result.scalar_one_or_none()
-
-    return ExpenseResponse(
-        id=str(expense.id),
-        amount=float(expense.amount),
-        currency=expense.currency,
-        description=expense.description,
-        transaction_date=expense.transaction_date,
-        payment_method=expense.payment_method,
-        category_id=str(expense.category_id) if expense.category_id else None,
-        created_at=expense.created_at,
-        category_name=category.name if category else None,
-        category_color=category.color if category else None,
-        category_icon=category.icon if category else None,
-    )
+    return _expense_to_response(expense, await category_cache.get(db, user["tenant_id"]))
 
 
-@app.delete("/expenses/{expense_id}")
+@app.delete("/expenses/{expense_id}", dependencies=[Depends(bumps(EXPENSES))])
 async def delete_expense(
     expense_id: str,
     request: Request,
@@ -450,12 +510,17 @@ async def delete_expense(
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     
+    entry = rollups.expense_entry(expense)
     await db.delete(expense)
+    await db.flush()
+    await rollups.remove_entry(db, entry)
+    await anomalies.drop_flags(db, [expense.id])
+    await recurring.drop_expense(db, expense.id)
     await db.commit()
     
     return {"message": "Expense deleted successfully"}
 
-@app.post("/categories", response_model=CategoryResponse)
+@app.post("/categories", response_model=CategoryResponse, dependencies=[Depends(bumps(CATEGORIES))])
 async def create_category(
     category: CategoryCreate,
     request: Request,
@@ -475,7 +540,12 @@ async def create_category(
     )
     
     db.add(new_category)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A category with this name already exists")
+    await category_cache.invalidate(user["tenant_id"])
     await db.refresh(new_category)
     
     return CategoryResponse(
@@ -487,7 +557,7 @@ async def create_category(
         is_system=new_category.is_system,
 )
 
-@app.put("/categories/{category_id}", response_model=CategoryResponse)
+@app.put("/categories/{category_id}", response_model=CategoryResponse, dependencies=[Depends(bumps(CATEGORIES))])
 async def update_category(
     category_id: str,
     category: CategoryCreate,
@@ -516,7 +586,12 @@ async def update_category(
     existing_category.color = category.color
     existing_category.icon = category.icon
     
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="A category with this name already exists")
+    await category_cache.invalidate(user["tenant_id"])
     await db.refresh(existing_category)
     
     return CategoryResponse(
@@ -528,7 +603,7 @@ async def update_category(
         is_system=existing_category.is_system
     )
 
-@app.delete("/categories/{category_id}")
+@app.delete("/categories/{category_id}", dependencies=[Depends(bumps(CATEGORIES, EXPENSES, BUDGETS))])
 async def delete_category(
     category_id: str,
     request: Request,
@@ -552,22 +627,79 @@ async def delete_category(
         raise HTTPException(status_code=404, detail="Category not found or cannot be deleted")
     
     # Check if category is being used by any expenses
-    expense_count = await db.execute(
+    expense_count = (await db.execute(
         select(func.count(Expense.id)).where(Expense.category_id == category.id)
-    ).scalar()
+    )).scalar()
     
     if expense_count > 0:
         # Set category_id to NULL for all expenses using this category
         await db.execute(
             update(Expense).where(Expense.category_id == category.id).values(category_id=None)
         )
+        await rollups.move_category(db, category.tenant_id, str(category.id), "")
     
     await db.delete(category)
     await db.commit()
+    await category_cache.invalidate(user["tenant_id"])
     
     return {"message": "Category deleted successfully"}
 
-@app.post("/budgets", response_model=BudgetResponse)
+def _budget_to_response(budget: Budget, spent: Decimal) -> BudgetResponse:
+    spent = spent or Decimal("0")
+    remaining = budget.amount - spent
+    percentage = (spent / budget.amount * 100) if budget.amount > 0 else 0
+    return BudgetResponse(
+        id=str(budget.id),
+        name=budget.name,
+        amount=float(budget.amount),
+        currency=budget.currency,
+        period=budget.period,
+        start_date=budget.start_date,
+        end_date=budget.end_date,
+        spent=float(spent),
+        remaining=float(remaining),
+        percentage_used=float(percentage)
+    )
+
+async def fetch_budgets_with_spend(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    budget_ids: Optional[List[uuid.UUID]] = None,
+    active_only: bool = False,
+) -> List[BudgetResponse]:
+    """
+    Load budgets together with their spend in a single statement.
+
+    Each budget is LEFT JOINed to the expenses that fall inside its own
+    start/end window (and its category, when it has one), so the number of
+    round-trips no longer grows with the number of budgets.  Expenses not
+    yet converted count at face value, like everywhere spend is summed.
+    """
+    spent = func.coalesce(func.sum(func.coalesce(Expense.amount_in_base_currency, Expense.amount)), 0).label("spent")
+    query = (
+        select(Budget, spent)
+        .outerjoin(
+            Expense,
+            and_(
+                Expense.user_id == Budget.user_id,
+                Expense.transaction_date >= Budget.start_date,
+                Expense.transaction_date <= Budget.end_date,
+                or_(Budget.category_id.is_(None), Expense.category_id == Budget.category_id),
+            )
+        )
+        .where(Budget.user_id == user_id)
+        .group_by(Budget.id)
+        .order_by(Budget.created_at.asc(), Budget.id.asc())
+    )
+    if budget_ids is not None:
+        query = query.where(Budget.id.in_(budget_ids))
+    if active_only:
+        query = query.where(Budget.is_active == True)
+
+    result = await db.execute(query)
+    return [_budget_to_response(budget, Decimal(str(spent))) for budget, spent in result.all()]
+
+@app.post("/budgets", response_model=BudgetResponse, dependencies=[Depends(bumps(BUDGETS))])
 async def create_budget(
     budget: BudgetCreate,
     request: Request,
@@ -594,36 +726,10 @@ async def create_budget(
     await db.commit()
     await db.refresh(new_budget)
     
-    result = await db.execute(
-        select(func.sum(Expense.amount_in_base_currency))
-        .where(
-            and_(
-                Expense.user_id == uuid.UUID(user["user_id"]),
-                Expense.transaction_date >= budget.start_date,
-                Expense.transaction_date <= budget.end_date,
-                Expense.category_id == new_budget.category_id if new_budget.category_id else True
-            )
-        )
-    )
-    spent = result.scalar() or Decimal("0")
-    
-    remaining = new_budget.amount - spent
-    percentage = (spent / new_budget.amount * 100) if new_budget.amount > 0 else 0
-    
-    return BudgetResponse(
-        id=str(new_budget.id),
-        name=new_budget.name,
-        amount=float(new_budget.amount),
-        currency=new_budget.currency,
-        period=new_budget.period,
-        start_date=new_budget.start_date,
-        end_date=new_budget.end_date,
-        spent=float(spent),
-        remaining=float(remaining),
-        percentage_used=float(percentage)
-    )
+    budgets = await fetch_budgets_with_spend(db, new_budget.user_id, budget_ids=[new_budget.id])
+    return budgets[0]
 
-@app.get("/budgets", response_model=List[BudgetResponse])
+@app.get("/budgets", response_model=List[BudgetResponse], dependencies=[Depends(conditional(BUDGETS, EXPENSES))])
 async def get_budgets(
     request: Request,
     db: AsyncSession = Depends(get_db)
@@ -631,53 +737,9 @@ async def get_budgets(
     user = get_current_user(request)
     await set_tenant_context(db, user["tenant_id"])
     
-    result = await db.execute(
-        select(Budget).where(
-            and_(
-                Budget.user_id == uuid.UUID(user["user_id"]),
-                Budget.is_active == True
-            )
-        )
-    )
-    budgets = result.scalars().all()
-    
-    budget_responses = []
-    for budget in budgets:
-        # Build conditions list
-        conditions = [
-            Expense.user_id == uuid.UUID(user["user_id"]),
-            Expense.transaction_date >= budget.start_date,
-            Expense.transaction_date <= budget.end_date,
-        ]
-        
-        # Add category filter only if budget.category_id exists
-        if budget.category_id:
-            conditions.append(Expense.category_id == budget.category_id)
-        
-        result = await db.execute(
-            select(func.sum(Expense.amount_in_base_currency))
-            .where(and_(*conditions))
-        )
-        spent = result.scalar() or Decimal("0")
-        remaining = budget.amount - spent
-        percentage = (spent / budget.amount * 100) if budget.amount > 0 else 0
-        
-        budget_responses.append(BudgetResponse(
-            id=str(budget.id),
-            name=budget.name,
-            amount=float(budget.amount),
-            currency=budget.currency,
-            period=budget.period,
-            start_date=budget.start_date,
-            end_date=budget.end_date,
-            spent=float(spent),
-            remaining=float(remaining),
-            percentage_used=float(percentage)
-        ))
-    
-    return budget_responses
+    return await fetch_budgets_with_spend(db, uuid.UUID(user["user_id"]), active_only=True)
 
-@app.put("/budgets/{budget_id}", response_model=BudgetResponse)
+@app.put("/budgets/{budget_id}", response_model=BudgetResponse, dependencies=[Depends(bumps(BUDGETS))])
 async def update_budget(
     budget_id: str,
     payload: BudgetUpdate,
@@ -721,37 +783,10 @@ async def update_budget(
     await db.commit()
     await db.refresh(budget)
 
-    # Recompute spent/remaining/percentage with updated fields
-    conditions = [
-        Expense.user_id == uuid.UUID(user["user_id"]),
-        Expense.transaction_date >= budget.start_date,
-        Expense.transaction_date <= budget.end_date,
-    ]
-    if budget.category_id:
-        conditions.append(Expense.category_id == budget.category_id)
-
-    result = await db.execute(
-        select(func.sum(Expense.amount_in_base_currency)).where(and_(*conditions))
-    )
-    spent = result.scalar() or Decimal("0")
-
-    remaining = budget.amount - spent
-    percentage = (spent / budget.amount * 100) if budget.amount > 0 else 0
+    budgets = await fetch_budgets_with_spend(db, budget.user_id, budget_ids=[budget.id])
+    return budgets[0]
 
-    return BudgetResponse(
-        id=str(budget.id),
-        name=budget.name,
-        amount=float(budget.amount),
-        currency=budget.currency,
-        period=budget.period,
-        start_date=budget.start_date,
-        end_date=budget.end_date,
-        spent=float(spent),
-        remaining=float(remaining),
-        percentage_used=float(percentage),
-    )
-
-@app.delete("/budgets/{budget_id}")
+@app.delete("/budgets/{budget_id}", dependencies=[Depends(bumps(BUDGETS))])
 async def delete_budget(
     budget_id: str,
     request: Request,
@@ -777,143 +812,128 @@ async def delete_budget(
 
     return {"message": "Budget deleted successfully"}
 
-def parse_bank_statement_csv(content: str, currency: str = "INR") -> List[dict]:
-    """Parse bank statement CSV and extract transactions"""
-    transactions = []
-    
-    try:
-        csv_reader = csv.DictReader(io.StringIO(content))
-        
-        for row in csv_reader:
-            # Try to identify common CSV formats
-            transaction_date = None
-            description = None
-            amount = None
-            payment_method = "Bank Transfer"
-            
-            # Common date field names
-            date_fields = ['Date', 'Transaction Date', 'Value Date', 'date', 'transaction_date']
-            for field in date_fields:
-                if field in row and row[field]:
-                    try:
-                        # Try parsing common date formats
-                        date_str = row[field].strip()
-                        for fmt in ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y']:
-                            try:
-                                transaction_date = datetime.strptime(date_str, fmt).date()
-                                break
-                            except:
-                                continue
-                        if transaction_date:
-                            break
-                    except:
-                        continue
-            
-            # Common description field names
-            desc_fields = ['Description', 'Narration', 'Particulars', 'description', 'narration']
-            for field in desc_fields:
-                if field in row and row[field]:
-                    description = row[field].strip()
-                    break
-            
-            # Common amount field names (look for debits/withdrawals)
-            amount_fields = ['Debit', 'Withdrawal', 'Amount', 'Debit Amount', 'debit', 'withdrawal']
-            for field in amount_fields:
-                if field in row and row[field]:
-                    try:
-                        # Remove currency symbols and commas
-                        amount_str = re.sub(r'[₹$,\s]', '', row[field].strip())
-                        if amount_str:
-                            amount = float(amount_str)
-                            break
-                    except:
-                        continue
-            
-            # Only add valid transactions with all required fields
-            if transaction_date and description and amount and amount > 0:
-                transactions.append({
-                    'transaction_date': transaction_date,
-                    'description': description,
-                    'amount': amount,
-                    'currency': currency,
-                    'payment_method': payment_method
-                })
-    except Exception as e:
-        print(f"Error parsing CSV: {e}")
-    
-    return transactions
-
-@app.post("/import/bank-statement")
+@app.post("/import/bank-statement", dependencies=[Depends(bumps(EXPENSES))])
 async def import_bank_statement(
     request: Request,
     file: UploadFile = File(...),
     currency: str = Form("INR"),
+    bank: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    Stream a CSV statement into expenses, committing every batch.
+
+    ``bank`` names a known statement layout (hdfc, icici, sbi, generic) and
+    skips format detection.  To resume an interrupted import, upload the
+    same file again with its ``job_id``; records before the job's checkpoint
+    are skipped.
+    """
     user = get_current_user(request)
     await set_tenant_context(db, user["tenant_id"])
     
     # Validate file type
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if bank and bank not in statement_formats.LAYOUTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown bank layout; expected one of: {', '.join(statement_formats.LAYOUTS)}"
+        )
     
-    # Read file content
-    file_content = await file.read()
-    content = file_content.decode('utf-8')
-    
-    # Parse transactions
-    transactions = parse_bank_statement_csv(content, currency)
+    if job_id:
+        try:
+            job_uuid = uuid.UUID(job_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid job_id")
+        result = await db.execute(
+            select(ImportJob).where(
+                ImportJob.id == job_uuid,
+                ImportJob.user_id == uuid.UUID(user["user_id"])
+            )
+        )
+        job = result.scalar_one_or_none()
+        if not job:
+            raise HTTPException(status_code=404, detail="Import job not found")
+        if job.status == "completed":
+            raise HTTPException(status_code=409, detail="Import job already completed")
+        if job.file_size is not None and file.size != job.file_size:
+            raise HTTPException(status_code=409, detail="File does not match the import job")
+        job.status = "running"
+        job.error = None
+    else:
+        job = ImportJob(
+            id=uuid.uuid4(),
+            tenant_id=uuid.UUID(user["tenant_id"]),
+            user_id=uuid.UUID(user["user_id"]),
+            filename=file.filename,
+            file_size=file.size,
+            currency=currency,
+            status="running",
+            rows_processed=0,
+            rows_imported=0,
+            rows_rejected=0,
+            rejection_counts={},
+        )
+        db.add(job)
+        
+        # Store file in MinIO for record keeping (streamed from the spooled upload)
+        try:
+            unique_filename = f"{user['user_id']}/statements/{job.id}.csv"
+            await storage.put_upload("bank-statements", unique_filename, file, content_type="text/csv")
+        except Exception as e:
+            print(f"MinIO upload error: {e}")
     
-    if not transactions:
-        raise HTTPException(status_code=400, detail="No valid transactions found in the statement")
+    await db.commit()
+    await set_tenant_context(db, user["tenant_id"])
     
-    # Store file in MinIO for record keeping
+    file.file.seek(0)
+    text_stream = statement_import.open_statement(file.file)
     try:
-        unique_filename = f"{user['user_id']}/statements/{uuid.uuid4()}.csv"
-        minio_client.put_object(
-            "bank-statements",
-            unique_filename,
-            io.BytesIO(file_content),
-            len(file_content),
-            content_type="text/csv"
+        report = await statement_import.import_statement(
+            db,
+            job,
+            text_stream,
+            rate_for=lambda day: get_exchange_rate(db, job.currency, "USD", day),
+            begin=lambda: set_tenant_context(db, user["tenant_id"]),
+            layout=bank or job.statement_format,
+            category_for=_statement_categorizer((await category_cache.get(db, user["tenant_id"])).ids_by_name),
         )
+    except statement_formats.StatementFormatError as e:
+        job.status = "failed"
+        job.error = str(e)
+        await db.commit()
+        raise HTTPException(status_code=400, detail=f"Unrecognised statement format: {e}")
     except Exception as e:
-        print(f"MinIO upload error: {e}")
-    
-    # Import transactions as expenses
-    imported_count = 0
-    exchange_rate = await get_exchange_rate(db, currency, "USD")
+        logger.exception("Statement import %s failed", job.id)
+        await db.rollback()
+        await set_tenant_context(db, user["tenant_id"])
+        await db.refresh(job)
+        job.status = "failed"
+        job.error = str(e)[:1000]
+        await db.commit()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Import failed after {job.rows_processed} rows; resume with job_id {job.id}"
+        )
+    finally:
+        text_stream.detach()
     
-    for trans in transactions:
-        try:
-            amount_in_base = Decimal(str(trans['amount'])) * exchange_rate
-            
-            new_expense = Expense(
-                tenant_id=uuid.UUID(user["tenant_id"]),
-                user_id=uuid.UUID(user["user_id"]),
-                amount=Decimal(str(trans['amount'])),
-                currency=trans['currency'],
-                amount_in_base_currency=amount_in_base,
-                exchange_rate=exchange_rate,
-                description=trans['description'],
-                transaction_date=trans['transaction_date'],
-                payment_method=trans['payment_method'],
-                synced=True
-            )
-            
-            db.add(new_expense)
-            imported_count += 1
-        except Exception as e:
-            print(f"Error importing transaction: {e}")
-            continue
+    if job.rows_imported == 0:
+        job.status = "failed"
+        job.error = "No valid transactions found in the statement"
+        await db.commit()
+        raise HTTPException(status_code=400, detail="No valid transactions found in the statement")
     
+    job.status = "completed"
+    job.completed_at = datetime.now(timezone.utc)
     await db.commit()
     
     return {
         "message": "Bank statement imported successfully",
-        "total_transactions": len(transactions),
-        "imported_count": imported_count,
-        "transactions": transactions[:10]  # Return first 10 for preview
+        "status": job.status,
+        "total_transactions": job.rows_processed,
+        **report,
     }
 
 ###############################################################################
@@ -954,7 +974,7 @@ def compute_remaining(principal: float, interest_rate: float, interest_type: str
     return float(principal) + accrued - float(total_repaid)
 
 # POST /borrowings - Create new borrowing
-@app.post("/borrowings")
+@app.post("/borrowings", dependencies=[Depends(bumps(BORROWINGS))])
 async def create_borrowing(data: BorrowingCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -992,8 +1012,8 @@ async def create_borrowing(data: BorrowingCreate, request: Request, db: AsyncSes
     }
 
 # GET /borrowings - List all borrowings
-@app.get("/borrowings")
-async def list_borrowings(request: Request, status: Optional[str] = None, lender: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+@app.get("/borrowings", dependencies=[Depends(conditional(BORROWINGS, daily=True))])
+async def list_borrowings(request: Request, response: Response, status: Optional[str] = None, lender: Optional[str] = None, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
     query = select(Borrowing).where(Borrowing.user_id == uuid.UUID(user["user_id"]))
@@ -1001,9 +1021,8 @@ async def list_borrowings(request: Request, status: Optional[str] = None, lender
         query = query.where(Borrowing.status == status)
     if lender:
         query = query.where(Borrowing.lender_name.ilike(f"%{lender}%"))
-    query = query.order_by(Borrowing.created_at.desc())
-    result = await db.execute(query)
-    borrowings = result.scalars().all()
+    borrowings, next_cursor = await paginate(db, query, Borrowing.created_at, Borrowing.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
     return [{
         "id": str(b.id), "lender_name": b.lender_name, "lender_contact": b.lender_contact,
         "principal_amount": float(b.principal_amount), "currency": b.currency,
@@ -1015,6 +1034,22 @@ async def list_borrowings(request: Request, status: Optional[str] = None, lender
         "created_at": str(b.created_at)
     } for b in borrowings]
 
+# GET /borrowings/summary - Totals over all borrowings, for the stat cards
+@app.get("/borrowings/summary", dependencies=[Depends(conditional(BORROWINGS, daily=True))])
+async def borrowing_summary(request: Request, db: AsyncSession = Depends(get_db)):
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+    uid = uuid.UUID(user["user_id"])
+    rates = _SummaryRates(db, await _preferred_currency(db, uid))
+    totals = await _debt_totals(db, rates, Borrowing, uid, Borrowing.total_repaid, ["open", "partially_paid"])
+    return {
+        "currency": rates.currency,
+        "outstanding": totals["outstanding"],
+        "repaid": totals["settled"],
+        "open": totals["open"],
+        "overdue": totals["overdue"],
+    }
+
 # GET /borrowings/:id - Get single borrowing with repayment history
 @app.get("/borrowings/{borrowing_id}")
 async def get_borrowing(borrowing_id: str, request: Request, db: AsyncSession = Depends(get_db)):
@@ -1048,7 +1083,7 @@ async def get_borrowing(borrowing_id: str, request: Request, db: AsyncSession =
     }
 
 # PUT /borrowings/:id - Update borrowing details
-@app.put("/borrowings/{borrowing_id}")
+@app.put("/borrowings/{borrowing_id}", dependencies=[Depends(bumps(BORROWINGS))])
 async def update_borrowing(borrowing_id: str, data: BorrowingCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1077,7 +1112,7 @@ async def update_borrowing(borrowing_id: str, data: BorrowingCreate, request: Re
     return {"message": "Borrowing updated", "id": str(b.id)}
 
 # DELETE /borrowings/:id - Delete borrowing + all repayments
-@app.delete("/borrowings/{borrowing_id}")
+@app.delete("/borrowings/{borrowing_id}", dependencies=[Depends(bumps(BORROWINGS))])
 async def delete_borrowing(borrowing_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1092,7 +1127,7 @@ async def delete_borrowing(borrowing_id: str, request: Request, db: AsyncSession
     return {"message": "Borrowing and all repayments deleted"}
 
 # POST /borrowings/:id/repayments - Record a repayment
-@app.post("/borrowings/{borrowing_id}/repayments")
+@app.post("/borrowings/{borrowing_id}/repayments", dependencies=[Depends(bumps(BORROWINGS))])
 async def create_repayment(borrowing_id: str, data: RepaymentCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1130,15 +1165,19 @@ async def create_repayment(borrowing_id: str, data: RepaymentCreate, request: Re
     return {"message": f"Repayment of {data.amount} recorded", "id": str(repayment.id), "remaining": float(b.remaining_amount), "status": b.status}
 
 # GET /borrowings/:id/repayments - List repayments for a borrowing
-@app.get("/borrowings/{borrowing_id}/repayments")
-async def list_repayments(borrowing_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+@app.get("/borrowings/{borrowing_id}/repayments", dependencies=[Depends(conditional(BORROWINGS))])
+async def list_repayments(borrowing_id: str, request: Request, response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    result = await db.execute(
-        select(BorrowingRepayment).where(BorrowingRepayment.borrowing_id == uuid.UUID(borrowing_id))
-        .order_by(BorrowingRepayment.repayment_date.desc())
-    )
-    repayments = result.scalars().all()
+    repayments, next_cursor = await paginate(
+        db,
+        select(BorrowingRepayment).where(BorrowingRepayment.borrowing_id == uuid.UUID(borrowing_id)),
+        BorrowingRepayment.repayment_date,
+        BorrowingRepayment.id,
+        cursor,
+        limit,
+    )
+    set_next_cursor(response, next_cursor)
     return [{
         "id": str(r.id), "amount": float(r.amount), "repayment_date": str(r.repayment_date),
         "payment_method": r.payment_method, "reference_number": r.reference_number,
@@ -1146,7 +1185,7 @@ async def list_repayments(borrowing_id: str, request: Request, db: AsyncSession
     } for r in repayments]
 
 # PUT /borrowings/:id/repayments/:rid - Edit a repayment
-@app.put("/borrowings/{borrowing_id}/repayments/{repayment_id}")
+@app.put("/borrowings/{borrowing_id}/repayments/{repayment_id}", dependencies=[Depends(bumps(BORROWINGS))])
 async def update_repayment(borrowing_id: str, repayment_id: str, data: RepaymentCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1185,7 +1224,7 @@ async def update_repayment(borrowing_id: str, repayment_id: str, data: Repayment
     return {"message": "Repayment updated"}
 
 # DELETE /borrowings/:id/repayments/:rid - Delete a repayment
-@app.delete("/borrowings/{borrowing_id}/repayments/{repayment_id}")
+@app.delete("/borrowings/{borrowing_id}/repayments/{repayment_id}", dependencies=[Depends(bumps(BORROWINGS))])
 async def delete_repayment(borrowing_id: str, repayment_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1211,7 +1250,7 @@ async def delete_repayment(borrowing_id: str, repayment_id: str, request: Reques
     return {"message": "Repayment deleted", "outstanding_increase": amount}
 
 # POST /borrowings/:id/close - Mark as fully closed
-@app.post("/borrowings/{borrowing_id}/close")
+@app.post("/borrowings/{borrowing_id}/close", dependencies=[Depends(bumps(BORROWINGS))])
 async def close_borrowing(borrowing_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1227,7 +1266,7 @@ async def close_borrowing(borrowing_id: str, request: Request, db: AsyncSession
     return {"message": "Borrowing marked as fully repaid"}
 
 # POST /borrowings/:id/reopen - Reopen a closed borrowing
-@app.post("/borrowings/{borrowing_id}/reopen")
+@app.post("/borrowings/{borrowing_id}/reopen", dependencies=[Depends(bumps(BORROWINGS))])
 async def reopen_borrowing(borrowing_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1268,7 +1307,7 @@ def _income_to_dict(i) -> dict:
         "created_at": str(i.created_at)
     }
 
-@app.post("/income")
+@app.post("/income", dependencies=[Depends(bumps(INCOME))])
 async def create_income(data: IncomeCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1285,12 +1324,15 @@ async def create_income(data: IncomeCreate, request: Request, db: AsyncSession =
         notes=data.notes,
     )
     db.add(income)
+    await db.flush()
+    await rollups.add_entry(db, rollups.income_entry(income))
+    await recurring.sync_income(db, income)
     await db.commit()
     await db.refresh(income)
     return _income_to_dict(income)
 
-@app.get("/income")
-async def list_income(request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None, db: AsyncSession = Depends(get_db)):
+@app.get("/income", dependencies=[Depends(conditional(INCOME))])
+async def list_income(request: Request, response: Response, start_date: Optional[date] = None, end_date: Optional[date] = None, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
     query = select(Income).where(Income.user_id == uuid.UUID(user["user_id"]))
@@ -1298,35 +1340,51 @@ async def list_income(request: Request, start_date: Optional[date] = None, end_d
         query = query.where(Income.income_date >= start_date)
     if end_date:
         query = query.where(Income.income_date <= end_date)
-    query = query.order_by(Income.income_date.desc())
-    result = await db.execute(query)
-    return [_income_to_dict(i) for i in result.scalars().all()]
+    incomes, next_cursor = await paginate(db, query, Income.income_date, Income.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return [_income_to_dict(i) for i in incomes]
 
-@app.get("/income/summary")
+@app.get("/income/summary", dependencies=[Depends(conditional(INCOME, daily=True))])
+@cached_response("income-summary", tags=(INCOME,), daily=True)
 async def income_summary(request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
     uid = uuid.UUID(user["user_id"])
-    # Total income
-    total_result = await db.execute(
-        select(func.sum(Income.amount)).where(Income.user_id == uid)
-    )
-    total = float(total_result.scalar() or 0)
-    # By source
-    by_source_result = await db.execute(
-        select(Income.source, func.sum(Income.amount).label("total"), func.count(Income.id).label("count"))
-        .where(Income.user_id == uid)
-        .group_by(Income.source)
-        .order_by(func.sum(Income.amount).desc())
-    )
-    by_source = [{"source": r.source, "total": float(r.total), "count": r.count} for r in by_source_result.all()]
-    # This month
-    first_of_month = date.today().replace(day=1)
-    month_result = await db.execute(
-        select(func.sum(Income.amount)).where(Income.user_id == uid, Income.income_date >= first_of_month)
+    rates = _SummaryRates(db, await _preferred_currency(db, uid))
+    # By source (and total) from the monthly rollups, converted to the
+    # preferred currency at each month's rate since income is stored in its
+    # original currency
+    rollup = MonthlyCategoryRollup
+    result = await db.execute(
+        select(rollup.category_key, rollup.currency, rollup.month, rollup.total_amount, rollup.entry_count)
+        .where(rollup.user_id == uid, rollup.entry_type == rollups.INCOME)
     )
-    this_month = float(month_result.scalar() or 0)
-    return {"total": total, "this_month": this_month, "by_source": by_source}
+    first_of_month = date.today().replace(day=1)
+    sources = {}
+    this_month = Decimal("0")
+    for r in result.all():
+        amount = Decimal(str(r.total_amount)) * await rates.rate(r.currency, r.month)
+        source = sources.setdefault(r.category_key, {"source": r.category_key, "total": Decimal("0"), "count": 0})
+        source["total"] += amount
+        source["count"] += r.entry_count
+        if r.month >= first_of_month:
+            this_month += amount
+    by_source = [
+        {"source": s["source"], "total": float(s["total"]), "count": s["count"]}
+        for s in sorted(sources.values(), key=lambda s: s["total"], reverse=True)
+    ]
+    total = sum(s["total"] for s in by_source)
+    this_month = float(this_month)
+    recurring_count = (await db.execute(
+        select(func.count(Income.id)).where(Income.user_id == uid, Income.is_recurring == True)
+    )).scalar_one()
+    return {
+        "currency": rates.currency,
+        "total": total,
+        "this_month": this_month,
+        "by_source": by_source,
+        "recurring_count": recurring_count,
+    }
 
 @app.get("/income/{income_id}")
 async def get_income(income_id: str, request: Request, db: AsyncSession = Depends(get_db)):
@@ -1340,7 +1398,7 @@ async def get_income(income_id: str, request: Request, db: AsyncSession = Depend
         raise HTTPException(status_code=404, detail="Income not found")
     return _income_to_dict(i)
 
-@app.put("/income/{income_id}")
+@app.put("/income/{income_id}", dependencies=[Depends(bumps(INCOME))])
 async def update_income(income_id: str, data: IncomeCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1350,19 +1408,23 @@ async def update_income(income_id: str, data: IncomeCreate, request: Request, db
     i = result.scalar_one_or_none()
     if not i:
         raise HTTPException(status_code=404, detail="Income not found")
+    old_entry = rollups.income_entry(i)
     i.source = data.source
     i.amount = Decimal(str(data.amount))
     i.currency = data.currency
-    i.income_date = data.income_date
     i.description = data.description
     i.is_recurring = data.is_recurring
     i.recurrence_period = data.recurrence_period
     i.notes = data.notes
+    await timeseries.move_to_date(db, i, Income.income_date, data.income_date)
+    await db.flush()
+    await rollups.replace_entry(db, old_entry, rollups.income_entry(i))
+    await recurring.sync_income(db, i)
     await db.commit()
     await db.refresh(i)
     return _income_to_dict(i)
 
-@app.delete("/income/{income_id}")
+@app.delete("/income/{income_id}", dependencies=[Depends(bumps(INCOME))])
 async def delete_income(income_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1372,7 +1434,11 @@ async def delete_income(income_id: str, request: Request, db: AsyncSession = Dep
     i = result.scalar_one_or_none()
     if not i:
         raise HTTPException(status_code=404, detail="Income not found")
+    entry = rollups.income_entry(i)
     await db.delete(i)
+    await db.flush()
+    await rollups.remove_entry(db, entry)
+    await recurring.drop_income(db, i.id)
     await db.commit()
     return {"message": "Income deleted successfully"}
 
@@ -1437,7 +1503,7 @@ def _lending_to_dict(l, collections=None) -> dict:
         } for c in collections]
     return d
 
-@app.post("/lendings")
+@app.post("/lendings", dependencies=[Depends(bumps(LENDINGS))])
 async def create_lending(data: LendingCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1464,8 +1530,8 @@ async def create_lending(data: LendingCreate, request: Request, db: AsyncSession
     await db.refresh(lending)
     return _lending_to_dict(lending)
 
-@app.get("/lendings")
-async def list_lendings(request: Request, status: Optional[str] = None, borrower: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+@app.get("/lendings", dependencies=[Depends(conditional(LENDINGS, daily=True))])
+async def list_lendings(request: Request, response: Response, status: Optional[str] = None, borrower: Optional[str] = None, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
     query = select(Lending).where(Lending.user_id == uuid.UUID(user["user_id"]))
@@ -1473,9 +1539,25 @@ async def list_lendings(request: Request, status: Optional[str] = None, borrower
         query = query.where(Lending.status == status)
     if borrower:
         query = query.where(Lending.borrower_name.ilike(f"%{borrower}%"))
-    query = query.order_by(Lending.created_at.desc())
-    result = await db.execute(query)
-    return [_lending_to_dict(l) for l in result.scalars().all()]
+    lendings, next_cursor = await paginate(db, query, Lending.created_at, Lending.id, cursor, limit)
+    set_next_cursor(response, next_cursor)
+    return [_lending_to_dict(l) for l in lendings]
+
+@app.get("/lendings/summary", dependencies=[Depends(conditional(LENDINGS, daily=True))])
+async def lending_summary(request: Request, db: AsyncSession = Depends(get_db)):
+    """Totals over all lendings, for the list page's stat cards."""
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+    uid = uuid.UUID(user["user_id"])
+    rates = _SummaryRates(db, await _preferred_currency(db, uid))
+    totals = await _debt_totals(db, rates, Lending, uid, Lending.total_received, ["open", "partially_received"])
+    return {
+        "currency": rates.currency,
+        "outstanding": totals["outstanding"],
+        "received": totals["settled"],
+        "open": totals["open"],
+        "overdue": totals["overdue"],
+    }
 
 @app.get("/lendings/{lending_id}")
 async def get_lending(lending_id: str, request: Request, db: AsyncSession = Depends(get_db)):
@@ -1493,7 +1575,7 @@ async def get_lending(lending_id: str, request: Request, db: AsyncSession = Depe
     collections = col_result.scalars().all()
     return _lending_to_dict(l, collections)
 
-@app.put("/lendings/{lending_id}")
+@app.put("/lendings/{lending_id}", dependencies=[Depends(bumps(LENDINGS))])
 async def update_lending(lending_id: str, data: LendingCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1520,7 +1602,7 @@ async def update_lending(lending_id: str, data: LendingCreate, request: Request,
     await db.refresh(l)
     return {"message": "Lending updated", "id": str(l.id)}
 
-@app.delete("/lendings/{lending_id}")
+@app.delete("/lendings/{lending_id}", dependencies=[Depends(bumps(LENDINGS))])
 async def delete_lending(lending_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1534,7 +1616,7 @@ async def delete_lending(lending_id: str, request: Request, db: AsyncSession = D
     await db.commit()
     return {"message": "Lending and all collections deleted"}
 
-@app.post("/lendings/{lending_id}/collections")
+@app.post("/lendings/{lending_id}/collections", dependencies=[Depends(bumps(LENDINGS))])
 async def create_collection(lending_id: str, data: CollectionCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1571,22 +1653,26 @@ async def create_collection(lending_id: str, data: CollectionCreate, request: Re
     await db.commit()
     return {"message": f"Collection of {data.amount} recorded", "id": str(collection.id), "remaining": float(l.remaining_amount), "status": l.status}
 
-@app.get("/lendings/{lending_id}/collections")
-async def list_collections(lending_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+@app.get("/lendings/{lending_id}/collections", dependencies=[Depends(conditional(LENDINGS))])
+async def list_collections(lending_id: str, request: Request, response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    result = await db.execute(
-        select(LendingCollection).where(LendingCollection.lending_id == uuid.UUID(lending_id))
-        .order_by(LendingCollection.collection_date.desc())
-    )
-    collections = result.scalars().all()
+    collections, next_cursor = await paginate(
+        db,
+        select(LendingCollection).where(LendingCollection.lending_id == uuid.UUID(lending_id)),
+        LendingCollection.collection_date,
+        LendingCollection.id,
+        cursor,
+        limit,
+    )
+    set_next_cursor(response, next_cursor)
     return [{
         "id": str(c.id), "amount": float(c.amount), "collection_date": str(c.collection_date),
         "payment_method": c.payment_method, "reference_number": c.reference_number,
         "note": c.note, "created_at": str(c.created_at)
     } for c in collections]
 
-@app.put("/lendings/{lending_id}/collections/{collection_id}")
+@app.put("/lendings/{lending_id}/collections/{collection_id}", dependencies=[Depends(bumps(LENDINGS))])
 async def update_collection(lending_id: str, collection_id: str, data: CollectionCreate, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1621,7 +1707,7 @@ async def update_collection(lending_id: str, collection_id: str, data: Collectio
     await db.commit()
     return {"message": "Collection updated"}
 
-@app.delete("/lendings/{lending_id}/collections/{collection_id}")
+@app.delete("/lendings/{lending_id}/collections/{collection_id}", dependencies=[Depends(bumps(LENDINGS))])
 async def delete_collection(lending_id: str, collection_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1646,7 +1732,7 @@ async def delete_collection(lending_id: str, collection_id: str, request: Reques
     await db.commit()
     return {"message": "Collection deleted", "outstanding_increase": amount}
 
-@app.post("/lendings/{lending_id}/close")
+@app.post("/lendings/{lending_id}/close", dependencies=[Depends(bumps(LENDINGS))])
 async def close_lending(lending_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1661,7 +1747,7 @@ async def close_lending(lending_id: str, request: Request, db: AsyncSession = De
     await db.commit()
     return {"message": "Lending marked as fully received"}
 
-@app.post("/lendings/{lending_id}/reopen")
+@app.post("/lendings/{lending_id}/reopen", dependencies=[Depends(bumps(LENDINGS))])
 async def reopen_lending(lending_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1697,40 +1783,71 @@ CATEGORY_RULES = {
     "Personal Care": ["salon", "haircut", "spa", "gym", "fitness", "yoga", "beauty", "skincare"],
 }
 
+categorizer = KeywordCategorizer(CATEGORY_RULES)
+
+def _categorization(match, category_ids: dict) -> dict:
+    if match is None:
+        return {"category_name": None, "category_id": None, "confidence": 0}
+    category_id = category_ids.get(match.category)
+    return {
+        "category_name": match.category,
+        "category_id": str(category_id) if category_id else None,
+        "confidence": round(match.confidence, 2)
+    }
+
+def _statement_categorizer(category_ids: dict):
+    """Category id for an imported statement row, or ``None``."""
+    def category_for(description: str):
+        match = categorizer.match(description)
+        return category_ids.get(match.category) if match else None
+    return category_for
+
+MAX_CATEGORIZE_BATCH = 5000
+
 class CategorizeRequest(BaseModel):
     description: str
     amount: Optional[float] = None
 
+class CategorizeBatchRequest(BaseModel):
+    descriptions: List[str] = Field(max_length=MAX_CATEGORIZE_BATCH)
+
 @app.post("/categorize")
 async def categorize_expense(data: CategorizeRequest, request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    desc_lower = data.description.lower()
-    best_match = None
-    best_confidence = 0.0
-    for category_name, keywords in CATEGORY_RULES.items():
-        for keyword in keywords:
-            if keyword in desc_lower:
-                confidence = len(keyword) / max(len(desc_lower), 1)
-                confidence = min(max(confidence, 0.5), 0.95)
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_match = category_name
-    if not best_match:
-        return {"category_name": None, "category_id": None, "confidence": 0}
-    # Find the matching category in DB
-    cat_result = await db.execute(
-        select(Category).where(Category.name == best_match, Category.tenant_id == uuid.UUID(user["tenant_id"]))
-    )
-    cat = cat_result.scalar_one_or_none()
+    match = categorizer.match(data.description)
+    if match is None:
+        return _categorization(None, {})
+    return _categorization(match, (await category_cache.get(db, user["tenant_id"])).ids_by_name)
+
+@app.post("/categorize/batch")
+async def categorize_batch(data: CategorizeBatchRequest, request: Request, db: AsyncSession = Depends(get_db)):
+    """Categorize up to ``MAX_CATEGORIZE_BATCH`` descriptions; results are in request order."""
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+    category_ids = (await category_cache.get(db, user["tenant_id"])).ids_by_name
     return {
-        "category_name": best_match,
-        "category_id": str(cat.id) if cat else None,
-        "confidence": round(best_confidence, 2)
+        "results": [
+            {"description": description, **_categorization(match, category_ids)}
+            for description, match in zip(data.descriptions, categorizer.match_many(data.descriptions))
+        ]
     }
 
+async def _category_names(db: AsyncSession, tenant_id: str, category_keys: List[str]) -> dict:
+    """Map rollup category keys (category id strings) to category names."""
+    if not any(category_keys):
+        return {}
+    categories = await category_cache.get(db, tenant_id)
+    names = {}
+    for key in category_keys:
+        category = categories.get(key)
+        if category:
+            names[key] = category.name
+    return names
+
 # 2.4 Smart Budget Recommendations
 @app.get("/budget-suggestions")
+@cached_response("budget-suggestions", tags=(EXPENSES, CATEGORIES), daily=True)
 async def budget_suggestions(request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
@@ -1741,31 +1858,34 @@ async def budget_suggestions(request: Request, db: AsyncSession = Depends(get_db
             three_months_ago = three_months_ago.replace(year=three_months_ago.year - 1, month=12)
         else:
             three_months_ago = three_months_ago.replace(month=three_months_ago.month - 1)
+    rollup = MonthlyCategoryRollup
     result = await db.execute(
         select(
-            Category.name,
-            Category.id,
-            func.avg(Expense.amount).label("avg_amount"),
-            func.max(Expense.amount).label("max_amount"),
-            func.count(Expense.id).label("count"),
-            func.sum(Expense.amount).label("total")
+            rollup.category_key,
+            func.max(rollup.max_amount).label("max_amount"),
+            func.sum(rollup.entry_count).label("count"),
+            func.sum(rollup.total_amount).label("total")
         )
-        .join(Category, Expense.category_id == Category.id)
         .where(
-            Expense.user_id == uuid.UUID(user["user_id"]),
-            Expense.transaction_date >= three_months_ago
+            rollup.user_id == uuid.UUID(user["user_id"]),
+            rollup.entry_type == rollups.EXPENSE,
+            rollup.category_key != "",
+            rollup.month >= three_months_ago
         )
-        .group_by(Category.name, Category.id)
-        .order_by(func.sum(Expense.amount).desc())
+        .group_by(rollup.category_key)
+        .order_by(func.sum(rollup.total_amount).desc())
     )
     rows = result.all()
+    names = await _category_names(db, user["tenant_id"], [row.category_key for row in rows])
     suggestions = []
     for row in rows:
+        if row.category_key not in names:
+            continue
         monthly_avg = float(row.total or 0) / 3
         suggested = round(monthly_avg * 1.1, -2)  # 10% buffer, round to nearest 100
         suggestions.append({
-            "category_name": row.name,
-            "category_id": str(row.id),
+            "category_name": names[row.category_key],
+            "category_id": row.category_key,
             "avg_last_3mo": round(monthly_avg, 2),
             "max_last_3mo": float(row.max_amount or 0),
             "suggested_amount": max(suggested, 500),  # minimum 500
@@ -1775,48 +1895,37 @@ async def budget_suggestions(request: Request, db: AsyncSession = Depends(get_db
 
 # 2.5 Anomaly Detection
 @app.get("/anomalies")
+@cached_response("anomalies", tags=(EXPENSES, CATEGORIES), daily=True)
 async def detect_anomalies(request: Request, db: AsyncSession = Depends(get_db)):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    # Get per-category stats
-    stats_result = await db.execute(
-        select(
-            Expense.category_id,
-            Category.name.label("category_name"),
-            func.avg(Expense.amount).label("avg_amount"),
-            func.count(Expense.id).label("count")
+    # Expenses are scored when written (shared/anomalies.py); read the flags
+    since = date.today() - timedelta(days=30)
+    result = await db.execute(
+        select(ExpenseAnomaly, Expense.description)
+        .join(Expense, and_(Expense.id == ExpenseAnomaly.expense_id,
+                            Expense.transaction_date == ExpenseAnomaly.transaction_date))
+        .where(
+            ExpenseAnomaly.user_id == uuid.UUID(user["user_id"]),
+            ExpenseAnomaly.transaction_date >= since
         )
-        .join(Category, Expense.category_id == Category.id, isouter=True)
-        .where(Expense.user_id == uuid.UUID(user["user_id"]))
-        .group_by(Expense.category_id, Category.name)
-        .having(func.count(Expense.id) >= 3)
+        .order_by(ExpenseAnomaly.score.desc())
     )
-    stats = {str(row.category_id): {"avg": float(row.avg_amount), "name": row.category_name, "count": row.count} for row in stats_result.all()}
-    # Get recent expenses (last 30 days)
-    thirty_days_ago = date.today().replace(day=1)
-    recent_result = await db.execute(
-        select(Expense).where(
-            Expense.user_id == uuid.UUID(user["user_id"]),
-            Expense.transaction_date >= thirty_days_ago
-        ).order_by(Expense.amount.desc()).limit(50)
-    )
-    recent = recent_result.scalars().all()
-    anomalies = []
-    for exp in recent:
-        cat_id = str(exp.category_id) if exp.category_id else None
-        if cat_id and cat_id in stats:
-            avg = stats[cat_id]["avg"]
-            if avg > 0 and float(exp.amount) > avg * 2.5:
-                anomalies.append({
-                    "expense_id": str(exp.id),
-                    "description": exp.description,
-                    "amount": float(exp.amount),
-                    "category": stats[cat_id]["name"],
-                    "category_avg": round(avg, 2),
-                    "multiplier": round(float(exp.amount) / avg, 1),
-                    "date": str(exp.transaction_date)
-                })
-    return anomalies
+    rows = result.all()
+    names = await _category_names(db, user["tenant_id"], [flag.category_key for flag, _ in rows])
+    return [
+        {
+            "expense_id": str(flag.expense_id),
+            "description": description,
+            "amount": float(flag.amount),
+            "category": names.get(flag.category_key),
+            "category_avg": float(flag.baseline_mean),
+            "multiplier": round(float(flag.amount) / float(flag.baseline_mean), 1) if flag.baseline_mean else None,
+            "score": round(flag.score, 2),
+            "date": str(flag.transaction_date)
+        }
+        for flag, description in rows
+    ]
 
 # Health Score Calculation Algorithm
 def calculate_health_score(
@@ -1887,67 +1996,21 @@ def calculate_health_score(
     )
 
 # Net Worth Snapshot Endpoint
-@app.post("/net-worth/snapshot", response_model=NetWorthSnapshotResponse)
+@app.post("/net-worth/snapshot", response_model=NetWorthSnapshotResponse, dependencies=[Depends(bumps(NET_WORTH))])
 async def create_net_worth_snapshot(
     request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    await ensure_net_worth_snapshot_table(db)
     
-    # Get current financial data
-    expenses_result = await db.execute(
-        select(func.sum(Expense.amount)).where(Expense.user_id == uuid.UUID(user["user_id"]))
-    )
-    total_expenses = float(expenses_result.scalar() or 0)
+    # Full balance sheet across expenses, income, investments, lendings,
+    # borrowings and EMIs in one query (see shared/net_worth.py)
+    sheet = (await db.execute(
+        net_worth.user_balance_sheet(date.today(), uuid.UUID(user["tenant_id"]), uuid.UUID(user["user_id"]))
+    )).mappings().one()
     
-    # Calculate current metrics (simplified for demo)
-    investment_value = 0  # Would come from investment service
-    lendings_outstanding = 0  # Would come from lending service
-    borrowings_owed = 0  # Would come from borrowing service
-    emi_remaining = 0  # Would come from EMI service
-    
-    # Get current month income
-    current_month = date.today().replace(day=1)
-    income_result = await db.execute(
-        select(func.sum(Income.amount))
-        .where(
-            Income.user_id == uuid.UUID(user["user_id"]),
-            Income.income_date >= current_month
-        )
-    )
-    monthly_income = float(income_result.scalar() or 0)
-    
-    # Calculate totals
-    total_assets = investment_value + lendings_outstanding + monthly_income
-    total_liabilities = borrowings_owed + emi_remaining
-    net_worth = total_assets - total_liabilities
-    
-    # Calculate health metrics
-    savings_rate = (monthly_income - total_expenses) / max(monthly_income, 1) * 100
-    debt_to_income_ratio = total_liabilities / max(monthly_income, 1) * 100
-    
-    # Create snapshot
-    snapshot = NetWorthSnapshot(
-        tenant_id=uuid.UUID(user["tenant_id"]),
-        user_id=uuid.UUID(user["user_id"]),
-        investment_value=investment_value,
-        lendings_outstanding=lendings_outstanding,
-        cash_balance=0,
-        income_monthly=monthly_income,
-        other_assets=0,
-        borrowings_owed=borrowings_owed,
-        emi_remaining=emi_remaining,
-        credit_card_debt=0,
-        other_liabilities=0,
-        total_assets=total_assets,
-        total_liabilities=total_liabilities,
-        net_worth=net_worth,
-        health_score=0,  # Will be calculated below
-        savings_rate=savings_rate,
-        debt_to_income_ratio=debt_to_income_ratio
-    )
+    snapshot = NetWorthSnapshot(**{name: sheet[name] for name in net_worth.SHEET_COLUMNS})
     
     db.add(snapshot)
     await db.commit()
@@ -1975,43 +2038,35 @@ async def create_net_worth_snapshot(
     )
 
 # Net Worth Trend Endpoint
-@app.get("/net-worth/trend", response_model=List[NetWorthTrendResponse])
+@app.get("/net-worth/trend", response_model=List[NetWorthTrendResponse], dependencies=[Depends(conditional(NET_WORTH))])
 async def get_net_worth_trend(
     request: Request,
     db: AsyncSession = Depends(get_db),
-    months: int = 12
+    months: int = 12,
+    max_points: int = Query(downsample.DEFAULT_MAX_POINTS, ge=downsample.MIN_POINTS, le=downsample.MAX_POINTS)
 ):
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
-    await ensure_net_worth_snapshot_table(db)
     
-    # Get historical snapshots (retry once if table missing)
-    try:
-        result = await db.execute(
-            select(NetWorthSnapshot)
-            .where(
-                NetWorthSnapshot.user_id == uuid.UUID(user["user_id"]),
-                NetWorthSnapshot.snapshot_date >= date.today() - timedelta(days=months * 30)
-            )
-            .order_by(NetWorthSnapshot.snapshot_date.asc())
-        )
-    except ProgrammingError as exc:
-        if "net_worth_snapshots" not in str(exc):
-            raise
-        await ensure_net_worth_snapshot_table(db)
-        result = await db.execute(
-            select(NetWorthSnapshot)
-            .where(
-                NetWorthSnapshot.user_id == uuid.UUID(user["user_id"]),
-                NetWorthSnapshot.snapshot_date >= date.today() - timedelta(days=months * 30)
-            )
-            .order_by(NetWorthSnapshot.snapshot_date.asc())
+    # Get historical snapshots (only the columns the chart needs)
+    result = await db.execute(
+        select(NetWorthSnapshot.snapshot_date, NetWorthSnapshot.net_worth, NetWorthSnapshot.health_score)
+        .where(
+            NetWorthSnapshot.user_id == uuid.UUID(user["user_id"]),
+            NetWorthSnapshot.snapshot_date >= date.today() - timedelta(days=months * 30)
         )
-    snapshots = result.scalars().all()
+        .order_by(NetWorthSnapshot.snapshot_date.asc())
+    )
+    snapshots = downsample.lttb(
+        result.all(), max_points,
+        x=lambda row: row.snapshot_date.toordinal(),
+        y=lambda row: row.net_worth,
+    )
     
     trend_data = []
     previous_worth = None
     
+    # Change is relative to the previous point returned
     for snapshot in snapshots:
         change_percent = 0
         if previous_worth and previous_worth != 0:
@@ -2030,6 +2085,7 @@ async def get_net_worth_trend(
 
 # Health Score Endpoint
 @app.get("/net-worth/health-score", response_model=HealthScoreBreakdown)
+@cached_response("health-score", tags=(EXPENSES, INCOME, BUDGETS), daily=True)
 async def get_health_score(
     request: Request,
     db: AsyncSession = Depends(get_db)
@@ -2040,25 +2096,21 @@ async def get_health_score(
     # Get current financial metrics
     current_month = date.today().replace(day=1)
     
-    # Income
-    income_result = await db.execute(
-        select(func.sum(Income.amount))
-        .where(
-            Income.user_id == uuid.UUID(user["user_id"]),
-            Income.income_date >= current_month
+    # Income and expenses from the monthly rollups
+    rollup = MonthlyCategoryRollup
+    totals_result = await db.execute(
+        select(
+            func.sum(case((rollup.entry_type == rollups.INCOME, rollup.total_amount), else_=0)).label("income"),
+            func.sum(case((rollup.entry_type == rollups.EXPENSE, rollup.total_amount), else_=0)).label("expenses"),
         )
-    )
-    monthly_income = float(income_result.scalar() or 0)
-    
-    # Expenses
-    expense_result = await db.execute(
-        select(func.sum(Expense.amount))
         .where(
-            Expense.user_id == uuid.UUID(user["user_id"]),
-            Expense.transaction_date >= current_month
+            rollup.user_id == uuid.UUID(user["user_id"]),
+            rollup.month >= current_month
         )
     )
-    monthly_expenses = float(expense_result.scalar() or 0)
+    totals = totals_result.one()
+    monthly_income = float(totals.income or 0)
+    monthly_expenses = float(totals.expenses or 0)
     
     # Budget utilization (total budget vs current month expenses)
     budget_total_result = await db.execute(
@@ -2089,23 +2141,43 @@ async def get_health_score(
     
     return health_breakdown
 
-@app.get("/recurring")
-async def get_recurring_transactions(request: Request, db: AsyncSession = Depends(get_db)):
-    """Return all recurring expenses and income for the current user."""
+@app.get("/recurring", dependencies=[Depends(conditional(EXPENSES, INCOME, CATEGORIES))])
+@cached_response("recurring", tags=(EXPENSES, INCOME, CATEGORIES))
+async def get_recurring_transactions(
+    request: Request,
+    expense_cursor: Optional[str] = None,
+    income_cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return recurring expenses and income for the current user.
+
+    The two lists are paged independently; pass ``next_expense_cursor`` /
+    ``next_income_cursor`` back as ``expense_cursor`` / ``income_cursor``.
+    Totals count every recurring expense and income, not just this page.
+    """
     user = request.state.user
     await set_tenant_context(db, user["tenant_id"])
     uid = uuid.UUID(user["user_id"])
 
     # ── Recurring Expenses ──────────────────────────────────────────────
-    expense_result = await db.execute(
-        select(Expense)
-        .options(joinedload(Expense.category))
-        .where(Expense.user_id == uid, Expense.is_recurring == True)
-        .order_by(Expense.created_at.desc())
-    )
+    expense_rows, next_expense_cursor = await paginate(
+        db,
+        select(RecurringSchedule)
+        .join(RecurringSchedule.expense)
+        .options(contains_eager(RecurringSchedule.expense))
+        .where(RecurringSchedule.user_id == uid),
+        RecurringSchedule.created_at,
+        RecurringSchedule.id,
+        expense_cursor,
+        limit,
+    )
+    categories = await category_cache.get(db, user["tenant_id"])
     recurring_expenses = []
-    for exp in expense_result.scalars().all():
-        config = exp.recurring_config or {}
+    for schedule in expense_rows:
+        exp = schedule.expense
+        category = categories.get(exp.category_id)
         recurring_expenses.append({
             "id": str(exp.id),
             "type": "expense",
@@ -2113,25 +2185,32 @@ async def get_recurring_transactions(request: Request, db: AsyncSession = Depend
             "currency": exp.currency,
             "description": exp.description,
             "category_id": str(exp.category_id) if exp.category_id else None,
-            "category_name": exp.category.name if exp.category else None,
-            "category_color": exp.category.color if exp.category else None,
-            "category_icon": exp.category.icon if exp.category else None,
+            "category_name": category.name if category else None,
+            "category_color": category.color if category else None,
+            "category_icon": category.icon if category else None,
             "payment_method": exp.payment_method,
             "tags": exp.tags,
-            "frequency": config.get("frequency"),
-            "next_due_date": config.get("next_due_date"),
+            "frequency": schedule.frequency,
+            "next_due_date": str(schedule.next_due_date),
             "transaction_date": str(exp.transaction_date),
             "created_at": str(exp.created_at),
         })
 
     # ── Recurring Income ────────────────────────────────────────────────
-    income_result = await db.execute(
-        select(Income)
-        .where(Income.user_id == uid, Income.is_recurring == True)
-        .order_by(Income.created_at.desc())
+    income_rows, next_income_cursor = await paginate(
+        db,
+        select(RecurringSchedule)
+        .join(RecurringSchedule.income)
+        .options(contains_eager(RecurringSchedule.income))
+        .where(RecurringSchedule.user_id == uid),
+        RecurringSchedule.created_at,
+        RecurringSchedule.id,
+        income_cursor,
+        limit,
     )
     recurring_income = []
-    for inc in income_result.scalars().all():
+    for schedule in income_rows:
+        inc = schedule.income
         recurring_income.append({
             "id": str(inc.id),
             "type": "income",
@@ -2139,17 +2218,392 @@ async def get_recurring_transactions(request: Request, db: AsyncSession = Depend
             "amount": float(inc.amount),
             "currency": inc.currency,
             "description": inc.description,
-            "frequency": inc.recurrence_period,
-            "next_due_date": str(inc.income_date),
+            "frequency": schedule.frequency,
+            "next_due_date": str(schedule.next_due_date),
             "notes": inc.notes,
             "created_at": str(inc.created_at),
         })
 
+    # COUNT(column) skips NULLs: each schedule has one template column set
+    totals = (await db.execute(
+        select(func.count(RecurringSchedule.expense_id), func.count(RecurringSchedule.income_id))
+        .where(RecurringSchedule.user_id == uid)
+    )).one()
+
     return {
         "recurring_expenses": recurring_expenses,
         "recurring_income": recurring_income,
-        "total_recurring_expenses": len(recurring_expenses),
-        "total_recurring_income": len(recurring_income),
+        "total_recurring_expenses": totals[0],
+        "total_recurring_income": totals[1],
+        "next_expense_cursor": next_expense_cursor,
+        "next_income_cursor": next_income_cursor,
+    }
+
+# =====================================================================
+# Dashboard Summary
+# =====================================================================
+
+DASHBOARD_TREND_MONTHS = 6
+DASHBOARD_UPCOMING_DAYS = 30
+
+
+def _month_windows(today: date, months: int) -> List[tuple]:
+    """(first_day, last_day) for the last ``months`` calendar months, oldest first."""
+    windows = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        start = date(year, month, 1)
+        end = (date(year + (month == 12), month % 12 + 1, 1)) - timedelta(days=1)
+        windows.append((start, end))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return list(reversed(windows))
+
+
+def _windowed_sums(amount, date_column, windows: List[tuple]) -> list:
+    """One conditional SUM per (start, end) window, so a single scan fills every bucket."""
+    return [
+        func.coalesce(
+            func.sum(case((date_column.between(start, end), amount), else_=0)), 0
+        ).label(f"w{i}")
+        for i, (start, end) in enumerate(windows)
+    ]
+
+
+async def _category_breakdown(db: AsyncSession, user_id: uuid.UUID, start: date, end: date, rates: "_SummaryRates") -> List[dict]:
+    """Expense totals per category between ``start`` and ``end``, largest first."""
+    amount = func.coalesce(Expense.amount_in_base_currency, Expense.amount)
+    result = await db.execute(
+        select(
+            Expense.category_id,
+            Category.name,
+            Category.color,
+            func.sum(amount).label("total"),
+            func.count(Expense.id).label("count"),
+        )
+        .join(Category, Expense.category_id == Category.id, isouter=True)
+        .where(Expense.user_id == user_id, Expense.transaction_date.between(start, end))
+        .group_by(Expense.category_id, Category.name, Category.color)
+        .order_by(func.sum(amount).desc())
+    )
+    return [{
+        "category_id": str(r.category_id) if r.category_id else None,
+        "name": r.name or "Uncategorized",
+        "color": r.color,
+        "total": await rates.convert(r.total, "USD", start),
+        "count": r.count,
+    } for r in result.all()]
+
+
+@app.get("/dashboard/summary", dependencies=[Depends(conditional(EXPENSES, INCOME, CATEGORIES, BUDGETS, EMIS, INVESTMENTS, BORROWINGS, LENDINGS, daily=True))])
+async def dashboard_summary(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Everything the dashboard cards and charts need in one payload.
+
+    Totals, the category breakdown and recent expenses cover
+    ``start_date``..``end_date`` (default: the current month).  The monthly
+    trend, ``current_month``, ``daily_expenses`` (last seven days) and
+    ``previous_month`` are fixed to the calendar and ignore the range.
+    Active budgets (as ``GET /budgets`` returns them, in their own
+    currency) and the investment
+    allocation by type come along, so the page needs no list calls.
+
+    Amounts are in ``currency``, the user's preferred one: base-currency
+    expense totals and income are converted at the rate of each window's
+    (or income month's) first day, everything else at the current month's.
+    """
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+    uid = uuid.UUID(user["user_id"])
+    rates = _SummaryRates(db, await _preferred_currency(db, uid))
+
+    today = date.today()
+    if start_date is None:
+        start_date = today.replace(day=1)
+    if end_date is None:
+        end_date = _month_windows(today, 1)[0][1]
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+
+    months = _month_windows(today, DASHBOARD_TREND_MONTHS + 1)
+    trend_months, prev_month = months[1:], months[-2]
+    windows = [(start_date, end_date), prev_month] + trend_months
+    expense_amount = func.coalesce(Expense.amount_in_base_currency, Expense.amount)
+
+    # Expenses and income: period total/count, previous month and monthly trend
+    expense_row = (await db.execute(
+        select(
+            func.count(Expense.id).filter(Expense.transaction_date.between(start_date, end_date)).label("count"),
+            func.count(Expense.id).label("all_time_count"),
+            *_windowed_sums(expense_amount, Expense.transaction_date, windows),
+        ).where(Expense.user_id == uid)
+    )).one()
+    # Income is stored in its original currency: sum per currency and month,
+    # then convert at each month's rate, as /income/summary does
+    income_year = func.extract("year", Income.income_date).label("year")
+    income_month = func.extract("month", Income.income_date).label("month")
+    income_by_month = (await db.execute(
+        select(
+            Income.currency, income_year, income_month,
+            func.count(Income.id).filter(Income.income_date.between(start_date, end_date)).label("count"),
+            *_windowed_sums(Income.amount, Income.income_date, windows),
+        ).where(
+            Income.user_id == uid,
+            Income.income_date.between(min(w[0] for w in windows), max(w[1] for w in windows)),
+        ).group_by(Income.currency, income_year, income_month)
+    )).all()
+    income_all_time_count = (await db.execute(
+        select(func.count(Income.id)).where(Income.user_id == uid)
+    )).scalar_one()
+    income_sums = [Decimal("0")] * len(windows)
+    income_count = 0
+    for row in income_by_month:
+        rate = await rates.rate(row.currency, date(int(row.year), int(row.month), 1))
+        for i in range(len(windows)):
+            income_sums[i] += Decimal(str(getattr(row, f"w{i}"))) * rate
+        income_count += row.count
+
+    expense_sums = [
+        await rates.convert(getattr(expense_row, f"w{i}"), "USD", window_start)
+        for i, (window_start, _) in enumerate(windows)
+    ]
+    total_expenses = expense_sums[0]
+    total_income = float(income_sums[0])
+    monthly_trend = []
+    for i, (month_start, _) in enumerate(trend_months, start=2):
+        spent = expense_sums[i]
+        earned = float(income_sums[i])
+        monthly_trend.append({
+            "month": month_start.strftime("%Y-%m"),
+            "expenses": spent,
+            "income": earned,
+            "savings": earned - spent,
+        })
+
+    category_breakdown = await _category_breakdown(db, uid, start_date, end_date, rates)
+    current_month = months[-1]
+    if (start_date, end_date) == current_month:
+        month_categories = category_breakdown
+    else:
+        month_categories = await _category_breakdown(db, uid, *current_month, rates)
+
+    week_start = today - timedelta(days=6)
+    daily_result = await db.execute(
+        select(Expense.transaction_date, func.sum(expense_amount).label("total"))
+        .where(Expense.user_id == uid, Expense.transaction_date.between(week_start, today))
+        .group_by(Expense.transaction_date)
+    )
+    daily_totals = {r.transaction_date: await rates.convert(r.total, "USD", r.transaction_date) for r in daily_result.all()}
+    daily_expenses = [
+        {"date": str(day), "total": daily_totals.get(day, 0.0)}
+        for day in (week_start + timedelta(days=i) for i in range(7))
+    ]
+
+    recent_result = await db.execute(
+        select(Expense)
+        .where(Expense.user_id == uid, Expense.transaction_date.between(start_date, end_date))
+        .order_by(Expense.transaction_date.desc(), Expense.id.desc())
+        .limit(5)
+    )
+    categories = await category_cache.get(db, user["tenant_id"])
+    recent_expenses = [_expense_to_response(e, categories) for e in recent_result.scalars().all()]
+
+    # EMIs: paid amount and next pending instalment per loan
+    emi_result = await db.execute(
+        select(
+            EMI.id,
+            EMI.lender_name,
+            EMI.loan_type,
+            EMI.monthly_emi,
+            EMI.tenure_months,
+            EMI.currency,
+            func.coalesce(func.sum(EMIPayment.amount).filter(EMIPayment.status == "paid"), 0).label("paid"),
+            func.min(EMIPayment.due_date).filter(EMIPayment.status == "pending").label("next_due"),
+        )
+        .join(EMIPayment, EMIPayment.emi_id == EMI.id, isouter=True)
+        .where(EMI.user_id == uid)
+        .group_by(EMI.id, EMI.lender_name, EMI.loan_type, EMI.monthly_emi, EMI.tenure_months, EMI.currency)
+    )
+    emi_rows = emi_result.all()
+    emi_monthly = [await rates.convert(r.monthly_emi, r.currency, today) for r in emi_rows]
+    emi_remaining = sum([
+        await rates.convert(r.monthly_emi * r.tenure_months - r.paid, r.currency, today) for r in emi_rows
+    ])
+
+    upcoming_until = today + timedelta(days=DASHBOARD_UPCOMING_DAYS)
+    upcoming = [{
+        "type": "emi",
+        "label": r.lender_name or r.loan_type,
+        "amount": monthly,
+        "due_date": str(r.next_due),
+        "days_left": (r.next_due - today).days,
+    } for r, monthly in zip(emi_rows, emi_monthly) if r.next_due and today <= r.next_due <= upcoming_until]
+
+    investment_cost = Investment.quantity * Investment.purchase_price
+    investment_type = func.lower(Investment.investment_type).label("type")
+    investment_rows = (await db.execute(
+        select(
+            investment_type,
+            Investment.currency,
+            func.coalesce(func.sum(func.coalesce(Investment.current_value, investment_cost)), 0).label("value"),
+            func.coalesce(func.sum(investment_cost), 0).label("cost"),
+            func.count(Investment.id).label("count"),
+        ).where(Investment.user_id == uid).group_by(investment_type, Investment.currency)
+    )).all()
+    allocation = {}
+    investment_value = investment_cost_total = 0.0
+    for r in investment_rows:
+        value = await rates.convert(r.value, r.currency, today)
+        allocation[r.type] = allocation.get(r.type, 0.0) + value
+        investment_value += value
+        investment_cost_total += await rates.convert(r.cost, r.currency, today)
+
+    budgets = await fetch_budgets_with_spend(db, uid, active_only=True)
+    budget_total = sum([await rates.convert(b.amount, b.currency, today) for b in budgets])
+    budget_used = sum([await rates.convert(b.spent, "USD", today) for b in budgets])
+
+    # Borrowings and lendings: outstanding, open and overdue counts
+    borrowing_totals = await _debt_totals(db, rates, Borrowing, uid, Borrowing.total_repaid, ["open", "partially_paid"])
+    lending_totals = await _debt_totals(db, rates, Lending, uid, Lending.total_received, ["open", "partially_received"])
+
+    due_borrowings = await db.execute(
+        select(Borrowing.lender_name, Borrowing.remaining_amount, Borrowing.currency, Borrowing.due_date)
+        .where(
+            Borrowing.user_id == uid,
+            Borrowing.status != "closed",
+            Borrowing.due_date.between(today, upcoming_until),
+        )
+    )
+    upcoming.extend([{
+        "type": "borrowing",
+        "label": r.lender_name,
+        "amount": await rates.convert(r.remaining_amount or 0, r.currency, today),
+        "due_date": str(r.due_date),
+        "days_left": (r.due_date - today).days,
+    } for r in due_borrowings.all()])
+    upcoming.sort(key=lambda item: item["due_date"])
+
+    borrowings_owed = borrowing_totals["outstanding"]
+    lendings_outstanding = lending_totals["outstanding"]
+    assets = investment_value + lendings_outstanding + total_income
+    liabilities = borrowings_owed + emi_remaining
+
+    return {
+        "period": {"start_date": str(start_date), "end_date": str(end_date)},
+        "currency": rates.currency,
+        "expenses": {
+            "total": total_expenses,
+            "count": expense_row.count,
+            "all_time_count": expense_row.all_time_count,
+            "previous_month": expense_sums[1],
+        },
+        "income": {
+            "total": total_income,
+            "count": income_count,
+            "all_time_count": income_all_time_count,
+            "previous_month": float(income_sums[1]),
+        },
+        "savings_rate": (total_income - total_expenses) / total_income * 100 if total_income > 0 else 0,
+        "category_breakdown": category_breakdown,
+        "monthly_trend": monthly_trend,
+        "current_month": {
+            "expenses": monthly_trend[-1]["expenses"],
+            "income": monthly_trend[-1]["income"],
+            "top_categories": month_categories[:3],
+        },
+        "daily_expenses": daily_expenses,
+        "recent_expenses": recent_expenses,
+        "emis": {
+            "count": len(emi_rows),
+            "monthly_total": sum(emi_monthly),
+            "remaining": emi_remaining,
+        },
+        "investments": {
+            "count": sum(r.count for r in investment_rows),
+            "value": investment_value,
+            "cost": investment_cost_total,
+            "return_percent": (investment_value - investment_cost_total) / investment_cost_total * 100 if investment_cost_total > 0 else 0,
+            "allocation": [
+                {"type": t, "value": v}
+                for t, v in sorted(allocation.items(), key=lambda item: item[1], reverse=True)
+            ],
+        },
+        "budgets": {"count": len(budgets), "total": budget_total, "used": budget_used, "items": budgets},
+        "borrowings": {
+            "outstanding": borrowings_owed,
+            "open": borrowing_totals["open"],
+            "overdue": borrowing_totals["overdue"],
+        },
+        "lendings": {
+            "outstanding": lendings_outstanding,
+            "open": lending_totals["open"],
+            "overdue": lending_totals["overdue"],
+        },
+        "upcoming_due": upcoming[:5],
+        "net_worth": assets - liabilities,
+    }
+
+
+# =====================================================================
+# Spend Time Series
+# =====================================================================
+
+TIMESERIES_DEFAULT_DAYS = 90
+TIMESERIES_DEFAULT_MONTHS = 12
+
+
+@app.get("/expenses/timeseries", dependencies=[Depends(conditional(EXPENSES, daily=True))])
+async def expense_timeseries(
+    request: Request,
+    interval: str = timeseries.DAY,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category_id: Optional[str] = None,
+    group_by_category: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Spend per day or month in base currency, served from the TimescaleDB
+    continuous aggregates.  Defaults to the last 90 days (``interval=day``)
+    or the last 12 months (``interval=month``); monthly ranges are widened to
+    whole months.
+    """
+    if interval not in timeseries.INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of: {', '.join(timeseries.INTERVALS)}")
+
+    user = request.state.user
+    await set_tenant_context(db, user["tenant_id"])
+
+    if end_date is None:
+        end_date = date.today()
+    if start_date is None:
+        if interval == timeseries.MONTH:
+            start_date = _month_windows(end_date, TIMESERIES_DEFAULT_MONTHS)[0][0]
+        else:
+            start_date = end_date - timedelta(days=TIMESERIES_DEFAULT_DAYS - 1)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    start_date, end_date = timeseries.bucket_range(interval, start_date, end_date)
+
+    points = await timeseries.expense_series(
+        db,
+        uuid.UUID(user["tenant_id"]),
+        uuid.UUID(user["user_id"]),
+        interval,
+        start_date,
+        end_date,
+        category_id=uuid.UUID(category_id) if category_id else None,
+        by_category=group_by_category,
+    )
+    return {
+        "interval": interval,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "points": points,
     }
 
 
@@ -2159,6 +2613,9 @@ async def get_recurring_transactions(request: Request, db: AsyncSession = Depend
 
 @app.get("/notifications")
 async def list_notifications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -2166,13 +2623,15 @@ async def list_notifications(
     uid = uuid.UUID(current_user["user_id"])
     await set_tenant_context(db, current_user["tenant_id"])
 
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.user_id == uid)
-        .order_by(Notification.created_at.desc())
-        .limit(50)
+    notifications, next_cursor = await paginate(
+        db,
+        select(Notification).where(Notification.user_id == uid),
+        Notification.created_at,
+        Notification.id,
+        cursor,
+        limit,
     )
-    notifications = result.scalars().all()
+    set_next_cursor(response, next_cursor)
     return [
         {
             "id": str(n.id),
@@ -0,0 +1,282 @@
+"""
+Bank statement CSV layouts.
+
+A statement is parsed with a ``RowMapper`` compiled once per file: fixed
+column indices, a single date format and a precompiled amount cleaner, so
+each row costs a few index lookups instead of probing every candidate column
+and date format.
+
+Named layouts (``LAYOUTS``) describe known bank exports and are matched on
+the header alone.  Anything else goes through the ``generic`` layout, whose
+columns and date format are resolved from the header and a sample of rows.
+"""
+
+import csv
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+SAMPLE_ROWS = 50
+DEFAULT_PAYMENT_METHOD = "Bank Transfer"
+
+# Stripped from amounts before Decimal(): currency symbols, thousands separators, spaces
+_AMOUNT_NOISE = str.maketrans("", "", "₹$, \t\u00a0")
+
+
+class StatementRow(NamedTuple):
+    line: int
+    transaction_date: date
+    description: str
+    amount: Decimal
+    payment_method: str
+
+
+class Rejection(NamedTuple):
+    line: int
+    reason: str
+
+
+class StatementFormatError(ValueError):
+    pass
+
+
+class StatementLayout(NamedTuple):
+    """Candidate header names per field, in order of preference."""
+    name: str
+    date_columns: Sequence[str]
+    date_formats: Sequence[str]
+    description_columns: Sequence[str]
+    debit_columns: Sequence[str]
+
+
+GENERIC = StatementLayout(
+    name="generic",
+    date_columns=['Date', 'Transaction Date', 'Value Date', 'transaction_date'],
+    date_formats=['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y'],
+    description_columns=['Description', 'Narration', 'Particulars'],
+    # Debit / withdrawal columns: credits are not expenses
+    debit_columns=['Debit', 'Withdrawal', 'Amount', 'Debit Amount'],
+)
+
+LAYOUTS: Dict[str, StatementLayout] = {}
+
+
+def register_layout(layout: StatementLayout):
+    LAYOUTS[layout.name] = layout
+
+
+register_layout(StatementLayout(
+    name="hdfc",
+    date_columns=['Date'],
+    date_formats=['%d/%m/%y'],
+    description_columns=['Narration'],
+    debit_columns=['Withdrawal Amt.'],
+))
+register_layout(StatementLayout(
+    name="icici",
+    date_columns=['Transaction Date'],
+    date_formats=['%d/%m/%Y'],
+    description_columns=['Transaction Remarks'],
+    debit_columns=['Withdrawal Amount (INR )', 'Withdrawal Amount (INR)'],
+))
+register_layout(StatementLayout(
+    name="sbi",
+    date_columns=['Txn Date'],
+    date_formats=['%d %b %Y'],
+    description_columns=['Description'],
+    debit_columns=['Debit'],
+))
+register_layout(GENERIC)
+
+
+# ── Compiled field parsers ────────────────────────────────────────────────
+
+def _normalize(header: str) -> str:
+    return " ".join(header.split()).casefold()
+
+
+def compile_date_parser(fmt: str) -> Callable[[str], date]:
+    """
+    A parser for one date format.  Purely numeric day/month/year formats
+    with a single separator are split and converted with ``int`` instead of
+    going through ``strptime``; anything else falls back to ``strptime``.
+    """
+    parts = fmt.replace("-", "/").split("/")
+    separator = "-" if "-" in fmt else "/"
+    if len(parts) == 3 and fmt.count(separator) == 2 and set(parts) <= {"%d", "%m", "%Y", "%y"} \
+            and {"%d", "%m"} <= set(parts) and ("%Y" in parts) != ("%y" in parts):
+        day_at, month_at = parts.index("%d"), parts.index("%m")
+        year_at = parts.index("%Y" if "%Y" in parts else "%y")
+        two_digit_year = "%y" in parts
+
+        def parse(value: str) -> date:
+            fields = value.split(separator)
+            if len(fields) != 3:
+                raise ValueError(value)
+            year = int(fields[year_at])
+            if two_digit_year:
+                # Same pivot as strptime's %y: 69-99 -> 1900s, 00-68 -> 2000s
+                if not 0 <= year < 100:
+                    raise ValueError(value)
+                year += 1900 if year >= 69 else 2000
+            return date(year, int(fields[month_at]), int(fields[day_at]))
+
+        return parse
+
+    return lambda value: datetime.strptime(value, fmt).date()
+
+
+def parse_amount(value: str) -> Optional[Decimal]:
+    cleaned = value.translate(_AMOUNT_NOISE)
+    if not cleaned:
+        return None
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation:
+        return None
+
+
+class RowMapper:
+    """Turns raw CSV fields into a ``StatementRow`` or a ``Rejection``."""
+
+    def __init__(self, layout: str, date_index: int, date_format: str, description_index: int, amount_index: int):
+        self.layout = layout
+        self.date_format = date_format
+        self._date_index = date_index
+        self._description_index = description_index
+        self._amount_index = amount_index
+        self._width = max(date_index, description_index, amount_index) + 1
+        self._parse_date = compile_date_parser(date_format)
+
+    def __call__(self, line: int, fields: List[str]) -> Union[StatementRow, Rejection]:
+        if len(fields) < self._width:
+            return Rejection(line, "too few columns")
+        try:
+            transaction_date = self._parse_date(fields[self._date_index].strip())
+        except ValueError:
+            return Rejection(line, "missing or unrecognised date")
+
+        description = fields[self._description_index].strip()
+        if not description:
+            return Rejection(line, "missing description")
+
+        amount = parse_amount(fields[self._amount_index])
+        if amount is None:
+            return Rejection(line, "no debit amount")
+        if amount <= 0:
+            return Rejection(line, "amount is not positive")
+
+        return StatementRow(line, transaction_date, description, amount, DEFAULT_PAYMENT_METHOD)
+
+
+# ── Detection ─────────────────────────────────────────────────────────────
+
+def _find_column(header: List[str], candidates: Sequence[str], sample: List[List[str]] = ()) -> Optional[int]:
+    """Index of the first candidate present in ``header`` (with data in ``sample``, if given)."""
+    positions = {_normalize(name): i for i, name in reversed(list(enumerate(header)))}
+    for candidate in candidates:
+        index = positions.get(_normalize(candidate))
+        if index is None:
+            continue
+        if not sample or any(len(row) > index and row[index].strip() for row in sample):
+            return index
+    return None
+
+
+def _resolve_date_format(values: List[str], formats: Sequence[str]) -> Optional[str]:
+    """The format that parses the most sampled values (earlier formats win ties)."""
+    best, best_count = None, 0
+    for fmt in formats:
+        parse = compile_date_parser(fmt)
+        count = 0
+        for value in values:
+            try:
+                parse(value)
+                count += 1
+            except ValueError:
+                pass
+        if count > best_count:
+            best, best_count = fmt, count
+    return best
+
+
+def _mapper_for_layout(layout: StatementLayout, header: List[str]) -> Optional[RowMapper]:
+    """Mapper for a named layout if the header has all its columns, else ``None``."""
+    indices = [
+        _find_column(header, layout.date_columns),
+        _find_column(header, layout.description_columns),
+        _find_column(header, layout.debit_columns),
+    ]
+    if None in indices:
+        return None
+    date_index, description_index, amount_index = indices
+    return RowMapper(layout.name, date_index, layout.date_formats[0], description_index, amount_index)
+
+
+def _detect_generic(header: List[str], sample: List[List[str]]) -> RowMapper:
+    description_index = _find_column(header, GENERIC.description_columns, sample)
+    amount_index = _find_column(header, GENERIC.debit_columns, sample)
+
+    date_index = date_format = None
+    for candidate in GENERIC.date_columns:
+        index = _find_column(header, [candidate], sample)
+        if index is None:
+            continue
+        values = [row[index].strip() for row in sample if len(row) > index and row[index].strip()]
+        date_format = _resolve_date_format(values, GENERIC.date_formats)
+        if date_format:
+            date_index = index
+            break
+
+    if date_index is None:
+        raise StatementFormatError("no date column with a recognised date format")
+    if description_index is None:
+        raise StatementFormatError("no description column")
+    if amount_index is None:
+        raise StatementFormatError("no debit amount column")
+    return RowMapper(GENERIC.name, date_index, date_format, description_index, amount_index)
+
+
+def build_mapper(header: List[str], sample: List[List[str]], layout: Optional[str] = None) -> RowMapper:
+    """
+    Compile the mapper for a statement.  ``layout`` forces a named layout;
+    otherwise named layouts are tried on the header before generic detection.
+    """
+    if layout is not None:
+        if layout not in LAYOUTS:
+            raise StatementFormatError(f"unknown statement layout '{layout}'")
+        if layout == GENERIC.name:
+            return _detect_generic(header, sample)
+        mapper = _mapper_for_layout(LAYOUTS[layout], header)
+        if mapper is None:
+            raise StatementFormatError(f"header does not match the '{layout}' layout")
+        return mapper
+
+    for name, known in LAYOUTS.items():
+        if name == GENERIC.name:
+            continue
+        mapper = _mapper_for_layout(known, header)
+        if mapper is not None:
+            return mapper
+    return _detect_generic(header, sample)
+
+
+def read_statement(text: Iterable[str], layout: Optional[str] = None) -> Tuple[RowMapper, Iterator[Tuple[int, List[str]]]]:
+    """
+    Read the header and a sample, build the mapper, and return it with an
+    iterator over every ``(line number, fields)`` record (sample included).
+    """
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if not header:
+        raise StatementFormatError("empty statement")
+
+    sample = []
+    for fields in islice(reader, SAMPLE_ROWS):
+        sample.append((reader.line_num, fields))
+    mapper = build_mapper(header, [fields for _, fields in sample], layout)
+
+    rest = ((reader.line_num, fields) for fields in reader)
+    records = (record for record in chain(sample, rest) if any(record[1]))
+    return mapper, records
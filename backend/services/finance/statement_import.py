@@ -0,0 +1,157 @@
+"""
+Streaming bank statement import.
+
+The upload is decoded incrementally and parsed one CSV record at a time
+with the row mapper compiled for its layout (``statement_formats``), so
+memory stays flat regardless of statement size.  Parsed rows are written in
+batches of ``IMPORT_BATCH_SIZE`` with one multi-row INSERT per batch, and
+each batch is committed together with its ``import_jobs`` checkpoint.  If an
+import dies part way, re-uploading the same file with the job id skips the
+records that were already committed.
+"""
+
+import io
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import islice
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.finance.statement_formats import Rejection, read_statement
+from shared import anomalies, rollups
+from shared.models import Expense, ImportJob
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_REJECTIONS = 100
+PREVIEW_ROWS = 10
+
+
+def open_statement(binary) -> io.TextIOWrapper:
+    """Text view over an uploaded file, decoded chunk by chunk as it is read."""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _batches(items: Iterator, size: int) -> Iterator[List]:
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ── Import ────────────────────────────────────────────────────────────────
+
+async def import_statement(
+    db: AsyncSession,
+    job: ImportJob,
+    text: Iterable[str],
+    rate_for: Callable[[date], Awaitable[Optional[Decimal]]],
+    begin: Callable[[], Awaitable[None]],
+    layout: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    category_for: Optional[Callable[[str], Optional[uuid.UUID]]] = None,
+) -> Dict:
+    """
+    Import the statement records after ``job.rows_processed`` into expenses.
+
+    ``rate_for`` returns the rate from the statement currency to USD for a
+    date, or ``None`` to store the row unconverted.  ``begin`` runs at the start of every transaction (the tenant
+    context is transaction-scoped).  ``layout`` forces a named statement
+    layout instead of detecting it.  ``category_for`` maps a description to
+    a category id (or ``None``) to auto-categorize rows.  Raises
+    ``StatementFormatError`` before anything is written if the file's columns
+    cannot be resolved.  If this raises, the caller rolls back the current
+    batch; the job keeps its last committed checkpoint.
+    """
+    started = time.perf_counter()
+    resumed_from = job.rows_processed
+    imported = rejected = 0
+    reasons: Counter = Counter()
+    rejections: List[dict] = []
+    preview: List[dict] = []
+    rates: Dict[date, Decimal] = {}
+
+    mapper, records = read_statement(text, layout)
+    job.statement_format = mapper.layout
+    parsed = (mapper(line, fields) for line, fields in islice(records, resumed_from, None))
+
+    for batch in _batches(parsed, batch_size or IMPORT_BATCH_SIZE):
+        rows, entries = [], []
+        for record in batch:
+            if isinstance(record, Rejection):
+                rejected += 1
+                reasons[record.reason] += 1
+                if len(rejections) < MAX_REPORTED_REJECTIONS:
+                    rejections.append(record._asdict())
+                continue
+
+            if record.transaction_date not in rates:
+                rates[record.transaction_date] = await rate_for(record.transaction_date)
+            rate = rates[record.transaction_date]
+            category_id = category_for(record.description) if category_for else None
+            rows.append({
+                "id": uuid.uuid4(),
+                "tenant_id": job.tenant_id,
+                "user_id": job.user_id,
+                "category_id": category_id,
+                "amount": record.amount,
+                "currency": job.currency,
+                "amount_in_base_currency": record.amount * rate if rate is not None else None,
+                "exchange_rate": rate,
+                "description": record.description,
+                "transaction_date": record.transaction_date,
+                "payment_method": record.payment_method,
+                "synced": True,
+            })
+            entries.append(rollups.RollupEntry(
+                rollups.EXPENSE, job.tenant_id, job.user_id, record.transaction_date.replace(day=1),
+                str(category_id) if category_id else "", job.currency, record.amount,
+            ))
+            if len(preview) < PREVIEW_ROWS:
+                preview.append({
+                    "transaction_date": record.transaction_date,
+                    "description": record.description,
+                    "amount": float(record.amount),
+                    "currency": job.currency,
+                    "category_id": str(category_id) if category_id else None,
+                    "payment_method": record.payment_method,
+                })
+
+        if rows:
+            await db.execute(insert(Expense).values(rows))
+            await rollups.add_entries(db, entries)
+            await anomalies.score_expenses(db, (
+                anomalies.Candidate(row["id"], entry, row["transaction_date"])
+                for row, entry in zip(rows, entries)
+            ))
+        imported += len(rows)
+
+        job.rows_processed += len(batch)
+        job.rows_imported += len(rows)
+        job.rows_rejected += len(batch) - len(rows)
+        job.rejection_counts = dict(Counter(job.rejection_counts or {}) + reasons)
+        reasons.clear()
+        job.updated_at = datetime.now(timezone.utc)
+        await db.commit()
+        await begin()
+
+    elapsed = time.perf_counter() - started
+    processed = imported + rejected
+    return {
+        "job_id": str(job.id),
+        "statement_format": mapper.layout,
+        "resumed_from": resumed_from,
+        "processed_count": processed,
+        "imported_count": imported,
+        "rejected_count": rejected,
+        "rejection_reasons": job.rejection_counts or {},
+        "rejections": rejections,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
+        "transactions": preview,
+    }
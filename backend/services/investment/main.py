@@ -1,10 +1,10 @@
-from fastapi import FastAPI, Depends, Request
+from fastapi import FastAPI, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, text
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 import uuid
 
@@ -15,6 +15,8 @@ from shared.database import get_db, set_tenant_context
 from shared.models import Investment
 from shared.middleware.auth import get_current_user, auth_middleware
 from shared.config import get_settings
+from shared import downsample
+from shared.versioning import versions, conditional, bumps, INVESTMENTS
 from .stock_api import stock_api
 
 app = FastAPI(title="Investment Service", version="1.0.0")
@@ -32,6 +34,17 @@ app.middleware("http")(auth_middleware)
 
 settings = get_settings()
 
+
+@app.on_event("startup")
+async def connect_data_versions():
+    versions.connect(settings.REDIS_URL)
+
+
+@app.on_event("shutdown")
+async def close_data_versions():
+    await versions.close()
+
+
 class InvestmentCreate(BaseModel):
     investment_type: str
     asset_name: str
@@ -67,11 +80,15 @@ class PortfolioSummary(BaseModel):
     gain_loss_percentage: float
     investments_count: int
 
+class PortfolioHistoryPoint(BaseModel):
+    time: datetime
+    value: float
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "investment"}
 
-@app.post("/investments", response_model=InvestmentResponse)
+@app.post("/investments", response_model=InvestmentResponse, dependencies=[Depends(bumps(INVESTMENTS))])
 async def create_investment(
     investment: InvestmentCreate,
     request: Request,
@@ -117,7 +134,7 @@ async def create_investment(
         notes=new_investment.notes
     )
 
-@app.get("/investments", response_model=List[InvestmentResponse])
+@app.get("/investments", response_model=List[InvestmentResponse], dependencies=[Depends(conditional(INVESTMENTS))])
 async def get_investments(
     request: Request,
     db: AsyncSession = Depends(get_db)
@@ -201,7 +218,7 @@ async def get_investment(
         notes=inv.notes
     )
 
-@app.put("/investments/{investment_id}")
+@app.put("/investments/{investment_id}", dependencies=[Depends(bumps(INVESTMENTS))])
 async def update_investment(
     investment_id: str,
     investment_update: InvestmentCreate,
@@ -241,7 +258,7 @@ async def update_investment(
     
     return {"message": "Investment updated successfully", "investment_id": investment_id}
 
-@app.delete("/investments/{investment_id}")
+@app.delete("/investments/{investment_id}", dependencies=[Depends(bumps(INVESTMENTS))])
 async def delete_investment(
     investment_id: str,
     request: Request,
@@ -269,7 +286,7 @@ async def delete_investment(
     
     return {"message": "Investment deleted successfully"}
 
-@app.get("/portfolio/summary", response_model=PortfolioSummary)
+@app.get("/portfolio/summary", response_model=PortfolioSummary, dependencies=[Depends(conditional(INVESTMENTS))])
 async def get_portfolio_summary(
     request: Request,
     db: AsyncSession = Depends(get_db)
@@ -303,7 +320,40 @@ async def get_portfolio_summary(
         investments_count=len(investments)
     )
 
-@app.put("/investments/{investment_id}/price")
+# Snapshots are taken at most this often
+SNAPSHOT_RESOLUTION = timedelta(hours=1)
+
+@app.get("/portfolio/history", response_model=List[PortfolioHistoryPoint])
+async def get_portfolio_history(
+    request: Request,
+    days: int = Query(365, ge=1, le=3650),
+    max_points: int = Query(downsample.DEFAULT_MAX_POINTS, ge=downsample.MIN_POINTS, le=downsample.MAX_POINTS),
+    db: AsyncSession = Depends(get_db)
+):
+    """Portfolio value over time from the investment_snapshots hypertable"""
+    user = get_current_user(request)
+    await set_tenant_context(db, user["tenant_id"])
+    
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=days)
+    width = downsample.bucket_width(start, end, max_points, SNAPSHOT_RESOLUTION)
+    
+    # Each investment's last value in the bucket, summed across the portfolio
+    result = await db.execute(text("""
+        SELECT bucket, SUM(value) AS value
+        FROM (
+            SELECT time_bucket(:width, time) AS bucket, investment_id, last(value, time) AS value
+            FROM investment_snapshots
+            WHERE user_id = :user_id AND time >= :start
+            GROUP BY bucket, investment_id
+        ) per_investment
+        GROUP BY bucket
+        ORDER BY bucket
+    """), {"width": width, "user_id": uuid.UUID(user["user_id"]), "start": start})
+    
+    return [PortfolioHistoryPoint(time=row.bucket, value=float(row.value)) for row in result]
+
+@app.put("/investments/{investment_id}/price", dependencies=[Depends(bumps(INVESTMENTS))])
 async def update_investment_price(
     investment_id: str,
     payload: PriceUpdate,
@@ -4,12 +4,16 @@ Supports Alpha Vantage, Finnhub for US stocks and Yahoo Finance for Indian stock
 Includes Redis caching for performance optimization
 """
 import os
+import math
 import httpx
 import redis
+import redis.asyncio as aioredis
 import json
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+from shared.rate_limit import ALPHA_VANTAGE, FINNHUB, YAHOO, AsyncTokenBucket
+
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "")
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY", "")
 
@@ -29,6 +33,20 @@ except:
     REDIS_AVAILABLE = False
     redis_client = None
 
+# Provider quotas shared with the stock workers (same Redis db)
+rate_limiter = AsyncTokenBucket(
+    aioredis.Redis(
+        host=os.getenv("REDIS_HOST", "redis"),
+        port=6379,
+        password=os.getenv("REDIS_PASSWORD", "redis_password"),
+        db=5,
+        decode_responses=True,
+        socket_connect_timeout=2
+    ) if REDIS_AVAILABLE else None
+)
+# Longest a request waits for a provider token before answering with retry_after
+MAX_THROTTLE_WAIT_SECONDS = 2.0
+
 CACHE_DURATIONS = {
     'quote': 60,  # 1 minute
     'profile': 86400,  # 24 hours
@@ -44,6 +62,13 @@ class StockAPI:
     def is_indian_stock(self, symbol: str) -> bool:
         """Check if stock is Indian (NSE/BSE)"""
         return symbol.endswith('.NS') or symbol.endswith('.BO')
+    
+    async def _throttled(self, provider: str, symbol: str) -> Optional[Dict]:
+        """None once a provider token is taken, else the error to answer with"""
+        wait = await rate_limiter.wait(provider, MAX_THROTTLE_WAIT_SECONDS)
+        if not wait:
+            return None
+        return {"error": f"Rate limited by {provider}", "symbol": symbol, "retry_after": math.ceil(wait)}
         
     async def get_quote(self, symbol: str) -> Dict:
         """Get real-time stock quote - routes to Yahoo Finance for Indian stocks, Finnhub for US"""
@@ -53,6 +78,9 @@ class StockAPI:
     
     async def _get_finnhub_quote(self, symbol: str) -> Dict:
         """Get US stock quote using Finnhub"""
+        throttled = await self._throttled(FINNHUB, symbol)
+        if throttled:
+            return throttled
         async with httpx.AsyncClient() as client:
             try:
                 response = await client.get(
@@ -81,6 +109,9 @@ class StockAPI:
     
     async def _get_yahoo_quote(self, symbol: str) -> Dict:
         """Get Indian stock quote using Yahoo Finance"""
+        throttled = await self._throttled(YAHOO, symbol)
+        if throttled:
+            return throttled
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -123,6 +154,9 @@ class StockAPI:
     
     async def _get_finnhub_profile(self, symbol: str) -> Dict:
         """Get US company profile using Finnhub"""
+        throttled = await self._throttled(FINNHUB, symbol)
+        if throttled:
+            return throttled
         async with httpx.AsyncClient() as client:
             try:
                 response = await client.get(
@@ -148,6 +182,9 @@ class StockAPI:
     
     async def _get_yahoo_profile(self, symbol: str) -> Dict:
         """Get Indian company profile using Yahoo Finance"""
+        throttled = await self._throttled(YAHOO, symbol)
+        if throttled:
+            return throttled
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -196,6 +233,9 @@ class StockAPI:
     
     async def _get_finnhub_historical(self, symbol: str, interval: str) -> Dict:
         """Get US stock historical data using Finnhub candles endpoint"""
+        throttled = await self._throttled(FINNHUB, symbol)
+        if throttled:
+            return throttled
         async with httpx.AsyncClient() as client:
             try:
                 # Map interval to Finnhub resolution
@@ -276,6 +316,9 @@ class StockAPI:
     
     async def _get_alpha_vantage_historical(self, symbol: str, interval: str, outputsize: str) -> Dict:
         """Get US historical data using Alpha Vantage"""
+        throttled = await self._throttled(ALPHA_VANTAGE, symbol)
+        if throttled:
+            return throttled
         async with httpx.AsyncClient() as client:
             try:
                 function_map = {
@@ -331,6 +374,9 @@ class StockAPI:
     
     async def _get_yahoo_historical(self, symbol: str, interval: str) -> Dict:
         """Get historical data using Yahoo Finance (works for all stocks)"""
+        throttled = await self._throttled(YAHOO, symbol)
+        if throttled:
+            return throttled
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -405,6 +451,9 @@ class StockAPI:
     
     async def get_intraday_data(self, symbol: str, interval: str = "5min") -> Dict:
         """Get intraday data using Alpha Vantage"""
+        throttled = await self._throttled(ALPHA_VANTAGE, symbol)
+        if throttled:
+            return throttled
         async with httpx.AsyncClient() as client:
             try:
                 response = await client.get(
@@ -462,6 +511,8 @@ class StockAPI:
     
     async def _search_us_stocks(self, query: str) -> List[Dict]:
         """Search US stocks using Alpha Vantage"""
+        if await self._throttled(ALPHA_VANTAGE, query):
+            return []
         async with httpx.AsyncClient() as client:
             try:
                 response = await client.get(
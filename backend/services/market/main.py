@@ -1,10 +1,10 @@
-from fastapi import FastAPI, Depends, Request, HTTPException
+from fastapi import FastAPI, Depends, Request, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, text
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import uuid
 import httpx
@@ -17,6 +17,7 @@ from shared.models import Watchlist
 from shared.middleware.auth import get_current_user, auth_middleware
 from shared.redis_client import get_redis
 from shared.config import get_settings
+from shared import downsample
 
 app = FastAPI(title="Market Service", version="1.0.0")
 
@@ -225,30 +226,53 @@ async def get_quote(
         timestamp=quote["timestamp"]
     )
 
+# Stored market_data intervals and their bucket width
+CHART_INTERVALS = {
+    "1D": ("1d", timedelta(days=1)),
+    "1W": ("1w", timedelta(weeks=1)),
+    "1M": ("1M", timedelta(days=30)),
+}
+# Candles a chart covers when no ``days`` range is given, at any interval
+DEFAULT_CHART_CANDLES = 100
+
 @app.get("/chart/{symbol}", response_model=List[OHLCVData])
 async def get_chart_data(
     symbol: str,
     interval: str = "1D",
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    max_points: int = Query(downsample.DEFAULT_MAX_POINTS, ge=downsample.MIN_POINTS, le=downsample.MAX_POINTS),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get historical OHLCV data for charting"""
-    intervals_map = {
-        "1D": "1d",
-        "1W": "1w",
-        "1M": "1M"
-    }
+    """Get historical OHLCV data for charting, newest first.
+    
+    Without ``days`` the range spans ``DEFAULT_CHART_CANDLES`` candles of
+    ``interval``.  Ranges with more than ``max_points`` candles are merged
+    into wider candles by ``time_bucket`` in the database.
+    """
+    db_interval, resolution = CHART_INTERVALS.get(interval, CHART_INTERVALS["1D"])
     
-    db_interval = intervals_map.get(interval, "1d")
+    end = datetime.now(timezone.utc)
+    start = end - (timedelta(days=days) if days else DEFAULT_CHART_CANDLES * resolution)
+    width = downsample.bucket_width(start, end, max_points, resolution)
     
     query = text("""
-        SELECT time, open, high, low, close, volume
+        SELECT time_bucket(:width, time) AS bucket,
+               first(open, time) AS open, MAX(high) AS high, MIN(low) AS low,
+               last(close, time) AS close, SUM(volume) AS volume
         FROM market_data
-        WHERE symbol = :symbol AND interval = :interval
-        ORDER BY time DESC
-        LIMIT 100
+        WHERE symbol = :symbol AND interval = :interval AND time >= :start
+        GROUP BY bucket
+        ORDER BY bucket DESC
+        LIMIT :max_points
     """)
     
-    result = await db.execute(query, {"symbol": symbol, "interval": db_interval})
+    result = await db.execute(query, {
+        "width": width,
+        "symbol": symbol,
+        "interval": db_interval,
+        "start": start,
+        "max_points": max_points,
+    })
     rows = result.fetchall()
     
     return [
@@ -258,7 +282,7 @@ async def get_chart_data(
             high=float(row[2]) if row[2] else 0,
             low=float(row[3]) if row[3] else 0,
             close=float(row[4]) if row[4] else 0,
-            volume=row[5] if row[5] else 0
+            volume=int(row[5]) if row[5] else 0
         )
         for row in rows
     ]
@@ -0,0 +1,260 @@
+"""
+Expense anomaly flags.
+
+An expense is scored against the same user's spending in its category and
+currency over the ``ANOMALY_WINDOW_MONTHS`` months before the expense's
+month::
+
+    score = (amount - mean) / max(std, MIN_SPREAD * mean)
+
+and flagged when ``score >= SCORE_THRESHOLD`` over a baseline of at least
+``MIN_BASELINE_COUNT`` expenses.  The spread floor keeps a category of
+near-identical amounts (rent, subscriptions) from flagging every small
+increase.
+
+Baselines come from ``monthly_category_rollups`` (see ``shared.rollups``):
+count, sum and sum of squares merge by addition, so a window is just the sum
+of a few rollup rows that are already maintained on every write.  Expenses
+are scored as they are created, updated or imported and the flags stored in
+``expense_anomalies``; ``GET /anomalies`` only reads them.
+
+Writing into a past month moves the baseline of the months after it, and
+history that predates this module has no flags.  Rescore a tenant's whole
+history (vectorized with NumPy) with::
+
+    python -m shared.anomalies [--tenant-id <uuid>]
+"""
+
+import argparse
+import asyncio
+import math
+import uuid
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared import rollups
+from shared.config import get_settings
+from shared.models import Expense, ExpenseAnomaly, MonthlyCategoryRollup
+
+MIN_BASELINE_COUNT = 5
+SCORE_THRESHOLD = 3.0
+MIN_SPREAD = 0.1
+INSERT_BATCH_SIZE = 1000
+
+
+class Candidate(NamedTuple):
+    """An expense to score."""
+    expense_id: uuid.UUID
+    entry: rollups.RollupEntry
+    transaction_date: date
+
+
+def candidate(expense: Expense) -> Candidate:
+    return Candidate(expense.id, rollups.expense_entry(expense), expense.transaction_date)
+
+
+class Baseline(NamedTuple):
+    count: int
+    mean: float
+    std: float
+
+
+def baseline(count: int, total: float, sum_of_squares: float) -> Optional[Baseline]:
+    if count < MIN_BASELINE_COUNT:
+        return None
+    mean = total / count
+    return Baseline(count, mean, math.sqrt(max(sum_of_squares / count - mean * mean, 0.0)))
+
+
+def score(amount: float, base: Baseline) -> float:
+    return (amount - base.mean) / max(base.std, abs(base.mean) * MIN_SPREAD, 0.01)
+
+
+def _month_index(month: date) -> int:
+    return month.year * 12 + month.month - 1
+
+
+def _window_months() -> int:
+    return get_settings().ANOMALY_WINDOW_MONTHS
+
+
+def _anomaly_row(c: Candidate, base: Baseline, value: float) -> dict:
+    return {
+        "expense_id": c.expense_id,
+        "tenant_id": c.entry.tenant_id,
+        "user_id": c.entry.user_id,
+        "category_key": c.entry.category_key,
+        "transaction_date": c.transaction_date,
+        "amount": c.entry.amount,
+        "baseline_count": base.count,
+        "baseline_mean": round(base.mean, 2),
+        "baseline_std": round(base.std, 2),
+        "score": round(value, 4),
+    }
+
+
+# ── Scoring at write time ─────────────────────────────────────────────────
+
+async def _baselines(db: AsyncSession, candidates: Sequence[Candidate], window: int) -> Dict[tuple, Baseline]:
+    """Baseline per (user, category, currency, month) of ``candidates``, from one rollup query."""
+    entries = [c.entry for c in candidates]
+    months = [e.month for e in entries]
+    earliest = min(months)
+    for _ in range(window):
+        earliest = date(earliest.year - (earliest.month == 1), (earliest.month - 2) % 12 + 1, 1)
+
+    rollup = MonthlyCategoryRollup
+    result = await db.execute(
+        select(
+            rollup.user_id, rollup.category_key, rollup.currency, rollup.month,
+            rollup.entry_count, rollup.total_amount, rollup.sum_of_squares,
+        ).where(
+            rollup.user_id.in_({e.user_id for e in entries}),
+            rollup.entry_type == rollups.EXPENSE,
+            rollup.category_key.in_({e.category_key for e in entries}),
+            rollup.currency.in_({e.currency for e in entries}),
+            rollup.month >= earliest,
+            rollup.month < max(months),
+        )
+    )
+    history = defaultdict(dict)
+    for row in result.all():
+        history[(row.user_id, row.category_key, row.currency)][_month_index(row.month)] = (
+            row.entry_count, float(row.total_amount), float(row.sum_of_squares),
+        )
+
+    baselines = {}
+    for e in entries:
+        key = (e.user_id, e.category_key, e.currency, e.month)
+        if key in baselines:
+            continue
+        months_of_group = history.get(key[:3], {})
+        end = _month_index(e.month)
+        count = total = squares = 0
+        for index in range(end - window, end):
+            if index in months_of_group:
+                n, t, q = months_of_group[index]
+                count, total, squares = count + n, total + t, squares + q
+        baselines[key] = baseline(count, total, squares)
+    return baselines
+
+
+async def drop_flags(db: AsyncSession, expense_ids: Sequence[uuid.UUID]):
+    """Drop the flags of ``expense_ids`` (updated or deleted expenses)."""
+    if expense_ids:
+        await db.execute(delete(ExpenseAnomaly).where(ExpenseAnomaly.expense_id.in_(expense_ids)))
+
+
+async def score_expenses(db: AsyncSession, candidates: Iterable[Candidate], replace: bool = False) -> int:
+    """
+    Flag the anomalous ``candidates``; ``replace`` first drops their
+    existing flags (for updated expenses).  Returns the number flagged.
+    """
+    candidates = list(candidates)
+    if replace:
+        await drop_flags(db, [c.expense_id for c in candidates])
+    # Uncategorized expenses have no meaningful baseline
+    candidates = [c for c in candidates if c.entry.category_key]
+    if not candidates:
+        return 0
+
+    baselines = await _baselines(db, candidates, _window_months())
+    rows = []
+    for c in candidates:
+        e = c.entry
+        base = baselines[(e.user_id, e.category_key, e.currency, e.month)]
+        if base is None:
+            continue
+        value = score(float(e.amount), base)
+        if value >= SCORE_THRESHOLD:
+            rows.append(_anomaly_row(c, base, value))
+    if rows:
+        await db.execute(insert(ExpenseAnomaly).values(rows))
+    return len(rows)
+
+
+# ── Backfill ──────────────────────────────────────────────────────────────
+
+def score_history(rows: Sequence[tuple], window: int) -> List[tuple]:
+    """
+    Score every expense of ``rows`` -- ``(group_key, month, amount)`` -- in one
+    vectorized pass.  Returns ``(index, count, mean, std, score)`` for the
+    anomalous ones.
+    """
+    import numpy as np
+
+    if not rows:
+        return []
+    groups, group_of = np.unique(np.array([str(r[0]) for r in rows]), return_inverse=True)
+    months = np.array([_month_index(r[1]) for r in rows])
+    months -= months.min()
+    amounts = np.array([float(r[2]) for r in rows])
+
+    # Per group and month totals, then cumulated so that
+    # cumulative[g, m] covers the months before m
+    shape = (len(groups), months.max() + 2)
+    counts, totals, squares = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    np.add.at(counts, (group_of, months + 1), 1)
+    np.add.at(totals, (group_of, months + 1), amounts)
+    np.add.at(squares, (group_of, months + 1), amounts * amounts)
+    counts, totals, squares = counts.cumsum(axis=1), totals.cumsum(axis=1), squares.cumsum(axis=1)
+
+    first = np.maximum(months - window, 0)
+    n = counts[group_of, months] - counts[group_of, first]
+    total = totals[group_of, months] - totals[group_of, first]
+    square = squares[group_of, months] - squares[group_of, first]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        std = np.sqrt(np.maximum(square / n - mean * mean, 0.0))
+        scores = (amounts - mean) / np.maximum(np.maximum(std, np.abs(mean) * MIN_SPREAD), 0.01)
+    flagged = np.flatnonzero((n >= MIN_BASELINE_COUNT) & (scores >= SCORE_THRESHOLD))
+    return [(int(i), int(n[i]), float(mean[i]), float(std[i]), float(scores[i])) for i in flagged]
+
+
+async def rescore_tenant(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """
+    Recompute every anomaly flag of one tenant from its expenses.  Every
+    flag of the tenant is dropped first, including stale ones whose expense
+    no longer exists.
+    """
+    await db.execute(delete(ExpenseAnomaly).where(ExpenseAnomaly.tenant_id == tenant_id))
+    result = await db.execute(
+        select(Expense.id, Expense.user_id, Expense.category_id, Expense.currency,
+               Expense.transaction_date, Expense.amount)
+        .where(Expense.tenant_id == tenant_id, Expense.category_id.is_not(None))
+    )
+    candidates = [
+        Candidate(expense_id, rollups.RollupEntry(
+            rollups.EXPENSE, tenant_id, user_id, transaction_date.replace(day=1),
+            str(category_id), currency, amount,
+        ), transaction_date)
+        for expense_id, user_id, category_id, currency, transaction_date, amount in result.all()
+    ]
+    flagged = score_history(
+        [((c.entry.user_id, c.entry.category_key, c.entry.currency), c.entry.month, c.entry.amount)
+         for c in candidates],
+        _window_months(),
+    )
+    rows = [_anomaly_row(candidates[i], Baseline(n, mean, std), value) for i, n, mean, std, value in flagged]
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await db.execute(insert(ExpenseAnomaly), rows[start:start + INSERT_BATCH_SIZE])
+    return len(rows)
+
+
+async def _rescore(tenant_id: Optional[str]):
+    from shared.database import for_each_tenant
+
+    async for tid, count in for_each_tenant(rescore_tenant, tenant_id):
+        print(f"Flagged {count} anomalous expenses for tenant {tid}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore expense_anomalies from expense history.")
+    parser.add_argument("--tenant-id", help="Only rescore this tenant (default: all tenants)")
+    args = parser.parse_args()
+    asyncio.run(_rescore(args.tenant_id))
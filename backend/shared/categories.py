@@ -0,0 +1,109 @@
+"""
+Default categories for new tenants.
+
+Every tenant gets ``DEFAULT_CATEGORIES`` once, when it is created (see
+``register`` in the auth service).  Seeding is a single
+``INSERT ... SELECT ... ON CONFLICT (tenant_id, name) DO NOTHING`` over the
+tenants being seeded, so it is idempotent and never needs a count query
+first; categories a tenant already has by those names are left alone.
+
+Seed tenants that predate this (or repair one) with::
+
+    python -m shared.categories [--tenant-id <uuid>]
+
+``uq_categories_tenant_name`` comes with ``init.sql``, or from the schema
+bootstrap (``shared.schema``) on databases created before it.
+"""
+
+import argparse
+import asyncio
+import uuid
+from typing import Optional, Sequence
+
+from sqlalchemy import Boolean, String, literal, select, true, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import Category, Tenant
+from shared.schema import new_id
+
+DEFAULT_CATEGORIES = [
+    # Expense Categories
+    {"name": "Food & Dining",   "type": "expense", "color": "#f97316", "icon": "utensils"},
+    {"name": "Transportation",  "type": "expense", "color": "#3b82f6", "icon": "car"},
+    {"name": "Shopping",        "type": "expense", "color": "#a855f7", "icon": "shopping"},
+    {"name": "Utilities",       "type": "expense", "color": "#10b981", "icon": "home"},
+    {"name": "Healthcare",      "type": "expense", "color": "#ef4444", "icon": "heart"},
+    {"name": "Entertainment",   "type": "expense", "color": "#ec4899", "icon": "film"},
+    {"name": "Other",           "type": "expense", "color": "#64748b", "icon": "folder"},
+
+    # Income Categories
+    {"name": "Salary",          "type": "income", "color": "#10b981", "icon": "briefcase"},
+    {"name": "Freelance",       "type": "income", "color": "#3b82f6", "icon": "trending-up"},
+    {"name": "Investments",     "type": "income", "color": "#8b5cf6", "icon": "trending-up"},
+    {"name": "Rental Income",   "type": "income", "color": "#f59e0b", "icon": "home"},
+    {"name": "Gifts",           "type": "income", "color": "#ec4899", "icon": "gift"},
+    {"name": "Other Income",    "type": "income", "color": "#64748b", "icon": "folder"},
+]
+
+
+def _seed_statement(dialect_name: str, tenant_ids: Optional[Sequence[uuid.UUID]]):
+    defaults = union_all(*[
+        select(
+            literal(cat["name"], String).label("name"),
+            literal(cat["type"], String).label("type"),
+            literal(cat["color"], String).label("color"),
+            literal(cat["icon"], String).label("icon"),
+        )
+        for cat in DEFAULT_CATEGORIES
+    ]).subquery("defaults")
+
+    rows = (
+        select(
+            new_id(dialect_name),
+            Tenant.id,
+            defaults.c.name,
+            defaults.c.type,
+            defaults.c.color,
+            defaults.c.icon,
+            literal(True, Boolean),
+        )
+        .select_from(Tenant)
+        .join(defaults, true())
+    )
+    # SQLite needs a WHERE to tell the upsert's ON CONFLICT from a join's ON
+    rows = rows.where(Tenant.id.in_(tenant_ids) if tenant_ids is not None else true())
+
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    return (
+        dialect_insert(Category)
+        .from_select(["id", "tenant_id", "name", "type", "color", "icon", "is_system"], rows, include_defaults=False)
+        .on_conflict_do_nothing(index_elements=["tenant_id", "name"])
+    )
+
+
+async def seed_default_categories(db: AsyncSession, tenant_ids: Optional[Sequence[uuid.UUID]] = None) -> int:
+    """
+    Add any missing default categories to ``tenant_ids`` (default: every
+    tenant) and return the number of rows inserted.  Does not commit.
+    """
+    if tenant_ids is not None and not tenant_ids:
+        return 0
+    result = await db.execute(_seed_statement(db.get_bind().dialect.name, tenant_ids))
+    return result.rowcount
+
+
+async def _backfill(tenant_id: Optional[str]):
+    from shared.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        count = await seed_default_categories(db, [uuid.UUID(tenant_id)] if tenant_id else None)
+        await db.commit()
+    print(f"Inserted {count} default categories")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed missing default categories for existing tenants.")
+    parser.add_argument("--tenant-id", help="Only seed this tenant (default: all tenants)")
+    args = parser.parse_args()
+    asyncio.run(_backfill(args.tenant_id))
@@ -1,7 +1,9 @@
 import re
+import uuid
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import text
+from sqlalchemy import select, text
 from shared.config import get_settings
 
 settings = get_settings()
@@ -42,3 +44,24 @@ async def set_tenant_context(session: AsyncSession, tenant_id: str):
 
 async def reset_tenant_context(session: AsyncSession):
     await session.execute(text("RESET app.current_tenant_id;"))
+
+async def for_each_tenant(fn, tenant_id: Optional[str] = None):
+    """
+    Run ``fn(db, tenant_id)`` for one tenant, or every tenant, each in its
+    own tenant-scoped session and transaction.  Yields ``(tenant_id, result)``
+    as each commits; for the maintenance CLIs.
+    """
+    from shared.models import Tenant
+
+    if tenant_id:
+        tenant_ids = [uuid.UUID(tenant_id)]
+    else:
+        async with AsyncSessionLocal() as db:
+            tenant_ids = (await db.execute(select(Tenant.id))).scalars().all()
+
+    for tid in tenant_ids:
+        async with AsyncSessionLocal() as db:
+            await set_tenant_context(db, str(tid))
+            result = await fn(db, tid)
+            await db.commit()
+        yield tid, result
@@ -0,0 +1,74 @@
+"""
+Bounding the size of chart series.
+
+Long ranges (5-10 years of daily points) are reduced server-side so the
+payload never exceeds what a chart can draw:
+
+* ``lttb`` -- Largest-Triangle-Three-Buckets over rows already in hand (the
+  net-worth trend).  Keeps the first and last point and, per bucket, the
+  point that best preserves the shape of the line, so peaks and dips
+  survive where an average would flatten them.
+* ``bucket_width`` -- the ``time_bucket`` width for hypertable queries
+  (``market_data``, ``investment_snapshots``), so the database aggregates to
+  at most ``max_points`` rows before anything is sent.
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_POINTS = 500
+MAX_POINTS = 5000
+# Fewer than three points leaves nothing between the kept endpoints
+MIN_POINTS = 3
+
+
+def lttb(points: Sequence[T], max_points: int, x: Callable[[T], float], y: Callable[[T], float]) -> List[T]:
+    """
+    Downsample ``points`` (ordered by ``x``) to at most ``max_points`` of
+    them, keeping the originals rather than synthesizing new ones.
+    """
+    n = len(points)
+    if max_points >= n or max_points < MIN_POINTS:
+        return list(points)
+
+    xs = [float(x(p)) for p in points]
+    ys = [float(y(p)) for p in points]
+    kept = [points[0]]
+    # The interior points are split into max_points - 2 buckets
+    every = (n - 2) / (max_points - 2)
+    a = 0
+    for i in range(max_points - 2):
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+
+        # Average of the next bucket (or the last point) is the third vertex
+        next_start, next_end = end, min(int(math.floor((i + 2) * every)) + 1, n)
+        if next_start >= n - 1:
+            next_start, next_end = n - 1, n
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(points[best])
+        a = best
+
+    kept.append(points[-1])
+    return kept
+
+
+def bucket_width(start: datetime, end: datetime, max_points: int, minimum: timedelta) -> timedelta:
+    """
+    The narrowest bucket, no finer than ``minimum`` (the native resolution of
+    the series), that splits ``start``..``end`` into at most ``max_points``.
+    """
+    span = max(end - start, timedelta(0))
+    seconds = math.ceil(span.total_seconds() / max(max_points, 1))
+    return max(timedelta(seconds=seconds), minimum)
@@ -0,0 +1,190 @@
+"""
+Cached exchange-rate lookups.
+
+``ExchangeRateResolver`` answers "how many ``to`` per one ``from`` on date D"
+from an in-process cache instead of querying ``exchange_rates`` on every
+write:
+
+- All rates of one rate date are loaded in a single query into a matrix.  A
+  pair that was not quoted directly is triangulated through USD (the daily
+  feed quotes everything against USD).
+- A date without rates falls back to the nearest earlier date that has them
+  (``MAX(date) WHERE date <= D``, served by ``idx_exchange_rates_date``).  If
+  one currency is missing from that date's matrix, its own latest quote on or
+  before D is used.
+- Matrices and date lookups live in small LRU maps.  The whole cache is
+  dropped when ``workers.tasks.update_exchange_rates`` publishes on
+  ``RATES_UPDATED_CHANNEL`` (see ``listen``), and after ``CACHE_TTL_SECONDS``
+  as a backstop in case a notification is missed.
+
+Unknown pairs raise ``ExchangeRateNotFound``; callers decide on a fallback.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+PIVOT_CURRENCY = "USD"
+RATES_UPDATED_CHANNEL = "exchange_rates:updated"
+
+MAX_CACHED_MATRICES = 400
+MAX_CACHED_DATE_LOOKUPS = 4096
+CACHE_TTL_SECONDS = 3600
+LISTEN_RETRY_SECONDS = 30
+
+_ONE = Decimal("1")
+
+
+class ExchangeRateNotFound(LookupError):
+    pass
+
+
+class RateMatrix:
+    """Every rate quoted on one date, with USD-relative values for triangulation."""
+
+    def __init__(self, rows):
+        self.direct: Dict[Tuple[str, str], Decimal] = {}
+        for base, target, rate in rows:
+            if rate:
+                self.direct[(base, target)] = Decimal(rate)
+
+        # Units of each currency per one USD, propagated along quoted pairs
+        self.per_pivot: Dict[str, Decimal] = {PIVOT_CURRENCY: _ONE}
+        changed = True
+        while changed:
+            changed = False
+            for (base, target), rate in self.direct.items():
+                if base in self.per_pivot and target not in self.per_pivot:
+                    self.per_pivot[target] = self.per_pivot[base] * rate
+                    changed = True
+                elif target in self.per_pivot and base not in self.per_pivot:
+                    self.per_pivot[base] = self.per_pivot[target] / rate
+                    changed = True
+
+    def rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        if (from_currency, to_currency) in self.direct:
+            return self.direct[(from_currency, to_currency)]
+        if (to_currency, from_currency) in self.direct:
+            return _ONE / self.direct[(to_currency, from_currency)]
+        if from_currency in self.per_pivot and to_currency in self.per_pivot:
+            return self.per_pivot[to_currency] / self.per_pivot[from_currency]
+        return None
+
+
+def _remember(cache: OrderedDict, key, value, limit: int):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+class ExchangeRateResolver:
+    def __init__(self):
+        self._matrices: "OrderedDict[date, RateMatrix]" = OrderedDict()
+        self._rate_dates: "OrderedDict[Tuple[date, Optional[str]], Optional[date]]" = OrderedDict()
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._matrices.clear()
+        self._rate_dates.clear()
+        self._loaded_at = time.monotonic()
+
+    def _expire(self):
+        if time.monotonic() - self._loaded_at > CACHE_TTL_SECONDS:
+            self.invalidate()
+
+    async def _rate_date(self, db: AsyncSession, on: date, currency: Optional[str] = None) -> Optional[date]:
+        """Latest rate date on or before ``on`` (quoting ``currency``, if given)."""
+        key = (on, currency)
+        if key in self._rate_dates:
+            self._rate_dates.move_to_end(key)
+            return self._rate_dates[key]
+
+        query = select(func.max(ExchangeRate.date)).where(ExchangeRate.date <= on)
+        if currency is not None:
+            query = query.where(or_(ExchangeRate.base_currency == currency, ExchangeRate.target_currency == currency))
+        rate_date = (await db.execute(query)).scalar()
+        _remember(self._rate_dates, key, rate_date, MAX_CACHED_DATE_LOOKUPS)
+        return rate_date
+
+    async def _matrix(self, db: AsyncSession, rate_date: date) -> RateMatrix:
+        matrix = self._matrices.get(rate_date)
+        if matrix is not None:
+            self._matrices.move_to_end(rate_date)
+            return matrix
+
+        result = await db.execute(
+            select(ExchangeRate.base_currency, ExchangeRate.target_currency, ExchangeRate.rate)
+            .where(ExchangeRate.date == rate_date)
+        )
+        matrix = RateMatrix(result.all())
+        _remember(self._matrices, rate_date, matrix, MAX_CACHED_MATRICES)
+        return matrix
+
+    async def _per_pivot(self, db: AsyncSession, currency: str, on: date) -> Optional[Decimal]:
+        if currency == PIVOT_CURRENCY:
+            return _ONE
+        rate_date = await self._rate_date(db, on, currency)
+        if rate_date is None:
+            return None
+        return (await self._matrix(db, rate_date)).per_pivot.get(currency)
+
+    async def rate(self, db: AsyncSession, from_currency: str, to_currency: str, on: Optional[date] = None) -> Decimal:
+        """Units of ``to_currency`` per one ``from_currency`` as of ``on`` (default: today)."""
+        if from_currency == to_currency:
+            return _ONE
+        if on is None:
+            on = date.today()
+        self._expire()
+
+        rate_date = await self._rate_date(db, on)
+        if rate_date is not None:
+            rate = (await self._matrix(db, rate_date)).rate(from_currency, to_currency)
+            if rate is not None:
+                return rate
+
+        # One side was not quoted on that date: use each currency's own latest quote
+        from_value = await self._per_pivot(db, from_currency, on)
+        to_value = await self._per_pivot(db, to_currency, on)
+        if from_value is None or to_value is None:
+            raise ExchangeRateNotFound(f"No exchange rate {from_currency}->{to_currency} on or before {on}")
+        return to_value / from_value
+
+    async def convert(self, db: AsyncSession, amount, from_currency: str, to_currency: str,
+                      on: Optional[date] = None) -> Decimal:
+        return Decimal(str(amount)) * await self.rate(db, from_currency, to_currency, on)
+
+    async def listen(self, redis_url: str):
+        """Drop the cache whenever new rates are published.  Runs until cancelled."""
+        while True:
+            client = aioredis.from_url(redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(RATES_UPDATED_CHANNEL)
+                    # Anything published while we were not subscribed was missed
+                    self.invalidate()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Exchange-rate invalidation listener failed: %s", e)
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+            finally:
+                await client.aclose()
+
+
+resolver = ExchangeRateResolver()
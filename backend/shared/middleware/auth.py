@@ -8,20 +8,10 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 security = HTTPBearer()
 
-async def auth_middleware(request: Request, call_next):
+def decode_bearer(auth_header) -> dict:
     """
-    Validate JWT token and extract user information
+    Validate a ``Bearer`` Authorization header and return its user claims
     """
-    # Allow OPTIONS requests for CORS preflight
-    if request.method in ["OPTIONS", "HEAD"]:
-        return await call_next(request)
-    
-    auth_header = request.headers.get("Authorization")
-    
-    public_paths = ["/docs", "/openapi.json", "/health", "/login", "/register", "/stocks"]
-    if any(request.url.path.startswith(path) for path in public_paths):
-        return await call_next(request)
-    
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,28 +26,42 @@ async def auth_middleware(request: Request, call_next):
             settings.SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        request.state.user = {
-            "user_id": payload.get("user_id"),
-            "tenant_id": payload.get("tenant_id"),
-            "email": payload.get("email"),
-            "role": payload.get("role")
-        }
     except JWTError as e:
         logger.error(f"JWT validation failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
+    return {
+        "user_id": payload.get("user_id"),
+        "tenant_id": payload.get("tenant_id"),
+        "email": payload.get("email"),
+        "role": payload.get("role")
+    }
+
+async def auth_middleware(request: Request, call_next):
+    """
+    Validate JWT token and extract user information
+    """
+    # Allow OPTIONS requests for CORS preflight
+    if request.method in ["OPTIONS", "HEAD"]:
+        return await call_next(request)
+    
+    auth_header = request.headers.get("Authorization")
+    
+    public_paths = ["/docs", "/openapi.json", "/health", "/login", "/register", "/stocks"]
+    if any(request.url.path.startswith(path) for path in public_paths):
+        return await call_next(request)
+    
+    request.state.user = decode_bearer(auth_header)
     
     return await call_next(request)
 
 def get_current_user(request: Request) -> dict:
     """
-    Dependency to get current user from request state
+    Dependency to get current user from request state, or from the
+    Authorization header in services that don't run auth_middleware
     """
     if not hasattr(request.state, "user"):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
-        )
+        request.state.user = decode_bearer(request.headers.get("Authorization"))
     return request.state.user
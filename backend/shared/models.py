@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, Date, TIMESTAMP, Text, DECIMAL, ARRAY, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Boolean, Date, TIMESTAMP, Text, DECIMAL, ARRAY, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -40,6 +40,9 @@ class User(Base):
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "name", name="uq_categories_tenant_name"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
@@ -294,6 +297,9 @@ class Currency(Base):
 
 class ExchangeRate(Base):
     __tablename__ = "exchange_rates"
+    __table_args__ = (
+        UniqueConstraint("base_currency", "target_currency", "date"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     base_currency = Column(String(3), ForeignKey('currencies.code'), nullable=False)
@@ -351,3 +357,98 @@ class Notification(Base):
     action_label = Column(String(100))
     action_href = Column(String(255))
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+
+class MonthlyCategoryRollup(Base):
+    """Per-user monthly totals of expenses (by category) and income (by source).
+
+    Maintained by ``shared.rollups`` on every expense/income write.
+    """
+    __tablename__ = "monthly_category_rollups"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    entry_type = Column(String(10), primary_key=True)  # 'expense', 'income'
+    month = Column(Date, primary_key=True)  # first day of the month
+    category_key = Column(String(64), primary_key=True)  # expense category id or income source; '' if none
+    currency = Column(String(3), primary_key=True)
+    total_amount = Column(DECIMAL(18, 2), nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    min_amount = Column(DECIMAL(15, 2))
+    max_amount = Column(DECIMAL(15, 2))
+    sum_of_squares = Column(DECIMAL(30, 4), nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RecurringSchedule(Base):
+    """Next due date of one recurring expense or income template.
+
+    Kept in sync with the templates by ``shared.recurring`` so that due items
+    are an index range scan on ``next_due_date``.  The template ids have no
+    foreign keys (``expenses`` and ``income`` are hypertables keyed on id and
+    date), so deleting a template drops its schedule explicitly.
+    """
+    __tablename__ = "recurring_schedules"
+    __table_args__ = (
+        CheckConstraint("(expense_id IS NULL) <> (income_id IS NULL)", name="ck_recurring_schedules_one_template"),
+        Index("idx_recurring_schedules_next_due", "next_due_date"),
+        Index("idx_recurring_schedules_user_created", "user_id", "created_at", "id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    expense_id = Column(UUID(as_uuid=True), unique=True)
+    income_id = Column(UUID(as_uuid=True), unique=True)
+    frequency = Column(String(20), nullable=False)  # daily, weekly, monthly, yearly
+    next_due_date = Column(Date, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    expense = relationship("Expense", primaryjoin="foreign(RecurringSchedule.expense_id) == Expense.id", viewonly=True)
+    income = relationship("Income", primaryjoin="foreign(RecurringSchedule.income_id) == Income.id", viewonly=True)
+
+
+class ExpenseAnomaly(Base):
+    """An expense flagged as unusually large for its category.
+
+    Written by ``shared.anomalies`` when the expense is created, updated or
+    imported; only flagged expenses have a row.  ``expense_id`` has no
+    foreign key (``expenses`` is a hypertable keyed on id and date), so
+    deleting an expense drops its flag explicitly.
+    """
+    __tablename__ = "expense_anomalies"
+
+    expense_id = Column(UUID(as_uuid=True), primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    category_key = Column(String(64), nullable=False)
+    transaction_date = Column(Date, nullable=False)
+    amount = Column(DECIMAL(15, 2), nullable=False)
+    baseline_count = Column(Integer, nullable=False)
+    baseline_mean = Column(DECIMAL(15, 2), nullable=False)
+    baseline_std = Column(DECIMAL(15, 2), nullable=False)
+    score = Column(Float, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+
+class ImportJob(Base):
+    """Progress of one bank statement import; ``rows_processed`` is the resume checkpoint."""
+    __tablename__ = "import_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    filename = Column(String(255))
+    file_size = Column(Integer)
+    currency = Column(String(3), nullable=False)
+    statement_format = Column(String(20))  # layout name from services/finance/statement_formats.py
+    status = Column(String(20), nullable=False, default='running')  # running, completed, failed
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    rejection_counts = Column(JSONB, default=dict)
+    error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+    completed_at = Column(TIMESTAMP(timezone=True))
@@ -0,0 +1,283 @@
+"""
+Net-worth balance sheet computed in the database.
+
+A balance sheet is one statement: per-user CTEs over ``investments``,
+``lendings``, ``borrowings``, open ``emi_payments`` (joined to ``emis``),
+``income`` and ``expenses``, left-joined onto the users in scope and folded
+into the ``net_worth_snapshots`` columns:
+
+* assets -- investments at their current value (falling back to
+  ``quantity * price``), open lendings still to be received, and a cash
+  balance of lifetime income minus lifetime expenses (never below zero);
+* liabilities -- open borrowings still owed and the unpaid principal of
+  active EMIs;
+* this month's income, the savings rate and the debt-to-income ratio.
+
+The finance service runs ``user_balance_sheet`` on
+``POST /net-worth/snapshot``.  The nightly ``snapshot_net_worth`` worker task
+feeds ``tenant_balance_sheets`` straight into ``INSERT ... SELECT``
+(``snapshot_statement``) one batch of tenants at a time, so every active
+user gets a daily snapshot without clicking anything.
+
+Tables are declared here as lightweight ``table()`` constructs rather than
+imported from ``shared.models``, which would drag in the async engine; the
+workers run these statements on their own sync engine.
+"""
+
+import uuid
+from datetime import date
+from typing import Sequence
+
+from sqlalchemy import (
+    Boolean, Date, Integer, Numeric, String, Uuid, case, cast, column, exists,
+    func, literal, literal_column, or_, select, table,
+)
+from sqlalchemy.sql import Insert, Select
+
+from shared.schema import new_id
+
+# DECIMAL(5, 2) in net_worth_snapshots
+MAX_RATIO = 999.99
+
+_tenants = table("tenants", column("id", Uuid), column("is_active", Boolean))
+_users = table("users", column("id", Uuid), column("tenant_id", Uuid), column("is_active", Boolean))
+_investments = table(
+    "investments",
+    column("user_id", Uuid), column("tenant_id", Uuid), column("quantity", Numeric),
+    column("purchase_price", Numeric), column("current_price", Numeric), column("current_value", Numeric),
+)
+_borrowings = table(
+    "borrowings",
+    column("user_id", Uuid), column("tenant_id", Uuid), column("status", String),
+    column("principal_amount", Numeric), column("total_repaid", Numeric), column("remaining_amount", Numeric),
+)
+_lendings = table(
+    "lendings",
+    column("user_id", Uuid), column("tenant_id", Uuid), column("status", String),
+    column("principal_amount", Numeric), column("total_received", Numeric), column("remaining_amount", Numeric),
+)
+_emis = table(
+    "emis",
+    column("id", Uuid), column("user_id", Uuid), column("tenant_id", Uuid), column("status", String),
+)
+_emi_payments = table(
+    "emi_payments",
+    column("emi_id", Uuid), column("status", String), column("principal_component", Numeric),
+)
+_income = table(
+    "income",
+    column("user_id", Uuid), column("tenant_id", Uuid), column("amount", Numeric), column("income_date", Date),
+)
+_expenses = table(
+    "expenses",
+    column("user_id", Uuid), column("tenant_id", Uuid), column("amount", Numeric), column("transaction_date", Date),
+)
+_snapshots = table(
+    "net_worth_snapshots",
+    *(column(name, Uuid) for name in ("id", "tenant_id", "user_id")),
+    column("snapshot_date", Date),
+    *(column(name, Numeric) for name in (
+        "investment_value", "lendings_outstanding", "cash_balance", "income_monthly", "other_assets",
+        "borrowings_owed", "emi_remaining", "credit_card_debt", "other_liabilities",
+        "total_assets", "total_liabilities", "net_worth", "savings_rate", "debt_to_income_ratio",
+    )),
+    column("health_score", Integer),
+)
+
+# Snapshot columns a balance sheet selects, in order
+SHEET_COLUMNS = (
+    "tenant_id", "user_id",
+    "investment_value", "lendings_outstanding", "cash_balance", "income_monthly", "other_assets",
+    "borrowings_owed", "emi_remaining", "credit_card_debt", "other_liabilities",
+    "total_assets", "total_liabilities", "net_worth", "health_score", "savings_rate", "debt_to_income_ratio",
+)
+
+
+def _zero(expr):
+    return func.coalesce(expr, 0)
+
+
+def _at_least_zero(expr):
+    return case((expr > 0, expr), else_=0)
+
+
+def _ratio(numerator, denominator):
+    """``numerator / max(denominator, 1)`` as a percentage, clamped to the column."""
+    value = numerator * 100.0 / case((denominator > 1, denominator), else_=1)
+    return case((value > MAX_RATIO, MAX_RATIO), (value < -MAX_RATIO, -MAX_RATIO), else_=value)
+
+
+def _open(status_column):
+    return func.coalesce(status_column, "open") != "closed"
+
+
+def _balance_sheet(today: date, owners, in_scope) -> Select:
+    """
+    One row of ``SHEET_COLUMNS`` per row of ``owners`` (``tenant_id``,
+    ``user_id``); ``in_scope(table)`` limits the source rows aggregated.
+    """
+    month_start = today.replace(day=1)
+
+    investments = (
+        select(
+            _investments.c.user_id,
+            func.sum(func.coalesce(
+                _investments.c.current_value,
+                _investments.c.quantity * func.coalesce(_investments.c.current_price, _investments.c.purchase_price),
+            )).label("value"),
+        )
+        .where(in_scope(_investments))
+        .group_by(_investments.c.user_id)
+        .cte("investment_totals")
+    )
+    lendings = (
+        select(
+            _lendings.c.user_id,
+            func.sum(func.coalesce(
+                _lendings.c.remaining_amount,
+                _lendings.c.principal_amount - _zero(_lendings.c.total_received),
+            )).label("outstanding"),
+        )
+        .where(in_scope(_lendings), _open(_lendings.c.status))
+        .group_by(_lendings.c.user_id)
+        .cte("lending_totals")
+    )
+    borrowings = (
+        select(
+            _borrowings.c.user_id,
+            func.sum(func.coalesce(
+                _borrowings.c.remaining_amount,
+                _borrowings.c.principal_amount - _zero(_borrowings.c.total_repaid),
+            )).label("owed"),
+        )
+        .where(in_scope(_borrowings), _open(_borrowings.c.status))
+        .group_by(_borrowings.c.user_id)
+        .cte("borrowing_totals")
+    )
+    emis = (
+        select(_emis.c.user_id, func.sum(_emi_payments.c.principal_component).label("remaining"))
+        .select_from(_emis.join(_emi_payments, _emi_payments.c.emi_id == _emis.c.id))
+        .where(
+            in_scope(_emis),
+            _emis.c.status == "active",
+            or_(_emi_payments.c.status.is_(None), _emi_payments.c.status != "paid"),
+        )
+        .group_by(_emis.c.user_id)
+        .cte("emi_totals")
+    )
+    income = (
+        select(
+            _income.c.user_id,
+            func.sum(_income.c.amount).label("lifetime"),
+            func.sum(case((_income.c.income_date >= month_start, _income.c.amount))).label("monthly"),
+        )
+        .where(in_scope(_income))
+        .group_by(_income.c.user_id)
+        .cte("income_totals")
+    )
+    expenses = (
+        select(
+            _expenses.c.user_id,
+            func.sum(_expenses.c.amount).label("lifetime"),
+            func.sum(case((_expenses.c.transaction_date >= month_start, _expenses.c.amount))).label("monthly"),
+        )
+        .where(in_scope(_expenses))
+        .group_by(_expenses.c.user_id)
+        .cte("expense_totals")
+    )
+
+    parts = (
+        select(
+            owners.c.tenant_id,
+            owners.c.user_id,
+            _zero(investments.c.value).label("investment_value"),
+            _zero(lendings.c.outstanding).label("lendings_outstanding"),
+            _at_least_zero(_zero(income.c.lifetime) - _zero(expenses.c.lifetime)).label("cash_balance"),
+            _zero(income.c.monthly).label("income_monthly"),
+            _zero(expenses.c.monthly).label("expenses_monthly"),
+            _zero(borrowings.c.owed).label("borrowings_owed"),
+            _zero(emis.c.remaining).label("emi_remaining"),
+        )
+        .select_from(
+            owners
+            .outerjoin(investments, investments.c.user_id == owners.c.user_id)
+            .outerjoin(lendings, lendings.c.user_id == owners.c.user_id)
+            .outerjoin(borrowings, borrowings.c.user_id == owners.c.user_id)
+            .outerjoin(emis, emis.c.user_id == owners.c.user_id)
+            .outerjoin(income, income.c.user_id == owners.c.user_id)
+            .outerjoin(expenses, expenses.c.user_id == owners.c.user_id)
+        )
+        .cte("balance_parts")
+    )
+
+    p = parts.c
+    total_assets = p.investment_value + p.lendings_outstanding + p.cash_balance
+    total_liabilities = p.borrowings_owed + p.emi_remaining
+    return select(
+        p.tenant_id,
+        p.user_id,
+        p.investment_value,
+        p.lendings_outstanding,
+        p.cash_balance,
+        p.income_monthly,
+        literal_column("0").label("other_assets"),
+        p.borrowings_owed,
+        p.emi_remaining,
+        literal_column("0").label("credit_card_debt"),
+        literal_column("0").label("other_liabilities"),
+        total_assets.label("total_assets"),
+        total_liabilities.label("total_liabilities"),
+        (total_assets - total_liabilities).label("net_worth"),
+        literal_column("0").label("health_score"),
+        _ratio(p.income_monthly - p.expenses_monthly, p.income_monthly).label("savings_rate"),
+        _ratio(total_liabilities, p.income_monthly).label("debt_to_income_ratio"),
+    )
+
+
+def user_balance_sheet(today: date, tenant_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    """The balance sheet of one user, as a single row."""
+    owner = select(
+        literal(tenant_id, Uuid).label("tenant_id"),
+        literal(user_id, Uuid).label("user_id"),
+    ).subquery("owner")
+    return _balance_sheet(today, owner, lambda t: t.c.user_id == user_id)
+
+
+def tenant_balance_sheets(today: date, tenant_ids: Sequence[uuid.UUID]) -> Select:
+    """The balance sheets of every active user of ``tenant_ids``."""
+    owners = (
+        select(_users.c.tenant_id, _users.c.id.label("user_id"))
+        .where(_users.c.tenant_id.in_(tenant_ids), _users.c.is_active.is_not(False))
+        .subquery("owners")
+    )
+    return _balance_sheet(today, owners, lambda t: t.c.tenant_id.in_(tenant_ids))
+
+
+def snapshot_statement(dialect_name: str, today: date, tenant_ids: Sequence[uuid.UUID]) -> Insert:
+    """
+    ``INSERT ... SELECT`` today's snapshot for every active user of
+    ``tenant_ids`` that has none yet, returning their ``user_id``.
+    """
+    sheet = tenant_balance_sheets(today, tenant_ids).subquery("sheet")
+    already_taken = exists().where(
+        _snapshots.c.user_id == sheet.c.user_id,
+        _snapshots.c.snapshot_date == today,
+    )
+    snapshot_date = literal(today, Date)
+    if dialect_name == "postgresql":
+        # An untyped parameter in the select list would be taken as text
+        snapshot_date = cast(snapshot_date, Date)
+    rows = select(
+        new_id(dialect_name),
+        snapshot_date,
+        *(sheet.c[name] for name in SHEET_COLUMNS),
+    ).where(~already_taken)
+    return (
+        _snapshots.insert()
+        .from_select(["id", "snapshot_date", *SHEET_COLUMNS], rows)
+        .returning(_snapshots.c.user_id)
+    )
+
+
+def active_tenant_ids() -> Select:
+    return select(_tenants.c.id).where(_tenants.c.is_active.is_not(False)).order_by(_tenants.c.id)
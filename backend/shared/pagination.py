@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered newest first by ``(sort_column, id)`` and the next page is
+selected with a row comparison against the last row returned, so fetching
+page N costs the same index range scan as page 1 — unlike OFFSET, which has
+to walk and discard every earlier row.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the last row's
+sort value and id.  The cursor for the following page is returned in the
+``X-Next-Cursor`` response header so list bodies keep their existing shape.
+"""
+
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SortValue = Union[date, datetime]
+
+
+def encode_cursor(sort_value: SortValue, row_id: uuid.UUID) -> str:
+    kind = "t" if isinstance(sort_value, datetime) else "d"
+    payload = json.dumps([kind, sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[SortValue, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = datetime.fromisoformat(value) if kind == "t" else date.fromisoformat(value)
+        return sort_value, uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of ``query`` ordered by ``(sort_column, id_column)`` descending.
+
+    Returns the rows and the cursor for the next page (``None`` on the last page).
+    ``query`` must not already carry an ORDER BY or LIMIT.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+
+    query = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    rows = list(result.scalars().unique().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,135 @@
+"""
+Fleet-wide rate limits for the upstream market-data providers.
+
+Quotes, profiles and candles come from Finnhub, Yahoo Finance and Alpha
+Vantage, whose free tiers allow a fixed number of calls per key and minute
+however many stock workers and investment service replicas share the key.
+Each provider has one token bucket in Redis (``ratelimit:<provider>``):
+``capacity`` tokens refilled evenly over ``per_seconds``, taken by a Lua
+script so check-and-take is atomic across processes and timed by the Redis
+clock rather than each host's.
+
+``acquire`` takes a token and returns ``0.0``, or takes nothing and returns
+the seconds until one is available -- the stock workers requeue the task with
+that countdown, the market-data ingestion waits for it, the investment
+service waits briefly or answers with a ``retry_after``.  Limits can be overridden per provider with
+``RATE_LIMIT_<PROVIDER>=<capacity>/<seconds>`` (e.g.
+``RATE_LIMIT_FINNHUB=60/60``).  If Redis errors the call is let through, as
+caching is without Redis.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, NamedTuple, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+FINNHUB = "finnhub"
+YAHOO = "yahoo"
+ALPHA_VANTAGE = "alpha_vantage"
+
+
+class Limit(NamedTuple):
+    capacity: int
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.capacity / self.per_seconds
+
+
+# Free-tier quotas; Yahoo publishes none, this keeps the old 2 s spacing on average
+DEFAULT_LIMITS: Dict[str, Limit] = {
+    FINNHUB: Limit(60, 60),
+    YAHOO: Limit(30, 60),
+    ALPHA_VANTAGE: Limit(5, 60),
+}
+
+# KEYS[1]: bucket; ARGV: capacity, refill rate (tokens/s).  Returns the wait
+# in seconds as a string (Lua numbers come back truncated to integers).
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+def limit_for(provider: str) -> Limit:
+    value = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if value:
+        try:
+            capacity, seconds = value.split("/")
+            return Limit(int(capacity), float(seconds))
+        except ValueError:
+            logger.warning("Ignoring malformed RATE_LIMIT_%s=%r", provider.upper(), value)
+    return DEFAULT_LIMITS[provider]
+
+
+def _key(provider: str) -> str:
+    return f"ratelimit:{provider}"
+
+
+class TokenBucket:
+    """Blocking-client buckets, for the Celery workers."""
+
+    def __init__(self, client: redis.Redis):
+        self._script = client.register_script(TOKEN_BUCKET_LUA)
+
+    def acquire(self, provider: str) -> float:
+        """Take one ``provider`` token: ``0.0``, or the seconds until one is available."""
+        limit = limit_for(provider)
+        try:
+            return float(self._script(keys=[_key(provider)], args=[limit.capacity, limit.rate]))
+        except redis.RedisError as e:
+            logger.warning("Rate limiter unavailable, letting %s call through: %s", provider, e)
+            return 0.0
+
+
+class AsyncTokenBucket:
+    """asyncio-client buckets, for the services."""
+
+    def __init__(self, client: Optional[aioredis.Redis] = None):
+        self._script = client.register_script(TOKEN_BUCKET_LUA) if client is not None else None
+
+    async def acquire(self, provider: str) -> float:
+        """Take one ``provider`` token: ``0.0``, or the seconds until one is available."""
+        if self._script is None:
+            return 0.0
+        limit = limit_for(provider)
+        try:
+            return float(await self._script(keys=[_key(provider)], args=[limit.capacity, limit.rate]))
+        except redis.RedisError as e:
+            logger.warning("Rate limiter unavailable, letting %s call through: %s", provider, e)
+            return 0.0
+
+    async def wait(self, provider: str, max_wait: float) -> float:
+        """
+        Take one ``provider`` token, sleeping up to ``max_wait`` seconds for
+        it.  Returns ``0.0`` once taken, or the seconds still to wait.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while True:
+            wait = await self.acquire(provider)
+            if wait == 0 or loop.time() + wait > deadline:
+                return wait
+            await asyncio.sleep(wait)
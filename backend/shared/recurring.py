@@ -0,0 +1,158 @@
+"""
+The recurring-schedule index.
+
+Recurring templates keep their due date where the rest of the code reads it
+-- ``recurring_config->>'next_due_date'`` on expenses and ``income_date`` on
+income -- but neither can be range-scanned: the first is a JSONB cast and the
+second shares the table with every non-recurring entry.
+``recurring_schedules`` holds one row per template with its frequency and
+next due date under a B-tree, so the daily worker and ``GET /recurring`` read
+a few index entries however large ``expenses`` and ``income`` grow.
+
+The finance service syncs the schedule in the same transaction as every
+template write and drops it with the template (there is no foreign key to
+cascade: both template tables are hypertables keyed on id and date); the
+recurring transactions worker advances it with plain SQL (see
+``workers/tasks.py``).  Backfill existing templates, or repair a tenant,
+with::
+
+    python -m shared.recurring [--tenant-id <uuid>]
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import Expense, Income, RecurringSchedule
+
+# The worker falls back to monthly for expense templates without one
+DEFAULT_FREQUENCY = "monthly"
+
+REBUILD_BATCH_SIZE = 1000
+
+
+class Schedule(NamedTuple):
+    frequency: str
+    next_due_date: date
+
+
+def expense_schedule(expense: Expense) -> Optional[Schedule]:
+    """The schedule of a recurring expense template, or ``None`` if it has none."""
+    config = expense.recurring_config or {}
+    if not expense.is_recurring or not config.get("next_due_date"):
+        return None
+    return Schedule(config.get("frequency") or DEFAULT_FREQUENCY, date.fromisoformat(config["next_due_date"][:10]))
+
+
+def income_schedule(income: Income) -> Optional[Schedule]:
+    """The schedule of a recurring income template, or ``None`` if it has none."""
+    if not income.is_recurring or not income.recurrence_period:
+        return None
+    return Schedule(income.recurrence_period, income.income_date)
+
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+async def _sync(db: AsyncSession, model, template_column, template, schedule: Optional[Schedule]):
+    if schedule is None:
+        await db.execute(delete(RecurringSchedule).where(template_column == template.id))
+        return
+    dialect_insert = postgresql.insert if _dialect(db) == "postgresql" else sqlite.insert
+    stmt = dialect_insert(RecurringSchedule).values(
+        id=uuid.uuid4(),
+        tenant_id=template.tenant_id,
+        user_id=template.user_id,
+        frequency=schedule.frequency,
+        next_due_date=schedule.next_due_date,
+        # Pages of GET /recurring keep the template's creation order
+        created_at=select(model.created_at).where(model.id == template.id).scalar_subquery(),
+        **{template_column.key: template.id},
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[template_column.key],
+        set_={
+            "frequency": stmt.excluded.frequency,
+            "next_due_date": stmt.excluded.next_due_date,
+            "updated_at": func.now(),
+        },
+    ))
+
+
+async def sync_expense(db: AsyncSession, expense: Expense):
+    """Create, move or drop the schedule of ``expense`` (flushed) to match it."""
+    await _sync(db, Expense, RecurringSchedule.expense_id, expense, expense_schedule(expense))
+
+
+async def sync_income(db: AsyncSession, income: Income):
+    """Create, move or drop the schedule of ``income`` (flushed) to match it."""
+    await _sync(db, Income, RecurringSchedule.income_id, income, income_schedule(income))
+
+
+async def drop_expense(db: AsyncSession, expense_id: uuid.UUID):
+    """Drop the schedule of a deleted expense template."""
+    await db.execute(delete(RecurringSchedule).where(RecurringSchedule.expense_id == expense_id))
+
+
+async def drop_income(db: AsyncSession, income_id: uuid.UUID):
+    """Drop the schedule of a deleted income template."""
+    await db.execute(delete(RecurringSchedule).where(RecurringSchedule.income_id == income_id))
+
+
+# ── Rebuild ───────────────────────────────────────────────────────────────
+
+async def rebuild_tenant(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Recompute every schedule row of one tenant from its templates."""
+    await db.execute(delete(RecurringSchedule).where(RecurringSchedule.tenant_id == tenant_id))
+
+    expenses = await db.execute(
+        select(Expense).where(Expense.tenant_id == tenant_id, Expense.is_recurring == True)
+    )
+    incomes = await db.execute(
+        select(Income).where(Income.tenant_id == tenant_id, Income.is_recurring == True)
+    )
+    rows = []
+    for column, templates, schedule_of in [
+        ("expense_id", expenses.scalars().all(), expense_schedule),
+        ("income_id", incomes.scalars().all(), income_schedule),
+    ]:
+        for template in templates:
+            schedule = schedule_of(template)
+            if schedule is None:
+                continue
+            rows.append({
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "user_id": template.user_id,
+                "expense_id": None,
+                "income_id": None,
+                column: template.id,
+                "frequency": schedule.frequency,
+                "next_due_date": schedule.next_due_date,
+                "created_at": template.created_at,
+            })
+
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        await db.execute(insert(RecurringSchedule), rows[start:start + REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+async def _rebuild(tenant_id: Optional[str]):
+    from shared.database import for_each_tenant
+
+    async for tid, count in for_each_tenant(rebuild_tenant, tenant_id):
+        print(f"Rebuilt {count} recurring schedules for tenant {tid}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild recurring_schedules from recurring templates.")
+    parser.add_argument("--tenant-id", help="Only rebuild this tenant (default: all tenants)")
+    args = parser.parse_args()
+    asyncio.run(_rebuild(args.tenant_id))
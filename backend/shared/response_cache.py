@@ -0,0 +1,183 @@
+"""
+Redis cache for read-heavy, recompute-from-scratch endpoints.
+
+``cached_response`` stores an endpoint's JSON-encoded result in Redis, keyed
+by endpoint, user, query string and the user's current data versions for the
+endpoint's tags (``shared.versioning``).  Write endpoints already bump those
+versions, so a write makes every dependent entry unreachable at once; the old
+entries simply age out through ``ttl``::
+
+    @app.get("/anomalies")
+    @cached_response("anomalies", tags=(EXPENSES, CATEGORIES), daily=True)
+    async def detect_anomalies(request: Request, ...):
+
+The endpoint must take ``request: Request``.  Cached results are returned as
+a raw JSON ``Response``, so ``response_model`` is not applied to them; the
+endpoint should already return that shape.
+
+Stampedes are damped twice: concurrent misses for one key in a process share
+a single computation, and across replicas only the holder of a short Redis
+lock computes while the others poll for its result (for up to
+``LOCK_WAIT_SECONDS``, then compute anyway).
+
+Per-endpoint hit/miss/coalesced/error counters are kept in process and
+served by ``/health/cache`` for monitoring.  Without Redis (``connect`` not
+called, versions unavailable, or Redis erroring) endpoints run uncached.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+import redis.asyncio as aioredis
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from shared.versioning import versions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600
+LOCK_TTL_MS = 10_000
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+
+
+class ResponseCache:
+    def __init__(self):
+        self._redis: Optional[aioredis.Redis] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats: Dict[str, Counter] = defaultdict(Counter)
+
+    def connect(self, redis_url: str):
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(counts) for name, counts in self.stats.items()}
+
+    async def _key(self, name: str, request: Request, tags: Sequence[str], daily: bool) -> Optional[str]:
+        user = getattr(request.state, "user", None)
+        if not user:
+            return None
+        tag_versions = await versions.current(user["user_id"], tags) if tags else []
+        if tag_versions is None:
+            return None
+        parts = [request.url.query, *(f"{tag}={v}" for tag, v in zip(tags, tag_versions))]
+        if daily:
+            parts.append(date.today().isoformat())
+        digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()[:20]
+        return f"respcache:{name}:{user['user_id']}:{digest}"
+
+    async def _await_peer(self, key: str) -> Optional[str]:
+        """Poll for a result another replica is computing under the lock."""
+        waited = 0.0
+        while waited < LOCK_WAIT_SECONDS:
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            waited += LOCK_POLL_SECONDS
+            payload = await self._redis.get(key)
+            if payload is not None:
+                return payload
+        return None
+
+    async def _compute(self, name: str, key: str, ttl: int, compute) -> str:
+        lock = f"{key}:lock"
+        locked = False
+        try:
+            locked = await self._redis.set(lock, "1", nx=True, px=LOCK_TTL_MS)
+            if not locked:
+                payload = await self._await_peer(key)
+                if payload is not None:
+                    self.stats[name]["coalesced"] += 1
+                    return payload
+        except Exception as e:
+            self.stats[name]["errors"] += 1
+            logger.warning("Response cache lock failed for %s: %s", name, e)
+
+        self.stats[name]["misses"] += 1
+        payload = None
+        try:
+            payload = json.dumps(jsonable_encoder(await compute()))
+        finally:
+            try:
+                if payload is not None:
+                    await self._redis.set(key, payload, ex=ttl)
+                if locked:
+                    await self._redis.delete(lock)
+            except Exception as e:
+                self.stats[name]["errors"] += 1
+                logger.warning("Response cache write failed for %s: %s", name, e)
+        return payload
+
+    def _response(self, request: Request, payload: str) -> Response:
+        # Headers set by dependencies (the conditional-GET ETag) are not
+        # merged into a returned Response, so carry them over here
+        headers = getattr(request.state, "version_headers", None)
+        return Response(content=payload, media_type="application/json", headers=headers)
+
+    async def fetch(self, name: str, request: Request, tags: Sequence[str], daily: bool, ttl: int, compute):
+        if self._redis is None:
+            return await compute()
+        key = payload = None
+        try:
+            key = await self._key(name, request, tags, daily)
+            if key is not None:
+                payload = await self._redis.get(key)
+        except Exception as e:
+            self.stats[name]["errors"] += 1
+            logger.warning("Response cache read failed for %s: %s", name, e)
+            key = None
+        if key is None:
+            return await compute()
+
+        if payload is not None:
+            self.stats[name]["hits"] += 1
+            return self._response(request, payload)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats[name]["coalesced"] += 1
+            return self._response(request, await asyncio.shield(inflight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await self._compute(name, key, ttl, compute)
+            future.set_result(payload)
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        return self._response(request, payload)
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(name: str, tags: Sequence[str] = (), daily: bool = False, ttl: int = DEFAULT_TTL_SECONDS):
+    """
+    Cache an endpoint's result per user and query string until one of the
+    user's ``tags`` changes (or ``ttl`` passes).  ``daily`` also keys on
+    today's date, for results relative to today.
+    """
+    def decorate(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request = kwargs["request"]
+            return await response_cache.fetch(
+                name, request, tuple(tags), daily, ttl, lambda: endpoint(*args, **kwargs)
+            )
+        return wrapper
+    return decorate
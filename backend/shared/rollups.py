@@ -0,0 +1,300 @@
+"""
+Incrementally maintained monthly category rollups.
+
+``monthly_category_rollups`` keeps, per (tenant, user, entry type, month,
+category, currency), the sum, count, min, max and sum of squares of the raw
+amounts in ``expenses`` (keyed by category id) and ``income`` (keyed by
+source).  The finance service applies the matching delta here in the same
+transaction as every expense/income write, so reports can read a few rollup
+rows instead of re-scanning a user's whole history.  The recurring
+transactions worker refreshes the groups it touches with plain SQL (see
+``workers/tasks.py``).
+
+Backfill existing data, or repair a tenant, with::
+
+    python -m shared.rollups [--tenant-id <uuid>]
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, update, delete, insert, func, case, and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import MonthlyCategoryRollup, Expense, Income
+
+EXPENSE = "expense"
+INCOME = "income"
+
+REBUILD_BATCH_SIZE = 1000
+
+_KEY_COLUMNS = ("entry_type", "tenant_id", "user_id", "month", "category_key", "currency")
+
+
+class RollupEntry(NamedTuple):
+    """One expense or income row as seen by the rollup."""
+    entry_type: str
+    tenant_id: uuid.UUID
+    user_id: uuid.UUID
+    month: date
+    category_key: str
+    currency: str
+    amount: Decimal
+
+
+def expense_entry(expense: Expense) -> RollupEntry:
+    return RollupEntry(
+        EXPENSE,
+        expense.tenant_id,
+        expense.user_id,
+        expense.transaction_date.replace(day=1),
+        str(expense.category_id) if expense.category_id else "",
+        expense.currency,
+        Decimal(str(expense.amount)),
+    )
+
+
+def income_entry(income: Income) -> RollupEntry:
+    return RollupEntry(
+        INCOME,
+        income.tenant_id,
+        income.user_id,
+        income.income_date.replace(day=1),
+        income.source,
+        income.currency,
+        Decimal(str(income.amount)),
+    )
+
+
+def month_after(month: date) -> date:
+    return date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+
+
+# ── Statement builders ────────────────────────────────────────────────────
+
+def _fold(entries: Iterable[RollupEntry]) -> List[dict]:
+    """Collapse entries into one upsert row per rollup key."""
+    groups: Dict[Tuple, dict] = {}
+    for entry in entries:
+        key = entry[:6]
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                **dict(zip(_KEY_COLUMNS, key)),
+                "total_amount": entry.amount,
+                "entry_count": 1,
+                "min_amount": entry.amount,
+                "max_amount": entry.amount,
+                "sum_of_squares": entry.amount * entry.amount,
+            }
+        else:
+            group["total_amount"] += entry.amount
+            group["entry_count"] += 1
+            group["min_amount"] = min(group["min_amount"], entry.amount)
+            group["max_amount"] = max(group["max_amount"], entry.amount)
+            group["sum_of_squares"] += entry.amount * entry.amount
+    return list(groups.values())
+
+
+def _upsert(dialect_name: str, rows: List[dict]):
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(MonthlyCategoryRollup).values(rows)
+    current, new = MonthlyCategoryRollup.__table__.c, stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEY_COLUMNS),
+        set_={
+            "total_amount": current.total_amount + new.total_amount,
+            "entry_count": current.entry_count + new.entry_count,
+            "sum_of_squares": current.sum_of_squares + new.sum_of_squares,
+            "min_amount": case((new.min_amount < current.min_amount, new.min_amount), else_=current.min_amount),
+            "max_amount": case((new.max_amount > current.max_amount, new.max_amount), else_=current.max_amount),
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _key_filter(entry: RollupEntry):
+    return and_(*(getattr(MonthlyCategoryRollup, column) == value for column, value in zip(_KEY_COLUMNS, entry)))
+
+
+def _decrement(entry: RollupEntry):
+    return (
+        update(MonthlyCategoryRollup)
+        .where(_key_filter(entry))
+        .values(
+            total_amount=MonthlyCategoryRollup.total_amount - entry.amount,
+            entry_count=MonthlyCategoryRollup.entry_count - 1,
+            sum_of_squares=MonthlyCategoryRollup.sum_of_squares - entry.amount * entry.amount,
+            updated_at=func.now(),
+        )
+        .returning(MonthlyCategoryRollup.entry_count, MonthlyCategoryRollup.min_amount, MonthlyCategoryRollup.max_amount)
+    )
+
+
+def _source_bounds(entry: RollupEntry):
+    """MIN/MAX of the raw rows still in ``entry``'s group."""
+    if entry.entry_type == EXPENSE:
+        model, date_column = Expense, Expense.transaction_date
+        category = (
+            Expense.category_id.is_(None) if not entry.category_key
+            else Expense.category_id == uuid.UUID(entry.category_key)
+        )
+    else:
+        model, date_column = Income, Income.income_date
+        category = Income.source == entry.category_key
+    return select(func.min(model.amount), func.max(model.amount)).where(
+        model.user_id == entry.user_id,
+        date_column >= entry.month,
+        date_column < month_after(entry.month),
+        category,
+        model.currency == entry.currency,
+    )
+
+
+def _set_bounds(entry: RollupEntry, low, high):
+    return update(MonthlyCategoryRollup).where(_key_filter(entry)).values(min_amount=low, max_amount=high)
+
+
+def _needs_new_bounds(entry: RollupEntry, row) -> bool:
+    return entry.amount <= row.min_amount or entry.amount >= row.max_amount
+
+
+# ── Incremental maintenance ───────────────────────────────────────────────
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+async def add_entries(db: AsyncSession, entries: Iterable[RollupEntry]):
+    rows = _fold(entries)
+    if rows:
+        await db.execute(_upsert(_dialect(db), rows))
+
+
+async def add_entry(db: AsyncSession, entry: RollupEntry):
+    await add_entries(db, [entry])
+
+
+async def remove_entry(db: AsyncSession, entry: RollupEntry):
+    """
+    Take ``entry`` out of its group.  The source row must already be deleted
+    or changed (and flushed) so that MIN/MAX can be recomputed without it.
+    """
+    row = (await db.execute(_decrement(entry))).first()
+    if row is None:
+        return
+    if row.entry_count <= 0:
+        await db.execute(delete(MonthlyCategoryRollup).where(_key_filter(entry)))
+    elif _needs_new_bounds(entry, row):
+        low, high = (await db.execute(_source_bounds(entry))).one()
+        await db.execute(_set_bounds(entry, low, high))
+
+
+async def replace_entry(db: AsyncSession, old: RollupEntry, new: RollupEntry):
+    if old != new:
+        await remove_entry(db, old)
+        await add_entry(db, new)
+
+
+async def move_category(db: AsyncSession, tenant_id: uuid.UUID, from_key: str, to_key: str):
+    """Merge every expense group for category ``from_key`` into ``to_key``."""
+    result = await db.execute(
+        delete(MonthlyCategoryRollup)
+        .where(
+            MonthlyCategoryRollup.tenant_id == tenant_id,
+            MonthlyCategoryRollup.entry_type == EXPENSE,
+            MonthlyCategoryRollup.category_key == from_key,
+        )
+        .returning(*MonthlyCategoryRollup.__table__.c)
+    )
+    rows = [
+        {**{c: getattr(r, c) for c in _KEY_COLUMNS}, "category_key": to_key,
+         "total_amount": r.total_amount, "entry_count": r.entry_count,
+         "min_amount": r.min_amount, "max_amount": r.max_amount,
+         "sum_of_squares": r.sum_of_squares}
+        for r in result.all()
+    ]
+    if rows:
+        await db.execute(_upsert(_dialect(db), rows))
+
+
+# ── Rebuild ───────────────────────────────────────────────────────────────
+
+def _month_start(column, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc("month", column)
+    return func.date(column, "start of month")
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+async def rebuild_tenant(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Recompute every rollup row of one tenant from the source tables."""
+    dialect_name = _dialect(db)
+    await db.execute(delete(MonthlyCategoryRollup).where(MonthlyCategoryRollup.tenant_id == tenant_id))
+
+    sources = [
+        (EXPENSE, Expense, Expense.transaction_date, Expense.category_id),
+        (INCOME, Income, Income.income_date, Income.source),
+    ]
+    rows = []
+    for entry_type, model, date_column, category_column in sources:
+        month = _month_start(date_column, dialect_name)
+        result = await db.execute(
+            select(
+                model.user_id,
+                month.label("month"),
+                category_column.label("category"),
+                model.currency,
+                func.sum(model.amount),
+                func.count(),
+                func.min(model.amount),
+                func.max(model.amount),
+                func.sum(model.amount * model.amount),
+            )
+            .where(model.tenant_id == tenant_id)
+            .group_by(model.user_id, month, category_column, model.currency)
+        )
+        for user_id, month_value, category, currency, total, count, low, high, squares in result.all():
+            rows.append({
+                "entry_type": entry_type,
+                "tenant_id": tenant_id,
+                "user_id": user_id,
+                "month": _as_date(month_value),
+                "category_key": str(category) if category else "",
+                "currency": currency,
+                "total_amount": total,
+                "entry_count": count,
+                "min_amount": low,
+                "max_amount": high,
+                "sum_of_squares": squares,
+            })
+
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        await db.execute(insert(MonthlyCategoryRollup), rows[start:start + REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+async def _rebuild(tenant_id: Optional[str]):
+    from shared.database import for_each_tenant
+
+    async for tid, count in for_each_tenant(rebuild_tenant, tenant_id):
+        print(f"Rebuilt {count} rollup rows for tenant {tid}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild monthly_category_rollups from expenses and income.")
+    parser.add_argument("--tenant-id", help="Only rebuild this tenant (default: all tenants)")
+    args = parser.parse_args()
+    asyncio.run(_rebuild(args.tenant_id))
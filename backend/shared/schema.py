@@ -0,0 +1,386 @@
+"""
+Schema bootstrap for tables added after ``init.sql``.
+
+``init.sql`` only runs when the database volume is first created, so tables
+introduced later -- ``net_worth_snapshots``, ``notifications``,
+``expense_anomalies``, ``recurring_schedules``, ``monthly_category_rollups``
+and ``import_jobs`` -- are owned here instead.  ``upgrade`` applies their
+idempotent DDL (tables, indexes, row-level security), plus indexes and
+constraints added later to ``init.sql`` tables (exchange rates, expenses,
+income, market data, ``uq_categories_tenant_name``), and is run once per
+deploy, before the services start (the ``schema_bootstrap`` one-shot
+service in docker-compose)::
+
+    python -m shared.schema upgrade
+    python -m shared.schema check
+
+Services call ``verify`` at startup and refuse to start if anything here is
+missing, so the request path never has to look at the catalog.
+"""
+
+import argparse
+import asyncio
+from typing import List
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+def new_id(dialect_name: str):
+    """
+    A fresh UUID per row for ``INSERT ... SELECT``: the ``uuid_generate_v4()``
+    the tables default to, or random hex on SQLite.
+    """
+    if dialect_name == "postgresql":
+        return func.uuid_generate_v4()
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+SCHEMA_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS net_worth_snapshots (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        snapshot_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        investment_value DECIMAL(15, 2) DEFAULT 0,
+        lendings_outstanding DECIMAL(15, 2) DEFAULT 0,
+        cash_balance DECIMAL(15, 2) DEFAULT 0,
+        income_monthly DECIMAL(15, 2) DEFAULT 0,
+        other_assets DECIMAL(15, 2) DEFAULT 0,
+        borrowings_owed DECIMAL(15, 2) DEFAULT 0,
+        emi_remaining DECIMAL(15, 2) DEFAULT 0,
+        credit_card_debt DECIMAL(15, 2) DEFAULT 0,
+        other_liabilities DECIMAL(15, 2) DEFAULT 0,
+        total_assets DECIMAL(15, 2) DEFAULT 0,
+        total_liabilities DECIMAL(15, 2) DEFAULT 0,
+        net_worth DECIMAL(15, 2) DEFAULT 0,
+        health_score INTEGER DEFAULT 0,
+        savings_rate DECIMAL(5, 2) DEFAULT 0,
+        debt_to_income_ratio DECIMAL(5, 2) DEFAULT 0,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Serves the per-user trend (date range, ascending)
+    "CREATE INDEX IF NOT EXISTS idx_net_worth_snapshots_user_date ON net_worth_snapshots(user_id, snapshot_date)",
+    "ALTER TABLE net_worth_snapshots ENABLE ROW LEVEL SECURITY",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_policies
+            WHERE tablename = 'net_worth_snapshots' AND policyname = 'tenant_isolation_policy_net_worth_snapshots'
+        ) THEN
+            CREATE POLICY tenant_isolation_policy_net_worth_snapshots ON net_worth_snapshots
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        title VARCHAR(255) NOT NULL,
+        message TEXT NOT NULL,
+        type VARCHAR(20) DEFAULT 'info',  -- info, warning, success, error
+        read BOOLEAN DEFAULT false,
+        action_label VARCHAR(100),
+        action_href VARCHAR(255),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, read, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user_created_id ON notifications(user_id, created_at DESC, id DESC)",
+    # One notification per (user, title, UTC day): the budget alert worker
+    # inserts with ON CONFLICT DO NOTHING against it.  Same-day duplicates
+    # from before the index existed are dropped first, keeping the earliest.
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('idx_notifications_dedup') IS NULL THEN
+            DELETE FROM notifications n
+            USING notifications d
+            WHERE n.user_id = d.user_id AND n.title = d.title
+              AND (n.created_at AT TIME ZONE 'UTC')::date = (d.created_at AT TIME ZONE 'UTC')::date
+              AND (n.created_at, n.id) > (d.created_at, d.id);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_dedup
+                ON notifications(user_id, title, ((created_at AT TIME ZONE 'UTC')::date));
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS expense_anomalies (
+        expense_id UUID PRIMARY KEY,
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        category_key VARCHAR(64) NOT NULL,
+        transaction_date DATE NOT NULL,
+        amount DECIMAL(15, 2) NOT NULL,
+        baseline_count INTEGER NOT NULL,
+        baseline_mean DECIMAL(15, 2) NOT NULL,
+        baseline_std DECIMAL(15, 2) NOT NULL,
+        score DOUBLE PRECISION NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # expenses is a hypertable keyed on (id, transaction_date), so expense_id
+    # cannot reference it: delete_expense drops the flag itself.  Databases
+    # that still have the old single-column key lose the FK here.
+    "ALTER TABLE expense_anomalies DROP CONSTRAINT IF EXISTS expense_anomalies_expense_id_fkey",
+    # Serves GET /anomalies (recent flags of one user)
+    "CREATE INDEX IF NOT EXISTS idx_expense_anomalies_user_date ON expense_anomalies(user_id, transaction_date DESC)",
+    "ALTER TABLE expense_anomalies ENABLE ROW LEVEL SECURITY",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_policies
+            WHERE tablename = 'expense_anomalies' AND policyname = 'tenant_isolation_policy_expense_anomalies'
+        ) THEN
+            CREATE POLICY tenant_isolation_policy_expense_anomalies ON expense_anomalies
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS recurring_schedules (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        expense_id UUID UNIQUE,
+        income_id UUID UNIQUE,
+        frequency VARCHAR(20) NOT NULL,
+        next_due_date DATE NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT ck_recurring_schedules_one_template CHECK ((expense_id IS NULL) <> (income_id IS NULL))
+    )
+    """,
+    # expenses and income are hypertables keyed on (id, date), so neither
+    # template column can be a foreign key: deleting a template drops its
+    # schedule explicitly (shared.recurring).  Drop FKs created before that.
+    "ALTER TABLE recurring_schedules DROP CONSTRAINT IF EXISTS recurring_schedules_expense_id_fkey",
+    "ALTER TABLE recurring_schedules DROP CONSTRAINT IF EXISTS recurring_schedules_income_id_fkey",
+    # The daily job's due-item range scan
+    "CREATE INDEX IF NOT EXISTS idx_recurring_schedules_next_due ON recurring_schedules(next_due_date)",
+    # Serves GET /recurring (one user's schedules, newest first)
+    "CREATE INDEX IF NOT EXISTS idx_recurring_schedules_user_created ON recurring_schedules(user_id, created_at DESC, id DESC)",
+    "ALTER TABLE recurring_schedules ENABLE ROW LEVEL SECURITY",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_policies
+            WHERE tablename = 'recurring_schedules' AND policyname = 'tenant_isolation_policy_recurring_schedules'
+        ) THEN
+            CREATE POLICY tenant_isolation_policy_recurring_schedules ON recurring_schedules
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+        END IF;
+    END
+    $$
+    """,
+    # One candle per (symbol, interval, time): update_market_data merges
+    # with ON CONFLICT against it.  It includes the hypertable's time
+    # column, as TimescaleDB requires.  Existing duplicates are dropped
+    # first, keeping one row each.
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('idx_market_data_dedup') IS NULL THEN
+            DELETE FROM market_data m
+            USING market_data d
+            WHERE m.symbol = d.symbol AND m.interval = d.interval AND m.time = d.time
+              AND m.ctid > d.ctid;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_market_data_dedup
+                ON market_data(symbol, interval, time DESC);
+        END IF;
+    END
+    $$
+    """,
+    # Conflict target for default-category seeding (shared/categories.py).
+    # Duplicate (tenant_id, name) rows are merged into the earliest one
+    # first: expenses, budgets and child categories are repointed before
+    # the rest are deleted.  Rollups keyed by a merged id are rebuilt by
+    # `python -m shared.rollups`.
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('uq_categories_tenant_name') IS NULL THEN
+            CREATE TEMPORARY TABLE category_merges ON COMMIT DROP AS
+                SELECT id, first_value(id) OVER (PARTITION BY tenant_id, name ORDER BY created_at, id) AS keep_id
+                FROM categories;
+            DELETE FROM category_merges WHERE id = keep_id;
+            UPDATE expenses e SET category_id = m.keep_id FROM category_merges m WHERE e.category_id = m.id;
+            UPDATE budgets b SET category_id = m.keep_id FROM category_merges m WHERE b.category_id = m.id;
+            UPDATE categories c SET parent_id = m.keep_id FROM category_merges m WHERE c.parent_id = m.id;
+            DELETE FROM categories c USING category_merges m WHERE c.id = m.id;
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_categories_tenant_name ON categories(tenant_id, name);
+            ALTER TABLE categories
+                ADD CONSTRAINT uq_categories_tenant_name UNIQUE USING INDEX uq_categories_tenant_name;
+        END IF;
+    END
+    $$
+    """,
+    # Monthly per-category rollups of expenses (keyed by category id) and
+    # income (keyed by source); maintained by shared/rollups.py, rebuilt
+    # with `python -m shared.rollups`
+    """
+    CREATE TABLE IF NOT EXISTS monthly_category_rollups (
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        entry_type VARCHAR(10) NOT NULL,  -- expense, income
+        month DATE NOT NULL,  -- first day of the month
+        category_key VARCHAR(64) NOT NULL DEFAULT '',
+        currency VARCHAR(3) NOT NULL,
+        total_amount DECIMAL(18, 2) NOT NULL DEFAULT 0,
+        entry_count INTEGER NOT NULL DEFAULT 0,
+        min_amount DECIMAL(15, 2),
+        max_amount DECIMAL(15, 2),
+        sum_of_squares DECIMAL(30, 4) NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (tenant_id, user_id, entry_type, month, category_key, currency)
+    )
+    """,
+    "ALTER TABLE monthly_category_rollups ENABLE ROW LEVEL SECURITY",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_policies
+            WHERE tablename = 'monthly_category_rollups' AND policyname = 'tenant_isolation_policy_monthly_category_rollups'
+        ) THEN
+            CREATE POLICY tenant_isolation_policy_monthly_category_rollups ON monthly_category_rollups
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+        END IF;
+    END
+    $$
+    """,
+    # Bank statement import jobs; rows_processed is the resume checkpoint
+    """
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        filename VARCHAR(255),
+        file_size INTEGER,
+        currency VARCHAR(3) NOT NULL,
+        statement_format VARCHAR(20),  -- hdfc, icici, sbi, generic
+        status VARCHAR(20) NOT NULL DEFAULT 'running',  -- running, completed, failed
+        rows_processed INTEGER NOT NULL DEFAULT 0,
+        rows_imported INTEGER NOT NULL DEFAULT 0,
+        rows_rejected INTEGER NOT NULL DEFAULT 0,
+        rejection_counts JSONB DEFAULT '{}',
+        error TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP WITH TIME ZONE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_import_jobs_user ON import_jobs(user_id, created_at DESC)",
+    "ALTER TABLE import_jobs ENABLE ROW LEVEL SECURITY",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_policies
+            WHERE tablename = 'import_jobs' AND policyname = 'tenant_isolation_policy_import_jobs'
+        ) THEN
+            CREATE POLICY tenant_isolation_policy_import_jobs ON import_jobs
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+        END IF;
+    END
+    $$
+    """,
+    # Nearest-earlier-date exchange rate lookups: MAX(date) WHERE date <= :d
+    "CREATE INDEX IF NOT EXISTS idx_exchange_rates_date ON exchange_rates(date DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_exchange_rates_target_date ON exchange_rates(target_currency, date DESC)",
+    # Serves the per-budget spend aggregation (window + optional category)
+    # as an index-only scan
+    """
+    CREATE INDEX IF NOT EXISTS idx_expenses_user_date_category
+        ON expenses(user_id, transaction_date, category_id) INCLUDE (amount_in_base_currency, amount)
+    """,
+    # Keyset pagination: GET /expenses and GET /income page on (date, id) descending
+    "CREATE INDEX IF NOT EXISTS idx_expenses_user_date_id ON expenses(user_id, transaction_date DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_income_user_date ON income(user_id, income_date DESC, id DESC)",
+]
+
+# Tables and indexes ``verify`` requires
+REQUIRED_RELATIONS = [
+    "net_worth_snapshots",
+    "idx_net_worth_snapshots_user_date",
+    "notifications",
+    "idx_notifications_user",
+    "idx_notifications_user_created_id",
+    "idx_notifications_dedup",
+    "expense_anomalies",
+    "idx_expense_anomalies_user_date",
+    "recurring_schedules",
+    "idx_recurring_schedules_next_due",
+    "idx_recurring_schedules_user_created",
+    "idx_market_data_dedup",
+    "uq_categories_tenant_name",
+    "monthly_category_rollups",
+    "import_jobs",
+    "idx_import_jobs_user",
+    "idx_exchange_rates_date",
+    "idx_exchange_rates_target_date",
+    "idx_expenses_user_date_category",
+    "idx_expenses_user_date_id",
+    "idx_income_user_date",
+]
+
+
+class SchemaError(RuntimeError):
+    pass
+
+
+async def upgrade(conn: AsyncConnection):
+    for statement in SCHEMA_DDL:
+        await conn.execute(text(statement))
+
+
+async def missing_relations(conn: AsyncConnection) -> List[str]:
+    result = await conn.execute(
+        text("SELECT name FROM unnest(CAST(:names AS text[])) AS name WHERE to_regclass(name) IS NULL"),
+        {"names": REQUIRED_RELATIONS},
+    )
+    return [row.name for row in result]
+
+
+async def verify(engine: AsyncEngine):
+    """Raise ``SchemaError`` unless every bootstrap relation exists."""
+    async with engine.connect() as conn:
+        missing = await missing_relations(conn)
+    if missing:
+        raise SchemaError(
+            f"Database schema is out of date (missing: {', '.join(missing)}); "
+            "run `python -m shared.schema upgrade`"
+        )
+
+
+async def _main(command: str):
+    from shared.database import engine
+
+    try:
+        if command == "upgrade":
+            async with engine.begin() as conn:
+                await upgrade(conn)
+            print("Schema is up to date")
+        else:
+            await verify(engine)
+            print("Schema OK")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bootstrap or check the tables owned by shared.schema.")
+    parser.add_argument("command", choices=["upgrade", "check"])
+    args = parser.parse_args()
+    asyncio.run(_main(args.command))
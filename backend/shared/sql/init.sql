@@ -48,12 +48,17 @@ CREATE TABLE categories (
     is_system BOOLEAN DEFAULT false,
     parent_id UUID REFERENCES categories(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    -- Conflict target for default-category seeding (shared/categories.py)
+    CONSTRAINT uq_categories_tenant_name UNIQUE (tenant_id, name)
 );
 
--- Create expenses table
+-- Create expenses table (TimescaleDB hypertable on transaction_date; the
+-- primary key must include the partitioning column, and an UPDATE cannot
+-- move a row into another chunk, so date changes are a DELETE + INSERT --
+-- see shared/timeseries.py move_to_date)
 CREATE TABLE expenses (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     category_id UUID REFERENCES categories(id) ON DELETE SET NULL,
@@ -71,9 +76,33 @@ CREATE TABLE expenses (
     recurring_config JSONB,
     synced BOOLEAN DEFAULT true,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, transaction_date)
+);
+
+SELECT create_hypertable('expenses', 'transaction_date', chunk_time_interval => INTERVAL '90 days');
+
+-- Create income table (TimescaleDB hypertable on income_date; date changes
+-- are a DELETE + INSERT, as for expenses)
+CREATE TABLE income (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    source VARCHAR(50) NOT NULL,  -- salary, freelance, dividends, rental, gift, other
+    amount DECIMAL(15, 2) NOT NULL,
+    currency VARCHAR(3) DEFAULT 'INR',
+    income_date DATE NOT NULL,
+    description TEXT,
+    is_recurring BOOLEAN DEFAULT false,
+    recurrence_period VARCHAR(20),  -- monthly, weekly, yearly
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, income_date)
 );
 
+SELECT create_hypertable('income', 'income_date', chunk_time_interval => INTERVAL '90 days');
+
 -- Create emis table
 CREATE TABLE emis (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -231,6 +260,7 @@ CREATE INDEX idx_investment_snapshots_user ON investment_snapshots (user_id, tim
 -- Enable Row-Level Security on all tenant tables
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE expenses ENABLE ROW LEVEL SECURITY;
+ALTER TABLE income ENABLE ROW LEVEL SECURITY;
 ALTER TABLE emis ENABLE ROW LEVEL SECURITY;
 ALTER TABLE emi_payments ENABLE ROW LEVEL SECURITY;
 ALTER TABLE investments ENABLE ROW LEVEL SECURITY;
@@ -245,6 +275,9 @@ CREATE POLICY tenant_isolation_policy_users ON users
 CREATE POLICY tenant_isolation_policy_expenses ON expenses
     USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
 
+CREATE POLICY tenant_isolation_policy_income ON income
+    USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
+
 CREATE POLICY tenant_isolation_policy_emis ON emis
     USING (tenant_id = current_setting('app.current_tenant_id', true)::UUID);
 
@@ -266,7 +299,6 @@ CREATE POLICY tenant_isolation_policy_watchlist ON watchlist
 -- Create indexes for performance
 CREATE INDEX idx_users_tenant_email ON users(tenant_id, email);
 CREATE INDEX idx_expenses_tenant_user ON expenses(tenant_id, user_id);
-CREATE INDEX idx_expenses_date ON expenses(transaction_date DESC);
 CREATE INDEX idx_emis_tenant_user ON emis(tenant_id, user_id);
 CREATE INDEX idx_investments_tenant_user ON investments(tenant_id, user_id);
 CREATE INDEX idx_budgets_tenant_user ON budgets(tenant_id, user_id);
@@ -307,6 +339,9 @@ CREATE TRIGGER update_categories_updated_at BEFORE UPDATE ON categories
 CREATE TRIGGER update_expenses_updated_at BEFORE UPDATE ON expenses
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_income_updated_at BEFORE UPDATE ON income
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
 CREATE TRIGGER update_emis_updated_at BEFORE UPDATE ON emis
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
@@ -319,18 +354,77 @@ CREATE TRIGGER update_investments_updated_at BEFORE UPDATE ON investments
 CREATE TRIGGER update_budgets_updated_at BEFORE UPDATE ON budgets
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
--- Notifications table
-CREATE TABLE IF NOT EXISTS notifications (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
-    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    title VARCHAR(255) NOT NULL,
-    message TEXT NOT NULL,
-    type VARCHAR(20) DEFAULT 'info',  -- info, warning, success, error
-    read BOOLEAN DEFAULT false,
-    action_label VARCHAR(100),
-    action_href VARCHAR(255),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE INDEX idx_notifications_user ON notifications(user_id, read, created_at DESC);
+-- net_worth_snapshots, notifications, monthly_category_rollups, import_jobs
+-- and the indexes added since (exchange rates, expenses, income) are created
+-- by shared/schema.py (python -m shared.schema upgrade), which runs on every
+-- deploy
+
+-- Continuous aggregates over the expenses / income hypertables.
+-- Real-time (materialized_only = false) so buckets newer than the last
+-- refresh are still answered from the raw rows.  Continuous aggregates do
+-- not support RLS: readers must filter on tenant_id and user_id themselves.
+CREATE MATERIALIZED VIEW expenses_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT tenant_id,
+       user_id,
+       category_id,
+       time_bucket(INTERVAL '1 day', transaction_date) AS bucket,
+       SUM(COALESCE(amount_in_base_currency, amount)) AS total_in_base_currency,
+       COUNT(*) AS entry_count
+FROM expenses
+GROUP BY tenant_id, user_id, category_id, bucket
+WITH NO DATA;
+
+CREATE MATERIALIZED VIEW expenses_monthly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT tenant_id,
+       user_id,
+       category_id,
+       time_bucket(INTERVAL '1 month', transaction_date) AS bucket,
+       SUM(COALESCE(amount_in_base_currency, amount)) AS total_in_base_currency,
+       COUNT(*) AS entry_count
+FROM expenses
+GROUP BY tenant_id, user_id, category_id, bucket
+WITH NO DATA;
+
+CREATE MATERIALIZED VIEW income_daily
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT tenant_id,
+       user_id,
+       source,
+       currency,
+       time_bucket(INTERVAL '1 day', income_date) AS bucket,
+       SUM(amount) AS total_amount,
+       COUNT(*) AS entry_count
+FROM income
+GROUP BY tenant_id, user_id, source, currency, bucket
+WITH NO DATA;
+
+CREATE MATERIALIZED VIEW income_monthly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT tenant_id,
+       user_id,
+       source,
+       currency,
+       time_bucket(INTERVAL '1 month', income_date) AS bucket,
+       SUM(amount) AS total_amount,
+       COUNT(*) AS entry_count
+FROM income
+GROUP BY tenant_id, user_id, source, currency, bucket
+WITH NO DATA;
+
+CREATE INDEX idx_expenses_daily_user ON expenses_daily (tenant_id, user_id, bucket DESC);
+CREATE INDEX idx_expenses_monthly_user ON expenses_monthly (tenant_id, user_id, bucket DESC);
+CREATE INDEX idx_income_daily_user ON income_daily (tenant_id, user_id, bucket DESC);
+CREATE INDEX idx_income_monthly_user ON income_monthly (tenant_id, user_id, bucket DESC);
+
+-- Backdated edits older than start_offset are picked up on the next manual
+-- refresh: CALL refresh_continuous_aggregate('expenses_monthly', NULL, NULL);
+SELECT add_continuous_aggregate_policy('expenses_daily',
+    start_offset => INTERVAL '1 year', end_offset => INTERVAL '1 day', schedule_interval => INTERVAL '1 hour');
+SELECT add_continuous_aggregate_policy('expenses_monthly',
+    start_offset => INTERVAL '3 years', end_offset => INTERVAL '1 day', schedule_interval => INTERVAL '6 hours');
+SELECT add_continuous_aggregate_policy('income_daily',
+    start_offset => INTERVAL '1 year', end_offset => INTERVAL '1 day', schedule_interval => INTERVAL '1 hour');
+SELECT add_continuous_aggregate_policy('income_monthly',
+    start_offset => INTERVAL '3 years', end_offset => INTERVAL '1 day', schedule_interval => INTERVAL '6 hours');
@@ -0,0 +1,156 @@
+"""
+Async object storage.
+
+The MinIO SDK is synchronous, so calling it from a request handler blocks
+the event loop for every other request on that worker.  ``MinioStorage``
+runs each call on a small bounded thread pool instead and uploads straight
+from the file object (an ``UploadFile``'s spooled temp file), letting the SDK
+split large bodies into multipart chunks rather than buffering them.
+
+``LocalFileStorage`` keeps objects under a directory and is selected with
+``STORAGE_BACKEND=local`` (tests, local development without MinIO).
+"""
+
+import abc
+import asyncio
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from minio import Minio
+from minio.error import S3Error
+from urllib3.exceptions import HTTPError
+
+from shared.config import get_settings
+
+# Multipart chunk size when the body length is not known up front
+PART_SIZE = 10 * 1024 * 1024
+PRESIGNED_URL_TTL = timedelta(hours=1)
+
+
+class StorageError(Exception):
+    pass
+
+
+class ObjectStorage(abc.ABC):
+    """Interface shared by the storage backends; every call is non-blocking."""
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    @abc.abstractmethod
+    async def ensure_bucket(self, bucket: str):
+        ...
+
+    @abc.abstractmethod
+    async def put_stream(self, bucket: str, key: str, stream: BinaryIO, length: Optional[int] = None,
+                         content_type: str = "application/octet-stream"):
+        ...
+
+    @abc.abstractmethod
+    async def presigned_get_url(self, bucket: str, key: str, expires: timedelta = PRESIGNED_URL_TTL) -> str:
+        ...
+
+    async def put_upload(self, bucket: str, key: str, upload: UploadFile, content_type: Optional[str] = None):
+        """
+        Store an uploaded file from its start, streaming from the spooled
+        temp file.  Do not touch ``upload`` until this returns.
+        """
+        await upload.seek(0)
+        await self.put_stream(
+            bucket, key, upload.file, upload.size,
+            content_type or upload.content_type or "application/octet-stream",
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class MinioStorage(ObjectStorage):
+    def __init__(self, client: Minio, max_workers: int = 4):
+        super().__init__(max_workers)
+        self.client = client
+
+    def _ensure_bucket(self, bucket: str):
+        if not self.client.bucket_exists(bucket):
+            self.client.make_bucket(bucket)
+
+    async def ensure_bucket(self, bucket: str):
+        try:
+            await self._run(self._ensure_bucket, bucket)
+        except (S3Error, HTTPError) as e:
+            raise StorageError(str(e)) from e
+
+    async def put_stream(self, bucket, key, stream, length=None, content_type="application/octet-stream"):
+        try:
+            await self._run(
+                self.client.put_object,
+                bucket,
+                key,
+                stream,
+                length if length is not None else -1,
+                content_type=content_type,
+                part_size=0 if length is not None else PART_SIZE,
+            )
+        except (S3Error, HTTPError) as e:
+            raise StorageError(str(e)) from e
+
+    async def presigned_get_url(self, bucket, key, expires=PRESIGNED_URL_TTL):
+        try:
+            return await self._run(self.client.presigned_get_object, bucket, key, expires=expires)
+        except (S3Error, HTTPError) as e:
+            raise StorageError(str(e)) from e
+
+
+class LocalFileStorage(ObjectStorage):
+    """Objects as files under ``root/<bucket>/<key>``."""
+
+    def __init__(self, root: str, max_workers: int = 2):
+        super().__init__(max_workers)
+        self.root = Path(root)
+
+    def _path(self, bucket: str, key: str) -> Path:
+        path = (self.root / bucket / key).resolve()
+        if not path.is_relative_to((self.root / bucket).resolve()):
+            raise StorageError(f"Invalid object key: {key}")
+        return path
+
+    async def ensure_bucket(self, bucket):
+        await self._run(os.makedirs, self.root / bucket, exist_ok=True)
+
+    def _write(self, path: Path, stream: BinaryIO):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(stream, out, PART_SIZE)
+
+    async def put_stream(self, bucket, key, stream, length=None, content_type="application/octet-stream"):
+        try:
+            await self._run(self._write, self._path(bucket, key), stream)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+
+    async def presigned_get_url(self, bucket, key, expires=PRESIGNED_URL_TTL):
+        return self._path(bucket, key).as_uri()
+
+
+def create_storage() -> ObjectStorage:
+    settings = get_settings()
+    if settings.STORAGE_BACKEND == "local":
+        return LocalFileStorage(settings.STORAGE_LOCAL_PATH, settings.STORAGE_MAX_WORKERS)
+
+    client = Minio(
+        settings.MINIO_ENDPOINT,
+        access_key=settings.MINIO_ACCESS_KEY,
+        secret_key=settings.MINIO_SECRET_KEY,
+        secure=settings.MINIO_SECURE,
+    )
+    return MinioStorage(client, settings.STORAGE_MAX_WORKERS)
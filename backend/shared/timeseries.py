@@ -0,0 +1,150 @@
+"""
+Daily and monthly spend series.
+
+On PostgreSQL these read the ``expenses_daily`` / ``expenses_monthly``
+TimescaleDB continuous aggregates defined in ``init.sql``, so a multi-year
+range costs one row per bucket and category instead of a scan of every raw
+expense.  The aggregates are real-time (``materialized_only = false``), so
+buckets newer than the last policy refresh are still exact.  Other dialects
+(the SQLite test database) group the raw ``expenses`` rows instead.
+
+Continuous aggregates do not support row level security, so every query here
+filters on tenant and user explicitly.
+
+``expenses`` and ``income`` are partitioned on their date, and TimescaleDB
+cannot UPDATE a row into another chunk: writers change those dates with
+``move_to_date`` (a DELETE + INSERT) instead of assigning them.
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Column, Date, DECIMAL, MetaData, Table, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient
+
+from shared.models import Expense
+from shared.rollups import month_after
+
+DAY = "day"
+MONTH = "month"
+INTERVALS = (DAY, MONTH)
+
+# The aggregates are views, not ORM tables: keep them out of Base.metadata so
+# create_all never tries to build them.
+_views = MetaData()
+
+
+def _expense_view(name: str) -> Table:
+    return Table(
+        name,
+        _views,
+        Column("tenant_id", UUID(as_uuid=True)),
+        Column("user_id", UUID(as_uuid=True)),
+        Column("category_id", UUID(as_uuid=True)),
+        Column("bucket", Date),
+        Column("total_in_base_currency", DECIMAL(18, 2)),
+        Column("entry_count", BigInteger),
+    )
+
+
+EXPENSE_VIEWS = {DAY: _expense_view("expenses_daily"), MONTH: _expense_view("expenses_monthly")}
+
+
+def bucket_range(interval: str, start: date, end: date) -> tuple:
+    """Widen ``start``..``end`` to whole buckets (monthly buckets cover whole months)."""
+    if interval == MONTH:
+        return start.replace(day=1), month_after(end.replace(day=1)) - timedelta(days=1)
+    return start, end
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _expense_series_query(dialect_name: str, tenant_id: uuid.UUID, user_id: uuid.UUID, interval: str,
+                          start: date, end: date, category_id: Optional[uuid.UUID], by_category: bool):
+    if dialect_name == "postgresql":
+        view = EXPENSE_VIEWS[interval].c
+        bucket, category = view.bucket, view.category_id
+        total, count = func.sum(view.total_in_base_currency), func.sum(view.entry_count)
+        filters = [view.tenant_id == tenant_id, view.user_id == user_id, bucket.between(start, end)]
+    else:
+        bucket = Expense.transaction_date
+        if interval == MONTH:
+            bucket = func.date(Expense.transaction_date, "start of month")
+        category = Expense.category_id
+        total = func.sum(func.coalesce(Expense.amount_in_base_currency, Expense.amount))
+        count = func.count(Expense.id)
+        filters = [
+            Expense.tenant_id == tenant_id,
+            Expense.user_id == user_id,
+            Expense.transaction_date.between(start, end),
+        ]
+    if category_id is not None:
+        filters.append(category == category_id)
+
+    group = [bucket, category] if by_category else [bucket]
+    columns = [bucket.label("bucket")]
+    if by_category:
+        columns.append(category.label("category_id"))
+    return (
+        select(*columns, total.label("total"), count.label("count"))
+        .where(*filters)
+        .group_by(*group)
+        .order_by(*group)
+    )
+
+
+async def expense_series(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    user_id: uuid.UUID,
+    interval: str,
+    start: date,
+    end: date,
+    category_id: Optional[uuid.UUID] = None,
+    by_category: bool = False,
+) -> List[dict]:
+    """
+    Spend (in base currency) per ``interval`` bucket between ``start`` and
+    ``end``, oldest first.  Buckets without expenses are omitted.  With
+    ``by_category`` each bucket is split per category (``None`` for
+    uncategorized).
+    """
+    query = _expense_series_query(
+        db.get_bind().dialect.name, tenant_id, user_id, interval, start, end, category_id, by_category
+    )
+    points = []
+    for row in (await db.execute(query)).all():
+        point = {"bucket": _as_date(row.bucket).isoformat()}
+        if by_category:
+            point["category_id"] = str(row.category_id) if row.category_id else None
+        point["total"] = float(row.total or 0)
+        point["count"] = int(row.count)
+        points.append(point)
+    return points
+
+
+async def move_to_date(db: AsyncSession, row, column, value: date):
+    """
+    Set the partitioning date ``column`` of ``row`` (an ``Expense`` or
+    ``Income``) to ``value``, deleting and re-inserting the row under the
+    same id when it changes.  Other pending attribute changes of ``row`` are
+    written by the INSERT.
+    """
+    if getattr(row, column.key) == value:
+        return
+    await db.delete(row)
+    await db.flush()
+    make_transient(row)
+    setattr(row, column.key, value)
+    row.updated_at = func.now()
+    db.add(row)
+    await db.flush()
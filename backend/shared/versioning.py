@@ -0,0 +1,153 @@
+"""
+Per-user data versions and conditional GETs.
+
+Every (user, entity) pair -- ``expenses``, ``budgets``, ``income`` ... --
+has a counter in Redis (``version:<user_id>:<entity>``) that only ever goes
+up.  Mutating endpoints bump the entities they change once the handler has
+committed (``bumps``); list and summary endpoints turn the counters they
+depend on into a weak ETag and answer a matching ``If-None-Match`` with 304
+before the handler, and so before any query, runs (``conditional``)::
+
+    @app.get("/expenses", dependencies=[Depends(conditional(EXPENSES, CATEGORIES))])
+    @app.post("/expenses", dependencies=[Depends(bumps(EXPENSES))])
+
+Counters are seeded from the wall clock the first time they are touched, so
+if Redis loses them they restart well above any value an old ETag was built
+from.  Without Redis (``connect`` not called, or Redis erroring) no ETag is
+sent and every GET is answered in full.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import date
+from typing import List, Optional, Sequence
+
+import redis.asyncio as aioredis
+from fastapi import HTTPException, Request, Response
+
+logger = logging.getLogger(__name__)
+
+EXPENSES = "expenses"
+CATEGORIES = "categories"
+BUDGETS = "budgets"
+INCOME = "income"
+BORROWINGS = "borrowings"
+LENDINGS = "lendings"
+NET_WORTH = "net_worth"
+EMIS = "emis"
+INVESTMENTS = "investments"
+
+
+def _key(user_id: str, entity: str) -> str:
+    return f"version:{user_id}:{entity}"
+
+
+def _seed() -> int:
+    return int(time.time() * 1000)
+
+
+class DataVersions:
+    def __init__(self):
+        self._redis: Optional[aioredis.Redis] = None
+
+    def connect(self, redis_url: str):
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def bump(self, user_id: str, entities: Sequence[str]):
+        if self._redis is None or not entities:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for entity in entities:
+                    pipe.set(_key(user_id, entity), _seed(), nx=True)
+                    pipe.incr(_key(user_id, entity))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Could not bump %s versions for user %s: %s", ",".join(entities), user_id, e)
+
+    async def current(self, user_id: str, entities: Sequence[str]) -> Optional[List[str]]:
+        """The counters of ``entities``, or ``None`` if they cannot be read."""
+        if self._redis is None:
+            return None
+        keys = [_key(user_id, entity) for entity in entities]
+        try:
+            values = await self._redis.mget(keys)
+            if None in values:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key, value in zip(keys, values):
+                        if value is None:
+                            pipe.set(key, _seed(), nx=True)
+                    pipe.mget(keys)
+                    values = (await pipe.execute())[-1]
+            return values
+        except Exception as e:
+            logger.warning("Could not read data versions for user %s: %s", user_id, e)
+            return None
+
+
+versions = DataVersions()
+
+
+def _etag(request: Request, entities: Sequence[str], values: Sequence[str], daily: bool) -> str:
+    parts = [request.url.path, request.url.query]
+    parts += [f"{entity}={value}" for entity, value in zip(entities, values)]
+    if daily:
+        parts.append(date.today().isoformat())
+    return 'W/"%s"' % hashlib.sha1("\n".join(parts).encode()).hexdigest()[:20]
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on either side
+    opaque = etag[2:]
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional(*entities: str, daily: bool = False):
+    """
+    Dependency for a GET whose result depends only on the user's
+    ``entities`` (and the query string).  ``daily`` folds in today's date for
+    results relative to today (current month, rates of the day, ...).
+    """
+    async def check(request: Request, response: Response):
+        user = getattr(request.state, "user", None)
+        if not user:
+            return
+        values = await versions.current(user["user_id"], entities)
+        if values is None:
+            return
+        etag = _etag(request, entities, values, daily)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("If-None-Match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        # For endpoints that return a Response themselves (shared.response_cache)
+        request.state.version_headers = headers
+
+    return check
+
+
+def bumps(*entities: str):
+    """
+    Dependency for a write endpoint: bump ``entities`` after the handler.
+    Failed requests bump too, since some (a statement import, say) commit
+    part of their work before failing; a spare bump only costs one refetch.
+    """
+    async def bump_after(request: Request):
+        try:
+            yield
+        finally:
+            user = getattr(request.state, "user", None)
+            if user:
+                await versions.bump(user["user_id"], entities)
+
+    return bump_after
@@ -0,0 +1,150 @@
+"""
+Tests for expense anomaly flags (shared/anomalies.py).
+
+Covers:
+- baseline / score maths, including the spread floor
+- expenses are flagged at write time against the previous months only
+- updating an expense rescores it, deleting it drops its flag; GET /anomalies
+  reads the flags
+- imported statement rows are scored
+- the NumPy backfill agrees with write-time scoring
+"""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from shared import anomalies
+from shared.models import ExpenseAnomaly
+from tests.conftest import TEST_TENANT_ID, create_expense
+
+
+def _month(offset: int) -> date:
+    """First day of the month ``offset`` months before this one."""
+    month = date.today().replace(day=1)
+    for _ in range(offset):
+        month = (month - timedelta(days=1)).replace(day=1)
+    return month
+
+
+async def _category(client, headers, name="Groceries"):
+    response = await client.post("/categories", json={"name": name, "type": "expense"}, headers=headers)
+    return response.json()["id"]
+
+
+async def _flags(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(ExpenseAnomaly).order_by(ExpenseAnomaly.score.desc()))
+        return result.scalars().all()
+
+
+def test_baseline_and_score():
+    assert anomalies.baseline(4, 400, 40_000) is None
+
+    steady = anomalies.baseline(5, 500, 50_000)
+    assert (steady.mean, steady.std) == (100, 0)
+    # std is 0, so the spread is floored at 10% of the mean
+    assert anomalies.score(130, steady) == pytest.approx(3.0)
+
+    spread = anomalies.baseline(5, 500, 5 * 100 ** 2 + 5 * 20 ** 2)
+    assert spread.std == pytest.approx(20)
+    assert anomalies.score(160, spread) == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_expenses_flagged_at_write_time(finance_client, auth_headers, session_factory):
+    category_id = await _category(finance_client, auth_headers)
+    for offset, amount in [(1, 95), (1, 105), (2, 100), (3, 90), (3, 110)]:
+        await create_expense(finance_client, auth_headers, amount, _month(offset), category_id)
+    # Too little history before these months: nothing flagged yet
+    assert await _flags(session_factory) == []
+
+    usual = await create_expense(finance_client, auth_headers, 108, _month(0), category_id)
+    spike = await create_expense(finance_client, auth_headers, 400, _month(0), category_id)
+
+    flags = await _flags(session_factory)
+    assert [str(f.expense_id) for f in flags] == [spike]
+    assert flags[0].baseline_count == 5
+    assert float(flags[0].baseline_mean) == 100
+
+    response = await finance_client.get("/anomalies", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["expense_id"] for a in data] == [spike]
+    assert data[0]["category"] == "Groceries"
+    assert data[0]["multiplier"] == 4.0
+
+    # Bringing the spike back in line drops its flag; the other one rises
+    await finance_client.put(
+        f"/expenses/{spike}",
+        json={"amount": 100, "currency": "USD", "description": "Spend 100",
+              "transaction_date": _month(0).isoformat(), "category_id": category_id},
+        headers=auth_headers,
+    )
+    await finance_client.put(
+        f"/expenses/{usual}",
+        json={"amount": 900, "currency": "USD", "description": "Spend 900",
+              "transaction_date": _month(0).isoformat(), "category_id": category_id},
+        headers=auth_headers,
+    )
+    assert [str(f.expense_id) for f in await _flags(session_factory)] == [usual]
+
+    # There is no FK cascade from expenses: deleting drops the flag explicitly
+    await finance_client.delete(f"/expenses/{usual}", headers=auth_headers)
+    assert await _flags(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_old_history_is_outside_the_window(finance_client, auth_headers, session_factory):
+    category_id = await _category(finance_client, auth_headers)
+    for _ in range(5):
+        await create_expense(finance_client, auth_headers, 100, _month(12), category_id)
+    await create_expense(finance_client, auth_headers, 1000, _month(0), category_id)
+    assert await _flags(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_imported_rows_are_scored(finance_client, auth_headers, session_factory):
+    category_id = await _category(finance_client, auth_headers, "Food & Dining")
+    for amount in (20, 22, 18, 21, 19):
+        await create_expense(finance_client, auth_headers, amount, _month(1), category_id)
+
+    day = _month(0).strftime("%d/%m/%Y")
+    statement = f"Date,Narration,Debit,Credit\n{day},Restaurant dinner,250.00,\n{day},Restaurant lunch,21.00,\n"
+    response = await finance_client.post(
+        "/import/bank-statement",
+        files={"file": ("statement.csv", statement.encode(), "text/csv")},
+        data={"currency": "USD"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    flags = await _flags(session_factory)
+    assert [float(f.amount) for f in flags] == [250]
+
+
+@pytest.mark.asyncio
+async def test_backfill_matches_write_time(finance_client, auth_headers, session_factory):
+    pytest.importorskip("numpy")
+    category_id = await _category(finance_client, auth_headers)
+    other_id = await _category(finance_client, auth_headers, "Travel")
+    for offset, amount, category in [
+        (8, 100, category_id), (7, 300, category_id), (5, 95, category_id), (4, 105, category_id),
+        (3, 100, category_id), (2, 98, category_id), (1, 102, category_id), (1, 500, category_id),
+        (0, 450, category_id), (2, 40, other_id), (1, 900, other_id),
+    ]:
+        await create_expense(finance_client, auth_headers, amount, _month(offset), category)
+    incremental = [(f.expense_id, f.baseline_count, float(f.baseline_mean), f.score)
+                   for f in await _flags(session_factory)]
+    assert incremental
+
+    async with session_factory() as session:
+        count = await anomalies.rescore_tenant(session, uuid.UUID(TEST_TENANT_ID))
+        await session.commit()
+    rescored = [(f.expense_id, f.baseline_count, float(f.baseline_mean), f.score)
+                for f in await _flags(session_factory)]
+    assert count == len(incremental)
+    assert [row[:3] for row in rescored] == [row[:3] for row in incremental]
+    assert [row[3] for row in rescored] == pytest.approx([row[3] for row in incremental])
@@ -0,0 +1,172 @@
+"""
+Tests for the Finance service – Budget endpoints.
+
+Endpoints tested:
+- POST /budgets          – create budget (spend computed on creation)
+- GET  /budgets          – list budgets with per-budget spend
+- PUT  /budgets/{id}     – update budget window, spend recomputed
+"""
+
+import pytest
+
+from tests.conftest import create_expense
+
+
+async def _create_category(client, headers, name):
+    response = await client.post(
+        "/categories",
+        json={"name": name, "type": "expense"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+# ── POST /budgets ────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_create_budget_includes_existing_spend(finance_client, auth_headers):
+    """A new budget should report the spend already inside its window."""
+    await create_expense(finance_client, auth_headers, 40.00, "2024-05-10")
+    await create_expense(finance_client, auth_headers, 500.00, "2024-06-10")
+
+    response = await finance_client.post(
+        "/budgets",
+        json={
+            "name": "May",
+            "amount": 200.00,
+            "period": "monthly",
+            "start_date": "2024-05-01",
+            "end_date": "2024-05-31",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["spent"] == 40.00
+    assert data["remaining"] == 160.00
+    assert data["percentage_used"] == 20.0
+
+
+# ── GET /budgets ─────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_list_budgets_respects_window_and_category(finance_client, auth_headers):
+    """Each budget is aggregated over its own date window and category."""
+    groceries = await _create_category(finance_client, auth_headers, "Groceries")
+    travel = await _create_category(finance_client, auth_headers, "Travel")
+
+    await create_expense(finance_client, auth_headers, 30.00, "2024-07-05", groceries)
+    await create_expense(finance_client, auth_headers, 70.00, "2024-07-20", travel)
+    await create_expense(finance_client, auth_headers, 10.00, "2024-07-25")
+    await create_expense(finance_client, auth_headers, 99.00, "2024-08-02", groceries)
+
+    budgets = [
+        {"name": "All July", "amount": 1000.00, "category_id": None},
+        {"name": "Groceries July", "amount": 60.00, "category_id": groceries},
+        {"name": "Travel July", "amount": 50.00, "category_id": travel},
+    ]
+    for budget in budgets:
+        response = await finance_client.post(
+            "/budgets",
+            json={
+                **budget,
+                "period": "monthly",
+                "start_date": "2024-07-01",
+                "end_date": "2024-07-31",
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    response = await finance_client.get("/budgets", headers=auth_headers)
+    assert response.status_code == 200
+
+    spent = {b["name"]: b["spent"] for b in response.json()}
+    assert spent["All July"] == 110.00
+    assert spent["Groceries July"] == 30.00
+    assert spent["Travel July"] == 70.00
+
+    by_name = {b["name"]: b for b in response.json()}
+    assert by_name["Groceries July"]["percentage_used"] == 50.0
+    assert by_name["Travel July"]["remaining"] == -20.00
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_without_expenses(finance_client, auth_headers):
+    """Budgets with no matching expenses report zero spend."""
+    await finance_client.post(
+        "/budgets",
+        json={
+            "name": "Empty",
+            "amount": 100.00,
+            "period": "monthly",
+            "start_date": "2023-01-01",
+            "end_date": "2023-01-31",
+        },
+        headers=auth_headers,
+    )
+
+    response = await finance_client.get("/budgets", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["spent"] == 0
+    assert data[0]["remaining"] == 100.00
+
+
+@pytest.mark.asyncio
+async def test_list_budgets_counts_unconverted_expenses(finance_client, auth_headers):
+    """Expenses without a known rate count at face value, as on the dashboard."""
+    response = await finance_client.post(
+        "/expenses",
+        json={"amount": 12.00, "currency": "GBP", "transaction_date": "2024-03-05"},
+        headers=auth_headers,
+    )
+    assert response.json()["converted"] is False
+    await create_expense(finance_client, auth_headers, 8.00, "2024-03-06")
+
+    await finance_client.post(
+        "/budgets",
+        json={
+            "name": "March",
+            "amount": 100.00,
+            "period": "monthly",
+            "start_date": "2024-03-01",
+            "end_date": "2024-03-31",
+        },
+        headers=auth_headers,
+    )
+
+    response = await finance_client.get("/budgets", headers=auth_headers)
+    assert response.json()[0]["spent"] == 20.00
+
+
+# ── PUT /budgets/{id} ────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_update_budget_recomputes_spend(finance_client, auth_headers):
+    """Moving a budget's window should recompute its spend."""
+    await create_expense(finance_client, auth_headers, 25.00, "2024-09-15")
+
+    create_resp = await finance_client.post(
+        "/budgets",
+        json={
+            "name": "Shifting",
+            "amount": 100.00,
+            "period": "monthly",
+            "start_date": "2024-08-01",
+            "end_date": "2024-08-31",
+        },
+        headers=auth_headers,
+    )
+    assert create_resp.json()["spent"] == 0
+
+    response = await finance_client.put(
+        f"/budgets/{create_resp.json()['id']}",
+        json={"start_date": "2024-09-01", "end_date": "2024-09-30"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["spent"] == 25.00
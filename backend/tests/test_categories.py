@@ -0,0 +1,72 @@
+"""
+Tests for default category seeding (shared/categories.py).
+
+Covers:
+- POST /register – a new tenant gets the default categories, once
+- seeding is idempotent and keeps existing same-named categories
+- POST /categories – duplicate name in a tenant → 409
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from shared.categories import DEFAULT_CATEGORIES, seed_default_categories
+from shared.models import Category, Tenant
+
+
+async def _register(client, email, tenant_name="Seed Co"):
+    response = await client.post(
+        "/register",
+        json={"email": email, "password": "Seed-pass-123", "full_name": "Seed User", "tenant_name": tenant_name},
+    )
+    assert response.status_code == 200
+    return uuid.UUID(response.json()["user"]["tenant_id"])
+
+
+async def _names(session_factory, tenant_id):
+    async with session_factory() as session:
+        result = await session.execute(select(Category.name).where(Category.tenant_id == tenant_id))
+        return sorted(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_register_seeds_new_tenant(auth_client, session_factory):
+    tenant_id = await _register(auth_client, "owner@seedco.com")
+    assert await _names(session_factory, tenant_id) == sorted(c["name"] for c in DEFAULT_CATEGORIES)
+
+    # Joining an existing tenant does not seed again
+    assert await _register(auth_client, "member@seedco.com") == tenant_id
+    assert len(await _names(session_factory, tenant_id)) == len(DEFAULT_CATEGORIES)
+
+
+@pytest.mark.asyncio
+async def test_seeding_is_idempotent(db_session):
+    first, second = Tenant(name="A", slug="a"), Tenant(name="B", slug="b")
+    db_session.add_all([first, second])
+    await db_session.flush()
+    db_session.add(Category(tenant_id=first.id, name="Salary", type="income", color="#000000"))
+    await db_session.commit()
+
+    inserted = await seed_default_categories(db_session)
+    await db_session.commit()
+    assert inserted == 2 * len(DEFAULT_CATEGORIES) - 1
+    assert await seed_default_categories(db_session) == 0
+
+    salary = (await db_session.execute(
+        select(Category).where(Category.tenant_id == first.id, Category.name == "Salary")
+    )).scalar_one()
+    assert salary.color == "#000000" and not salary.is_system
+    count = (await db_session.execute(
+        select(func.count()).select_from(Category).where(Category.tenant_id == second.id)
+    )).scalar_one()
+    assert count == len(DEFAULT_CATEGORIES)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_category_name_conflicts(finance_client, auth_headers):
+    payload = {"name": "Pets", "type": "expense"}
+    assert (await finance_client.post("/categories", json=payload, headers=auth_headers)).status_code == 200
+    response = await finance_client.post("/categories", json=payload, headers=auth_headers)
+    assert response.status_code == 409
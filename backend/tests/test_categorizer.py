@@ -0,0 +1,133 @@
+"""
+Tests for keyword categorization (services/finance/categorizer.py).
+
+Covers:
+- matches agree with the original per-keyword substring scan
+- overlapping keywords and rule rebuilds
+- POST /categorize/batch – results in order, ids from the tenant's categories
+- POST /import/bank-statement – rows are auto-categorized
+"""
+
+import random
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from services.finance.categorizer import KeywordCategorizer
+from services.finance.main import CATEGORY_RULES
+from shared.models import Category, Expense
+from tests.conftest import TEST_TENANT_ID
+
+
+def _substring_scan(rules, description):
+    """The categorizer this engine replaced."""
+    desc_lower = description.lower()
+    best_match, best_confidence = None, 0.0
+    for category_name, keywords in rules.items():
+        for keyword in keywords:
+            if keyword in desc_lower:
+                confidence = len(keyword) / max(len(desc_lower), 1)
+                confidence = min(max(confidence, 0.5), 0.95)
+                if confidence > best_confidence:
+                    best_confidence = confidence
+                    best_match = category_name
+    return best_match, best_confidence
+
+
+def test_matches_substring_scan():
+    engine = KeywordCategorizer(CATEGORY_RULES)
+    words = [kw for keywords in CATEGORY_RULES.values() for kw in keywords]
+    words += ["UPI", "ref", "payment", "to", "xyz", "Ltd", "#123", "-"]
+    rng = random.Random(7)
+    for _ in range(2000):
+        description = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        if rng.random() < 0.5:
+            description = description.upper()
+        match = engine.match(description)
+        expected = _substring_scan(CATEGORY_RULES, description)
+        assert (match.category if match else None, match.confidence if match else 0.0) == expected
+
+
+def test_overlapping_keywords_and_rebuild():
+    engine = KeywordCategorizer({"A": ["he", "she"], "B": ["hers", "his"]})
+    assert engine.match("ushers").category == "B"
+    assert engine.match("ushe").keyword == "she"
+    assert engine.match("nothing here...").keyword == "he"
+    assert engine.match("xyz") is None
+
+    engine.update_rules({"C": ["xyz"]})
+    assert engine.match("ushers") is None
+    assert engine.match("XYZ corp").category == "C"
+
+
+async def _add_category(session_factory, name, is_system=True):
+    async with session_factory() as session:
+        category = Category(
+            tenant_id=uuid.UUID(TEST_TENANT_ID), name=name, type="expense", is_system=is_system,
+        )
+        session.add(category)
+        await session.commit()
+        return category.id
+
+
+@pytest.mark.asyncio
+async def test_categorize_batch(finance_client, auth_headers, session_factory):
+    food_id = await _add_category(session_factory, "Food & Dining")
+    response = await finance_client.post(
+        "/categorize/batch",
+        json={"descriptions": ["SWIGGY order 1234", "random transfer", "Uber trip"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["description"] for r in results] == ["SWIGGY order 1234", "random transfer", "Uber trip"]
+    assert results[0]["category_name"] == "Food & Dining"
+    assert results[0]["category_id"] == str(food_id)
+    assert results[1] == {"description": "random transfer", "category_name": None, "category_id": None, "confidence": 0}
+    assert results[2]["category_name"] == "Transportation"
+    assert results[2]["category_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_category_ids_refresh_after_create(finance_client, auth_headers):
+    first = await finance_client.post("/categorize", json={"description": "Uber trip"}, headers=auth_headers)
+    assert first.json()["category_id"] is None
+
+    created = await finance_client.post(
+        "/categories", json={"name": "Transportation", "type": "expense"}, headers=auth_headers,
+    )
+    assert created.status_code == 200
+
+    second = await finance_client.post("/categorize", json={"description": "Uber trip"}, headers=auth_headers)
+    assert second.json()["category_id"] == created.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_categorize_batch_limit(finance_client, auth_headers):
+    response = await finance_client.post(
+        "/categorize/batch", json={"descriptions": ["x"] * 5001}, headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_import_auto_categorizes(finance_client, auth_headers, session_factory):
+    groceries_id = await _add_category(session_factory, "Groceries")
+    statement = (
+        "Date,Narration,Debit\n"
+        "01/03/2024,BIGBASKET order,500\n"
+        "02/03/2024,Transfer to savings,1000\n"
+    )
+    response = await finance_client.post(
+        "/import/bank-statement",
+        files={"file": ("statement.csv", statement.encode(), "text/csv")},
+        data={"currency": "USD"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["transactions"][0]["category_id"] == str(groceries_id)
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(Expense.description, Expense.category_id))).all()
+    assert dict(rows) == {"BIGBASKET order": groceries_id, "Transfer to savings": None}
@@ -0,0 +1,115 @@
+"""
+Tests for the per-tenant category cache (services/finance/category_cache.py).
+
+Covers:
+- local hits need no database; invalidate reloads
+- a second replica loads a tenant from the Redis tier alone
+- a generation bump hides Redis entries written before the change
+- GET /expenses reflects a category rename made through the API
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from services.finance.category_cache import CategoryCache
+from shared.models import Category
+from tests.conftest import TEST_TENANT_ID
+
+
+class _FakeRedis:
+    """The handful of commands the cache uses, in memory."""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, "0")) + 1)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def _cache(redis=None):
+    cache = CategoryCache()
+    cache._redis = redis
+    return cache
+
+
+async def _seed(db_session, *names):
+    for name in names:
+        db_session.add(Category(tenant_id=uuid.UUID(TEST_TENANT_ID), name=name, type="expense"))
+    await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_local_hit_until_invalidated(db_session):
+    await _seed(db_session, "Rent", "Food")
+    cache = _cache()
+    first = await cache.get(db_session, TEST_TENANT_ID)
+    assert [c.name for c in first.categories] == ["Food", "Rent"]
+
+    await db_session.execute(delete(Category).where(Category.name == "Rent"))
+    await db_session.commit()
+    # Served locally; a stale read here proves no query ran
+    assert await cache.get(db_session, TEST_TENANT_ID) is first
+
+    await cache.invalidate(TEST_TENANT_ID)
+    assert [c.name for c in (await cache.get(db_session, TEST_TENANT_ID)).categories] == ["Food"]
+
+
+@pytest.mark.asyncio
+async def test_second_replica_reads_redis(db_session):
+    await _seed(db_session, "Travel")
+    redis = _FakeRedis()
+    loaded = await _cache(redis).get(db_session, TEST_TENANT_ID)
+
+    replica = await _cache(redis).get(None, TEST_TENANT_ID)
+    assert replica.categories == loaded.categories
+    assert replica.ids_by_name["Travel"] == loaded.ids_by_name["Travel"]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_generation(db_session):
+    await _seed(db_session, "Travel")
+    redis = _FakeRedis()
+    writer, replica = _cache(redis), _cache(redis)
+    await replica.get(db_session, TEST_TENANT_ID)
+
+    await _seed(db_session, "Books")
+    await writer.invalidate(TEST_TENANT_ID)
+    assert redis.published == [("categories:changed", TEST_TENANT_ID)]
+
+    replica.drop(TEST_TENANT_ID)  # what the pub/sub listener does
+    names = [c.name for c in (await replica.get(db_session, TEST_TENANT_ID)).categories]
+    assert names == ["Books", "Travel"]
+
+
+@pytest.mark.asyncio
+async def test_expense_list_sees_category_rename(finance_client, auth_headers):
+    created = await finance_client.post(
+        "/categories", json={"name": "Snacks", "type": "expense"}, headers=auth_headers,
+    )
+    category_id = created.json()["id"]
+    await finance_client.post(
+        "/expenses",
+        json={"amount": 5, "currency": "USD", "transaction_date": "2024-03-01", "category_id": category_id},
+        headers=auth_headers,
+    )
+    listed = await finance_client.get("/expenses", headers=auth_headers)
+    assert listed.json()[0]["category_name"] == "Snacks"
+
+    renamed = await finance_client.put(
+        f"/categories/{category_id}", json={"name": "Treats", "type": "expense"}, headers=auth_headers,
+    )
+    assert renamed.status_code == 200
+    listed = await finance_client.get("/expenses", headers=auth_headers)
+    assert listed.json()[0]["category_name"] == "Treats"
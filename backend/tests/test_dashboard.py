@@ -0,0 +1,181 @@
+"""
+Tests for the Finance service – Dashboard summary endpoint.
+
+Endpoints tested:
+- GET /dashboard/summary – aggregated totals, breakdown and monthly trend
+- GET /dashboard/summary – invalid date range → 400
+- GET /dashboard/summary – active budgets and investment allocation
+- GET /borrowings/summary, /lendings/summary – list stat cards
+"""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from shared.models import Investment
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID
+
+
+def _previous_month_day(today: date) -> date:
+    return today.replace(day=1) - timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_aggregates(finance_client, auth_headers):
+    """Totals, category breakdown and month-over-month figures come from the database."""
+    today = date.today()
+    last_month = _previous_month_day(today)
+
+    category = await finance_client.post(
+        "/categories", json={"name": "Food", "type": "expense"}, headers=auth_headers
+    )
+    food_id = category.json()["id"]
+
+    for amount, day, category_id in [
+        (30.00, today, food_id),
+        (20.00, today, food_id),
+        (15.00, today, None),
+        (100.00, last_month, food_id),
+    ]:
+        response = await finance_client.post(
+            "/expenses",
+            json={
+                "amount": amount,
+                "currency": "USD",
+                "transaction_date": str(day),
+                "category_id": category_id,
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    await finance_client.post(
+        "/income",
+        json={"source": "salary", "amount": 500.00, "income_date": str(today)},
+        headers=auth_headers,
+    )
+    await finance_client.post(
+        "/borrowings",
+        json={
+            "lender_name": "Friend",
+            "principal_amount": 200.00,
+            "borrowed_date": str(today),
+            "due_date": str(today + timedelta(days=3)),
+        },
+        headers=auth_headers,
+    )
+
+    response = await finance_client.get("/dashboard/summary", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["expenses"]["total"] == 65.00
+    assert data["expenses"]["count"] == 3
+    assert data["expenses"]["previous_month"] == 100.00
+    assert data["income"]["total"] == 500.00
+    assert data["savings_rate"] == pytest.approx(87.0)
+
+    breakdown = {c["name"]: c["total"] for c in data["category_breakdown"]}
+    assert breakdown == {"Food": 50.00, "Uncategorized": 15.00}
+    assert data["category_breakdown"][0]["name"] == "Food"
+
+    assert len(data["monthly_trend"]) == 6
+    assert data["monthly_trend"][-1]["month"] == today.strftime("%Y-%m")
+    assert data["monthly_trend"][-1]["expenses"] == 65.00
+    assert data["monthly_trend"][-2]["expenses"] == 100.00
+
+    assert data["current_month"]["expenses"] == 65.00
+    assert data["current_month"]["top_categories"][0]["name"] == "Food"
+    assert data["daily_expenses"][-1] == {"date": str(today), "total": 65.00}
+
+    assert len(data["recent_expenses"]) == 3
+    assert data["borrowings"]["outstanding"] == 200.00
+    assert data["borrowings"]["open"] == 1
+    assert [u["type"] for u in data["upcoming_due"]] == ["borrowing"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_custom_range(finance_client, auth_headers):
+    """An explicit range narrows the period totals but not the monthly trend."""
+    today = date.today()
+    last_month = _previous_month_day(today)
+    for amount, day in [(10.00, today), (40.00, last_month)]:
+        await finance_client.post(
+            "/expenses",
+            json={"amount": amount, "currency": "USD", "transaction_date": str(day)},
+            headers=auth_headers,
+        )
+
+    response = await finance_client.get(
+        "/dashboard/summary",
+        params={"start_date": str(last_month.replace(day=1)), "end_date": str(last_month)},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["expenses"]["total"] == 40.00
+    assert data["expenses"]["count"] == 1
+    assert data["monthly_trend"][-1]["expenses"] == 10.00
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_invalid_range(finance_client, auth_headers):
+    """A start date after the end date should be rejected."""
+    response = await finance_client.get(
+        "/dashboard/summary",
+        params={"start_date": "2024-05-02", "end_date": "2024-05-01"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_lists_budgets_and_allocation(finance_client, auth_headers, db_session):
+    """Budget cards and the allocation donut are served from the summary itself."""
+    today = date.today()
+    budget = {"name": "Food", "amount": 300, "currency": "USD", "period": "monthly",
+              "start_date": str(today.replace(day=1)), "end_date": str(today + timedelta(days=30))}
+    assert (await finance_client.post("/budgets", json=budget, headers=auth_headers)).status_code == 200
+    for investment_type, quantity, price in [("stock", 2, 100), ("Stock", 1, 50), ("gold", 1, 400)]:
+        db_session.add(Investment(
+            tenant_id=uuid.UUID(TEST_TENANT_ID), user_id=uuid.UUID(TEST_USER_ID), investment_type=investment_type,
+            asset_name="x", quantity=quantity, purchase_price=price, currency="USD", purchase_date=today,
+        ))
+    await db_session.commit()
+
+    data = (await finance_client.get("/dashboard/summary", headers=auth_headers)).json()
+    assert [b["name"] for b in data["budgets"]["items"]] == ["Food"]
+    assert data["investments"]["allocation"] == [
+        {"type": "gold", "value": 400.0},
+        {"type": "stock", "value": 250.0},
+    ]
+    assert data["investments"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_borrowing_and_lending_summaries(finance_client, auth_headers):
+    """The list pages' stat cards total every borrowing and lending."""
+    today = date.today()
+    for lender, amount, due in [("A", 100.00, today - timedelta(days=1)), ("B", 50.00, None)]:
+        await finance_client.post(
+            "/borrowings",
+            json={"lender_name": lender, "principal_amount": amount, "currency": "USD",
+                  "borrowed_date": str(today), "due_date": str(due) if due else None},
+            headers=auth_headers,
+        )
+    lending = await finance_client.post(
+        "/lendings",
+        json={"borrower_name": "C", "principal_amount": 80.00, "currency": "USD", "lent_date": str(today)},
+        headers=auth_headers,
+    )
+    await finance_client.post(
+        f"/lendings/{lending.json()['id']}/collections",
+        json={"amount": 30.00, "collection_date": str(today)},
+        headers=auth_headers,
+    )
+
+    borrowings = (await finance_client.get("/borrowings/summary", headers=auth_headers)).json()
+    assert borrowings == {"currency": "USD", "outstanding": 150.00, "repaid": 0.0, "open": 2, "overdue": 1}
+    lendings = (await finance_client.get("/lendings/summary", headers=auth_headers)).json()
+    assert lendings == {"currency": "USD", "outstanding": 50.00, "received": 30.00, "open": 1, "overdue": 0}
@@ -0,0 +1,76 @@
+"""
+Tests for chart series downsampling (shared/downsample.py).
+
+Covers:
+- lttb keeps the endpoints and the extremes, and never exceeds max_points
+- bucket_width bounds the bucket count and respects the native resolution
+- GET /net-worth/trend honours max_points
+"""
+
+import math
+import random
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from shared import downsample
+from shared.models import NetWorthSnapshot
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID
+
+
+def test_lttb_bounds_and_keeps_shape():
+    rng = random.Random(7)
+    points = [(i, math.sin(i / 40) * 100 + rng.uniform(-5, 5)) for i in range(2000)]
+    points[1234] = (1234, 1000.0)  # a spike
+
+    kept = downsample.lttb(points, 100, x=lambda p: p[0], y=lambda p: p[1])
+
+    assert len(kept) == 100
+    assert kept[0] == points[0] and kept[-1] == points[-1]
+    assert (1234, 1000.0) in kept
+    assert [p[0] for p in kept] == sorted(p[0] for p in kept)
+
+
+def test_lttb_returns_short_series_unchanged():
+    points = [(i, i) for i in range(10)]
+    assert downsample.lttb(points, 10, x=lambda p: p[0], y=lambda p: p[1]) == points
+    assert downsample.lttb(points, 500, x=lambda p: p[0], y=lambda p: p[1]) == points
+
+
+def test_bucket_width():
+    end = datetime(2024, 1, 1)
+    ten_years = downsample.bucket_width(end - timedelta(days=3650), end, 500, timedelta(days=1))
+    assert math.ceil(timedelta(days=3650) / ten_years) <= 500
+
+    one_month = downsample.bucket_width(end - timedelta(days=30), end, 500, timedelta(days=1))
+    assert one_month == timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_net_worth_trend_max_points(finance_client, auth_headers, session_factory):
+    today = date.today()
+    async with session_factory() as session:
+        session.add_all([
+            NetWorthSnapshot(
+                tenant_id=uuid.UUID(TEST_TENANT_ID), user_id=uuid.UUID(TEST_USER_ID),
+                snapshot_date=today - timedelta(days=days), net_worth=1000 + days,
+            )
+            for days in range(720)
+        ])
+        await session.commit()
+
+    response = await finance_client.get(
+        "/net-worth/trend", params={"months": 24, "max_points": 60}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    trend = response.json()
+    assert len(trend) == 60
+    assert trend[0]["date"] == (today - timedelta(days=719)).isoformat()
+    assert trend[-1]["date"] == today.isoformat()
+
+    full = await finance_client.get("/net-worth/trend", params={"months": 24}, headers=auth_headers)
+    assert len(full.json()) == downsample.DEFAULT_MAX_POINTS
+
+    too_few = await finance_client.get("/net-worth/trend", params={"max_points": 2}, headers=auth_headers)
+    assert too_few.status_code == 422
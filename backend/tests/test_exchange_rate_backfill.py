@@ -0,0 +1,104 @@
+"""
+Tests for the exchange-rate backfill (workers/exchange_rates.py).
+
+Covers:
+- the file provider feeds a concurrent multi-base backfill
+- quotes are upserted (re-running updates, never duplicates) and unknown
+  currencies are dropped
+- expenses of the range are re-priced at the backfilled rates
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from shared.database import Base
+from shared.models import Currency, ExchangeRate, Expense
+from workers import exchange_rates, resources, tasks
+
+TENANT_ID, USER_ID = uuid.uuid4(), uuid.uuid4()
+DAY_1, DAY_2 = date(2023, 3, 1), date(2023, 3, 2)
+
+
+@pytest.fixture
+def worker_db(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'worker.db'}"
+    Base.metadata.create_all(create_engine(url))
+    monkeypatch.setattr(resources, "DATABASE_URL", url)
+    monkeypatch.setattr(tasks, "_bump_versions", lambda pairs: None)
+    monkeypatch.setattr(tasks, "_publish_rates_updated", lambda: None)
+    yield resources.engine()
+    resources.close()
+
+
+@pytest.fixture
+def rate_file(tmp_path, monkeypatch):
+    def write(lines):
+        path = tmp_path / "rates.csv"
+        path.write_text("date,base_currency,target_currency,rate\n" + "\n".join(lines) + "\n")
+        monkeypatch.setenv("EXCHANGE_RATE_FILE", str(path))
+    return write
+
+
+def _seed(engine):
+    with Session(engine) as session:
+        session.add_all([
+            Currency(code=code, name=code, symbol=code) for code in ("USD", "EUR", "INR")
+        ] + [
+            Expense(tenant_id=TENANT_ID, user_id=USER_ID, amount=amount, currency=currency,
+                    amount_in_base_currency=amount, exchange_rate=1, transaction_date=DAY_2)
+            for amount, currency in [(100, "EUR"), (8300, "INR"), (50, "USD")]
+        ])
+        session.commit()
+
+
+def test_days_between():
+    assert exchange_rates.days_between(DAY_1, DAY_2) == [DAY_1, DAY_2]
+    assert exchange_rates.days_between(DAY_2, DAY_1) == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_rates_skips_same_currency(rate_file):
+    rate_file(["2023-03-01,USD,EUR,0.9", "2023-03-01,USD,USD,1", "2023-03-01,EUR,USD,1.11"])
+    provider = exchange_rates.create_provider("file")
+    rows = await exchange_rates.fetch_rates(provider, ["USD", "EUR"], [DAY_1, DAY_2], concurrency=2)
+    assert sorted((r["base_currency"], r["target_currency"], r["rate"]) for r in rows) == [
+        ("EUR", "USD", Decimal("1.11")), ("USD", "EUR", Decimal("0.9")),
+    ]
+    assert {r["source"] for r in rows} == {"file"}
+
+
+def test_backfill_upserts_and_reconverts(worker_db, rate_file):
+    _seed(worker_db)
+    rate_file([
+        "2023-03-01,USD,EUR,0.9",
+        "2023-03-01,USD,INR,80",
+        "2023-03-01,USD,XXX,3.5",
+        "2023-03-02,USD,INR,83",
+        "2023-03-02,EUR,USD,1.1",
+    ])
+    result = tasks.backfill_exchange_rates(
+        DAY_1.isoformat(), DAY_2.isoformat(), bases=["usd", "eur"], provider="file",
+    )
+    assert result == {"status": "success", "rates_updated": 4, "expenses_reconverted": 2}
+
+    with Session(worker_db) as session:
+        expenses = {e.currency: e for e in session.scalars(select(Expense))}
+        assert expenses["EUR"].exchange_rate == Decimal("1.1")
+        assert expenses["EUR"].amount_in_base_currency == Decimal("110")
+        assert expenses["INR"].exchange_rate == Decimal("0.012048")
+        assert expenses["INR"].amount_in_base_currency == Decimal("100")
+        assert expenses["USD"].exchange_rate == 1
+
+    # A corrected feed replaces the quotes in place; unchanged expenses are skipped
+    rate_file(["2023-03-02,USD,INR,82"])
+    result = tasks.backfill_exchange_rates(DAY_2.isoformat(), DAY_2.isoformat(), provider="file")
+    assert result == {"status": "success", "rates_updated": 1, "expenses_reconverted": 1}
+    with Session(worker_db) as session:
+        assert session.scalar(select(ExchangeRate.rate).where(ExchangeRate.target_currency == "INR",
+                                                               ExchangeRate.date == DAY_2)) == Decimal("82")
+        assert len(session.scalars(select(ExchangeRate)).all()) == 4
@@ -0,0 +1,207 @@
+"""
+Tests for the cached exchange-rate resolver (shared/exchange_rates.py).
+
+Covers:
+- direct, inverse and USD-triangulated rates from one date's matrix
+- nearest-earlier-date fallback, per currency when a date is incomplete
+- unknown pairs raise, and cached rates persist until invalidated
+- POST /expenses converts at the resolved rate, or stores the expense
+  unconverted when no rate is known
+- the dashboard and /income/summary convert income at each month's rate
+- the dashboard and /income/summary report totals in the user's preferred
+  currency, resolving each (currency, month) rate once
+"""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from shared.exchange_rates import ExchangeRateNotFound, ExchangeRateResolver
+from shared.models import Expense, ExchangeRate, Tenant, User
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID
+
+
+@pytest_asyncio.fixture
+async def rates(db_session):
+    for base, target, rate, rate_date in [
+        ("USD", "INR", "83", date(2024, 1, 1)),
+        ("USD", "EUR", "0.8", date(2024, 1, 1)),
+        ("USD", "INR", "84", date(2024, 1, 5)),
+    ]:
+        db_session.add(ExchangeRate(
+            base_currency=base, target_currency=target, rate=Decimal(rate), date=rate_date,
+        ))
+    await db_session.commit()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_matrix_direct_inverse_and_triangulated(rates):
+    resolver = ExchangeRateResolver()
+    on = date(2024, 1, 1)
+    assert await resolver.rate(rates, "USD", "INR", on) == Decimal("83")
+    assert await resolver.rate(rates, "INR", "USD", on) == Decimal("1") / Decimal("83")
+    assert await resolver.rate(rates, "EUR", "INR", on) == Decimal("83") / Decimal("0.8")
+    assert await resolver.rate(rates, "INR", "INR", on) == Decimal("1")
+
+
+@pytest.mark.asyncio
+async def test_nearest_earlier_date(rates):
+    resolver = ExchangeRateResolver()
+    # No rates on the 3rd: use the 1st
+    assert await resolver.rate(rates, "USD", "INR", date(2024, 1, 3)) == Decimal("83")
+    assert await resolver.rate(rates, "USD", "INR", date(2024, 2, 1)) == Decimal("84")
+    # The 5th only quotes INR, so EUR comes from its own latest quote (the 1st)
+    assert await resolver.rate(rates, "EUR", "INR", date(2024, 1, 6)) == Decimal("84") / Decimal("0.8")
+
+
+@pytest.mark.asyncio
+async def test_missing_rate_raises(rates):
+    resolver = ExchangeRateResolver()
+    with pytest.raises(ExchangeRateNotFound):
+        await resolver.rate(rates, "GBP", "USD", date(2024, 1, 1))
+    with pytest.raises(ExchangeRateNotFound):
+        await resolver.rate(rates, "USD", "INR", date(2023, 12, 31))
+
+
+@pytest.mark.asyncio
+async def test_cache_until_invalidated(rates):
+    resolver = ExchangeRateResolver()
+    on = date(2024, 1, 1)
+    assert await resolver.rate(rates, "USD", "INR", on) == Decimal("83")
+
+    row = (await rates.execute(
+        select(ExchangeRate).where(ExchangeRate.target_currency == "INR", ExchangeRate.date == on)
+    )).scalar_one()
+    row.rate = Decimal("90")
+    await rates.commit()
+
+    assert await resolver.rate(rates, "USD", "INR", on) == Decimal("83")
+    resolver.invalidate()
+    assert await resolver.rate(rates, "USD", "INR", on) == Decimal("90")
+
+
+@pytest.mark.asyncio
+async def test_create_expense_uses_resolved_rate(rates, finance_client, auth_headers, session_factory):
+    response = await finance_client.post(
+        "/expenses",
+        json={"amount": 830.00, "currency": "INR", "transaction_date": "2024-01-03"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    async with session_factory() as session:
+        expense = await session.get(Expense, uuid.UUID(response.json()["id"]))
+    assert expense.amount_in_base_currency == Decimal("10.00")
+
+
+@pytest.mark.asyncio
+async def test_expense_without_rate_is_unconverted(rates, finance_client, auth_headers, session_factory):
+    response = await finance_client.post(
+        "/expenses",
+        json={"amount": 12.00, "currency": "GBP", "transaction_date": "2024-01-03"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["converted"] is False
+
+    async with session_factory() as session:
+        expense = await session.get(Expense, uuid.UUID(response.json()["id"]))
+    assert expense.exchange_rate is None and expense.amount_in_base_currency is None
+
+
+@pytest.mark.asyncio
+async def test_income_converted_at_each_months_rate(db_session, finance_client, auth_headers):
+    this_month = date.today().replace(day=1)
+    last_month = (this_month - timedelta(days=1)).replace(day=1)
+    for rate, rate_date in [("80", last_month), ("100", this_month)]:
+        db_session.add(ExchangeRate(
+            base_currency="USD", target_currency="INR", rate=Decimal(rate), date=rate_date,
+        ))
+    await db_session.commit()
+    for amount, day in [(800, last_month), (1000, this_month)]:
+        response = await finance_client.post(
+            "/income",
+            json={"source": "salary", "amount": amount, "currency": "INR", "income_date": str(day)},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    dashboard = (await finance_client.get("/dashboard/summary", headers=auth_headers)).json()
+    assert dashboard["income"]["total"] == pytest.approx(10.0)
+    assert [m["income"] for m in dashboard["monthly_trend"][-2:]] == [pytest.approx(10.0)] * 2
+
+    summary = (await finance_client.get("/income/summary", headers=auth_headers)).json()
+    assert summary["total"] == pytest.approx(20.0)
+    assert summary["this_month"] == pytest.approx(10.0)
+
+
+async def _user_preferring(db_session, currency):
+    db_session.add(Tenant(id=uuid.UUID(TEST_TENANT_ID), name="Acme", slug="acme"))
+    await db_session.flush()
+    db_session.add(User(
+        id=uuid.UUID(TEST_USER_ID), tenant_id=uuid.UUID(TEST_TENANT_ID), email="a@acme.com",
+        password_hash="x", full_name="A", preferred_currency=currency,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_dashboard_in_preferred_currency(db_session, finance_client, auth_headers):
+    await _user_preferring(db_session, "INR")
+    db_session.add(ExchangeRate(
+        base_currency="USD", target_currency="INR", rate=Decimal("80"), date=date.today().replace(day=1),
+    ))
+    await db_session.commit()
+    today = str(date.today())
+    await finance_client.post(
+        "/expenses", json={"amount": 10, "currency": "USD", "transaction_date": today}, headers=auth_headers,
+    )
+    await finance_client.post(
+        "/income", json={"source": "salary", "amount": 1600, "currency": "INR", "income_date": today},
+        headers=auth_headers,
+    )
+
+    dashboard = (await finance_client.get("/dashboard/summary", headers=auth_headers)).json()
+    assert dashboard["currency"] == "INR"
+    assert dashboard["expenses"]["total"] == pytest.approx(800.0)
+    assert dashboard["income"]["total"] == pytest.approx(1600.0)
+    assert dashboard["category_breakdown"][0]["total"] == pytest.approx(800.0)
+    assert dashboard["daily_expenses"][-1]["total"] == pytest.approx(800.0)
+
+
+@pytest.mark.asyncio
+async def test_income_summary_in_preferred_currency(db_session, finance_client, auth_headers, monkeypatch):
+    from services.finance import main
+
+    await _user_preferring(db_session, "EUR")
+    this_month = date.today().replace(day=1)
+    db_session.add(ExchangeRate(
+        base_currency="USD", target_currency="EUR", rate=Decimal("0.5"), date=this_month,
+    ))
+    await db_session.commit()
+    for source, amount, currency in [("salary", 100, "USD"), ("bonus", 20, "USD"), ("rent", 30, "EUR")]:
+        await finance_client.post(
+            "/income",
+            json={"source": source, "amount": amount, "currency": currency, "income_date": str(this_month)},
+            headers=auth_headers,
+        )
+
+    lookups = []
+    get_exchange_rate = main.get_exchange_rate
+
+    async def counting(db, from_currency, to_currency, rate_date=None):
+        lookups.append((from_currency, to_currency, rate_date))
+        return await get_exchange_rate(db, from_currency, to_currency, rate_date)
+
+    monkeypatch.setattr(main, "get_exchange_rate", counting)
+    summary = (await finance_client.get("/income/summary", headers=auth_headers)).json()
+    assert summary["currency"] == "EUR"
+    assert summary["total"] == pytest.approx(90.0)
+    assert {s["source"]: s["total"] for s in summary["by_source"]} == {
+        "salary": pytest.approx(50.0), "bonus": pytest.approx(10.0), "rent": pytest.approx(30.0),
+    }
+    assert lookups == [("USD", "EUR", this_month)]
@@ -4,6 +4,8 @@ Tests for the Finance service – Expense endpoints.
 Endpoints tested:
 - POST   /expenses           – create expense
 - GET    /expenses           – list expenses
+- GET    /expenses           – cursor pagination (X-Next-Cursor)
+- GET    /expenses/summary   – stat-card totals over every expense
 - PUT    /expenses/{id}      – update expense
 - DELETE /expenses/{id}      – delete expense
 - POST   /expenses           – missing required fields → 422
@@ -11,6 +13,8 @@ Endpoints tested:
 
 import pytest
 
+from tests.conftest import create_expense
+
 
 # ── POST /expenses ───────────────────────────────────────────────────────
 
@@ -79,6 +83,85 @@ async def test_list_expenses(finance_client, auth_headers):
     assert "Books" in descriptions
 
 
+@pytest.mark.asyncio
+async def test_list_expenses_cursor_pagination(finance_client, auth_headers):
+    """Following X-Next-Cursor should walk every expense exactly once, newest first."""
+    # Two expenses share a date so the id tie-breaker is exercised
+    for day in ["2024-04-01", "2024-04-02", "2024-04-02", "2024-04-03", "2024-04-04"]:
+        await finance_client.post(
+            "/expenses",
+            json={
+                "amount": 5.00,
+                "currency": "USD",
+                "description": f"Paged {day}",
+                "transaction_date": day,
+            },
+            headers=auth_headers,
+        )
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await finance_client.get("/expenses", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len({e["id"] for e in seen}) == 5
+    dates = [e["transaction_date"] for e in seen]
+    assert dates == sorted(dates, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_list_expenses_invalid_cursor(finance_client, auth_headers):
+    """A malformed cursor should be rejected with 400."""
+    response = await finance_client.get(
+        "/expenses", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_expense_summary_counts_beyond_a_page(finance_client, auth_headers):
+    """Stat-card totals cover every matching expense, not just one page."""
+    category = await finance_client.post(
+        "/categories", json={"name": "Groceries", "type": "expense"}, headers=auth_headers
+    )
+    groceries = category.json()["id"]
+    for amount, day, category_id in [
+        (10.00, "2024-03-01", groceries),
+        (20.00, "2024-03-15", groceries),
+        (30.00, "2024-04-01", None),
+    ]:
+        await create_expense(finance_client, auth_headers, amount, day, category_id)
+    assert len((await finance_client.get("/expenses", params={"limit": 1}, headers=auth_headers)).json()) == 1
+
+    response = await finance_client.get("/expenses/summary", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"currency": "USD", "total": 60.00, "count": 3, "categories": 1}
+
+    response = await finance_client.get(
+        "/expenses/summary",
+        params={"category_id": groceries, "start_date": "2024-03-10", "end_date": "2024-03-31"},
+        headers=auth_headers,
+    )
+    assert response.json() == {"currency": "USD", "total": 20.00, "count": 1, "categories": 1}
+
+    response = await finance_client.get(
+        "/expenses/summary", params={"category_id": "not-a-uuid"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
 # ── PUT /expenses/{id} ───────────────────────────────────────────────────
 
 @pytest.mark.asyncio
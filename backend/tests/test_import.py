@@ -0,0 +1,110 @@
+"""
+Tests for the Finance service – streaming bank statement import.
+
+Endpoints tested:
+- POST /import/bank-statement – batched import with a rejection report
+- POST /import/bank-statement – resume an interrupted job by job_id
+- POST /import/bank-statement – nothing importable → 400
+"""
+
+
+import pytest
+from sqlalchemy import func, select
+
+from services.finance import statement_import
+from shared import rollups
+from shared.models import Expense, ImportJob, MonthlyCategoryRollup
+
+STATEMENT = (
+    "Date,Narration,Debit,Credit\n"
+    "01/03/2024,Groceries,\"1,250.00\",\n"
+    "02/03/2024,Salary,,50000\n"
+    "31/02/2024,Bad date,10,\n"
+    "03/03/2024,,20,\n"
+    "04/03/2024,Fuel,₹ 800,\n"
+    "05/03/2024,Coffee,150.50,\n"
+)
+
+
+async def _upload(client, headers, content, **form):
+    return await client.post(
+        "/import/bank-statement",
+        files={"file": ("statement.csv", content.encode(), "text/csv")},
+        data={"currency": "USD", **form},
+        headers=headers,
+    )
+
+
+async def _expense_count(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(func.count(Expense.id)))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_import_reports_rejections(finance_client, auth_headers, session_factory, monkeypatch):
+    """Valid debits are inserted in batches; every other row gets a reason."""
+    monkeypatch.setattr(statement_import, "IMPORT_BATCH_SIZE", 2)
+    response = await _upload(finance_client, auth_headers, STATEMENT)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["status"] == "completed"
+    assert data["total_transactions"] == 6
+    assert data["imported_count"] == 3
+    assert data["rejected_count"] == 3
+    assert data["rejection_reasons"] == {
+        "no debit amount": 1,
+        "missing or unrecognised date": 1,
+        "missing description": 1,
+    }
+    assert [r["line"] for r in data["rejections"]] == [3, 4, 5]
+    assert data["rows_per_second"] > 0
+    assert [t["amount"] for t in data["transactions"]] == [1250.00, 800.00, 150.50]
+
+    assert await _expense_count(session_factory) == 3
+    async with session_factory() as session:
+        rollup = (await session.execute(select(MonthlyCategoryRollup))).scalar_one()
+    assert (float(rollup.total_amount), rollup.entry_count) == (2200.50, 3)
+
+
+@pytest.mark.asyncio
+async def test_resume_interrupted_import(finance_client, auth_headers, session_factory, monkeypatch):
+    """A failed batch keeps the earlier checkpoint; resuming imports only the rest."""
+    monkeypatch.setattr(statement_import, "IMPORT_BATCH_SIZE", 2)
+    add_entries = rollups.add_entries
+    calls = []
+
+    async def flaky_add_entries(db, entries):
+        calls.append(entries)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        await add_entries(db, entries)
+
+    monkeypatch.setattr(rollups, "add_entries", flaky_add_entries)
+    response = await _upload(finance_client, auth_headers, STATEMENT)
+    assert response.status_code == 500
+
+    async with session_factory() as session:
+        job = (await session.execute(select(ImportJob))).scalar_one()
+    assert (job.status, job.rows_processed, job.rows_imported) == ("failed", 4, 1)
+    assert await _expense_count(session_factory) == 1
+
+    response = await _upload(finance_client, auth_headers, STATEMENT, job_id=str(job.id))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resumed_from"] == 4
+    assert data["imported_count"] == 2
+    assert data["total_transactions"] == 6
+    assert await _expense_count(session_factory) == 3
+
+    response = await _upload(finance_client, auth_headers, STATEMENT, job_id=str(job.id))
+    assert response.status_code == 409
+
+    response = await _upload(finance_client, auth_headers, STATEMENT, job_id="not-a-job")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_without_valid_rows(finance_client, auth_headers):
+    response = await _upload(finance_client, auth_headers, "Date,Narration,Debit\n01/03/2024,Refund,\n")
+    assert response.status_code == 400
@@ -0,0 +1,141 @@
+"""
+Tests for the watchlist market-data ingestion (workers/market_data.py).
+
+Covers:
+- the replay provider resumes each symbol from its newest stored candle
+- a failing symbol is reported without sinking the batch
+- a rate-limited provider takes a token per fetch
+- candles serialize to the CSV that COPY reads (empty field = NULL)
+- Yahoo daily bars are keyed by their trading day, not the live quote time
+
+The COPY + ON CONFLICT merge itself needs Postgres.
+"""
+
+import asyncio
+import csv
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from shared.rate_limit import YAHOO, AsyncTokenBucket
+from workers import market_data
+from workers.market_data import Candle, Watched
+
+
+@pytest.fixture
+def replay(tmp_path):
+    now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    path = tmp_path / "candles.csv"
+    path.write_text(
+        "time,symbol,open,high,low,close,volume\n"
+        + "".join(
+            f"{(now - timedelta(days=days)).isoformat()},AAPL,1{days}0,1{days}5,1{days}0,1{days}2.5,{days}00\n"
+            for days in range(5, 0, -1)
+        )
+        + f"{now.isoformat()},TCS,3500,3550,,3520.25,\n"
+        + "not-a-date,AAPL,1,1,1,1,1\n"
+    )
+    return market_data.ReplayProvider(str(path)), now
+
+
+def test_replay_resumes_from_latest_candle(replay):
+    provider, now = replay
+    watched = [
+        Watched("AAPL", "NASDAQ", now - timedelta(days=2)),
+        Watched("TCS", "NSE", None),
+    ]
+    candles, failed = asyncio.run(market_data.fetch_candles(provider, watched, concurrency=2))
+
+    assert failed == []
+    # Resumes OVERLAP (2 days) before the newest stored candle
+    assert [(c.symbol, c.time) for c in candles] == [
+        ("AAPL", now - timedelta(days=4)),
+        ("AAPL", now - timedelta(days=3)),
+        ("AAPL", now - timedelta(days=2)),
+        ("AAPL", now - timedelta(days=1)),
+        ("TCS", now),
+    ]
+    assert candles[0].close == Decimal("142.5") and candles[0].volume == 400
+    assert candles[-1] == Candle(now, "TCS", "NSE", Decimal("3500"), Decimal("3550"), None,
+                                 Decimal("3520.25"), None, market_data.DAILY)
+
+
+def test_failed_symbol_is_reported(replay):
+    provider, now = replay
+
+    class Flaky(market_data.MarketDataProvider):
+        async def fetch(self, client, watched, since):
+            if watched.symbol == "BAD":
+                raise ValueError("no such symbol")
+            return await provider.fetch(client, watched, since)
+
+    candles, failed = asyncio.run(market_data.fetch_candles(
+        Flaky(), [Watched("BAD", None, None), Watched("TCS", "NSE", None)],
+    ))
+    assert failed == ["BAD"]
+    assert [c.symbol for c in candles] == ["TCS"]
+
+
+def test_fetches_take_provider_tokens(replay):
+    provider, now = replay
+
+    class Limited(market_data.MarketDataProvider):
+        rate_limit = YAHOO
+
+        async def fetch(self, client, watched, since):
+            return await provider.fetch(client, watched, since)
+
+    class Bucket(AsyncTokenBucket):
+        taken = []
+
+        async def acquire(self, name):
+            self.taken.append(name)
+            return 0.0
+
+    watched = [Watched("AAPL", "NASDAQ", None), Watched("TCS", "NSE", None)]
+    asyncio.run(market_data.fetch_candles(Limited(), watched, limiter=Bucket()))
+    assert Bucket.taken == [YAHOO, YAHOO]
+
+    # Replayed candles are not rate limited
+    asyncio.run(market_data.fetch_candles(provider, watched, limiter=Bucket()))
+    assert Bucket.taken == [YAHOO, YAHOO]
+
+
+def test_copy_buffer():
+    moment = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    rows = list(csv.reader(market_data.copy_buffer([
+        Candle(moment, "AAPL", None, Decimal("1.5"), None, None, Decimal("2"), 100),
+    ])))
+    assert rows == [["2024-03-01T00:00:00+00:00", "AAPL", "", "1.5", "", "", "2", "100", "1d"]]
+    assert len(rows[0]) == len(market_data.COLUMNS)
+
+
+def test_yahoo_quote_symbol():
+    assert market_data.YahooProvider.quote_symbol(Watched("TCS", "NSE", None)) == "TCS.NS"
+    assert market_data.YahooProvider.quote_symbol(Watched("TCS.BO", "BSE", None)) == "TCS.BO"
+    assert market_data.YahooProvider.quote_symbol(Watched("AAPL", "NASDAQ", None)) == "AAPL"
+
+
+def test_yahoo_candles_keyed_by_trading_day():
+    # NSE bars: open at 03:45 UTC, the live bar at the latest quote (IST = UTC+05:30)
+    opens, live = datetime(2024, 3, 1, 3, 45, tzinfo=timezone.utc), datetime(2024, 3, 4, 9, 58, 17, tzinfo=timezone.utc)
+
+    def chart(request):
+        return httpx.Response(200, json={"chart": {"result": [{
+            "meta": {"gmtoffset": 19800},
+            "timestamp": [int(opens.timestamp()), int(live.timestamp())],
+            "indicators": {"quote": [{
+                "open": [1, 2], "high": [1, 2], "low": [1, 2], "close": [1, 2], "volume": [10, None],
+            }]},
+        }]}})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(chart)) as client:
+            return await market_data.YahooProvider().fetch(client, Watched("TCS", "NSE", None), opens)
+
+    candles = asyncio.run(fetch())
+    assert [c.time for c in candles] == [
+        datetime(2024, 3, 1, tzinfo=timezone.utc), datetime(2024, 3, 4, tzinfo=timezone.utc),
+    ]
@@ -0,0 +1,139 @@
+"""
+Tests for the net-worth balance sheet (shared/net_worth.py).
+
+Covers:
+- one user's sheet folds in investments, lendings, borrowings, EMIs,
+  income and expenses
+- the nightly INSERT ... SELECT snapshots active users once per day
+- POST /net-worth/snapshot stores the computed sheet
+"""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from shared import net_worth
+from shared.models import (
+    EMI, EMIPayment, Borrowing, Expense, Income, Investment, Lending, NetWorthSnapshot, Tenant, User,
+)
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID
+
+TODAY = date(2024, 5, 20)
+
+
+def _holdings(tenant_id, user_id):
+    emi_id = uuid.uuid4()
+    return [
+        Investment(tenant_id=tenant_id, user_id=user_id, investment_type="stock", asset_name="A",
+                   quantity=10, purchase_price=100, purchase_date=TODAY, current_value=1500),
+        Investment(tenant_id=tenant_id, user_id=user_id, investment_type="stock", asset_name="B",
+                   quantity=2, purchase_price=50, purchase_date=TODAY, current_price=75),
+        Lending(tenant_id=tenant_id, user_id=user_id, borrower_name="Sam", principal_amount=400,
+                total_received=100, lent_date=TODAY, status="partially_received"),
+        Lending(tenant_id=tenant_id, user_id=user_id, borrower_name="Kim", principal_amount=999,
+                remaining_amount=0, lent_date=TODAY, status="closed"),
+        Borrowing(tenant_id=tenant_id, user_id=user_id, lender_name="Bank", principal_amount=1000,
+                  remaining_amount=600, borrowed_date=TODAY, status="open"),
+        EMI(id=emi_id, tenant_id=tenant_id, user_id=user_id, loan_type="car", lender_name="Bank",
+            principal_amount=1200, interest_rate=10, tenure_months=2, monthly_emi=650,
+            start_date=TODAY, end_date=TODAY + timedelta(days=60), status="active"),
+        EMIPayment(tenant_id=tenant_id, emi_id=emi_id, installment_number=1, due_date=TODAY,
+                   amount=650, principal_component=590, interest_component=60,
+                   outstanding_balance=610, status="paid"),
+        EMIPayment(tenant_id=tenant_id, emi_id=emi_id, installment_number=2, due_date=TODAY,
+                   amount=650, principal_component=610, interest_component=40,
+                   outstanding_balance=0, status="pending"),
+        Income(tenant_id=tenant_id, user_id=user_id, source="salary", amount=3000, income_date=TODAY),
+        Income(tenant_id=tenant_id, user_id=user_id, source="salary", amount=3000,
+               income_date=date(2024, 4, 20)),
+        Expense(tenant_id=tenant_id, user_id=user_id, amount=1000, currency="USD", transaction_date=TODAY),
+        Expense(tenant_id=tenant_id, user_id=user_id, amount=2500, currency="USD",
+                transaction_date=date(2024, 4, 2)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_user_balance_sheet(db_session):
+    tenant_id, user_id = uuid.uuid4(), uuid.uuid4()
+    db_session.add_all(_holdings(tenant_id, user_id))
+    # Someone else's data stays out of the sheet
+    db_session.add(Income(tenant_id=tenant_id, user_id=uuid.uuid4(), source="salary",
+                          amount=10_000, income_date=TODAY))
+    await db_session.commit()
+
+    sheet = (await db_session.execute(
+        net_worth.user_balance_sheet(TODAY, tenant_id, user_id)
+    )).mappings().one()
+
+    assert float(sheet["investment_value"]) == 1650
+    assert float(sheet["lendings_outstanding"]) == 300
+    assert float(sheet["cash_balance"]) == 2500
+    assert float(sheet["income_monthly"]) == 3000
+    assert float(sheet["borrowings_owed"]) == 600
+    assert float(sheet["emi_remaining"]) == 610
+    assert float(sheet["total_assets"]) == 4450
+    assert float(sheet["total_liabilities"]) == 1210
+    assert float(sheet["net_worth"]) == 3240
+    assert float(sheet["savings_rate"]) == pytest.approx(66.67, abs=0.01)
+    assert float(sheet["debt_to_income_ratio"]) == pytest.approx(40.33, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_user_without_data_has_an_empty_sheet(db_session):
+    sheet = (await db_session.execute(
+        net_worth.user_balance_sheet(TODAY, uuid.uuid4(), uuid.uuid4())
+    )).mappings().one()
+    assert float(sheet["net_worth"]) == 0
+    assert float(sheet["savings_rate"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_snapshot_statement_covers_active_users_once(db_session):
+    tenant = Tenant(name="Acme", slug="acme")
+    other = Tenant(name="Other", slug="other")
+    db_session.add_all([tenant, other])
+    await db_session.flush()
+    active = User(tenant_id=tenant.id, email="a@acme.com", password_hash="x", full_name="A")
+    inactive = User(tenant_id=tenant.id, email="b@acme.com", password_hash="x", full_name="B", is_active=False)
+    elsewhere = User(tenant_id=other.id, email="c@other.com", password_hash="x", full_name="C")
+    db_session.add_all([active, inactive, elsewhere])
+    await db_session.flush()
+    db_session.add_all(_holdings(tenant.id, active.id))
+    await db_session.commit()
+
+    statement = net_worth.snapshot_statement("sqlite", TODAY, [tenant.id])
+    inserted = (await db_session.execute(statement)).scalars().all()
+    await db_session.commit()
+    assert inserted == [active.id]
+
+    snapshot = (await db_session.execute(select(NetWorthSnapshot))).scalar_one()
+    assert (snapshot.tenant_id, snapshot.user_id, snapshot.snapshot_date) == (tenant.id, active.id, TODAY)
+    assert snapshot.net_worth == Decimal("3240")
+
+    # Already snapshotted today
+    assert (await db_session.execute(statement)).scalars().all() == []
+    count = await db_session.execute(select(func.count()).select_from(NetWorthSnapshot))
+    assert count.scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_endpoint_stores_sheet(finance_client, auth_headers, session_factory):
+    tenant_id, user_id = uuid.UUID(TEST_TENANT_ID), uuid.UUID(TEST_USER_ID)
+    async with session_factory() as session:
+        session.add_all([
+            Investment(tenant_id=tenant_id, user_id=user_id, investment_type="stock", asset_name="A",
+                       quantity=1, purchase_price=100, purchase_date=date.today(), current_value=800),
+            Borrowing(tenant_id=tenant_id, user_id=user_id, lender_name="Bank", principal_amount=300,
+                      borrowed_date=date.today(), status="open"),
+        ])
+        await session.commit()
+
+    response = await finance_client.post("/net-worth/snapshot", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["investment_value"] == 800
+    assert body["borrowings_owed"] == 300
+    assert body["net_worth"] == 500
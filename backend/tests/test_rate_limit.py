@@ -0,0 +1,71 @@
+"""
+Tests for the provider rate limiter (shared/rate_limit.py).
+
+Covers:
+- per-provider limits and their environment overrides
+- throttled stock worker fetches are requeued with the bucket's countdown
+- the service waits briefly for a token, then reports retry_after
+- an unreachable Redis lets calls through
+
+The Lua bucket itself needs a Redis server.
+"""
+
+import asyncio
+
+import pytest
+import redis
+
+from shared import rate_limit
+from shared.rate_limit import FINNHUB, YAHOO, AsyncTokenBucket, Limit, TokenBucket
+from workers import stock_tasks
+
+
+def test_limits(monkeypatch):
+    assert rate_limit.limit_for(FINNHUB) == Limit(60, 60)
+    monkeypatch.setenv("RATE_LIMIT_FINNHUB", "30/1")
+    assert rate_limit.limit_for(FINNHUB).rate == 30
+    monkeypatch.setenv("RATE_LIMIT_YAHOO", "lots")
+    assert rate_limit.limit_for(YAHOO) == rate_limit.DEFAULT_LIMITS[YAHOO]
+
+
+def test_throttled_fetch_is_requeued(monkeypatch):
+    class Retry(Exception):
+        pass
+
+    class Task:
+        def retry(self, countdown, max_retries):
+            self.countdown = countdown
+            return Retry()
+
+    monkeypatch.setattr(stock_tasks.rate_limiter, "acquire", lambda provider: 0.0)
+    stock_tasks.requeue_if_throttled(Task(), YAHOO)
+
+    task = Task()
+    monkeypatch.setattr(stock_tasks.rate_limiter, "acquire", lambda provider: 4.5)
+    with pytest.raises(Retry):
+        stock_tasks.requeue_if_throttled(task, YAHOO)
+    assert 4.5 <= task.countdown <= 5.5
+
+
+def test_service_waits_then_gives_up():
+    class Bucket(AsyncTokenBucket):
+        def __init__(self, waits):
+            super().__init__()
+            self.waits = list(waits)
+
+        async def acquire(self, provider):
+            return self.waits.pop(0)
+
+    # A token frees up within max_wait: sleep for it and take it
+    bucket = Bucket([0.05, 0.0])
+    assert asyncio.run(bucket.wait(FINNHUB, max_wait=1)) == 0.0
+    assert bucket.waits == []
+
+    # Too far off: answer with the wait instead of sleeping
+    assert asyncio.run(Bucket([30.0]).wait(FINNHUB, max_wait=1)) == 30.0
+
+
+def test_unreachable_redis_lets_calls_through():
+    client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2)
+    assert TokenBucket(client).acquire(FINNHUB) == 0.0
+    assert asyncio.run(AsyncTokenBucket().acquire(FINNHUB)) == 0.0
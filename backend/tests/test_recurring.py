@@ -0,0 +1,147 @@
+"""
+Tests for the recurring-schedule index (shared/recurring.py).
+
+Covers:
+- income and expense templates keep their schedule in sync on create /
+  update / delete (there is no FK cascade to rely on)
+- GET /recurring lists templates from their schedules
+- rebuild_tenant backfills expense and income templates
+"""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from shared import recurring
+from shared.models import Expense, Income, RecurringSchedule
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID
+
+
+def _income(income_date: date, is_recurring=True, period="monthly"):
+    return {"source": "salary", "amount": 5000, "currency": "USD",
+            "income_date": income_date.isoformat(), "is_recurring": is_recurring,
+            "recurrence_period": period}
+
+
+async def _schedules(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(select(RecurringSchedule).order_by(RecurringSchedule.next_due_date))
+        return result.scalars().all()
+
+
+def test_expense_schedule():
+    expense = Expense(is_recurring=True, recurring_config={"next_due_date": "2024-03-05"})
+    assert recurring.expense_schedule(expense) == ("monthly", date(2024, 3, 5))
+
+    expense.recurring_config = {"frequency": "weekly", "next_due_date": "2024-03-05"}
+    assert recurring.expense_schedule(expense) == ("weekly", date(2024, 3, 5))
+
+    expense.is_recurring = False
+    assert recurring.expense_schedule(expense) is None
+
+
+@pytest.mark.asyncio
+async def test_income_schedule_follows_template(finance_client, auth_headers, session_factory):
+    due = date.today() + timedelta(days=3)
+    response = await finance_client.post("/income", json=_income(due), headers=auth_headers)
+    income_id = response.json()["id"]
+    await finance_client.post("/income", json=_income(due, is_recurring=False), headers=auth_headers)
+
+    schedules = await _schedules(session_factory)
+    assert [(str(s.income_id), s.frequency, s.next_due_date) for s in schedules] == [(income_id, "monthly", due)]
+
+    later = due + timedelta(days=7)
+    await finance_client.put(f"/income/{income_id}", json=_income(later, period="weekly"), headers=auth_headers)
+    schedules = await _schedules(session_factory)
+    assert [(s.frequency, s.next_due_date) for s in schedules] == [("weekly", later)]
+
+    await finance_client.put(f"/income/{income_id}", json=_income(later, is_recurring=False), headers=auth_headers)
+    assert await _schedules(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_templates_drops_schedules(finance_client, auth_headers, session_factory):
+    due = date.today() + timedelta(days=3)
+    response = await finance_client.post("/income", json=_income(due), headers=auth_headers)
+    await finance_client.delete(f"/income/{response.json()['id']}", headers=auth_headers)
+    assert await _schedules(session_factory) == []
+
+    expense = {"amount": 15, "currency": "USD", "description": "Streaming",
+               "transaction_date": date.today().isoformat(), "is_recurring": True,
+               "recurring_config": {"frequency": "weekly", "next_due_date": due.isoformat()}}
+    response = await finance_client.post("/expenses", json=expense, headers=auth_headers)
+    assert response.status_code == 200
+    expense_id = response.json()["id"]
+    schedules = await _schedules(session_factory)
+    assert [(str(s.expense_id), s.frequency, s.next_due_date) for s in schedules] == [(expense_id, "weekly", due)]
+
+    # Updates that leave the recurrence out keep the template as it is
+    await finance_client.put(f"/expenses/{expense_id}", json={**expense, "is_recurring": None, "amount": 20},
+                             headers=auth_headers)
+    assert len(await _schedules(session_factory)) == 1
+
+    await finance_client.delete(f"/expenses/{expense_id}", headers=auth_headers)
+    assert await _schedules(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_recurring_endpoint_reads_schedules(finance_client, auth_headers, session_factory):
+    tenant_id, user_id = uuid.UUID(TEST_TENANT_ID), uuid.UUID(TEST_USER_ID)
+    async with session_factory() as session:
+        session.add_all([
+            Expense(tenant_id=tenant_id, user_id=user_id, amount=15, currency="USD",
+                    description="Streaming", transaction_date=date(2024, 1, 10), is_recurring=True,
+                    recurring_config={"frequency": "monthly", "next_due_date": "2024-02-10"}),
+            Expense(tenant_id=tenant_id, user_id=user_id, amount=40, currency="USD",
+                    description="Groceries", transaction_date=date(2024, 1, 12)),
+        ])
+        await session.flush()
+        assert await recurring.rebuild_tenant(session, tenant_id) == 1
+        await session.commit()
+    await finance_client.post("/income", json=_income(date(2024, 2, 1)), headers=auth_headers)
+
+    response = await finance_client.get("/recurring", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [(e["description"], e["frequency"], e["next_due_date"]) for e in data["recurring_expenses"]] == [
+        ("Streaming", "monthly", "2024-02-10"),
+    ]
+    assert [(i["source"], i["next_due_date"]) for i in data["recurring_income"]] == [("salary", "2024-02-01")]
+    assert (data["total_recurring_expenses"], data["total_recurring_income"]) == (1, 1)
+
+    # Totals cover every schedule, not just the page
+    await finance_client.post("/income", json=_income(date(2024, 3, 1)), headers=auth_headers)
+    data = (await finance_client.get("/recurring", params={"limit": 1}, headers=auth_headers)).json()
+    assert len(data["recurring_income"]) == 1 and data["next_income_cursor"]
+    assert (data["total_recurring_expenses"], data["total_recurring_income"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_tenant(session_factory):
+    tenant_id, user_id = uuid.UUID(TEST_TENANT_ID), uuid.UUID(TEST_USER_ID)
+    async with session_factory() as session:
+        session.add_all([
+            Expense(tenant_id=tenant_id, user_id=user_id, amount=15, currency="USD",
+                    transaction_date=date(2024, 1, 10), is_recurring=True,
+                    recurring_config={"frequency": "weekly", "next_due_date": "2024-01-17"}),
+            # Recurring without a due date has nothing to schedule
+            Expense(tenant_id=tenant_id, user_id=user_id, amount=15, currency="USD",
+                    transaction_date=date(2024, 1, 10), is_recurring=True, recurring_config={}),
+            Income(tenant_id=tenant_id, user_id=user_id, source="rent", amount=900, currency="USD",
+                   income_date=date(2024, 2, 1), is_recurring=True, recurrence_period="monthly"),
+            Income(tenant_id=uuid.uuid4(), user_id=uuid.uuid4(), source="rent", amount=900, currency="USD",
+                   income_date=date(2024, 2, 1), is_recurring=True, recurrence_period="monthly"),
+        ])
+        await session.flush()
+        assert await recurring.rebuild_tenant(session, tenant_id) == 2
+        # Rebuilding again replaces rather than duplicates
+        assert await recurring.rebuild_tenant(session, tenant_id) == 2
+        await session.commit()
+
+    schedules = await _schedules(session_factory)
+    assert [(s.expense_id is not None, s.frequency, s.next_due_date) for s in schedules] == [
+        (True, "weekly", date(2024, 1, 17)),
+        (False, "monthly", date(2024, 2, 1)),
+    ]
@@ -0,0 +1,82 @@
+"""
+Tests for the response cache (shared/response_cache.py).
+
+Covers:
+- GET /anomalies – second call is a hit; a new expense invalidates it
+- /health/cache – per-endpoint counters
+- concurrent misses share one computation; errors are not cached
+- the conditional-GET ETag survives a cached response
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from shared.response_cache import ResponseCache
+
+EXPENSE = {"amount": 40, "currency": "USD", "transaction_date": "2024-03-01"}
+
+
+@pytest.mark.asyncio
+async def test_hit_until_tag_changes(finance_client, auth_headers, fake_redis):
+    first = await finance_client.get("/anomalies", headers=auth_headers)
+    second = await finance_client.get("/anomalies", headers=auth_headers)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+
+    await finance_client.post("/expenses", json=EXPENSE, headers=auth_headers)
+    await finance_client.get("/anomalies", headers=auth_headers)
+
+    stats = (await finance_client.get("/health/cache")).json()["response_cache"]
+    assert stats["anomalies"]["hits"] >= 1
+    assert stats["anomalies"]["misses"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_cached_response_keeps_etag(finance_client, auth_headers, fake_redis):
+    await finance_client.get("/income/summary", headers=auth_headers)
+    cached = await finance_client.get("/income/summary", headers=auth_headers)
+    assert cached.status_code == 200
+    assert cached.headers["ETag"].startswith('W/"')
+
+
+def _request(query=""):
+    return SimpleNamespace(state=SimpleNamespace(user={"user_id": "u1"}), url=SimpleNamespace(query=query))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once(fake_redis):
+    cache = ResponseCache()
+    cache._redis = fake_redis
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"total": 1}
+
+    responses = await asyncio.gather(*[
+        cache.fetch("report", _request(), (), False, 60, compute) for _ in range(5)
+    ])
+    assert calls == 1
+    assert {r.body for r in responses} == {b'{"total": 1}'}
+    assert cache.snapshot()["report"] == {"misses": 1, "coalesced": 4}
+
+    # Different query string, different entry
+    await cache.fetch("report", _request("month=3"), (), False, 60, compute)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(fake_redis):
+    cache = ResponseCache()
+    cache._redis = fake_redis
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.fetch("report", _request(), (), False, 60, fail)
+    assert not any(key.startswith("respcache:") for key in fake_redis.values)
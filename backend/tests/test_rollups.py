@@ -0,0 +1,160 @@
+"""
+Tests for the monthly category rollups (shared/rollups.py).
+
+Covers:
+- expense create / update / delete keep the rollup in step
+- income writes feed GET /income/summary
+- GET /budget-suggestions and GET /anomalies read from the rollup
+- rebuild_tenant reproduces the incrementally maintained rows
+"""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from shared import rollups
+from shared.models import MonthlyCategoryRollup
+from tests.conftest import TEST_TENANT_ID, create_expense
+
+
+async def _rollup_rows(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(MonthlyCategoryRollup).order_by(
+                MonthlyCategoryRollup.entry_type,
+                MonthlyCategoryRollup.month,
+                MonthlyCategoryRollup.category_key,
+            )
+        )
+        return [
+            (r.entry_type, r.month, r.category_key, r.currency, float(r.total_amount),
+             r.entry_count, float(r.min_amount), float(r.max_amount), float(r.sum_of_squares))
+            for r in result.scalars().all()
+        ]
+
+
+# ── Incremental maintenance ──────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_expense_writes_maintain_rollup(finance_client, auth_headers, session_factory):
+    """Create, update and delete should keep sum/count/min/max/sumsq exact."""
+    first = await create_expense(finance_client, auth_headers, 10.00, "2024-03-05")
+    await create_expense(finance_client, auth_headers, 30.00, "2024-03-20")
+    third = await create_expense(finance_client, auth_headers, 50.00, "2024-03-25")
+
+    assert await _rollup_rows(session_factory) == [
+        ("expense", date(2024, 3, 1), "", "USD", 90.0, 3, 10.0, 50.0, 3500.0),
+    ]
+
+    # Moving the largest expense to April recomputes March's max
+    await finance_client.put(
+        f"/expenses/{third}",
+        json={"amount": 50.00, "currency": "USD", "transaction_date": "2024-04-02"},
+        headers=auth_headers,
+    )
+    assert await _rollup_rows(session_factory) == [
+        ("expense", date(2024, 3, 1), "", "USD", 40.0, 2, 10.0, 30.0, 1000.0),
+        ("expense", date(2024, 4, 1), "", "USD", 50.0, 1, 50.0, 50.0, 2500.0),
+    ]
+
+    # Deleting the smallest recomputes min; deleting the last row drops the group
+    await finance_client.delete(f"/expenses/{first}", headers=auth_headers)
+    await finance_client.delete(f"/expenses/{third}", headers=auth_headers)
+    assert await _rollup_rows(session_factory) == [
+        ("expense", date(2024, 3, 1), "", "USD", 30.0, 1, 30.0, 30.0, 900.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_category_moves_rollup_to_uncategorized(finance_client, auth_headers, session_factory):
+    """Deleting a category folds its groups into the uncategorized bucket."""
+    category = await finance_client.post(
+        "/categories", json={"name": "Fuel", "type": "expense"}, headers=auth_headers
+    )
+    category_id = category.json()["id"]
+    await create_expense(finance_client, auth_headers, 20.00, "2024-05-01", category_id)
+    await create_expense(finance_client, auth_headers, 5.00, "2024-05-02")
+
+    response = await finance_client.delete(f"/categories/{category_id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    assert await _rollup_rows(session_factory) == [
+        ("expense", date(2024, 5, 1), "", "USD", 25.0, 2, 5.0, 20.0, 425.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_income_summary_reads_rollup(finance_client, auth_headers):
+    """Income summary totals and per-source counts come from the rollup."""
+    for source, amount, income_date, is_recurring in [
+        ("salary", 1000.00, "2024-01-31", True),
+        ("salary", 1000.00, "2024-02-29", False),
+        ("freelance", 250.00, "2024-02-10", False),
+    ]:
+        response = await finance_client.post(
+            "/income",
+            json={"source": source, "amount": amount, "income_date": income_date, "is_recurring": is_recurring},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    response = await finance_client.get("/income/summary", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2250.00
+    assert data["by_source"] == [
+        {"source": "salary", "total": 2000.00, "count": 2},
+        {"source": "freelance", "total": 250.00, "count": 1},
+    ]
+    assert data["recurring_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_anomalies_use_rollup_category_average(finance_client, auth_headers):
+    """An expense far above its category's recent average is flagged."""
+    category = await finance_client.post(
+        "/categories", json={"name": "Coffee", "type": "expense"}, headers=auth_headers
+    )
+    category_id = category.json()["id"]
+    this_month = date.today().replace(day=1)
+    last_month = (this_month - timedelta(days=1)).replace(day=1).isoformat()
+    for amount in (5.00, 5.00, 5.00, 5.00, 5.00):
+        await create_expense(finance_client, auth_headers, amount, last_month, category_id)
+    spike = await create_expense(finance_client, auth_headers, 80.00, this_month.isoformat(), category_id)
+
+    response = await finance_client.get("/anomalies", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["expense_id"] for a in data] == [spike]
+    assert data[0]["category"] == "Coffee"
+    assert data[0]["category_avg"] == 5.00
+
+
+# ── Rebuild ──────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental(finance_client, auth_headers, session_factory):
+    """rebuild_tenant should reproduce exactly what the write paths maintained."""
+    category = await finance_client.post(
+        "/categories", json={"name": "Rent", "type": "expense"}, headers=auth_headers
+    )
+    category_id = category.json()["id"]
+    await create_expense(finance_client, auth_headers, 12.50, "2024-06-01", category_id)
+    await create_expense(finance_client, auth_headers, 7.25, "2024-06-15", category_id)
+    await create_expense(finance_client, auth_headers, 3.00, "2024-07-04")
+    await finance_client.post(
+        "/income",
+        json={"source": "gift", "amount": 40.00, "income_date": "2024-06-09"},
+        headers=auth_headers,
+    )
+
+    incremental = await _rollup_rows(session_factory)
+
+    async with session_factory() as session:
+        count = await rollups.rebuild_tenant(session, uuid.UUID(TEST_TENANT_ID))
+        await session.commit()
+
+    assert count == len(incremental) == 3
+    assert await _rollup_rows(session_factory) == incremental
@@ -0,0 +1,116 @@
+"""
+Tests for bank statement layout detection (services/finance/statement_formats.py).
+
+Covers:
+- named layouts matched on the header, or forced by name
+- generic detection of columns and a single date format from a sample
+- the compiled date parser agrees with strptime
+- POST /import/bank-statement with an explicit bank layout
+"""
+
+import io
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from services.finance.statement_formats import (
+    Rejection,
+    StatementFormatError,
+    StatementRow,
+    compile_date_parser,
+    parse_amount,
+    read_statement,
+)
+
+
+def _parse(content, layout=None):
+    mapper, records = read_statement(io.StringIO(content), layout)
+    return mapper, [mapper(line, fields) for line, fields in records]
+
+
+def test_hdfc_detected_from_header():
+    content = (
+        "Date,Narration,Chq./Ref.No.,Value Dt,Withdrawal Amt.,Deposit Amt.,Closing Balance\n"
+        "05/04/24,UPI-GROCER,0001,05/04/24,\"1,200.00\",,10000\n"
+        "06/04/24,SALARY,0002,06/04/24,,50000,60000\n"
+    )
+    mapper, rows = _parse(content)
+    assert (mapper.layout, mapper.date_format) == ("hdfc", "%d/%m/%y")
+    assert rows == [
+        StatementRow(2, date(2024, 4, 5), "UPI-GROCER", Decimal("1200.00"), "Bank Transfer"),
+        Rejection(3, "no debit amount"),
+    ]
+
+
+def test_forced_layout_must_match_header():
+    content = "Txn Date,Value Date,Description,Ref No./Cheque No.,Debit,Credit,Balance\n1 Apr 2024,,ATM WDL,,500,,\n"
+    mapper, rows = _parse(content, "sbi")
+    assert rows[0].transaction_date == date(2024, 4, 1)
+
+    with pytest.raises(StatementFormatError):
+        read_statement(io.StringIO(content), "icici")
+    with pytest.raises(StatementFormatError):
+        read_statement(io.StringIO(content), "unknown")
+
+
+def test_generic_resolves_one_date_format_from_sample():
+    content = (
+        "Value Date,Particulars,Amount\n"
+        "03/01/2024,Rent,900\n"
+        "03/25/2024,Internet,40\n"
+        "not a date,Bad,10\n"
+    )
+    mapper, rows = _parse(content)
+    assert (mapper.layout, mapper.date_format) == ("generic", "%m/%d/%Y")
+    assert [r.transaction_date for r in rows[:2]] == [date(2024, 3, 1), date(2024, 3, 25)]
+    assert rows[2] == Rejection(4, "missing or unrecognised date")
+
+
+def test_generic_without_amount_column():
+    with pytest.raises(StatementFormatError):
+        read_statement(io.StringIO("Date,Description,Balance\n01/01/2024,x,5\n"))
+
+
+@pytest.mark.parametrize("fmt", ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y", "%d/%m/%y"])
+def test_compiled_date_parser_matches_strptime(fmt):
+    parse = compile_date_parser(fmt)
+    day = date(1999, 12, 25)
+    while day < date(2031, 1, 1):
+        assert parse(day.strftime(fmt)) == datetime.strptime(day.strftime(fmt), fmt).date()
+        day += timedelta(days=37)
+    with pytest.raises(ValueError):
+        parse("31/02/2024" if fmt.startswith("%d/%m") else "2024-02-31")
+
+
+def test_parse_amount():
+    assert parse_amount("₹ 1,234.50") == Decimal("1234.50")
+    assert parse_amount("$12") == Decimal("12")
+    assert parse_amount("") is None
+    assert parse_amount("n/a") is None
+
+
+@pytest.mark.asyncio
+async def test_import_with_bank_layout(finance_client, auth_headers):
+    content = (
+        "S No.,Value Date,Transaction Date,Cheque Number,Transaction Remarks,"
+        "Withdrawal Amount (INR ),Deposit Amount (INR ),Balance (INR )\n"
+        "1,02/05/2024,02/05/2024,,NEFT-RENT,15000.00,0.00,5000\n"
+    )
+    response = await finance_client.post(
+        "/import/bank-statement",
+        files={"file": ("icici.csv", content.encode(), "text/csv")},
+        data={"currency": "INR", "bank": "icici"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["statement_format"] == "icici"
+    assert response.json()["imported_count"] == 1
+
+    response = await finance_client.post(
+        "/import/bank-statement",
+        files={"file": ("x.csv", content.encode(), "text/csv")},
+        data={"bank": "chase"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,77 @@
+"""
+Tests for the async object storage layer (shared/storage.py).
+
+Covers:
+- LocalFileStorage streams uploads to disk and rejects keys outside the bucket
+- MinioStorage runs SDK calls off the event loop and streams unknown lengths
+- POST /import/bank-statement archives the statement
+- POST /profile/upload-image stores the image and returns a download URL
+"""
+
+import io
+import threading
+from pathlib import Path
+
+import pytest
+
+from shared.config import get_settings
+from shared.storage import LocalFileStorage, MinioStorage, PART_SIZE, StorageError
+from tests.conftest import TEST_USER_ID
+
+
+@pytest.mark.asyncio
+async def test_local_storage_roundtrip(tmp_path):
+    storage = LocalFileStorage(str(tmp_path))
+    await storage.put_stream("docs", "a/b.txt", io.BytesIO(b"hello"))
+    assert (tmp_path / "docs" / "a" / "b.txt").read_bytes() == b"hello"
+    assert await storage.presigned_get_url("docs", "a/b.txt") == (tmp_path / "docs" / "a" / "b.txt").as_uri()
+
+    with pytest.raises(StorageError):
+        await storage.put_stream("docs", "../escape.txt", io.BytesIO(b"x"))
+
+
+@pytest.mark.asyncio
+async def test_minio_calls_run_on_worker_threads():
+    calls = []
+
+    class FakeMinio:
+        def put_object(self, bucket, key, data, length, content_type, part_size):
+            calls.append((threading.current_thread().name, bucket, key, data.read(), length, part_size))
+
+    storage = MinioStorage(FakeMinio(), max_workers=2)
+    await storage.put_stream("bank-statements", "k.csv", io.BytesIO(b"a,b"), 3, "text/csv")
+    await storage.put_stream("bank-statements", "k2.csv", io.BytesIO(b"c"))
+    storage.close()
+
+    assert [c[0].startswith("storage") for c in calls] == [True, True]
+    assert calls[0][1:] == ("bank-statements", "k.csv", b"a,b", 3, 0)
+    assert calls[1][4:] == (-1, PART_SIZE)
+
+
+@pytest.mark.asyncio
+async def test_statement_import_is_archived(finance_client, auth_headers):
+    response = await finance_client.post(
+        "/import/bank-statement",
+        files={"file": ("s.csv", b"Date,Description,Debit\n01/03/2024,Tea,12\n", "text/csv")},
+        data={"currency": "USD"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    archived = Path(get_settings().STORAGE_LOCAL_PATH) / "bank-statements" / TEST_USER_ID / "statements" / f"{job_id}.csv"
+    assert archived.read_bytes().startswith(b"Date,Description,Debit")
+
+
+@pytest.mark.asyncio
+async def test_profile_image_upload(auth_client, auth_headers):
+    response = await auth_client.post(
+        "/profile/upload-image",
+        files={"file": ("me.png", b"\x89PNG fake", "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    key = data["image_url"].removeprefix("/api/profile-images/")
+    stored = Path(get_settings().STORAGE_LOCAL_PATH) / "profile-images" / key
+    assert stored.read_bytes() == b"\x89PNG fake"
+    assert data["download_url"] == stored.resolve().as_uri()
@@ -0,0 +1,137 @@
+"""
+Tests for the Finance service – spend time series (shared/timeseries.py).
+
+Endpoints tested:
+- GET /expenses/timeseries – daily and monthly buckets, per-category split
+- GET /expenses/timeseries – invalid interval / range → 400
+- move_to_date – date changes are a DELETE + INSERT, never an UPDATE
+"""
+
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from shared import timeseries
+from shared.models import Expense
+from tests.conftest import TEST_TENANT_ID, TEST_USER_ID, create_expense
+
+
+@pytest.mark.asyncio
+async def test_daily_timeseries(finance_client, auth_headers):
+    """Daily buckets sum the expenses of each day inside the range."""
+    await create_expense(finance_client, auth_headers, 10.00, "2024-03-01")
+    await create_expense(finance_client, auth_headers, 5.50, "2024-03-01")
+    await create_expense(finance_client, auth_headers, 20.00, "2024-03-03")
+    await create_expense(finance_client, auth_headers, 99.00, "2024-04-01")
+
+    response = await finance_client.get(
+        "/expenses/timeseries",
+        params={"interval": "day", "start_date": "2024-03-01", "end_date": "2024-03-31"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["interval"] == "day"
+    assert data["points"] == [
+        {"bucket": "2024-03-01", "total": 15.50, "count": 2},
+        {"bucket": "2024-03-03", "total": 20.00, "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_monthly_timeseries_by_category(finance_client, auth_headers):
+    """Monthly ranges widen to whole months and split per category on request."""
+    category = await finance_client.post(
+        "/categories", json={"name": "Travel", "type": "expense"}, headers=auth_headers
+    )
+    travel_id = category.json()["id"]
+    await create_expense(finance_client, auth_headers, 100.00, "2023-12-31", travel_id)
+    await create_expense(finance_client, auth_headers, 40.00, "2024-01-05", travel_id)
+    await create_expense(finance_client, auth_headers, 60.00, "2024-01-20", travel_id)
+    await create_expense(finance_client, auth_headers, 7.00, "2024-01-21")
+
+    response = await finance_client.get(
+        "/expenses/timeseries",
+        params={"interval": "month", "start_date": "2023-12-15", "end_date": "2024-01-10"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["start_date"], data["end_date"]) == ("2023-12-01", "2024-01-31")
+    assert data["points"] == [
+        {"bucket": "2023-12-01", "total": 100.00, "count": 1},
+        {"bucket": "2024-01-01", "total": 107.00, "count": 3},
+    ]
+
+    response = await finance_client.get(
+        "/expenses/timeseries",
+        params={
+            "interval": "month",
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "group_by_category": True,
+        },
+        headers=auth_headers,
+    )
+    points = {p["category_id"]: (p["total"], p["count"]) for p in response.json()["points"]}
+    assert points == {travel_id: (100.00, 2), None: (7.00, 1)}
+
+    response = await finance_client.get(
+        "/expenses/timeseries",
+        params={"interval": "month", "start_date": "2024-01-01", "category_id": travel_id},
+        headers=auth_headers,
+    )
+    assert response.json()["points"][0] == {"bucket": "2024-01-01", "total": 100.00, "count": 2}
+
+
+@pytest.mark.asyncio
+async def test_timeseries_rejects_bad_parameters(finance_client, auth_headers):
+    response = await finance_client.get(
+        "/expenses/timeseries", params={"interval": "week"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+    response = await finance_client.get(
+        "/expenses/timeseries",
+        params={"start_date": "2024-05-02", "end_date": "2024-05-01"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_postgres_reads_continuous_aggregate():
+    """On PostgreSQL the series comes from the cagg, filtered by tenant and user."""
+    query = timeseries._expense_series_query(
+        "postgresql", uuid.uuid4(), uuid.uuid4(), timeseries.MONTH,
+        date(2020, 1, 1), date(2024, 12, 31), None, False,
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "FROM expenses_monthly" in sql
+    assert "expenses_monthly.tenant_id" in sql
+    assert "expenses_monthly.user_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_move_to_date_reinserts_row(async_engine, db_session):
+    """The partitioning date is never UPDATEd: the row is re-inserted under the same id."""
+    expense = Expense(tenant_id=uuid.UUID(TEST_TENANT_ID), user_id=uuid.UUID(TEST_USER_ID),
+                      amount=12, currency="USD", description="Lunch", transaction_date=date(2024, 3, 30))
+    db_session.add(expense)
+    await db_session.commit()
+    expense_id, created_at = expense.id, expense.created_at
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    expense.description = "Team lunch"
+    await timeseries.move_to_date(db_session, expense, Expense.transaction_date, date(2024, 7, 1))
+    await db_session.commit()
+    event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert statements == ["DELETE", "INSERT"]
+    row = (await db_session.execute(select(Expense))).scalar_one()
+    assert (row.id, row.transaction_date, row.description) == (expense_id, date(2024, 7, 1), "Team lunch")
+    assert row.created_at == created_at
@@ -0,0 +1,77 @@
+"""
+Tests for per-user data versions and conditional GETs (shared/versioning.py).
+
+Covers:
+- GET /expenses – weak ETag, 304 on a matching If-None-Match
+- POST /expenses and DELETE /categories/{id} bump the versions lists depend on
+- POST /budgets invalidates the dashboard summary
+- no Redis → no ETag, full responses
+- If-None-Match parsing
+"""
+
+import pytest
+
+from shared.versioning import _matches
+
+
+EXPENSE = {"amount": 12.5, "currency": "USD", "transaction_date": "2024-03-01"}
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_and_bump(finance_client, auth_headers, fake_redis):
+    first = await finance_client.get("/expenses", headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = await finance_client.get("/expenses", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # A different query string is a different representation
+    paged = await finance_client.get("/expenses?limit=5", headers={**auth_headers, "If-None-Match": etag})
+    assert paged.status_code == 200
+
+    assert (await finance_client.post("/expenses", json=EXPENSE, headers=auth_headers)).status_code == 200
+    fresh = await finance_client.get("/expenses", headers={**auth_headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert len(fresh.json()) == 1
+    assert fresh.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_category_delete_invalidates_expense_list(finance_client, auth_headers, fake_redis):
+    created = await finance_client.post("/categories", json={"name": "Gone", "type": "expense"}, headers=auth_headers)
+    etag = (await finance_client.get("/budgets", headers=auth_headers)).headers["ETag"]
+
+    await finance_client.delete(f"/categories/{created.json()['id']}", headers=auth_headers)
+    response = await finance_client.get("/budgets", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_budget_change_invalidates_dashboard(finance_client, auth_headers, fake_redis):
+    etag = (await finance_client.get("/dashboard/summary", headers=auth_headers)).headers["ETag"]
+
+    budget = {"name": "Food", "amount": 300, "currency": "USD", "period": "monthly",
+              "start_date": "2024-01-01", "end_date": "2024-12-31"}
+    assert (await finance_client.post("/budgets", json=budget, headers=auth_headers)).status_code == 200
+    response = await finance_client.get("/dashboard/summary", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_no_redis_no_etag(finance_client, auth_headers):
+    response = await finance_client.get("/expenses", headers={**auth_headers, "If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_if_none_match_parsing():
+    etag = 'W/"abc"'
+    assert _matches('W/"abc"', etag)
+    assert _matches('"abc"', etag)
+    assert _matches('"zzz", W/"abc"', etag)
+    assert _matches("*", etag)
+    assert not _matches('"abcd"', etag)
+    assert not _matches(None, etag)
@@ -0,0 +1,61 @@
+"""
+Tests for the worker process resources (workers/resources.py).
+
+Covers:
+- pool sizing follows the worker pool type and concurrency
+- the engine and clients are created once per process and reused
+- close reports pool metrics and releases everything
+"""
+
+import pytest
+from sqlalchemy import text
+
+from workers import resources
+
+
+@pytest.fixture
+def worker_resources(tmp_path, monkeypatch):
+    monkeypatch.setattr(resources, "DATABASE_URL", f"sqlite:///{tmp_path / 'worker.db'}")
+    monkeypatch.setattr(resources, "_threads_per_process", 1)
+    yield resources
+    resources.close()
+
+
+def test_threads_per_process():
+    assert resources.threads_per_process("prefork", 8) == 1
+    assert resources.threads_per_process("solo", 8) == 1
+    assert resources.threads_per_process("threads", 8) == 8
+    assert resources.threads_per_process("gevent", 0) == 1
+
+
+def test_pool_size_from_worker_and_env(worker_resources, monkeypatch):
+    class Worker:
+        pool_cls = "threads"
+        concurrency = 6
+
+    resources._record_concurrency(sender=Worker())
+    assert resources.pool_size() == 6
+
+    monkeypatch.setenv("WORKER_DB_POOL_SIZE", "3")
+    assert resources.pool_size() == 3
+
+
+def test_resources_are_reused(worker_resources):
+    engine = resources.engine()
+    assert resources.engine() is engine
+    assert resources.http_client() is resources.http_client()
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    metrics = resources.pool_metrics()
+    assert metrics["connects"] == 1
+    assert metrics["checkouts"] == 3
+    assert metrics["checked_out"] == 0
+
+    client = resources.http_client()
+    resources.close()
+    assert client.is_closed
+    assert resources.pool_metrics() == {"connects": 0, "checkouts": 0}
+    assert resources.engine() is not engine
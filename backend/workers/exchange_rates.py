@@ -0,0 +1,219 @@
+"""
+Exchange-rate feeds for the workers.
+
+``update_exchange_rates`` stores today's USD quotes, and
+``backfill_exchange_rates`` stores a date range for several base
+currencies, so expenses dated before the feed existed no longer stay
+unconverted (see ``get_exchange_rate`` in the finance service).  Both:
+
+* fetch through a ``RateProvider`` -- ``ExchangeRateApiProvider`` (the
+  exchangerate-api.com feed) or ``FileRateProvider`` (a local CSV, so a
+  backfill can run offline), chosen with ``EXCHANGE_RATE_PROVIDER``;
+* run the (base, date) fetches concurrently under a semaphore of
+  ``EXCHANGE_RATE_CONCURRENCY``;
+* write every quote of a batch with one multi-row
+  ``INSERT ... ON CONFLICT (base_currency, target_currency, date)``.
+
+``reconvert_statement`` then recomputes ``exchange_rate`` and
+``amount_in_base_currency`` of the expenses in the backfilled range in one
+``UPDATE``.  Run a backfill by hand with::
+
+    python -m workers.exchange_rates --start 2023-01-01 --end 2023-12-31 [--base USD --base EUR]
+
+Tables are lightweight ``table()`` constructs, as in ``shared.net_worth``.
+"""
+
+import abc
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import httpx
+from sqlalchemy import Date, Numeric, String, Uuid, bindparam, column, select, table, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Insert
+
+logger = logging.getLogger(__name__)
+
+# Expenses are converted into this currency (see get_exchange_rate)
+PIVOT_CURRENCY = "USD"
+DEFAULT_CONCURRENCY = 8
+# Rows per INSERT; five parameters each stays well under Postgres' 65535
+UPSERT_BATCH_SIZE = 5000
+API_TIMEOUT_SECONDS = 10.0
+
+_exchange_rates = table(
+    "exchange_rates",
+    column("id", Uuid), column("base_currency", String), column("target_currency", String),
+    column("rate", Numeric), column("date", Date), column("source", String),
+)
+_currencies = table("currencies", column("code", String))
+
+
+class RateProvider(abc.ABC):
+    """Quotes of one base currency on one date: ``{target: rate}``."""
+    name = "provider"
+
+    @abc.abstractmethod
+    async def fetch(self, client: httpx.AsyncClient, base: str, on: date) -> Dict[str, Decimal]:
+        ...
+
+
+class ExchangeRateApiProvider(RateProvider):
+    name = "api"
+    URL = "https://v6.exchangerate-api.com/v6"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    async def fetch(self, client: httpx.AsyncClient, base: str, on: date) -> Dict[str, Decimal]:
+        if on >= date.today():
+            url = f"{self.URL}/{self.api_key}/latest/{base}"
+        else:
+            url = f"{self.URL}/{self.api_key}/history/{base}/{on.year}/{on.month}/{on.day}"
+        response = await client.get(url, timeout=API_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        rates = response.json().get("conversion_rates", {})
+        return {target: Decimal(str(rate)) for target, rate in rates.items()}
+
+
+class FileRateProvider(RateProvider):
+    """Rates from a CSV with ``date,base_currency,target_currency,rate`` columns."""
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._rates: Dict[tuple, Dict[str, Decimal]] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    key = (row["base_currency"].strip().upper(), date.fromisoformat(row["date"].strip()))
+                    self._rates.setdefault(key, {})[row["target_currency"].strip().upper()] = Decimal(row["rate"].strip())
+                except (KeyError, ValueError, InvalidOperation, AttributeError):
+                    logger.warning("Skipping malformed exchange rate row in %s: %s", path, row)
+
+    async def fetch(self, client: httpx.AsyncClient, base: str, on: date) -> Dict[str, Decimal]:
+        return dict(self._rates.get((base, on), {}))
+
+
+def create_provider(name: Optional[str] = None) -> RateProvider:
+    name = name or os.getenv("EXCHANGE_RATE_PROVIDER", "api")
+    if name == "file":
+        return FileRateProvider(os.getenv("EXCHANGE_RATE_FILE", "exchange_rates.csv"))
+    if name == "api":
+        return ExchangeRateApiProvider(os.getenv("EXCHANGE_RATE_API_KEY", ""))
+    raise ValueError(f"Unknown exchange rate provider: {name}")
+
+
+def days_between(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+async def fetch_rates(
+    provider: RateProvider,
+    bases: Sequence[str],
+    days: Sequence[date],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[dict]:
+    """
+    Fetch every (base, day) with at most ``concurrency`` requests in flight.
+    Returns one ``exchange_rates`` row per quote; failed fetches are logged
+    and skipped.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def one(client: httpx.AsyncClient, base: str, on: date) -> List[dict]:
+        async with semaphore:
+            try:
+                rates = await provider.fetch(client, base, on)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Could not fetch %s rates for %s: %s", base, on, e)
+                return []
+        return [
+            {"base_currency": base, "target_currency": target, "rate": rate, "date": on, "source": provider.name}
+            for target, rate in rates.items()
+            if target != base and rate > 0
+        ]
+
+    async with httpx.AsyncClient() as client:
+        batches = await asyncio.gather(*(one(client, base, on) for base in bases for on in days))
+    return [row for batch in batches for row in batch]
+
+
+def known_currencies():
+    """``exchange_rates`` references ``currencies``; quotes for other codes are dropped."""
+    return select(_currencies.c.code)
+
+
+def upsert_statements(dialect_name: str, rows: Sequence[dict]) -> Iterator[Insert]:
+    """One multi-row upsert per ``UPSERT_BATCH_SIZE`` rows."""
+    dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = dialect_insert(_exchange_rates).values(
+            [{"id": uuid.uuid4(), **row} for row in rows[start:start + UPSERT_BATCH_SIZE]]
+        )
+        yield stmt.on_conflict_do_update(
+            index_elements=["base_currency", "target_currency", "date"],
+            set_={"rate": stmt.excluded.rate, "source": stmt.excluded.source},
+        )
+
+
+def reconvert_statement():
+    """
+    Re-price the expenses of ``:start``..``:end`` in ``:currencies`` at the
+    latest rate on or before their date, quoted either way against the
+    pivot.  Only rows whose rate changes are written; returns their
+    ``user_id``.
+    """
+    return text("""
+        WITH rates AS (
+            SELECT e.id,
+                   (SELECT CASE WHEN r.target_currency = :pivot THEN r.rate ELSE 1.0 / r.rate END
+                    FROM exchange_rates r
+                    WHERE ((r.base_currency = e.currency AND r.target_currency = :pivot)
+                           OR (r.base_currency = :pivot AND r.target_currency = e.currency))
+                      AND r.date <= e.transaction_date
+                    ORDER BY r.date DESC, CASE WHEN r.target_currency = :pivot THEN 0 ELSE 1 END
+                    LIMIT 1) AS rate
+            FROM expenses e
+            WHERE e.transaction_date BETWEEN :start AND :end
+              AND e.currency IN :currencies
+        )
+        UPDATE expenses
+        SET exchange_rate = ROUND(rates.rate, 6),
+            amount_in_base_currency = ROUND(expenses.amount * rates.rate, 2),
+            updated_at = CURRENT_TIMESTAMP
+        FROM rates
+        WHERE expenses.id = rates.id
+          AND rates.rate IS NOT NULL
+          AND expenses.exchange_rate IS DISTINCT FROM ROUND(rates.rate, 6)
+        RETURNING expenses.user_id
+    """).bindparams(bindparam("currencies", expanding=True))
+
+
+def affected_currencies(rows: Iterable[dict]) -> List[str]:
+    """Currencies whose conversion into the pivot the ``rows`` can change."""
+    return sorted({c for row in rows for c in (row["base_currency"], row["target_currency"])} - {PIVOT_CURRENCY})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill exchange_rates and re-price the affected expenses.")
+    parser.add_argument("--start", required=True, type=date.fromisoformat)
+    parser.add_argument("--end", required=True, type=date.fromisoformat)
+    parser.add_argument("--base", action="append", help=f"Base currency (repeatable, default {PIVOT_CURRENCY})")
+    parser.add_argument("--provider", choices=["api", "file"], help="Default: EXCHANGE_RATE_PROVIDER")
+    parser.add_argument("--no-reconvert", action="store_true", help="Only store the rates")
+    args = parser.parse_args()
+
+    from workers.tasks import backfill_exchange_rates
+
+    print(backfill_exchange_rates(
+        args.start.isoformat(), args.end.isoformat(), bases=args.base,
+        provider=args.provider, reconvert=not args.no_reconvert,
+    ))
@@ -0,0 +1,268 @@
+"""
+Watchlist market-data ingestion for ``update_market_data``.
+
+Every run fetches daily OHLCV candles for each distinct watched symbol and
+writes them into the ``market_data`` hypertable that ``GET /chart/{symbol}``
+reads:
+
+* symbols are fetched in batches of ``MARKET_DATA_BATCH``, concurrently
+  (``MARKET_DATA_CONCURRENCY``) through a ``MarketDataProvider`` --
+  ``YahooProvider``, or ``ReplayProvider`` replaying a local CSV so the
+  pipeline runs offline -- chosen with ``MARKET_DATA_PROVIDER``;
+* each symbol resumes from its newest stored candle (found through
+  ``idx_market_data_symbol_time``), or backfills ``BACKFILL_DAYS``;
+* a batch is ``COPY``-ed into a temporary staging table and merged with one
+  ``INSERT ... SELECT DISTINCT ON ... ON CONFLICT (symbol, interval, time)``,
+  so re-fetched candles update in place (today's candle moves until the
+  close) instead of duplicating -- daily candles are keyed by the UTC
+  midnight of their trading day (``trading_day``).
+
+The merge relies on ``idx_market_data_dedup`` (see ``shared/schema.py``).
+"""
+
+import abc
+import asyncio
+import csv
+import io
+import logging
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import text
+
+from shared.rate_limit import YAHOO, AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+# The interval GET /chart/{symbol} reads for "1D"
+DAILY = "1d"
+BACKFILL_DAYS = 365
+# Re-fetch this much before the newest stored candle, in case it was revised
+OVERLAP = timedelta(days=2)
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT_SECONDS = 15.0
+
+COLUMNS = ("time", "symbol", "exchange", "open", "high", "low", "close", "volume", "interval")
+
+
+class Watched(NamedTuple):
+    symbol: str
+    exchange: Optional[str]
+    latest: Optional[datetime]  # newest stored candle
+
+
+class Candle(NamedTuple):
+    time: datetime
+    symbol: str
+    exchange: Optional[str]
+    open: Optional[Decimal]
+    high: Optional[Decimal]
+    low: Optional[Decimal]
+    close: Decimal
+    volume: Optional[int]
+    interval: str = DAILY
+
+
+class MarketDataProvider(abc.ABC):
+    """Daily candles of one symbol from ``since`` (inclusive) until now."""
+    name = "provider"
+    # shared.rate_limit bucket each fetch takes a token from, if any
+    rate_limit: Optional[str] = None
+
+    @abc.abstractmethod
+    async def fetch(self, client: httpx.AsyncClient, watched: Watched, since: datetime) -> List[Candle]:
+        ...
+
+
+def _decimal(value) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
+
+
+def trading_day(ts: int, utc_offset: int = 0) -> datetime:
+    """
+    UTC midnight of the trading day of the bar at ``ts``, the exchange being
+    ``utc_offset`` seconds from UTC.  Daily candles are keyed by day: the
+    last bar carries the live quote time, which would otherwise insert a new
+    "today" row every run.
+    """
+    day = datetime.fromtimestamp(ts + utc_offset, timezone.utc).date()
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+class YahooProvider(MarketDataProvider):
+    name = "yahoo"
+    rate_limit = YAHOO
+    URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+
+    @staticmethod
+    def quote_symbol(watched: Watched) -> str:
+        # Same mapping as stock_tasks: NSE -> .NS, BSE -> .BO
+        if watched.exchange == "NSE" and not watched.symbol.endswith(".NS"):
+            return f"{watched.symbol}.NS"
+        if watched.exchange == "BSE" and not watched.symbol.endswith(".BO"):
+            return f"{watched.symbol}.BO"
+        return watched.symbol
+
+    async def fetch(self, client: httpx.AsyncClient, watched: Watched, since: datetime) -> List[Candle]:
+        response = await client.get(
+            f"{self.URL}/{self.quote_symbol(watched)}",
+            params={
+                "interval": DAILY,
+                "period1": int(since.timestamp()),
+                "period2": int(datetime.now(timezone.utc).timestamp()),
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        try:
+            result = response.json()["chart"]["result"][0]
+            timestamps = result.get("timestamp") or []
+            quote = result["indicators"]["quote"][0]
+            utc_offset = int(result.get("meta", {}).get("gmtoffset") or 0)
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Unexpected chart response for {watched.symbol}: {e}")
+
+        candles = []
+        for i, ts in enumerate(timestamps):
+            close = quote["close"][i]
+            if close is None:
+                continue
+            candles.append(Candle(
+                trading_day(ts, utc_offset), watched.symbol, watched.exchange,
+                _decimal(quote["open"][i]), _decimal(quote["high"][i]), _decimal(quote["low"][i]),
+                _decimal(close), int(quote["volume"][i]) if quote["volume"][i] is not None else None,
+            ))
+        return candles
+
+
+class ReplayProvider(MarketDataProvider):
+    """Candles replayed from a CSV with ``time,symbol,open,high,low,close,volume`` columns."""
+    name = "replay"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._candles: Dict[str, List[tuple]] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    moment = datetime.fromisoformat(row["time"].strip())
+                    if moment.tzinfo is None:
+                        moment = moment.replace(tzinfo=timezone.utc)
+                    self._candles.setdefault(row["symbol"].strip(), []).append((
+                        moment, _decimal(row.get("open") or None), _decimal(row.get("high") or None),
+                        _decimal(row.get("low") or None), Decimal(row["close"]),
+                        int(row["volume"]) if row.get("volume") else None,
+                    ))
+                except (KeyError, ValueError, InvalidOperation, AttributeError):
+                    logger.warning("Skipping malformed market data row in %s: %s", path, row)
+
+    async def fetch(self, client: httpx.AsyncClient, watched: Watched, since: datetime) -> List[Candle]:
+        return [
+            Candle(moment, watched.symbol, watched.exchange, *values)
+            for moment, *values in sorted(self._candles.get(watched.symbol, []))
+            if moment >= since
+        ]
+
+
+def create_provider(name: Optional[str] = None) -> MarketDataProvider:
+    name = name or os.getenv("MARKET_DATA_PROVIDER", "yahoo")
+    if name == "replay":
+        return ReplayProvider(os.getenv("MARKET_DATA_REPLAY_FILE", "market_data.csv"))
+    if name == "yahoo":
+        return YahooProvider()
+    raise ValueError(f"Unknown market data provider: {name}")
+
+
+def fetch_start(watched: Watched, now: datetime) -> datetime:
+    if watched.latest is None:
+        return now - timedelta(days=BACKFILL_DAYS)
+    return watched.latest - OVERLAP
+
+
+async def fetch_candles(
+    provider: MarketDataProvider,
+    watched: Sequence[Watched],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limiter: Optional[AsyncTokenBucket] = None,
+) -> Tuple[List[Candle], List[str]]:
+    """
+    Fetch every symbol of ``watched`` with at most ``concurrency`` requests
+    in flight, each waiting for a token of the provider's bucket in
+    ``limiter``.  Returns the candles and the symbols that failed (logged and
+    skipped, so one bad symbol never sinks the batch).
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    now = datetime.now(timezone.utc)
+
+    async def one(client: httpx.AsyncClient, item: Watched) -> Optional[List[Candle]]:
+        async with semaphore:
+            if limiter is not None and provider.rate_limit:
+                await limiter.wait(provider.rate_limit, max_wait=math.inf)
+            try:
+                return await provider.fetch(client, item, fetch_start(item, now))
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Could not fetch market data for %s: %s", item.symbol, e)
+                return None
+
+    async with httpx.AsyncClient() as client:
+        results = await asyncio.gather(*(one(client, item) for item in watched))
+    candles = [candle for result in results if result for candle in result]
+    failed = [item.symbol for item, result in zip(watched, results) if result is None]
+    return candles, failed
+
+
+# ── Writing ───────────────────────────────────────────────────────────────
+
+# Each watched symbol with its newest stored daily candle (one index probe per symbol)
+WATCHED_SQL = text("""
+    SELECT w.symbol, w.exchange,
+           (SELECT MAX(m.time) FROM market_data m WHERE m.symbol = w.symbol AND m.interval = :interval) AS latest
+    FROM (SELECT DISTINCT ON (symbol) symbol, exchange FROM watchlist ORDER BY symbol, exchange) w
+""")
+
+_STAGING_SQL = "CREATE TEMP TABLE market_data_staging (LIKE market_data) ON COMMIT DROP"
+_COPY_SQL = f"COPY market_data_staging ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+# DISTINCT ON: one statement may not update the same row twice
+_MERGE_SQL = """
+    INSERT INTO market_data (time, symbol, exchange, open, high, low, close, volume, interval)
+    SELECT DISTINCT ON (symbol, interval, time)
+           time, symbol, exchange, open, high, low, close, volume, interval
+    FROM market_data_staging
+    ORDER BY symbol, interval, time
+    ON CONFLICT (symbol, interval, time) DO UPDATE SET
+        exchange = EXCLUDED.exchange,
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+    WHERE (market_data.open, market_data.high, market_data.low, market_data.close, market_data.volume)
+          IS DISTINCT FROM (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.close, EXCLUDED.volume)
+"""
+
+
+def copy_buffer(candles: Sequence[Candle]) -> io.StringIO:
+    """``candles`` as the CSV ``COPY`` reads (an empty field is NULL)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for candle in candles:
+        writer.writerow([candle.time.isoformat(), *("" if value is None else value for value in candle[1:])])
+    buffer.seek(0)
+    return buffer
+
+
+def copy_candles(conn, candles: Sequence[Candle]) -> int:
+    """
+    Stage ``candles`` with ``COPY`` and merge them into ``market_data`` in
+    ``conn``'s transaction.  Returns the rows inserted or changed.
+    """
+    if not candles:
+        return 0
+    conn.execute(text(_STAGING_SQL))
+    with conn.connection.driver_connection.cursor() as cursor:
+        cursor.copy_expert(_COPY_SQL, copy_buffer(candles))
+    return conn.execute(text(_MERGE_SQL)).rowcount
@@ -7,11 +7,13 @@ from celery.schedules import crontab
 import os
 import redis
 import json
-import httpx
-import time
+import random
 from typing import Dict, List
 from datetime import datetime, timedelta
 
+from shared.rate_limit import ALPHA_VANTAGE, FINNHUB, YAHOO, TokenBucket
+from workers import resources
+
 # Celery configuration
 celery_app = Celery(
     'stock_tasks',
@@ -41,6 +43,9 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# Provider quotas shared with the investment service (same Redis db)
+rate_limiter = TokenBucket(redis_client)
+
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "")
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY", "")
 
@@ -62,8 +67,19 @@ CACHE_DURATIONS = {
 }
 
 
-@celery_app.task(name='stock_tasks.fetch_and_cache_quote')
-def fetch_and_cache_quote(symbol: str, exchange: str = 'US') -> Dict:
+def requeue_if_throttled(task, provider: str):
+    """
+    Take a ``provider`` token, or retry ``task`` once one is available
+    (plus jitter, so requeued tasks do not all wake together) instead of
+    holding the worker slot.
+    """
+    wait = rate_limiter.acquire(provider)
+    if wait:
+        raise task.retry(countdown=wait + random.uniform(0, 1), max_retries=None)
+
+
+@celery_app.task(name='stock_tasks.fetch_and_cache_quote', bind=True)
+def fetch_and_cache_quote(self, symbol: str, exchange: str = 'US') -> Dict:
     """
     Fetch real-time quote and cache in Redis
     Args:
@@ -77,6 +93,8 @@ def fetch_and_cache_quote(symbol: str, exchange: str = 'US') -> Dict:
     if cached:
         return json.loads(cached)
     
+    requeue_if_throttled(self, YAHOO if exchange in ['NSE', 'BSE'] else FINNHUB)
+    
     # Fetch from API
     try:
         if exchange in ['NSE', 'BSE']:
@@ -103,22 +121,21 @@ def fetch_us_stock_quote(symbol: str) -> Dict:
     """Fetch US stock quote from Finnhub"""
     url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={FINNHUB_API_KEY}"
     
-    with httpx.Client(timeout=10.0) as client:
-        response = client.get(url)
-        data = response.json()
-        
-        return {
-            "symbol": symbol,
-            "price": data.get("c", 0),
-            "change": data.get("d", 0),
-            "change_percent": data.get("dp", 0),
-            "high": data.get("h", 0),
-            "low": data.get("l", 0),
-            "open": data.get("o", 0),
-            "previous_close": data.get("pc", 0),
-            "timestamp": datetime.now().isoformat(),
-            "exchange": "US"
-        }
+    response = resources.http_client().get(url, timeout=10.0)
+    data = response.json()
+    
+    return {
+        "symbol": symbol,
+        "price": data.get("c", 0),
+        "change": data.get("d", 0),
+        "change_percent": data.get("dp", 0),
+        "high": data.get("h", 0),
+        "low": data.get("l", 0),
+        "open": data.get("o", 0),
+        "previous_close": data.get("pc", 0),
+        "timestamp": datetime.now().isoformat(),
+        "exchange": "US"
+    }
 
 
 def fetch_indian_stock_quote(symbol: str) -> Dict:
@@ -129,36 +146,35 @@ def fetch_indian_stock_quote(symbol: str) -> Dict:
     
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
     
-    with httpx.Client(timeout=10.0) as client:
-        response = client.get(url)
-        data = response.json()
+    response = resources.http_client().get(url, timeout=10.0)
+    data = response.json()
+    
+    try:
+        result = data['chart']['result'][0]
+        meta = result['meta']
+        quote = result['indicators']['quote'][0]
+        
+        current_price = meta.get('regularMarketPrice', 0)
+        previous_close = meta.get('previousClose', 0)
+        change = current_price - previous_close
+        change_percent = (change / previous_close * 100) if previous_close else 0
         
-        try:
-            result = data['chart']['result'][0]
-            meta = result['meta']
-            quote = result['indicators']['quote'][0]
-            
-            current_price = meta.get('regularMarketPrice', 0)
-            previous_close = meta.get('previousClose', 0)
-            change = current_price - previous_close
-            change_percent = (change / previous_close * 100) if previous_close else 0
-            
-            return {
-                "symbol": symbol,
-                "price": current_price,
-                "change": change,
-                "change_percent": change_percent,
-                "high": meta.get('regularMarketDayHigh', 0),
-                "low": meta.get('regularMarketDayLow', 0),
-                "open": quote.get('open', [0])[-1] if quote.get('open') else 0,
-                "previous_close": previous_close,
-                "timestamp": datetime.now().isoformat(),
-                "exchange": "NSE" if symbol.endswith('.NS') else "BSE",
-                "currency": "INR"
-            }
-        except (KeyError, IndexError) as e:
-            print(f"Error parsing Yahoo Finance data for {symbol}: {e}")
-            return {"error": "Failed to parse data", "symbol": symbol}
+        return {
+            "symbol": symbol,
+            "price": current_price,
+            "change": change,
+            "change_percent": change_percent,
+            "high": meta.get('regularMarketDayHigh', 0),
+            "low": meta.get('regularMarketDayLow', 0),
+            "open": quote.get('open', [0])[-1] if quote.get('open') else 0,
+            "previous_close": previous_close,
+            "timestamp": datetime.now().isoformat(),
+            "exchange": "NSE" if symbol.endswith('.NS') else "BSE",
+            "currency": "INR"
+        }
+    except (KeyError, IndexError) as e:
+        print(f"Error parsing Yahoo Finance data for {symbol}: {e}")
+        return {"error": "Failed to parse data", "symbol": symbol}
 
 
 @celery_app.task(name='stock_tasks.cache_popular_stocks')
@@ -169,22 +185,19 @@ def cache_popular_stocks():
     """
     print("🔄 Caching popular stocks...")
     
-    # Cache US stocks (no rate limit issues)
+    # Cache US stocks
     for symbol in US_POPULAR_STOCKS:
         fetch_and_cache_quote.delay(symbol, 'US')
     
-    # Cache Indian stocks with delays to avoid rate limiting
-    for i, symbol in enumerate(NIFTY_50_SYMBOLS):
+    # Cache Indian stocks; Yahoo fetches over its quota requeue themselves
+    for symbol in NIFTY_50_SYMBOLS:
         fetch_and_cache_quote.delay(symbol, 'NSE')
-        # Add 2 second delay between requests to avoid Yahoo Finance rate limits
-        if i < len(NIFTY_50_SYMBOLS) - 1:
-            time.sleep(2)
     
     print(f"✅ Queued {len(US_POPULAR_STOCKS) + len(NIFTY_50_SYMBOLS)} stocks for caching")
 
 
-@celery_app.task(name='stock_tasks.fetch_historical_data')
-def fetch_historical_data(symbol: str, interval: str = 'daily', exchange: str = 'US') -> Dict:
+@celery_app.task(name='stock_tasks.fetch_historical_data', bind=True)
+def fetch_historical_data(self, symbol: str, interval: str = 'daily', exchange: str = 'US') -> Dict:
     """
     Fetch historical data and cache
     Args:
@@ -199,6 +212,8 @@ def fetch_historical_data(symbol: str, interval: str = 'daily', exchange: str =
     if cached:
         return json.loads(cached)
     
+    requeue_if_throttled(self, YAHOO if exchange in ['NSE', 'BSE'] else ALPHA_VANTAGE)
+    
     # Fetch from API based on exchange
     try:
         if exchange in ['NSE', 'BSE']:
@@ -229,32 +244,31 @@ def fetch_us_stock_history(symbol: str, interval: str) -> Dict:
     
     url = f"https://www.alphavantage.co/query?function={function_map[interval]}&symbol={symbol}&outputsize=compact&apikey={ALPHA_VANTAGE_API_KEY}"
     
-    with httpx.Client(timeout=15.0) as client:
-        response = client.get(url)
-        data = response.json()
-        
-        # Parse time series
-        time_series_key = None
-        for key in data.keys():
-            if "Time Series" in key:
-                time_series_key = key
-                break
-        
-        if not time_series_key:
-            return {"error": "No data", "symbol": symbol}
-        
-        candles = []
-        for date_str, values in sorted(data[time_series_key].items()):
-            candles.append({
-                "time": date_str,
-                "open": float(values.get("1. open", 0)),
-                "high": float(values.get("2. high", 0)),
-                "low": float(values.get("3. low", 0)),
-                "close": float(values.get("4. close", 0)),
-                "volume": int(values.get("5. volume", 0))
-            })
-        
-        return {"symbol": symbol, "interval": interval, "data": candles}
+    response = resources.http_client().get(url, timeout=15.0)
+    data = response.json()
+    
+    # Parse time series
+    time_series_key = None
+    for key in data.keys():
+        if "Time Series" in key:
+            time_series_key = key
+            break
+    
+    if not time_series_key:
+        return {"error": "No data", "symbol": symbol}
+    
+    candles = []
+    for date_str, values in sorted(data[time_series_key].items()):
+        candles.append({
+            "time": date_str,
+            "open": float(values.get("1. open", 0)),
+            "high": float(values.get("2. high", 0)),
+            "low": float(values.get("3. low", 0)),
+            "close": float(values.get("4. close", 0)),
+            "volume": int(values.get("5. volume", 0))
+        })
+    
+    return {"symbol": symbol, "interval": interval, "data": candles}
 
 
 def fetch_indian_stock_history(symbol: str, interval: str) -> Dict:
@@ -274,31 +288,30 @@ def fetch_indian_stock_history(symbol: str, interval: str) -> Dict:
     
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval={yf_interval}&range={period}"
     
-    with httpx.Client(timeout=15.0) as client:
-        response = client.get(url)
-        data = response.json()
+    response = resources.http_client().get(url, timeout=15.0)
+    data = response.json()
+    
+    try:
+        result = data['chart']['result'][0]
+        timestamps = result['timestamp']
+        quote = result['indicators']['quote'][0]
+        
+        candles = []
+        for i, ts in enumerate(timestamps):
+            date_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+            candles.append({
+                "time": date_str,
+                "open": quote['open'][i] or 0,
+                "high": quote['high'][i] or 0,
+                "low": quote['low'][i] or 0,
+                "close": quote['close'][i] or 0,
+                "volume": quote['volume'][i] or 0
+            })
         
-        try:
-            result = data['chart']['result'][0]
-            timestamps = result['timestamp']
-            quote = result['indicators']['quote'][0]
-            
-            candles = []
-            for i, ts in enumerate(timestamps):
-                date_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                candles.append({
-                    "time": date_str,
-                    "open": quote['open'][i] or 0,
-                    "high": quote['high'][i] or 0,
-                    "low": quote['low'][i] or 0,
-                    "close": quote['close'][i] or 0,
-                    "volume": quote['volume'][i] or 0
-                })
-            
-            return {"symbol": symbol, "interval": interval, "data": candles}
-        except (KeyError, IndexError) as e:
-            print(f"Error parsing Yahoo Finance history for {symbol}: {e}")
-            return {"error": "Failed to parse data", "symbol": symbol}
+        return {"symbol": symbol, "interval": interval, "data": candles}
+    except (KeyError, IndexError) as e:
+        print(f"Error parsing Yahoo Finance history for {symbol}: {e}")
+        return {"error": "Failed to parse data", "symbol": symbol}
 
 
 # Celery Beat Schedule - Periodic Tasks
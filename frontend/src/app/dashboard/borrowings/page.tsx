@@ -14,15 +14,19 @@ import {
   AlertCircle, Clock, Eye, RotateCcw, Lock, CreditCard, ArrowRight
 } from 'lucide-react'
 import { toast } from 'sonner'
-import { borrowingApi, Borrowing, BorrowingRepayment } from '@/lib/api'
+import { borrowingApi, Borrowing, BorrowingRepayment, BorrowingSummary } from '@/lib/api'
 import { useCurrency } from '@/hooks/useCurrency'
+import { formatCurrency } from '@/lib/currency'
 import { cn } from '@/lib/utils'
 import { getErrorMessage } from '@/lib/error-utils'
 
 export default function BorrowingsPage() {
   const { currency, symbol, format } = useCurrency()
   const [borrowings, setBorrowings] = useState<Borrowing[]>([])
+  const [summary, setSummary] = useState<BorrowingSummary | null>(null)
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | undefined>()
+  const [loadingMore, setLoadingMore] = useState(false)
   const [showForm, setShowForm] = useState(false)
   const [editingBorrowing, setEditingBorrowing] = useState<Borrowing | null>(null)
   const [selectedBorrowing, setSelectedBorrowing] = useState<(Borrowing & { repayments?: BorrowingRepayment[] }) | null>(null)
@@ -59,8 +63,10 @@ export default function BorrowingsPage() {
 
   const fetchBorrowings = async () => {
     try {
-      const data = await borrowingApi.list()
-      setBorrowings(data || [])
+      const [page, totals] = await Promise.all([borrowingApi.list(), borrowingApi.summary().catch(() => null)])
+      setBorrowings(page.items)
+      setNextCursor(page.nextCursor)
+      setSummary(totals)
     } catch (error: any) {
       toast.error(getErrorMessage(error) || 'Failed to fetch borrowings')
     } finally {
@@ -68,6 +74,20 @@ export default function BorrowingsPage() {
     }
   }
 
+  const loadMoreBorrowings = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await borrowingApi.list(undefined, undefined, nextCursor)
+      setBorrowings(prev => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } catch (error: any) {
+      toast.error(getErrorMessage(error) || 'Failed to fetch borrowings')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleSubmit = async () => {
     if (!formData.lender_name || !formData.principal_amount || !formData.borrowed_date) {
       toast.error('Please fill in all required fields')
@@ -217,11 +237,12 @@ export default function BorrowingsPage() {
     return matchSearch && matchStatus
   })
 
-  // Stats
-  const totalOwed = borrowings.filter(b => b.status !== 'closed').reduce((s, b) => s + (b.remaining_amount || 0), 0)
-  const openCount = borrowings.filter(b => b.status === 'open' || b.status === 'partially_paid').length
-  const overdueCount = borrowings.filter(b => b.due_date && new Date(b.due_date) < new Date() && b.status !== 'closed').length
-  const totalRepaid = borrowings.reduce((s, b) => s + (b.total_repaid || 0), 0)
+  // Stats cover all borrowings, not just the loaded pages, in the summary's currency
+  const formatTotal = (amount: number) => formatCurrency(amount, summary?.currency ?? currency)
+  const totalOwed = summary?.outstanding ?? 0
+  const openCount = summary?.open ?? 0
+  const overdueCount = summary?.overdue ?? 0
+  const totalRepaid = summary?.repaid ?? 0
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-slate-50 via-white to-teal-50/20 dark:from-slate-950 dark:via-slate-950 dark:to-slate-900">
@@ -259,7 +280,7 @@ export default function BorrowingsPage() {
           <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mt-6">
             <div className="bg-gradient-to-br from-rose-500/10 to-pink-500/10 border border-rose-200/50 dark:border-rose-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Total Owed</p>
-              <p className="text-2xl font-bold text-rose-600">{format(totalOwed)}</p>
+              <p className="text-2xl font-bold text-rose-600">{formatTotal(totalOwed)}</p>
             </div>
             <div className="bg-gradient-to-br from-blue-500/10 to-indigo-500/10 border border-blue-200/50 dark:border-blue-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Open</p>
@@ -271,7 +292,7 @@ export default function BorrowingsPage() {
             </div>
             <div className="bg-gradient-to-br from-emerald-500/10 to-teal-500/10 border border-emerald-200/50 dark:border-emerald-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Repaid</p>
-              <p className="text-2xl font-bold text-emerald-600">{format(totalRepaid)}</p>
+              <p className="text-2xl font-bold text-emerald-600">{formatTotal(totalRepaid)}</p>
             </div>
           </div>
         </div>
@@ -396,6 +417,13 @@ export default function BorrowingsPage() {
             })}
           </div>
         )}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" className="rounded-xl" onClick={loadMoreBorrowings} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more borrowings'}
+            </Button>
+          </div>
+        )}
       </div>
 
       {/* Add/Edit Form Modal */}
@@ -13,7 +13,8 @@ import {
   Smartphone, CreditCard, Banknote, Globe
 } from 'lucide-react'
 import { toast } from 'sonner'
-import { expenseApi, aiApi, Expense, Category, categoryApi, financeApiClient } from '@/lib/api'
+import { expenseApi, aiApi, Expense, ExpenseSummary, Category, categoryApi, financeApiClient } from '@/lib/api'
+import { formatCurrency } from '@/lib/currency'
 import { useCurrency } from '@/hooks/useCurrency'
 import { useAuthStore } from '@/lib/store'
 import { cn } from '@/lib/utils'
@@ -229,6 +230,8 @@ export default function ExpensesPage() {
 
   // Core data
   const [expenses, setExpenses] = useState<Expense[]>([])
+  const [summary, setSummary] = useState<ExpenseSummary | null>(null)
+  const [listVersion, setListVersion] = useState(0)
   const [loading, setLoading] = useState(true)
   const [fetchError, setFetchError] = useState(false)
   const [categoriesMaster, setCategoriesMaster] = useState<Category[]>([])
@@ -258,6 +261,8 @@ export default function ExpensesPage() {
   const [sortOption, setSortOption] = useState<SortOption>('newest')
   const [sidebarCollapsed, setSidebarCollapsed] = useState(false)
   const [visibleCount, setVisibleCount] = useState(50)
+  const [nextCursor, setNextCursor] = useState<string | undefined>()
+  const [loadingMore, setLoadingMore] = useState(false)
   const [mobileFilterOpen, setMobileFilterOpen] = useState(false)
 
   // Delete state
@@ -315,8 +320,10 @@ export default function ExpensesPage() {
   const fetchExpenses = useCallback(async () => {
     try {
       setFetchError(false)
-      const response = await expenseApi.list()
-      setExpenses(response || [])
+      const page = await expenseApi.list()
+      setExpenses(page.items)
+      setNextCursor(page.nextCursor)
+      setListVersion(v => v + 1)
     } catch (error: unknown) {
       setExpenses([])
       setFetchError(true)
@@ -335,6 +342,24 @@ export default function ExpensesPage() {
     }
   }, [isAuthenticated, token, fetchExpenses])
 
+  // Stat-card totals over every expense matching the category/date filters,
+  // refreshed whenever the list is reloaded
+  const fetchSummary = useCallback(async () => {
+    try {
+      setSummary(await expenseApi.summary({
+        category_id: selectedCategory ?? undefined,
+        start_date: selectedDate ?? undefined,
+        end_date: selectedDate ?? undefined,
+      }))
+    } catch {
+      setSummary(null)
+    }
+  }, [selectedCategory, selectedDate])
+
+  useEffect(() => {
+    if (isAuthenticated && token) fetchSummary()
+  }, [isAuthenticated, token, fetchSummary, listVersion])
+
   useEffect(() => {
     if (!isAuthenticated || !token) return
     const load = async () => {
@@ -413,6 +438,22 @@ export default function ExpensesPage() {
   const paginatedExpenses = useMemo(() => sortedFilteredExpenses.slice(0, visibleCount), [sortedFilteredExpenses, visibleCount])
   const hasMore = sortedFilteredExpenses.length > visibleCount
 
+  // Show the next 50 loaded expenses, fetching the next page once they run out
+  const loadMoreExpenses = useCallback(async () => {
+    setVisibleCount(prev => prev + 50)
+    if (hasMore || !nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await expenseApi.list(nextCursor)
+      setExpenses(prev => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } catch (error: unknown) {
+      toast.error(getErrorMessage(error) || 'Failed to load more expenses. Please try again.')
+    } finally {
+      setLoadingMore(false)
+    }
+  }, [hasMore, nextCursor])
+
   const groupedExpenses = useMemo(() => {
     if (!isDateSort) return null
     return paginatedExpenses.reduce((acc, expense) => {
@@ -426,6 +467,13 @@ export default function ExpensesPage() {
   const displayedTotal = useMemo(() => paginatedExpenses.reduce((sum, expense) => sum + expense.amount, 0), [paginatedExpenses])
   const categories = useMemo(() => Array.from(new Set(expenses.map(e => e.category_name).filter(Boolean))), [expenses])
 
+  // A text search only applies to the loaded rows, so the cards fall back to them
+  const statsFromServer = !!summary && !searchQuery
+  const statTotal = statsFromServer ? summary.total : displayedTotal
+  const statCount = statsFromServer ? summary.count : paginatedExpenses.length
+  const statCategories = statsFromServer ? summary.categories : categories.length
+  const formatStat = (amount: number) => formatCurrency(amount, statsFromServer ? summary.currency : currency)
+
   const monthlyTotal = useMemo(() => {
     const year = currentMonth.getFullYear()
     const month = currentMonth.getMonth()
@@ -552,7 +600,12 @@ export default function ExpensesPage() {
       const response = await financeApiClient.post('/import/bank-statement', formDataUpload, {
         headers: { 'Content-Type': 'multipart/form-data' }
       })
-      toast.success(`Successfully imported ${response.data.imported_count} transactions!`)
+      const { imported_count, rejected_count } = response.data
+      toast.success(
+        rejected_count
+          ? `Imported ${imported_count} transactions, skipped ${rejected_count} rows`
+          : `Successfully imported ${imported_count} transactions!`
+      )
       fetchExpenses()
     } catch (error: unknown) {
       toast.error(getErrorMessage(error) || 'Failed to import bank statement')
@@ -779,25 +832,25 @@ export default function ExpensesPage() {
               </div>
             ) : (
               <div className="grid grid-cols-2 md:grid-cols-4 gap-3 md:gap-4 mt-4 md:mt-6">
-                <div className="bg-gradient-to-br from-rose-500/10 to-pink-500/10 border border-rose-200/50 dark:border-rose-800/50 rounded-xl p-3 md:p-4" aria-label={`Total spent: ${format(displayedTotal)}`}>
+                <div className="bg-gradient-to-br from-rose-500/10 to-pink-500/10 border border-rose-200/50 dark:border-rose-800/50 rounded-xl p-3 md:p-4" aria-label={`Total spent: ${formatStat(statTotal)}`}>
                   <p className="text-[11px] font-medium text-slate-600 dark:text-slate-400 mb-1">
                     {hasActiveFilters ? 'Filtered Total' : 'Total Spent'}
                   </p>
-                  <p className="text-xl md:text-2xl font-bold text-rose-600 dark:text-rose-400 tabular-nums">{format(displayedTotal)}</p>
+                  <p className="text-xl md:text-2xl font-bold text-rose-600 dark:text-rose-400 tabular-nums">{formatStat(statTotal)}</p>
                 </div>
-                <div className="bg-gradient-to-br from-blue-500/10 to-indigo-500/10 border border-blue-200/50 dark:border-blue-800/50 rounded-xl p-3 md:p-4" aria-label={`${paginatedExpenses.length} transactions`}>
+                <div className="bg-gradient-to-br from-blue-500/10 to-indigo-500/10 border border-blue-200/50 dark:border-blue-800/50 rounded-xl p-3 md:p-4" aria-label={`${statCount} transactions`}>
                   <p className="text-[11px] font-medium text-slate-600 dark:text-slate-400 mb-1">Transactions</p>
-                  <p className="text-xl md:text-2xl font-bold text-blue-600 dark:text-blue-400 tabular-nums">{paginatedExpenses.length}</p>
+                  <p className="text-xl md:text-2xl font-bold text-blue-600 dark:text-blue-400 tabular-nums">{statCount}</p>
                 </div>
                 <div className="bg-gradient-to-br from-emerald-500/10 to-teal-500/10 border border-emerald-200/50 dark:border-emerald-800/50 rounded-xl p-3 md:p-4">
                   <p className="text-[11px] font-medium text-slate-600 dark:text-slate-400 mb-1">Avg/Transaction</p>
                   <p className="text-xl md:text-2xl font-bold text-emerald-600 dark:text-emerald-400 tabular-nums">
-                    {paginatedExpenses.length > 0 ? format(displayedTotal / paginatedExpenses.length) : format(0)}
+                    {statCount > 0 ? formatStat(statTotal / statCount) : formatStat(0)}
                   </p>
                 </div>
                 <div className="bg-gradient-to-br from-amber-500/10 to-orange-500/10 border border-amber-200/50 dark:border-amber-800/50 rounded-xl p-3 md:p-4">
                   <p className="text-[11px] font-medium text-slate-600 dark:text-slate-400 mb-1">Categories</p>
-                  <p className="text-xl md:text-2xl font-bold text-amber-600 dark:text-amber-400 tabular-nums">{categories.length}</p>
+                  <p className="text-xl md:text-2xl font-bold text-amber-600 dark:text-amber-400 tabular-nums">{statCategories}</p>
                 </div>
               </div>
             )}
@@ -1027,14 +1080,19 @@ export default function ExpensesPage() {
               )}
 
               {/* Load More */}
-              {hasMore && (
+              {(hasMore || nextCursor) && (
                 <div className="flex justify-center pt-6">
                   <Button
                     variant="outline"
-                    onClick={() => setVisibleCount(prev => prev + 50)}
+                    onClick={loadMoreExpenses}
+                    disabled={loadingMore}
                     className="rounded-xl px-8"
                   >
-                    Load More ({sortedFilteredExpenses.length - visibleCount} remaining)
+                    {loadingMore
+                      ? 'Loading...'
+                      : hasMore
+                        ? `Load More (${sortedFilteredExpenses.length - visibleCount} remaining)`
+                        : 'Load More'}
                   </Button>
                 </div>
               )}
@@ -15,8 +15,9 @@ import {
   RefreshCw, DollarSign, ArrowUpRight, Repeat
 } from 'lucide-react'
 import { toast } from 'sonner'
-import { incomeApi, Income } from '@/lib/api'
+import { incomeApi, Income, IncomeSummary } from '@/lib/api'
 import { useCurrency } from '@/hooks/useCurrency'
+import { formatCurrency } from '@/lib/currency'
 import { cn } from '@/lib/utils'
 import { getErrorMessage } from '@/lib/error-utils'
 
@@ -50,7 +51,10 @@ const sourceBadgeColors: Record<string, string> = {
 export default function IncomePage() {
   const { currency, symbol, format } = useCurrency()
   const [incomes, setIncomes] = useState<Income[]>([])
+  const [summary, setSummary] = useState<IncomeSummary | null>(null)
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | undefined>()
+  const [loadingMore, setLoadingMore] = useState(false)
   const [showForm, setShowForm] = useState(false)
   const [editingIncome, setEditingIncome] = useState<Income | null>(null)
   const [searchQuery, setSearchQuery] = useState('')
@@ -72,8 +76,10 @@ export default function IncomePage() {
 
   const fetchIncomes = async () => {
     try {
-      const data = await incomeApi.list()
-      setIncomes(data || [])
+      const [page, totals] = await Promise.all([incomeApi.list(), incomeApi.summary().catch(() => null)])
+      setIncomes(page.items)
+      setNextCursor(page.nextCursor)
+      setSummary(totals)
     } catch (error: any) {
       // Backend endpoint may not exist yet — show empty state
       setIncomes([])
@@ -82,6 +88,20 @@ export default function IncomePage() {
     }
   }
 
+  const loadMoreIncomes = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await incomeApi.list(undefined, undefined, nextCursor)
+      setIncomes(prev => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } catch (error: any) {
+      toast.error(getErrorMessage(error) || 'Failed to load more income')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleSubmit = async () => {
     if (!formData.amount || !formData.income_date) {
       toast.error('Please fill in amount and date')
@@ -144,16 +164,8 @@ export default function IncomePage() {
     })
   }
 
-  // Stats
-  const totalIncome = incomes.reduce((s, i) => s + i.amount, 0)
-  const thisMonth = incomes.filter(i => {
-    const d = new Date(i.income_date)
-    const now = new Date()
-    return d.getMonth() === now.getMonth() && d.getFullYear() === now.getFullYear()
-  })
-  const thisMonthTotal = thisMonth.reduce((s, i) => s + i.amount, 0)
-  const recurringCount = incomes.filter(i => i.is_recurring).length
-  const sources = [...new Set(incomes.map(i => i.source))]
+  // Stats cover all income, not just the loaded pages, in the summary's currency
+  const formatTotal = (amount: number) => formatCurrency(amount, summary?.currency ?? currency)
 
   // Filters
   const filtered = incomes.filter(i => {
@@ -211,19 +223,19 @@ export default function IncomePage() {
           <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mt-6">
             <div className="bg-gradient-to-br from-emerald-500/10 to-teal-500/10 border border-emerald-200/50 dark:border-emerald-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Total Income</p>
-              <p className="text-2xl font-bold text-emerald-600">{format(totalIncome)}</p>
+              <p className="text-2xl font-bold text-emerald-600">{formatTotal(summary?.total ?? 0)}</p>
             </div>
             <div className="bg-gradient-to-br from-blue-500/10 to-indigo-500/10 border border-blue-200/50 dark:border-blue-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">This Month</p>
-              <p className="text-2xl font-bold text-blue-600">{format(thisMonthTotal)}</p>
+              <p className="text-2xl font-bold text-blue-600">{formatTotal(summary?.this_month ?? 0)}</p>
             </div>
             <div className="bg-gradient-to-br from-violet-500/10 to-purple-500/10 border border-violet-200/50 dark:border-violet-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Sources</p>
-              <p className="text-2xl font-bold text-violet-600">{sources.length}</p>
+              <p className="text-2xl font-bold text-violet-600">{summary?.by_source.length ?? 0}</p>
             </div>
             <div className="bg-gradient-to-br from-amber-500/10 to-orange-500/10 border border-amber-200/50 dark:border-amber-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Recurring</p>
-              <p className="text-2xl font-bold text-amber-600">{recurringCount} entries</p>
+              <p className="text-2xl font-bold text-amber-600">{summary?.recurring_count ?? 0} entries</p>
             </div>
           </div>
         </div>
@@ -323,6 +335,13 @@ export default function IncomePage() {
           </div>
         </div>
         )}
+        {!loading && nextCursor && (
+          <div className="flex justify-center px-4 md:px-6 pb-6">
+            <Button variant="outline" className="rounded-xl" onClick={loadMoreIncomes} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more income'}
+            </Button>
+          </div>
+        )}
 
       {/* Add/Edit Form Modal */}
       {showForm && (
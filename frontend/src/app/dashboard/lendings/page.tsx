@@ -14,15 +14,19 @@ import {
   AlertCircle, Clock, Eye, RotateCcw, Lock, Wallet, ArrowRight, Percent
 } from 'lucide-react'
 import { toast } from 'sonner'
-import { lendingApi, Lending, LendingCollection } from '@/lib/api'
+import { lendingApi, Lending, LendingCollection, LendingSummary } from '@/lib/api'
 import { useCurrency } from '@/hooks/useCurrency'
+import { formatCurrency } from '@/lib/currency'
 import { cn } from '@/lib/utils'
 import { getErrorMessage } from '@/lib/error-utils'
 
 export default function LendingsPage() {
   const { currency, symbol, format } = useCurrency()
   const [lendings, setLendings] = useState<Lending[]>([])
+  const [summary, setSummary] = useState<LendingSummary | null>(null)
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState<string | undefined>()
+  const [loadingMore, setLoadingMore] = useState(false)
   const [showForm, setShowForm] = useState(false)
   const [editingLending, setEditingLending] = useState<Lending | null>(null)
   const [selectedLending, setSelectedLending] = useState<(Lending & { collections?: LendingCollection[] }) | null>(null)
@@ -59,8 +63,10 @@ export default function LendingsPage() {
 
   const fetchLendings = async () => {
     try {
-      const data = await lendingApi.list()
-      setLendings(data || [])
+      const [page, totals] = await Promise.all([lendingApi.list(), lendingApi.summary().catch(() => null)])
+      setLendings(page.items)
+      setNextCursor(page.nextCursor)
+      setSummary(totals)
     } catch (error: any) {
       setLendings([])
     } finally {
@@ -68,6 +74,20 @@ export default function LendingsPage() {
     }
   }
 
+  const loadMoreLendings = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await lendingApi.list(undefined, undefined, nextCursor)
+      setLendings(prev => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } catch (error: any) {
+      toast.error(getErrorMessage(error) || 'Failed to fetch lendings')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleSubmit = async () => {
     if (!formData.borrower_name || !formData.principal_amount || !formData.lent_date) {
       toast.error('Please fill in all required fields')
@@ -218,11 +238,12 @@ export default function LendingsPage() {
     return matchSearch && matchStatus
   })
 
-  // Stats
-  const totalLent = lendings.filter(l => l.status !== 'closed').reduce((s, l) => s + (l.remaining_amount || 0), 0)
-  const openCount = lendings.filter(l => l.status === 'open' || l.status === 'partially_received').length
-  const overdueCount = lendings.filter(l => l.due_date && new Date(l.due_date) < new Date() && l.status !== 'closed').length
-  const totalCollected = lendings.reduce((s, l) => s + (l.total_received || 0), 0)
+  // Stats cover all lendings, not just the loaded pages, in the summary's currency
+  const formatTotal = (amount: number) => formatCurrency(amount, summary?.currency ?? currency)
+  const totalLent = summary?.outstanding ?? 0
+  const openCount = summary?.open ?? 0
+  const overdueCount = summary?.overdue ?? 0
+  const totalCollected = summary?.received ?? 0
 
   const getStatusBadge = (status: string, dueDate?: string | null) => {
     const isOverdue = dueDate && new Date(dueDate) < new Date() && status !== 'closed'
@@ -268,7 +289,7 @@ export default function LendingsPage() {
           <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mt-6">
             <div className="bg-gradient-to-br from-indigo-500/10 to-violet-500/10 border border-indigo-200/50 dark:border-indigo-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Outstanding</p>
-              <p className="text-2xl font-bold text-indigo-600">{format(totalLent)}</p>
+              <p className="text-2xl font-bold text-indigo-600">{formatTotal(totalLent)}</p>
             </div>
             <div className="bg-gradient-to-br from-blue-500/10 to-indigo-500/10 border border-blue-200/50 dark:border-blue-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Open</p>
@@ -280,7 +301,7 @@ export default function LendingsPage() {
             </div>
             <div className="bg-gradient-to-br from-emerald-500/10 to-teal-500/10 border border-emerald-200/50 dark:border-emerald-700/50 rounded-xl p-4">
               <p className="text-xs font-medium text-slate-600 dark:text-slate-400 mb-1">Collected</p>
-              <p className="text-2xl font-bold text-emerald-600">{format(totalCollected)}</p>
+              <p className="text-2xl font-bold text-emerald-600">{formatTotal(totalCollected)}</p>
             </div>
           </div>
         </div>
@@ -395,6 +416,13 @@ export default function LendingsPage() {
             })}
           </div>
         )}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" className="rounded-xl" onClick={loadMoreLendings} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more lendings'}
+            </Button>
+          </div>
+        )}
       </div>
 
       {/* Add/Edit Form */}
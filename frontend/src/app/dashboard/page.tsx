@@ -14,7 +14,9 @@ import {
 import { motion, animate, AnimatePresence } from 'framer-motion'
 import { useAuthStore } from '@/lib/store'
 import { useCurrency } from '@/hooks/useCurrency'
-import { expenseApi, emiApi, investmentApi, budgetApi, borrowingApi, incomeApi, lendingApi, netWorthApi, aiApi } from '@/lib/api'
+import { formatCurrency } from '@/lib/currency'
+import { netWorthApi, aiApi, dashboardApi } from '@/lib/api'
+import type { DashboardSummary } from '@/lib/api'
 import { toast } from 'sonner'
 import { PieChart as RechartsPie, Pie, Cell, ResponsiveContainer, Tooltip, Legend, AreaChart, Area, XAxis, YAxis, CartesianGrid, BarChart, Bar, LineChart, Line, ComposedChart } from 'recharts'
 import Link from 'next/link'
@@ -178,17 +180,16 @@ const MiniSparkline = ({ data, color, height = 32 }: { data: number[]; color: st
 }
 
 export default function DashboardPage() {
-  const { currency, symbol, format } = useCurrency()
+  const { currency: preferredCurrency } = useCurrency()
   const user = useAuthStore((state) => state.user)
   const token = useAuthStore((state) => state.token)
   const isAuthenticated = useAuthStore((state) => state.isAuthenticated())
   const [loading, setLoading] = useState(true)
   const [showBalance, setShowBalance] = useState(true)
   const [dateRange, setDateRange] = useState<string>('this_month')
-  const [allExpenses, setAllExpenses] = useState<ExpenseResponse[]>([])
-  const [allIncomes, setAllIncomes] = useState<any[]>([])
-  const [allEmis, setAllEmis] = useState<any[]>([])
-  const [allBorrowings, setAllBorrowings] = useState<any[]>([])
+  const [summary, setSummary] = useState<DashboardSummary | null>(null)
+  // The server converts the summary into the preferred currency and says which one it used
+  const format = (amount: number) => formatCurrency(amount, summary?.currency ?? preferredCurrency)
   const [stats, setStats] = useState({
     totalExpenses: 0,
     expenseCount: 0,
@@ -221,8 +222,6 @@ export default function DashboardPage() {
   const [isMockData, setIsMockData] = useState(false)
   const [anomalies, setAnomalies] = useState<any[]>([])
   const [incomeVsExpenseData, setIncomeVsExpenseData] = useState<any[]>([])
-  const [allInvestments, setAllInvestments] = useState<any[]>([])
-  const [allBudgets, setAllBudgets] = useState<any[]>([])
 
   // Date range helper
   const getDateRange = (range: string): { start: Date; end: Date } => {
@@ -247,12 +246,12 @@ export default function DashboardPage() {
     }
   }
 
-  const filterByDateRange = <T extends Record<string, any>>(items: T[], dateField: string): T[] => {
-    const { start, end } = getDateRange(dateRange)
-    return items.filter(item => {
-      const d = new Date(item[dateField])
-      return d >= start && d <= end
-    })
+  const toISODate = (d: Date) =>
+    `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`
+
+  const loadSummary = (range: string): Promise<DashboardSummary> => {
+    const { start, end } = getDateRange(range)
+    return dashboardApi.summary(toISODate(start), toISODate(end))
   }
 
   useEffect(() => {
@@ -263,30 +262,17 @@ export default function DashboardPage() {
     }
   }, [isAuthenticated, token, user])
 
-  // Recalculate stats when date range changes
+  // Re-aggregate on the server when the date range changes
   useEffect(() => {
-    if (allExpenses.length === 0 && allIncomes.length === 0) return
-    recalculateStats()
+    if (!summary) return
+    loadSummary(dateRange)
+      .then(applySummary)
+      .catch(() => toast.error('Failed to load dashboard data'))
   }, [dateRange])
 
   const fetchDashboardData = async () => {
     try {
-      const [expenses, emis, investments, budgets, borrowings, incomes, lendings] = await Promise.all([
-        expenseApi.list().catch(() => [] as ExpenseResponse[]),
-        emiApi.list().catch(() => []),
-        investmentApi.list().catch(() => []),
-        budgetApi.list().catch(() => []),
-        borrowingApi.list().catch(() => []),
-        incomeApi.list().catch(() => []),
-        lendingApi.list().catch(() => [])
-      ])
-
-      setAllExpenses(expenses)
-      setAllIncomes(incomes)
-      setAllEmis(emis)
-      setAllBorrowings(borrowings)
-      setAllInvestments(investments)
-      setAllBudgets(budgets)
+      applySummary(await loadSummary(dateRange))
 
       // Net worth data
       let netWorthData: any[] = []
@@ -331,56 +317,6 @@ export default function DashboardPage() {
         setIsMockData(true)
       }
 
-      const filteredExpenses = filterByDateRange(expenses, 'transaction_date')
-      const filteredIncomes = filterByDateRange(incomes, 'income_date')
-
-      // Previous month calculations for trend comparison
-      const now = new Date()
-      const prevStart = new Date(now.getFullYear(), now.getMonth() - 1, 1)
-      const prevEnd = new Date(now.getFullYear(), now.getMonth(), 0)
-      const prevMonthExpenses = expenses.filter((e: any) => {
-        const d = new Date(e.transaction_date)
-        return d >= prevStart && d <= prevEnd
-      }).reduce((s: number, e: any) => s + e.amount, 0)
-      const prevMonthIncome = incomes.filter((i: any) => {
-        const d = new Date(i.income_date)
-        return d >= prevStart && d <= prevEnd
-      }).reduce((s: number, i: any) => s + i.amount, 0)
-
-      const totalExpenses = filteredExpenses.reduce((sum: number, e: any) => sum + e.amount, 0)
-      const emiMonthly = emis.reduce((sum: number, e: any) => sum + (e.monthly_emi || 0), 0)
-      const investmentValue = investments.reduce((sum: number, i: any) => sum + (i.total_value || i.quantity * i.purchase_price), 0)
-      const investmentCost = investments.reduce((sum: number, i: any) => sum + (i.quantity * i.purchase_price), 0)
-      const investmentReturn = investmentCost > 0 ? ((investmentValue - investmentCost) / investmentCost) * 100 : 0
-      const budgetTotal = budgets.reduce((sum: number, b: any) => sum + b.amount, 0)
-      const budgetUsed = budgets.reduce((sum: number, b: any) => sum + (b.spent || 0), 0)
-      const borrowingsOwed = borrowings.filter((b: any) => b.status !== 'closed').reduce((s: number, b: any) => s + (b.remaining_amount || 0), 0)
-      const borrowingsOpen = borrowings.filter((b: any) => b.status === 'open' || b.status === 'partially_paid').length
-      const borrowingsOverdue = borrowings.filter((b: any) => b.due_date && new Date(b.due_date) < new Date() && b.status !== 'closed')
-      const totalIncome = filteredIncomes.reduce((s: number, i: any) => s + i.amount, 0)
-      const thisMonthIncome = filteredIncomes.reduce((s: number, i: any) => s + i.amount, 0)
-      const lendingsOutstanding = lendings.filter((l: any) => l.status !== 'closed').reduce((s: number, l: any) => s + (l.remaining_amount || 0), 0)
-      const lendingsOpen = lendings.filter((l: any) => l.status === 'open' || l.status === 'partially_received').length
-      const lendingsOverdue = lendings.filter((l: any) => l.due_date && new Date(l.due_date) < new Date() && l.status !== 'closed').length
-
-      const savingsRate = totalIncome > 0 ? ((totalIncome - totalExpenses) / totalIncome) * 100 : 0
-
-      const assets = investmentValue + lendingsOutstanding + thisMonthIncome
-      const liabilities = borrowingsOwed + emis.reduce((sum: number, e: any) => sum + (e.remaining_amount || 0), 0)
-      const calculatedNetWorth = assets - liabilities
-
-      setStats({
-        totalExpenses, expenseCount: filteredExpenses.length,
-        emiCount: emis.length, emiMonthly,
-        investmentValue, investmentReturn,
-        budgetTotal, budgetUsed,
-        borrowingsOwed, borrowingsOpen: borrowingsOpen, borrowingsOverdue: borrowingsOverdue.length,
-        totalIncome, thisMonthIncome, incomeCount: filteredIncomes.length,
-        lendingsOutstanding, lendingsOpen, lendingsOverdue,
-        netWorth: calculatedNetWorth,
-        prevMonthExpenses, prevMonthIncome, savingsRate,
-      })
-
       setNetWorthTrend(netWorthData)
       setHealthScore(healthData)
 
@@ -391,60 +327,6 @@ export default function DashboardPage() {
       } catch {
         setAnomalies([])
       }
-
-      setRecentExpenses(filteredExpenses.slice(0, 5))
-
-      // Build income vs expense monthly comparison (last 6 months)
-      if (expenses.length > 0 || incomes.length > 0) {
-        const monthMap = new Map<string, { expenses: number; income: number }>()
-        for (let i = 5; i >= 0; i--) {
-          const d = new Date(now.getFullYear(), now.getMonth() - i, 1)
-          const key = `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}`
-          monthMap.set(key, { expenses: 0, income: 0 })
-        }
-        expenses.forEach((e: any) => {
-          const d = new Date(e.transaction_date)
-          const key = `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}`
-          const entry = monthMap.get(key)
-          if (entry) entry.expenses += e.amount
-        })
-        incomes.forEach((i: any) => {
-          const d = new Date(i.income_date)
-          const key = `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}`
-          const entry = monthMap.get(key)
-          if (entry) entry.income += i.amount
-        })
-        const chartData = Array.from(monthMap.entries()).map(([key, data]) => {
-          const [y, m] = key.split('-')
-          const monthName = new Date(parseInt(y), parseInt(m) - 1).toLocaleDateString('en-US', { month: 'short' })
-          return { month: monthName, expenses: Math.round(data.expenses), income: Math.round(data.income), savings: Math.round(data.income - data.expenses) }
-        })
-        setIncomeVsExpenseData(chartData)
-        setMonthlyTrendData(chartData)
-      }
-
-      // Build pie chart
-      if (filteredExpenses.length > 0) {
-        type CategoryAggregate = { id: string; name: string; color: string; total: number }
-        const categoryMap = new Map<string, CategoryAggregate>()
-        filteredExpenses.forEach((expense) => {
-          const bucketId = expense.category_id ?? 'uncategorized'
-          const existing = categoryMap.get(bucketId)
-          const name = expense.category_name ?? 'Uncategorized'
-          const color = expense.category_color ?? DEFAULT_CATEGORY_COLOR
-          if (existing) { existing.total += expense.amount } else { categoryMap.set(bucketId, { id: bucketId, name, color, total: expense.amount }) }
-        })
-        if (categoryMap.size > 0) {
-          const sorted = Array.from(categoryMap.values()).sort((a, b) => b.total - a.total)
-          const top = sorted.slice(0, 5)
-          const rest = sorted.slice(5)
-          const otherTotal = rest.reduce((sum, item) => sum + item.total, 0)
-          setExpensePieData([
-            ...top,
-            ...(otherTotal > 0 ? [{ id: 'other', name: 'Other', color: '#CBD5F5', total: otherTotal }] : []),
-          ].map(item => ({ id: item.id, name: item.name, value: Math.round(item.total), color: item.color })))
-        } else { setExpensePieData([]) }
-      }
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error)
       toast.error('Failed to load dashboard data')
@@ -453,104 +335,58 @@ export default function DashboardPage() {
     }
   }
 
-  const recalculateStats = () => {
-    const filteredExp = filterByDateRange(allExpenses, 'transaction_date')
-    const filteredInc = filterByDateRange(allIncomes, 'income_date')
-    const totalExpenses = filteredExp.reduce((sum: number, e: any) => sum + e.amount, 0)
-    const totalIncome = filteredInc.reduce((s: number, i: any) => s + i.amount, 0)
-    const savingsRate = totalIncome > 0 ? ((totalIncome - totalExpenses) / totalIncome) * 100 : 0
-
-    setStats(prev => ({
-      ...prev,
-      totalExpenses, expenseCount: filteredExp.length,
-      totalIncome, thisMonthIncome: totalIncome, incomeCount: filteredInc.length,
-      savingsRate,
-    }))
-    setRecentExpenses(filteredExp.slice(0, 5))
-
-    // Rebuild pie chart
-    type CategoryAggregate = { id: string; name: string; color: string; total: number }
-    const categoryMap = new Map<string, CategoryAggregate>()
-    filteredExp.forEach((expense: any) => {
-      const bucketId = expense.category_id ?? 'uncategorized'
-      const existing = categoryMap.get(bucketId)
-      if (existing) { existing.total += expense.amount } else {
-        categoryMap.set(bucketId, { id: bucketId, name: expense.category_name ?? 'Uncategorized', color: expense.category_color ?? DEFAULT_CATEGORY_COLOR, total: expense.amount })
-      }
+  const applySummary = (data: DashboardSummary) => {
+    setSummary(data)
+    setStats({
+      totalExpenses: data.expenses.total, expenseCount: data.expenses.count,
+      emiCount: data.emis.count, emiMonthly: data.emis.monthly_total,
+      investmentValue: data.investments.value, investmentReturn: data.investments.return_percent,
+      budgetTotal: data.budgets.total, budgetUsed: data.budgets.used,
+      borrowingsOwed: data.borrowings.outstanding, borrowingsOpen: data.borrowings.open, borrowingsOverdue: data.borrowings.overdue,
+      totalIncome: data.income.total, thisMonthIncome: data.income.total, incomeCount: data.income.count,
+      lendingsOutstanding: data.lendings.outstanding, lendingsOpen: data.lendings.open, lendingsOverdue: data.lendings.overdue,
+      netWorth: data.net_worth,
+      prevMonthExpenses: data.expenses.previous_month, prevMonthIncome: data.income.previous_month,
+      savingsRate: data.savings_rate,
     })
-    if (categoryMap.size > 0) {
-      const sorted = Array.from(categoryMap.values()).sort((a, b) => b.total - a.total)
-      const top = sorted.slice(0, 5)
-      const rest = sorted.slice(5)
-      const otherTotal = rest.reduce((sum, item) => sum + item.total, 0)
-      setExpensePieData([
-        ...top,
-        ...(otherTotal > 0 ? [{ id: 'other', name: 'Other', color: '#CBD5F5', total: otherTotal }] : []),
-      ].map(item => ({ id: item.id, name: item.name, value: Math.round(item.total), color: item.color })))
-    } else { setExpensePieData([]) }
+    setRecentExpenses(data.recent_expenses)
+
+    // Income vs expense monthly comparison (last 6 months)
+    const chartData = data.monthly_trend.map(m => {
+      const [y, mo] = m.month.split('-')
+      const monthName = new Date(parseInt(y), parseInt(mo) - 1).toLocaleDateString('en-US', { month: 'short' })
+      return { month: monthName, expenses: Math.round(m.expenses), income: Math.round(m.income), savings: Math.round(m.savings) }
+    })
+    setIncomeVsExpenseData(chartData)
+    setMonthlyTrendData(chartData)
+
+    // Pie chart: top five categories plus "Other"
+    const top = data.category_breakdown.slice(0, 5)
+    const otherTotal = data.category_breakdown.slice(5).reduce((sum, item) => sum + item.total, 0)
+    setExpensePieData([
+      ...top.map(c => ({ id: c.category_id ?? 'uncategorized', name: c.name, color: c.color ?? DEFAULT_CATEGORY_COLOR, total: c.total })),
+      ...(otherTotal > 0 ? [{ id: 'other', name: 'Other', color: '#CBD5F5', total: otherTotal }] : []),
+    ].map(item => ({ id: item.id, name: item.name, value: Math.round(item.total), color: item.color })))
   }
 
   const budgetUtilization = stats.budgetTotal > 0 ? (stats.budgetUsed / stats.budgetTotal) * 100 : 0
   const budgetRemaining = stats.budgetTotal - stats.budgetUsed
+  const allBudgets = summary?.budgets.items ?? []
 
-  // Compute monthly expense sparkline from all expenses (last 6 months)
-  const expenseSparkline = useMemo(() => {
-    if (!allExpenses.length) return []
-    const now = new Date()
-    const points: number[] = []
-    for (let i = 5; i >= 0; i--) {
-      const start = new Date(now.getFullYear(), now.getMonth() - i, 1)
-      const end = new Date(now.getFullYear(), now.getMonth() - i + 1, 0)
-      const total = allExpenses.filter((e: any) => {
-        const d = new Date(e.transaction_date)
-        return d >= start && d <= end
-      }).reduce((s: number, e: any) => s + e.amount, 0)
-      points.push(total)
-    }
-    return points
-  }, [allExpenses])
-
-  const incomeSparkline = useMemo(() => {
-    if (!allIncomes.length) return []
-    const now = new Date()
-    const points: number[] = []
-    for (let i = 5; i >= 0; i--) {
-      const start = new Date(now.getFullYear(), now.getMonth() - i, 1)
-      const end = new Date(now.getFullYear(), now.getMonth() - i + 1, 0)
-      const total = allIncomes.filter((inc: any) => {
-        const d = new Date(inc.income_date)
-        return d >= start && d <= end
-      }).reduce((s: number, inc: any) => s + inc.amount, 0)
-      points.push(total)
-    }
-    return points
-  }, [allIncomes])
+  // Monthly sparklines (last 6 months)
+  const expenseSparkline = useMemo(() => summary?.monthly_trend.map(m => m.expenses) ?? [], [summary])
+  const incomeSparkline = useMemo(() => summary?.monthly_trend.map(m => m.income) ?? [], [summary])
 
   // Upcoming due dates (EMIs + Borrowings with due dates in next 30 days)
   const upcomingDueDates = useMemo(() => {
-    const now = new Date()
-    const thirtyDays = new Date(now.getTime() + 30 * 24 * 60 * 60 * 1000)
-    const items: { label: string; amount: number; dueDate: Date; type: string; daysLeft: number }[] = []
-
-    allEmis.forEach((emi: any) => {
-      if (emi.next_payment_date) {
-        const due = new Date(emi.next_payment_date)
-        if (due >= now && due <= thirtyDays) {
-          items.push({ label: emi.lender_name || emi.loan_name || 'EMI Payment', amount: emi.monthly_emi || 0, dueDate: due, type: 'emi', daysLeft: Math.ceil((due.getTime() - now.getTime()) / (1000 * 60 * 60 * 24)) })
-        }
-      }
-    })
-    allBorrowings.forEach((b: any) => {
-      if (b.due_date && b.status !== 'closed') {
-        const due = new Date(b.due_date)
-        if (due >= now && due <= thirtyDays) {
-          items.push({ label: b.lender || 'Borrowing Due', amount: b.remaining_amount || 0, dueDate: due, type: 'borrowing', daysLeft: Math.ceil((due.getTime() - now.getTime()) / (1000 * 60 * 60 * 24)) })
-        }
-      }
-    })
-
-    return items.sort((a, b) => a.dueDate.getTime() - b.dueDate.getTime()).slice(0, 5)
-  }, [allEmis, allBorrowings])
+    return (summary?.upcoming_due ?? []).map(item => ({
+      label: item.label,
+      amount: item.amount,
+      dueDate: new Date(item.due_date),
+      type: item.type,
+      daysLeft: item.days_left,
+    }))
+  }, [summary])
 
   // Trend percentage helper
   const getTrendPct = (current: number, previous: number): { pct: number; direction: 'up' | 'down' | 'flat' } => {
@@ -564,7 +400,7 @@ export default function DashboardPage() {
   const incomeTrend = getTrendPct(stats.totalIncome, stats.prevMonthIncome)
 
   // Check if user is brand new (empty state)
-  const isNewUser = !loading && allExpenses.length === 0 && allIncomes.length === 0
+  const isNewUser = !loading && !!summary && summary.expenses.all_time_count === 0 && summary.income.all_time_count === 0
 
   // Mock data generators
   const generateMockNetWorthTrend = (): any[] => {
@@ -1154,14 +990,9 @@ export default function DashboardPage() {
               </div>
               {(() => {
                 const now = new Date()
-                const monthStart = new Date(now.getFullYear(), now.getMonth(), 1)
                 const monthEnd = new Date(now.getFullYear(), now.getMonth() + 1, 0)
-                const currentMonthIncome = allIncomes
-                  .filter((i: any) => { const d = new Date(i.income_date); return d >= monthStart && d <= monthEnd })
-                  .reduce((s: number, i: any) => s + i.amount, 0)
-                const currentMonthExpenses = allExpenses
-                  .filter((e: any) => { const d = new Date(e.transaction_date); return d >= monthStart && d <= monthEnd })
-                  .reduce((s: number, e: any) => s + e.amount, 0)
+                const currentMonthIncome = summary?.current_month.income ?? 0
+                const currentMonthExpenses = summary?.current_month.expenses ?? 0
 
                 const totalObligations = currentMonthExpenses + stats.emiMonthly
                 const safeToSpend = Math.max(0, currentMonthIncome - totalObligations)
@@ -1242,17 +1073,10 @@ export default function DashboardPage() {
 
                     {/* Last 7 days spending mini bar chart */}
                     {(() => {
-                      const bars: { day: string; amount: number }[] = []
-                      for (let i = 6; i >= 0; i--) {
-                        const d = new Date(now.getFullYear(), now.getMonth(), now.getDate() - i)
-                        const dayTotal = allExpenses
-                          .filter((e: any) => {
-                            const ed = new Date(e.transaction_date)
-                            return ed.getFullYear() === d.getFullYear() && ed.getMonth() === d.getMonth() && ed.getDate() === d.getDate()
-                          })
-                          .reduce((s: number, e: any) => s + e.amount, 0)
-                        bars.push({ day: d.toLocaleDateString('en-US', { weekday: 'narrow' }), amount: dayTotal })
-                      }
+                      const bars = (summary?.daily_expenses ?? []).map(d => {
+                        const [y, m, day] = d.date.split('-').map(Number)
+                        return { day: new Date(y, m - 1, day).toLocaleDateString('en-US', { weekday: 'narrow' }), amount: d.total }
+                      })
                       const maxBar = Math.max(...bars.map(b => b.amount), 1)
                       return (
                         <div className="mb-4">
@@ -1276,16 +1100,11 @@ export default function DashboardPage() {
 
                     {/* Top categories this month */}
                     {(() => {
-                      const catMap = new Map<string, { name: string; color: string; total: number }>()
-                      allExpenses
-                        .filter((e: any) => { const d = new Date(e.transaction_date); return d >= monthStart && d <= monthEnd })
-                        .forEach((e: any) => {
-                          const id = e.category_id ?? 'uncategorized'
-                          const existing = catMap.get(id)
-                          if (existing) existing.total += e.amount
-                          else catMap.set(id, { name: e.category_name ?? 'Other', color: e.category_color ?? '#64748b', total: e.amount })
-                        })
-                      const topCats = Array.from(catMap.values()).sort((a, b) => b.total - a.total).slice(0, 3)
+                      const topCats = (summary?.current_month.top_categories ?? []).map(c => ({
+                        name: c.category_id ? c.name : 'Other',
+                        color: c.color ?? '#64748b',
+                        total: c.total,
+                      }))
                       if (topCats.length === 0) return null
                       const catMax = topCats[0]?.total || 1
                       return (
@@ -1460,16 +1279,7 @@ export default function DashboardPage() {
                   stock: '#3b82f6', sip: '#8b5cf6', mutual_fund: '#6366f1', crypto: '#f59e0b',
                   fd: '#10b981', gold: '#eab308', bond: '#14b8a6', ppf: '#06b6d4', nps: '#ec4899', other: '#64748b',
                 }
-                const typeMap = new Map<string, { type: string; value: number }>()
-                allInvestments.forEach((inv: any) => {
-                  const t = (inv.investment_type || 'other').toLowerCase()
-                  const val = inv.total_value || inv.quantity * inv.purchase_price
-                  const existing = typeMap.get(t)
-                  if (existing) existing.value += val
-                  else typeMap.set(t, { type: t, value: val })
-                })
-                const slices = Array.from(typeMap.values())
-                  .sort((a, b) => b.value - a.value)
+                const slices = (summary?.investments.allocation ?? [])
                   .map((s) => ({ ...s, name: s.type.replace(/_/g, ' ').replace(/\b\w/g, (c) => c.toUpperCase()), color: INV_COLORS[s.type] || '#64748b' }))
                 const totalValue = slices.reduce((s, d) => s + d.value, 0)
 
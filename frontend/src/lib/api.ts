@@ -82,6 +82,23 @@ investmentApiClient.interceptors.response.use((r) => r, handle401)
 exportApiClient.interceptors.request.use(addAuthToken)
 exportApiClient.interceptors.response.use((r) => r, handle401)
 
+// Finance list endpoints are cursor-paginated: the cursor for the next page
+// comes back in the X-Next-Cursor header. Lists load one page at a time;
+// pass nextCursor back to load the next.
+const PAGE_SIZE = 100
+
+export interface Page<T> {
+  items: T[]
+  nextCursor?: string
+}
+
+async function fetchPage<T>(url: string, params?: Record<string, string | undefined>, cursor?: string): Promise<Page<T>> {
+  const response = await financeApiClient.get(url, {
+    params: { ...params, limit: PAGE_SIZE, cursor },
+  })
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || undefined }
+}
+
 export interface LoginRequest {
   email: string
   password: string
@@ -133,9 +150,20 @@ export interface ExpenseCreatePayload {
   tags?: string[]
 }
 
+// Stat-card totals over every matching expense; total is in `currency`
+export interface ExpenseSummary {
+  currency: string
+  total: number
+  count: number
+  categories: number
+}
+
 export const expenseApi = {
-  list(): Promise<ExpenseResponse[]> {
-    return financeApiClient.get('/expenses').then(r => r.data)
+  list(cursor?: string): Promise<Page<ExpenseResponse>> {
+    return fetchPage<ExpenseResponse>('/expenses', undefined, cursor)
+  },
+  summary(params?: { start_date?: string; end_date?: string; category_id?: string }): Promise<ExpenseSummary> {
+    return financeApiClient.get('/expenses/summary', { params }).then(r => r.data)
   },
   create(data: ExpenseCreatePayload): Promise<ExpenseResponse> {
     return financeApiClient.post('/expenses', data).then(r => r.data)
@@ -207,6 +235,49 @@ export const netWorthApi = {
   },
 }
 
+export interface DashboardCategoryTotal {
+  category_id: string | null
+  name: string
+  color: string | null
+  total: number
+  count: number
+}
+
+export interface DashboardPeriodTotals {
+  total: number
+  count: number
+  all_time_count: number
+  previous_month: number
+}
+
+export interface DashboardSummary {
+  period: { start_date: string; end_date: string }
+  currency: string
+  expenses: DashboardPeriodTotals
+  income: DashboardPeriodTotals
+  savings_rate: number
+  category_breakdown: DashboardCategoryTotal[]
+  monthly_trend: { month: string; expenses: number; income: number; savings: number }[]
+  current_month: { expenses: number; income: number; top_categories: DashboardCategoryTotal[] }
+  daily_expenses: { date: string; total: number }[]
+  recent_expenses: ExpenseResponse[]
+  emis: { count: number; monthly_total: number; remaining: number }
+  investments: { count: number; value: number; cost: number; return_percent: number; allocation: { type: string; value: number }[] }
+  budgets: { count: number; total: number; used: number; items: (Budget & { spent: number; remaining: number; percentage_used: number })[] }
+  borrowings: { outstanding: number; open: number; overdue: number }
+  lendings: { outstanding: number; open: number; overdue: number }
+  upcoming_due: { type: 'emi' | 'borrowing'; label: string; amount: number; due_date: string; days_left: number }[]
+  net_worth: number
+}
+
+export const dashboardApi = {
+  summary(startDate?: string, endDate?: string): Promise<DashboardSummary> {
+    return financeApiClient
+      .get('/dashboard/summary', { params: { start_date: startDate, end_date: endDate } })
+      .then(r => r.data)
+  },
+}
+
 export interface Budget {
   id?: string
   name: string
@@ -336,12 +407,20 @@ export interface BorrowingRepayment {
   created_at?: string
 }
 
+export interface BorrowingSummary {
+  currency: string
+  outstanding: number
+  repaid: number
+  open: number
+  overdue: number
+}
+
 export const borrowingApi = {
-  list: async (status?: string, lender?: string) => {
-    const params = new URLSearchParams()
-    if (status) params.append('status', status)
-    if (lender) params.append('lender', lender)
-    const response = await financeApiClient.get(`/borrowings?${params}`)
+  list: async (status?: string, lender?: string, cursor?: string): Promise<Page<any>> => {
+    return fetchPage<any>('/borrowings', { status, lender }, cursor)
+  },
+  summary: async (): Promise<BorrowingSummary> => {
+    const response = await financeApiClient.get('/borrowings/summary')
     return response.data
   },
   get: async (id: string) => {
@@ -368,9 +447,8 @@ export const borrowingApi = {
     const response = await financeApiClient.post(`/borrowings/${id}/reopen`)
     return response.data
   },
-  listRepayments: async (borrowingId: string) => {
-    const response = await financeApiClient.get(`/borrowings/${borrowingId}/repayments`)
-    return response.data
+  listRepayments: async (borrowingId: string, cursor?: string): Promise<Page<any>> => {
+    return fetchPage<any>(`/borrowings/${borrowingId}/repayments`, undefined, cursor)
   },
   createRepayment: async (borrowingId: string, data: BorrowingRepayment) => {
     const response = await financeApiClient.post(`/borrowings/${borrowingId}/repayments`, data)
@@ -447,13 +525,18 @@ export interface Income {
   created_at?: string
 }
 
+// Totals come converted into `currency`, the user's preferred one
+export interface IncomeSummary {
+  currency: string
+  total: number
+  this_month: number
+  by_source: { source: string; total: number; count: number }[]
+  recurring_count: number
+}
+
 export const incomeApi = {
-  list: async (startDate?: string, endDate?: string) => {
-    const params = new URLSearchParams()
-    if (startDate) params.append('start_date', startDate)
-    if (endDate) params.append('end_date', endDate)
-    const response = await financeApiClient.get(`/income?${params}`)
-    return response.data
+  list: async (startDate?: string, endDate?: string, cursor?: string): Promise<Page<any>> => {
+    return fetchPage<any>('/income', { start_date: startDate, end_date: endDate }, cursor)
   },
   get: async (id: string) => {
     const response = await financeApiClient.get(`/income/${id}`)
@@ -471,7 +554,7 @@ export const incomeApi = {
     const response = await financeApiClient.delete(`/income/${id}`)
     return response.data
   },
-  summary: async () => {
+  summary: async (): Promise<IncomeSummary> => {
     const response = await financeApiClient.get('/income/summary')
     return response.data
   },
@@ -509,12 +592,20 @@ export interface LendingCollection {
   created_at?: string
 }
 
+export interface LendingSummary {
+  currency: string
+  outstanding: number
+  received: number
+  open: number
+  overdue: number
+}
+
 export const lendingApi = {
-  list: async (status?: string, borrower?: string) => {
-    const params = new URLSearchParams()
-    if (status) params.append('status', status)
-    if (borrower) params.append('borrower', borrower)
-    const response = await financeApiClient.get(`/lendings?${params}`)
+  list: async (status?: string, borrower?: string, cursor?: string): Promise<Page<any>> => {
+    return fetchPage<any>('/lendings', { status, borrower }, cursor)
+  },
+  summary: async (): Promise<LendingSummary> => {
+    const response = await financeApiClient.get('/lendings/summary')
     return response.data
   },
   get: async (id: string) => {
@@ -541,9 +632,8 @@ export const lendingApi = {
     const response = await financeApiClient.post(`/lendings/${id}/reopen`)
     return response.data
   },
-  listCollections: async (lendingId: string) => {
-    const response = await financeApiClient.get(`/lendings/${lendingId}/collections`)
-    return response.data
+  listCollections: async (lendingId: string, cursor?: string): Promise<Page<any>> => {
+    return fetchPage<any>(`/lendings/${lendingId}/collections`, undefined, cursor)
   },
   createCollection: async (lendingId: string, data: LendingCollection) => {
     const response = await financeApiClient.post(`/lendings/${lendingId}/collections`, data)
@@ -7,6 +7,7 @@ export interface ExpenseResponse {
   payment_method?: string | null
   category_id?: string | null
   created_at: string
+  converted?: boolean      // false until a USD rate is known
   category_name?: string | null
   category_color?: string | null
   category_icon?: string | null